@@ -19,9 +19,8 @@ from awscrt.io import (
 )
 import asyncio
 from collections import deque
-from io import BytesIO
 from concurrent.futures import Future
-from typing import List, Tuple, Optional, Callable, AsyncIterator
+from typing import List, Tuple, Optional, Callable, AsyncIterator, Union
 import threading
 
 
@@ -330,7 +329,8 @@ class AIOHttpClientStreamUnified(HttpClientStreamBase):
         '_stream_completed',
         '_status_code',
         '_loop',
-        '_deque_lock')
+        '_deque_lock',
+        '_body_as_memoryview')
 
     def __init__(self,
                  connection: AIOHttpClientConnection,
@@ -340,7 +340,11 @@ class AIOHttpClientStreamUnified(HttpClientStreamBase):
 
         # Initialize the parent class
         http2_manual_write = request_body_generator is not None and connection.version is HttpVersion.Http2
+        # Body data arrives as bytes, which are queued or returned by get_next_response_chunk() as they are.
+        # While the next waiting read is a read_response_body_into(), it arrives as a view of a reused
+        # buffer instead, and is copied into the read's buffer without creating bytes for it.
         super()._init_common(connection, request, http2_manual_write=http2_manual_write)
+        self._body_as_memoryview = False
 
         # Attach the event loop for async operations
         if loop is None:
@@ -352,7 +356,9 @@ class AIOHttpClientStreamUnified(HttpClientStreamBase):
 
         # Lock to protect check-then-act sequences on deques for thread safety in free-threaded Python
         self._deque_lock = threading.Lock()
+        # Waiting reads, as (future, buffer) pairs. buffer is None for get_next_response_chunk()
         self._chunk_futures = deque()
+        # Body data nobody was waiting for, as bytes, or memoryviews of what's left after a partial read
         self._received_chunks = deque()
         self._stream_completed = False
 
@@ -376,20 +382,52 @@ class AIOHttpClientStreamUnified(HttpClientStreamBase):
         self._response_status_future.set_result(status_code)
         self._response_headers_future.set_result(name_value_pairs)
 
-    def _on_body(self, chunk: bytes) -> None:
-        """Process body chunk - called from C thread."""
-        with self._deque_lock:
-            if self._chunk_futures:
-                future = self._chunk_futures.popleft()
-            else:
-                self._received_chunks.append(chunk)
+    def _on_body(self, chunk: Union[bytes, memoryview]) -> None:
+        """Process body chunk - called from C thread.
+
+        A memoryview chunk is a view of a buffer reused for later chunks, so it's copied out before returning."""
+        offset = 0
+        while offset < len(chunk):
+            with self._deque_lock:
+                if self._chunk_futures:
+                    future, buffer = self._chunk_futures.popleft()
+                    self._update_body_buffer_mode()
+                else:
+                    self._received_chunks.append(self._rest_of_chunk(chunk, offset))
+                    return
+
+            # Skip reads whose caller stopped waiting
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            # Set result outside lock (Future is thread-safe)
+            if buffer is None:
+                rest = self._rest_of_chunk(chunk, offset)
+                future.set_result(rest if isinstance(rest, bytes) else bytes(rest))
                 return
-
-        # Set result outside lock (Future is thread-safe)
-        future.set_result(chunk)
+            n = min(len(buffer), len(chunk) - offset)
+            buffer[:n] = chunk[offset:offset + n]
+            offset += n
+            future.set_result(n)
+
+    @staticmethod
+    def _rest_of_chunk(chunk: Union[bytes, memoryview], offset: int) -> Union[bytes, memoryview]:
+        """Returns the data of chunk from offset on, which stays valid once _on_body() returns.
+        bytes aren't copied, memoryviews are, since their buffer is reused."""
+        if isinstance(chunk, bytes):
+            return chunk if offset == 0 else memoryview(chunk)[offset:]
+        return bytes(chunk[offset:])
+
+    def _update_body_buffer_mode(self) -> None:
+        """Has body data arrive as memoryviews only while the next waiting read is a read_response_body_into(),
+        since bytes would be copied again into its buffer. Call with _deque_lock held."""
+        as_memoryview = bool(self._chunk_futures) and self._chunk_futures[0][1] is not None
+        if as_memoryview != self._body_as_memoryview:
+            self._body_as_memoryview = as_memoryview
+            _awscrt.http_stream_set_body_buffer_mode(self, as_memoryview)
 
     def _resolve_pending_chunk_futures(self) -> None:
-        """Helper to resolve all pending chunk futures with empty bytes.
+        """Helper to resolve all pending chunk futures with empty bytes (or 0 bytes read).
 
         This indicates end of stream to any waiting get_next_response_chunk() calls.
         Must be called when either the stream completes or remote peer sends END_STREAM.
@@ -398,10 +436,12 @@ class AIOHttpClientStreamUnified(HttpClientStreamBase):
         with self._deque_lock:
             pending_futures = list(self._chunk_futures)
             self._chunk_futures.clear()
+            self._update_body_buffer_mode()
 
         # Set results outside lock (Future is thread-safe)
-        for future in pending_futures:
-            future.set_result(b"")
+        for future, buffer in pending_futures:
+            if future.set_running_or_notify_cancel():
+                future.set_result(b"" if buffer is None else 0)
 
     def _on_complete(self, error_code: int) -> None:
         """Set the completion status of the stream."""
@@ -445,12 +485,51 @@ class AIOHttpClientStreamUnified(HttpClientStreamBase):
         """
         with self._deque_lock:
             if self._received_chunks:
-                return self._received_chunks.popleft()
+                chunk = self._received_chunks.popleft()
+                return chunk if isinstance(chunk, bytes) else bytes(chunk)
             elif self._completion_future.done() or self._remote_completion_future.done():
                 return b""
             else:
                 future = Future()
-                self._chunk_futures.append(future)
+                self._chunk_futures.append((future, None))
+
+        # Await outside lock
+        return await asyncio.wrap_future(future, loop=self._loop)
+
+    async def read_response_body_into(self, buffer) -> int:
+        """Read the next response body data into a buffer you own.
+
+        If this read is waiting when data arrives, the data is copied into `buffer` from a buffer
+        that's reused for later data, without creating a `bytes` object for it.
+        Don't modify `buffer` until this returns.
+
+        Args:
+            buffer: Writable object supporting the buffer protocol (ex: bytearray, memoryview).
+
+        Returns:
+            int: Number of bytes written to the start of `buffer`, which may be fewer than its length.
+                Returns 0 when the stream is completed and no more data is left.
+        """
+        view = memoryview(buffer).cast('B')
+        if len(view) == 0:
+            return 0
+
+        with self._deque_lock:
+            if self._received_chunks:
+                chunk = self._received_chunks[0]
+                n = min(len(view), len(chunk))
+                view[:n] = chunk[:n]
+                if n == len(chunk):
+                    self._received_chunks.popleft()
+                else:
+                    self._received_chunks[0] = memoryview(chunk)[n:]
+                return n
+            elif self._completion_future.done() or self._remote_completion_future.done():
+                return 0
+            else:
+                future = Future()
+                self._chunk_futures.append((future, view))
+                self._update_body_buffer_mode()
 
         # Await outside lock
         return await asyncio.wrap_future(future, loop=self._loop)
@@ -527,6 +606,6 @@ class AIOHttp2ClientStream(AIOHttpClientStreamUnified):
     async def _set_request_body_generator(self, body_iterator: AsyncIterator[bytes]):
         try:
             async for chunk in body_iterator:
-                await self._write_data(BytesIO(chunk), False)
+                await self._write_data(chunk, False)
         finally:
             await self._write_data(None, True)
@@ -0,0 +1,379 @@
+"""
+S3 AsyncIO support
+
+This module provides asyncio wrappers around the awscrt.s3 module.
+All network operations in `awscrt.aio.s3` are asynchronous and use Python's asyncio framework.
+"""
+
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0.
+
+from awscrt.auth import AwsSigningConfig
+from awscrt.io import ClientBootstrap, TlsConnectionOptions
+from awscrt.s3 import (
+    S3ChecksumConfig, S3Client, S3RequestTlsMode, S3RequestType, _new_object_request,
+    _DEFAULT_STREAMING_PART_SIZE, _DEFAULT_STREAMING_BUFFERED_PARTS
+)
+import asyncio
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+import os
+from typing import BinaryIO, List, Optional, Sequence, Tuple, Union
+import threading
+
+
+class AIOS3Client:
+    """
+    An async S3 client.
+
+    Downloads are exposed as async iterators of body parts, with buffering bounded by the CRT read window:
+    each download's window only grows as its parts are consumed, so a slow consumer stops further parts
+    from downloading instead of buffering them in memory. Body parts are handed to the event loop without
+    scheduling a callback per part; the event loop is only woken up when a consumer is waiting for data.
+
+    Keyword Args:
+        region (str): Region that the S3 bucket lives in.
+
+        bootstrap (Optional [ClientBootstrap]): Client bootstrap to use when initiating socket connection.
+            If None is provided, the default singleton is used.
+
+        tls_mode (Optional[S3RequestTlsMode]): How TLS should be used while performing the request.
+            See :class:`~awscrt.s3.S3Client`.
+
+        signing_config (Optional[AwsSigningConfig]): Configuration for signing of the client.
+            See :class:`~awscrt.s3.S3Client`.
+
+        tls_connection_options (Optional[TlsConnectionOptions]): Optional TLS Options to be used
+            for each connection, unless `tls_mode` is :attr:`~awscrt.s3.S3RequestTlsMode.DISABLED`
+
+        part_size (Optional[int]): Size, in bytes, of parts that objects will be downloaded or uploaded in.
+            Default is 8 MiB.
+
+        multipart_upload_threshold (Optional[int]): The size threshold in bytes, for when to use multipart uploads.
+            See :class:`~awscrt.s3.S3Client`.
+
+        throughput_target_gbps (Optional[float]): Throughput target in Gigabits per second (Gbps).
+            See :class:`~awscrt.s3.S3Client`.
+
+        enable_s3express (Optional[bool]): To enable S3 Express support for the client.
+
+        memory_limit (Optional[int]): Memory limit, in bytes, of how much memory
+            client can use for buffering data for requests. See :class:`~awscrt.s3.S3Client`.
+
+        network_interface_names (Optional[Sequence(str)]):
+            **THIS IS AN EXPERIMENTAL AND UNSTABLE API.**
+            See :class:`~awscrt.s3.S3Client`.
+
+        max_active_connections_override (Optional[int]):
+            When set, this will cap the number of active connections for each request.
+
+        read_window_size (Optional[int]): Maximum number of bytes of each download that may be
+            received but not yet consumed from its iterator. Must be at least `part_size`.
+            A larger window allows more parts of a download to be in flight at once.
+            Default is 4 times `part_size`.
+
+        endpoint (Optional[str]): Host to send requests to, using path-style addressing (ex: "localhost:8080").
+            If None, requests go to the virtual-hosted-style endpoint "{bucket}.s3.{region}.amazonaws.com".
+    """
+
+    __slots__ = ('_client', '_region', '_endpoint')
+
+    def __init__(
+            self,
+            *,
+            region: str,
+            bootstrap: Optional[ClientBootstrap] = None,
+            tls_mode: Optional[S3RequestTlsMode] = None,
+            signing_config: Optional[AwsSigningConfig] = None,
+            tls_connection_options: Optional[TlsConnectionOptions] = None,
+            part_size: Optional[int] = None,
+            multipart_upload_threshold: Optional[int] = None,
+            throughput_target_gbps: Optional[float] = None,
+            enable_s3express: bool = False,
+            memory_limit: Optional[int] = None,
+            network_interface_names: Optional[Sequence[str]] = None,
+            max_active_connections_override: Optional[int] = None,
+            read_window_size: Optional[int] = None,
+            endpoint: Optional[str] = None) -> None:
+        assert isinstance(part_size, int) or part_size is None
+        assert isinstance(read_window_size, int) or read_window_size is None
+        assert isinstance(endpoint, str) or endpoint is None
+
+        if part_size is None:
+            part_size = _DEFAULT_STREAMING_PART_SIZE
+        if read_window_size is None:
+            read_window_size = part_size * _DEFAULT_STREAMING_BUFFERED_PARTS
+        if read_window_size < part_size:
+            # A part is only delivered once the window can hold all of it, so a smaller window never makes progress
+            raise ValueError("'read_window_size' must be at least 'part_size'")
+
+        self._region = region
+        self._endpoint = endpoint
+        self._client = S3Client(
+            bootstrap=bootstrap,
+            region=region,
+            tls_mode=tls_mode,
+            signing_config=signing_config,
+            tls_connection_options=tls_connection_options,
+            part_size=part_size,
+            multipart_upload_threshold=multipart_upload_threshold,
+            throughput_target_gbps=throughput_target_gbps,
+            enable_s3express=enable_s3express,
+            memory_limit=memory_limit,
+            network_interface_names=network_interface_names,
+            max_active_connections_override=max_active_connections_override,
+            enable_read_backpressure=True,
+            initial_read_window=read_window_size)
+
+    @property
+    def shutdown_event(self) -> threading.Event:
+        """threading.Event: Signals when the underlying :class:`~awscrt.s3.S3Client` has finished shutting down.
+        Shutdown begins when the AIOS3Client is destroyed."""
+        return self._client.shutdown_event
+
+    async def get_object(self,
+                         bucket: str,
+                         key: str,
+                         *,
+                         headers: Optional[List[Tuple[str, str]]] = None,
+                         checksum_config: Optional[S3ChecksumConfig] = None) -> 'AIOS3GetObjectStream':
+        """Start downloading an object, and wait for the response headers.
+
+        Args:
+            bucket (str): Bucket name.
+
+            key (str): Object key.
+
+            headers (Optional[List[Tuple[str, str]]]): Additional request headers (ex: Range, If-Match).
+
+            checksum_config (Optional[S3ChecksumConfig]): Optional checksum settings.
+
+        Returns:
+            AIOS3GetObjectStream: Async iterator over the response body.
+                Use it in an `async with` statement, or call :meth:`AIOS3GetObjectStream.aclose()`,
+                so the download is cancelled if you stop consuming the body early.
+
+        Raises:
+            S3ResponseError: If the request fails due to an unsuccessful response from S3.
+        """
+        request = _new_object_request("GET", bucket, key, self._region, endpoint=self._endpoint, headers=headers)
+        stream = AIOS3GetObjectStream(self._client, request, checksum_config)
+        try:
+            await asyncio.wrap_future(stream._headers_future)
+        except asyncio.CancelledError:
+            stream.cancel()
+            raise
+        return stream
+
+    async def put_object(self,
+                         bucket: str,
+                         key: str,
+                         *,
+                         body: Union[bytes, bytearray, memoryview, BinaryIO, None] = None,
+                         filepath: Optional[str] = None,
+                         content_length: Optional[int] = None,
+                         headers: Optional[List[Tuple[str, str]]] = None,
+                         checksum_config: Optional[S3ChecksumConfig] = None) -> List[Tuple[str, str]]:
+        """Upload an object, and wait for the upload to complete.
+
+        Exactly one of `body` or `filepath` must be set.
+
+        Args:
+            bucket (str): Bucket name.
+
+            key (str): Object key.
+
+            body (Union[bytes, bytearray, memoryview, BinaryIO, None]): Object data, either bytes-like,
+                or a binary file-like object that will be read from CRT threads.
+
+            filepath (Optional[str]): Path of a file to upload. The file is read directly by native code,
+                which should give better performance than `body`.
+
+            content_length (Optional[int]): Size of the object. Determined automatically for bytes-like `body`
+                and `filepath`. If unknown for a file-like `body`, the object is uploaded in parts until
+                the end of the stream.
+
+            headers (Optional[List[Tuple[str, str]]]): Additional request headers (ex: Content-Type).
+
+            checksum_config (Optional[S3ChecksumConfig]): Optional checksum settings.
+
+        Returns:
+            List[Tuple[str, str]]: The response headers.
+
+        Raises:
+            S3ResponseError: If the request fails due to an unsuccessful response from S3.
+        """
+        if (body is None) == (filepath is None):
+            raise ValueError("Exactly one of 'body' or 'filepath' must be set")
+
+        if isinstance(body, (bytes, bytearray, memoryview)):
+            if content_length is None:
+                content_length = memoryview(body).nbytes
+        elif filepath is not None and content_length is None:
+            content_length = os.stat(filepath).st_size
+
+        request = _new_object_request("PUT", bucket, key, self._region, endpoint=self._endpoint, headers=headers,
+                                      body_stream=body)
+        if content_length is not None:
+            request.headers.set("Content-Length", str(content_length))
+
+        response_headers = []
+
+        def on_headers(status_code, headers, **kwargs):
+            response_headers.extend(headers)
+
+        s3_request = self._client.make_request(
+            type=S3RequestType.PUT_OBJECT,
+            request=request,
+            send_filepath=filepath,
+            checksum_config=checksum_config,
+            on_headers=on_headers)
+        try:
+            await asyncio.wrap_future(s3_request.finished_future)
+        except asyncio.CancelledError:
+            s3_request.cancel()
+            raise
+        return response_headers
+
+
+class AIOS3GetObjectStream:
+    """Async iterator over the body of an object being downloaded.
+
+    Create with :meth:`AIOS3Client.get_object()`. Iterating yields the body as `bytes` parts, in order.
+    Raises the request's error, if any, once the parts received before the failure have been consumed.
+
+    Attributes:
+        status_code (int): Response status code.
+
+        headers (List[Tuple[str, str]]): Response headers.
+
+    Notes:
+        All async methods must be called from the thread that owns the event loop awaiting them.
+    """
+
+    __slots__ = ('status_code', 'headers', '_request', '_headers_future', '_done_future',
+                 '_lock', '_chunks', '_waiter', '_done', '_error')
+
+    def __init__(self, client: S3Client, request, checksum_config: Optional[S3ChecksumConfig]) -> None:
+        self.status_code = None
+        self.headers = None
+        self._headers_future = Future()
+        self._done_future = Future()
+
+        # Lock protecting check-then-act sequences between the CRT thread delivering parts and the consumer
+        self._lock = threading.Lock()
+        self._chunks = deque()
+        # Future for a consumer waiting on an empty queue. Only set while a consumer is waiting,
+        # so the event loop is woken up at most once per wait instead of once per part.
+        self._waiter = None
+        self._done = False
+        self._error = None
+
+        self._request = client.make_request(
+            type=S3RequestType.GET_OBJECT,
+            request=request,
+            checksum_config=checksum_config,
+            on_headers=self._on_headers,
+            on_body=self._on_body,
+            on_done=self._on_done)
+
+    def _on_headers(self, status_code: int, headers: List[Tuple[str, str]], **kwargs) -> None:
+        """Called from a CRT thread."""
+        self.status_code = status_code
+        self.headers = headers
+        self._headers_future.set_result(None)
+
+    def _on_body(self, chunk: bytes, offset: int, **kwargs) -> None:
+        """Called from a CRT thread. Parts are delivered in order, one at a time."""
+        while True:
+            with self._lock:
+                waiter = self._waiter
+                self._waiter = None
+                if waiter is None:
+                    self._chunks.append(chunk)
+                    return
+            try:
+                waiter.set_result(chunk)
+                return
+            except InvalidStateError:
+                # The consumer stopped waiting (cancelled). Try again so the part isn't lost.
+                continue
+
+    def _on_done(self, error: Optional[BaseException], **kwargs) -> None:
+        """Called from a CRT thread."""
+        with self._lock:
+            self._error = error
+            self._done = True
+            waiter = self._waiter
+            self._waiter = None
+
+        if not self._headers_future.done():
+            if error is not None:
+                self._headers_future.set_exception(error)
+            else:
+                self._headers_future.set_result(None)
+
+        if waiter is not None:
+            try:
+                waiter.set_result(None)
+            except InvalidStateError:
+                pass
+
+        if error is not None:
+            self._done_future.set_exception(error)
+        else:
+            self._done_future.set_result(None)
+
+    def __aiter__(self) -> 'AIOS3GetObjectStream':
+        return self
+
+    async def __anext__(self) -> bytes:
+        chunk = None
+        waiter = None
+        with self._lock:
+            if self._chunks:
+                chunk = self._chunks.popleft()
+            elif not self._done:
+                waiter = Future()
+                self._waiter = waiter
+
+        if waiter is not None:
+            # Await outside lock
+            chunk = await asyncio.wrap_future(waiter)
+
+        if chunk is None:
+            if self._error is not None:
+                raise self._error
+            raise StopAsyncIteration
+
+        # The part has left our buffer, let the CRT download that much more
+        self._request.increment_read_window(len(chunk))
+        return chunk
+
+    def cancel(self) -> None:
+        """Cancel the download. Iteration then raises an error once buffered parts are consumed."""
+        self._request.cancel()
+
+    async def wait_for_completion(self) -> None:
+        """Wait for the download to complete. The body must be consumed for the download to make progress.
+
+        Raises:
+            S3ResponseError: If the request fails due to an unsuccessful response from S3.
+        """
+        await asyncio.wrap_future(self._done_future)
+
+    async def aclose(self) -> None:
+        """Cancel the download if it's still in progress, and wait for it to finish.
+        Errors from the download are not raised."""
+        if not self._done_future.done():
+            self.cancel()
+        try:
+            await asyncio.wrap_future(self._done_future)
+        except Exception:
+            pass
+
+    async def __aenter__(self) -> 'AIOS3GetObjectStream':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
@@ -13,6 +13,7 @@ from awscrt import NativeResource
 import awscrt.exceptions
 from awscrt.io import ClientBootstrap, InputStream, TlsConnectionOptions, SocketOptions
 from enum import IntEnum
+import threading
 from typing import List, Tuple, Dict, Optional, Union, Iterator, Callable, Any
 
 
@@ -99,6 +100,10 @@ class HttpConnectionBase(NativeResource):
         concurrent.futures.Future: Completes when this connection has finished shutting down.
         Future will contain a result of None, or an exception indicating why shutdown occurred.
         Note that the connection may have been garbage-collected before this future completes.
+
+        For a connection acquired from an :class:`HttpClientConnectionManager`, the manager
+        owns its shutdown, so this only completes, with None, when the connection is released.
+        It doesn't complete if the connection closes while acquired. Use :meth:`is_open()` to check for that.
         """
         return self._shutdown_future
 
@@ -281,7 +286,9 @@ class HttpClientConnection(HttpClientConnectionBase):
     def request(self,
                 request: 'HttpRequest',
                 on_response: Optional[Callable[..., None]] = None,
-                on_body: Optional[Callable[..., None]] = None) -> 'HttpClientStream':
+                on_body: Optional[Callable[..., None]] = None,
+                on_body_buffer_mode: Optional[str] = None,
+                on_body_min_chunk_size: Optional[int] = None) -> 'HttpClientStream':
         """Create :class:`HttpClientStream` to carry out the request/response exchange.
 
         NOTE: The HTTP stream sends no data until :meth:`HttpClientStream.activate()`
@@ -314,16 +321,39 @@ class HttpClientConnection(HttpClientConnectionBase):
 
                     *   `chunk` (buffer): Response body data (not necessarily
                         a whole "chunk" of chunked encoding).
+                        See `on_body_buffer_mode` for its type.
 
                     *   `**kwargs` (dict): Forward-compatibility kwargs.
 
                 An exception raise by this function will cause the HTTP stream to end in error.
                 This callback is always invoked on the connection's event-loop thread.
 
+            on_body_buffer_mode (Optional[str]): How `chunk` is passed to the `on_body` callback.
+
+                *   "bytes" (default): `chunk` is a new `bytes` object, copied from the native buffer.
+
+                *   "memoryview": `chunk` is a read-only `memoryview` of a buffer that's reused
+                    between callbacks, saving a new allocation for every chunk. The buffer is only
+                    reused once no views of it remain, so a `chunk` (or slice of it, or object
+                    exporting its buffer) kept past the callback stays valid and unchanged,
+                    but then the next chunk needs a new buffer.
+
+                Either way, the data is copied out of the native buffer, which is only valid during
+                the callback. "memoryview" saves allocations, not that copy.
+
+            on_body_min_chunk_size (Optional[int]): If set, body data is coalesced natively and
+                `on_body` is invoked once at least this many bytes have arrived, instead of once per
+                read from the socket. Every `chunk` is at least this size, except the last one,
+                which is delivered once the body is done. This cuts the number of Python calls
+                for large responses. A buffer of this size is allocated for the stream.
+                If you manage flow-control windows manually, keep the window at least this size,
+                or the server stops sending before enough data arrives.
+                If None or 0 (default), `on_body` is invoked as data arrives.
+
         Returns:
             HttpClientStream:
         """
-        return HttpClientStream(self, request, on_response, on_body)
+        return HttpClientStream(self, request, on_response, on_body, on_body_buffer_mode, on_body_min_chunk_size)
 
     def close(self) -> "concurrent.futures.Future":
         """Close the connection.
@@ -416,7 +446,9 @@ class Http2ClientConnection(HttpClientConnectionBase):
                 request: 'HttpRequest',
                 on_response: Optional[Callable[..., None]] = None,
                 on_body: Optional[Callable[..., None]] = None,
-                manual_write: bool = False) -> 'Http2ClientStream':
+                manual_write: bool = False,
+                on_body_buffer_mode: Optional[str] = None,
+                on_body_min_chunk_size: Optional[int] = None) -> 'Http2ClientStream':
         """Create `Http2ClientStream` to carry out the request/response exchange.
 
         NOTE: The HTTP stream sends no data until `Http2ClientStream.activate()`
@@ -446,6 +478,7 @@ class Http2ClientConnection(HttpClientConnectionBase):
 
                     *   `chunk` (buffer): Response body data (not necessarily
                         a whole "chunk" of chunked encoding).
+                        See `on_body_buffer_mode` for its type.
 
                     *   `**kwargs` (dict): Forward-compatibility kwargs.
 
@@ -453,10 +486,18 @@ class Http2ClientConnection(HttpClientConnectionBase):
                 This allows calling `write_data()` to stream the request body in chunks.
                 Note: In the asyncio version, this is replaced by the async_body parameter.
 
+            on_body_buffer_mode (Optional[str]): How `chunk` is passed to the `on_body` callback,
+                "bytes" (default) or "memoryview". See :meth:`HttpClientConnection.request()`.
+
+            on_body_min_chunk_size (Optional[int]): If set, `on_body` is invoked once at least
+                this many bytes have arrived, or the body is done.
+                See :meth:`HttpClientConnection.request()`.
+
         Returns:
             Http2ClientStream: Stream for the HTTP/2 request/response exchange.
         """
-        return Http2ClientStream(self, request, on_response, on_body, manual_write)
+        return Http2ClientStream(self, request, on_response, on_body, manual_write, on_body_buffer_mode,
+                                 on_body_min_chunk_size)
 
     def close(self) -> "concurrent.futures.Future":
         """Close the connection.
@@ -481,11 +522,329 @@ class Http2ClientConnection(HttpClientConnectionBase):
         _awscrt.http2_connection_update_window(self._binding, increment_size)
 
 
+class HttpClientConnectionManager(NativeResource):
+    """
+    Pool of HTTP client connections to one endpoint.
+
+    Connections are established as needed, up to `max_connections`, and reused once released.
+    Acquire a connection with :meth:`acquire_connection()`, use it for one request at a time,
+    and give it back with :meth:`release_connection()` once the request's stream completes.
+    Closed connections are discarded instead of being handed out again.
+
+    Keep one manager per endpoint (host, port, and TLS settings).
+
+    Args:
+        host_name (str): Connect to host.
+
+        port (int): Connect to port.
+
+        bootstrap (Optional [ClientBootstrap]): Client bootstrap to use when initiating socket connection.
+            If None is provided, the default singleton is used.
+
+        socket_options (Optional[SocketOptions]): Optional socket options.
+            If None is provided, then default options are used.
+
+        tls_connection_options (Optional[TlsConnectionOptions]): Optional TLS
+            connection options. If None is provided, then connections will
+            be attempted over plain-text.
+
+        proxy_options (Optional[HttpProxyOptions]): Optional proxy options.
+            If None is provided then a proxy is not used.
+
+        max_connections (int): Maximum number of connections open at once, whether acquired or idle.
+            When all are acquired, further acquisitions wait until one is released.
+
+        max_connection_idle_ms (Optional[int]): Idle connections are closed after this many milliseconds
+            without being acquired. If None, idle connections are kept until the manager shuts down.
+
+    Attributes:
+        shutdown_event (threading.Event): Signals when the manager and all its connections
+            have finished shutting down. Shutdown begins when the HttpClientConnectionManager
+            object is destroyed, and finishes once every acquired connection has been released.
+    """
+
+    __slots__ = ('shutdown_event', '_host_name', '_port')
+
+    def __init__(self,
+                 host_name: str,
+                 port: int,
+                 bootstrap: Optional[ClientBootstrap] = None,
+                 socket_options: Optional[SocketOptions] = None,
+                 tls_connection_options: Optional[TlsConnectionOptions] = None,
+                 proxy_options: Optional['HttpProxyOptions'] = None,
+                 max_connections: int = 16,
+                 max_connection_idle_ms: Optional[int] = None) -> None:
+        assert isinstance(bootstrap, ClientBootstrap) or bootstrap is None
+        assert isinstance(host_name, str)
+        assert isinstance(port, int)
+        assert isinstance(tls_connection_options, TlsConnectionOptions) or tls_connection_options is None
+        assert isinstance(socket_options, SocketOptions) or socket_options is None
+        assert isinstance(proxy_options, HttpProxyOptions) or proxy_options is None
+
+        super().__init__()
+
+        if max_connections <= 0:
+            raise ValueError("max_connections must be positive")
+        if max_connection_idle_ms is not None and max_connection_idle_ms <= 0:
+            raise ValueError("max_connection_idle_ms must be positive")
+
+        shutdown_event = threading.Event()
+
+        def on_shutdown():
+            shutdown_event.set()
+
+        self.shutdown_event = shutdown_event
+        self._host_name = host_name
+        self._port = port
+
+        if not socket_options:
+            socket_options = SocketOptions()
+
+        if not bootstrap:
+            bootstrap = ClientBootstrap.get_or_create_static_default()
+
+        self._binding = _awscrt.http_connection_manager_new(
+            bootstrap,
+            host_name,
+            port,
+            socket_options,
+            tls_connection_options,
+            proxy_options,
+            max_connections,
+            max_connection_idle_ms or 0,
+            on_shutdown)
+
+    @property
+    def host_name(self) -> str:
+        """Remote hostname"""
+        return self._host_name
+
+    @property
+    def port(self) -> int:
+        """Remote port"""
+        return self._port
+
+    def acquire_connection(self) -> "concurrent.futures.Future":
+        """
+        Asynchronously acquire a connection.
+
+        An idle connection is reused if one is available. Otherwise, a new connection is established,
+        or if `max_connections` are already open, the acquisition waits until one is released.
+
+        Returns:
+            concurrent.futures.Future: A Future which completes when a connection is acquired.
+            If successful, the Future will contain an :class:`HttpClientConnection`
+            (or :class:`Http2ClientConnection`, if HTTP/2 was negotiated).
+            Otherwise, it will contain an exception.
+            The connection's :attr:`~HttpConnectionBase.shutdown_future` completes when it's released,
+            not when its socket closes. Check :meth:`~HttpConnectionBase.is_open()` before reusing it.
+        """
+        future = Future()
+        try:
+            _awscrt.http_connection_manager_acquire_connection(self, _HttpConnectionAcquisitionCore(self, future))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def release_connection(self, connection: HttpClientConnectionBase) -> None:
+        """
+        Give an acquired connection back, so it can be reused.
+
+        Release a connection once its stream has completed. The connection must not be used afterwards.
+        Connections that are garbage-collected without being released are also given back.
+
+        Args:
+            connection (HttpClientConnectionBase): Connection acquired from this manager.
+        """
+        _awscrt.http_connection_manager_release_connection(self, connection._binding)
+        if not connection.shutdown_future.done():
+            connection.shutdown_future.set_result(None)
+
+
+class Http2StreamManager(NativeResource):
+    """
+    Spreads HTTP/2 streams over a bounded pool of connections to one endpoint.
+
+    Each request is assigned to a connection with room for another stream.
+    New connections are opened when every open connection has reached
+    `ideal_concurrent_streams_per_connection`, up to `max_connections`, after which streams are packed
+    onto existing connections up to `max_concurrent_streams_per_connection` (or the server's
+    SETTINGS_MAX_CONCURRENT_STREAMS, if lower). Beyond that, requests wait for a stream to complete.
+    Connections that receive GOAWAY get no new streams: their in-flight streams finish,
+    and later requests go to other connections.
+
+    Args:
+        host_name (str): Connect to host.
+
+        port (int): Connect to port.
+
+        bootstrap (Optional [ClientBootstrap]): Client bootstrap to use when initiating socket connection.
+            If None is provided, the default singleton is used.
+
+        socket_options (Optional[SocketOptions]): Optional socket options.
+            If None is provided, then default options are used.
+
+        tls_connection_options (Optional[TlsConnectionOptions]): TLS connection options,
+            which must negotiate "h2" through ALPN. Required unless `prior_knowledge` is True.
+
+        proxy_options (Optional[HttpProxyOptions]): Optional proxy options.
+            If None is provided then a proxy is not used.
+
+        initial_settings (Optional[List[Http2Setting]]): The initial settings to change for each connection.
+
+        prior_knowledge (bool): If True, connect with HTTP/2 over plain-text, without negotiation.
+            Only valid if `tls_connection_options` is None.
+
+        max_connections (int): Maximum number of connections open at once.
+
+        ideal_concurrent_streams_per_connection (Optional[int]): Streams per connection, past which
+            the manager prefers to open a new connection. If None, a default is used.
+
+        max_concurrent_streams_per_connection (Optional[int]): Most streams ever assigned to one connection.
+            If None, the server's SETTINGS_MAX_CONCURRENT_STREAMS is the limit.
+
+        close_connection_on_server_error (bool): If True, close a connection when a stream on it
+            receives a 5xx response, so later streams go to healthier connections.
+
+    Attributes:
+        shutdown_event (threading.Event): Signals when the manager and its connections
+            have finished shutting down. Shutdown begins when the Http2StreamManager
+            object is destroyed, and finishes once every stream it made has completed.
+    """
+
+    __slots__ = ('shutdown_event', '_host_name', '_port')
+
+    def __init__(self,
+                 host_name: str,
+                 port: int,
+                 bootstrap: Optional[ClientBootstrap] = None,
+                 socket_options: Optional[SocketOptions] = None,
+                 tls_connection_options: Optional[TlsConnectionOptions] = None,
+                 proxy_options: Optional['HttpProxyOptions'] = None,
+                 initial_settings: Optional[List[Http2Setting]] = None,
+                 prior_knowledge: bool = False,
+                 max_connections: int = 16,
+                 ideal_concurrent_streams_per_connection: Optional[int] = None,
+                 max_concurrent_streams_per_connection: Optional[int] = None,
+                 close_connection_on_server_error: bool = False) -> None:
+        assert isinstance(bootstrap, ClientBootstrap) or bootstrap is None
+        assert isinstance(host_name, str)
+        assert isinstance(port, int)
+        assert isinstance(tls_connection_options, TlsConnectionOptions) or tls_connection_options is None
+        assert isinstance(socket_options, SocketOptions) or socket_options is None
+        assert isinstance(proxy_options, HttpProxyOptions) or proxy_options is None
+
+        super().__init__()
+
+        if (tls_connection_options is None) != prior_knowledge:
+            raise ValueError("Exactly one of 'tls_connection_options' and 'prior_knowledge' must be set")
+        if max_connections <= 0:
+            raise ValueError("max_connections must be positive")
+        for name, value in (('ideal_concurrent_streams_per_connection', ideal_concurrent_streams_per_connection),
+                            ('max_concurrent_streams_per_connection', max_concurrent_streams_per_connection)):
+            if value is not None and value <= 0:
+                raise ValueError("{} must be positive".format(name))
+
+        shutdown_event = threading.Event()
+
+        def on_shutdown():
+            shutdown_event.set()
+
+        self.shutdown_event = shutdown_event
+        self._host_name = host_name
+        self._port = port
+
+        if not socket_options:
+            socket_options = SocketOptions()
+
+        if not bootstrap:
+            bootstrap = ClientBootstrap.get_or_create_static_default()
+
+        # C layer uses 0 to indicate defaults
+        self._binding = _awscrt.http2_stream_manager_new(
+            bootstrap,
+            host_name,
+            port,
+            socket_options,
+            tls_connection_options,
+            proxy_options,
+            initial_settings,
+            prior_knowledge,
+            max_connections,
+            ideal_concurrent_streams_per_connection or 0,
+            max_concurrent_streams_per_connection or 0,
+            close_connection_on_server_error,
+            on_shutdown)
+
+    @property
+    def host_name(self) -> str:
+        """Remote hostname"""
+        return self._host_name
+
+    @property
+    def port(self) -> int:
+        """Remote port"""
+        return self._port
+
+    def request(self,
+                request: 'HttpRequest',
+                on_response: Optional[Callable[..., None]] = None,
+                on_body: Optional[Callable[..., None]] = None,
+                on_body_buffer_mode: Optional[str] = None,
+                on_body_min_chunk_size: Optional[int] = None) -> 'Http2ClientStream':
+        """Send a request on a stream of one of the manager's connections.
+
+        Unlike :meth:`Http2ClientConnection.request()`, the stream is activated by the manager,
+        as soon as a connection has room for it. Calling `activate()` on it does nothing.
+        The stream's :attr:`~HttpStreamBase.connection` is None.
+
+        Until the manager has acquired a stream on one of its connections, there is no
+        native stream to act on, and :meth:`~HttpClientStreamBase.update_window()` raises
+        RuntimeError. Call it from the `on_response` or `on_body` callbacks, which only
+        fire once the stream is acquired, or retry later.
+
+        The manager does not report the server's END_STREAM separately, so the stream's
+        :attr:`~Http2ClientStream.remote_end_stream_future` completes just before its
+        `completion_future`, when the stream completes successfully.
+
+        Args:
+            request (HttpRequest): Definition for outgoing request.
+
+            on_response: Optional callback invoked once main response headers are received.
+                See :meth:`Http2ClientConnection.request()` for its arguments.
+
+            on_body: Optional callback invoked 0+ times as response body data is received.
+                See :meth:`Http2ClientConnection.request()` for its arguments.
+
+            on_body_buffer_mode (Optional[str]): How `chunk` is passed to the `on_body` callback,
+                "bytes" (default) or "memoryview". See :meth:`HttpClientConnection.request()`.
+
+            on_body_min_chunk_size (Optional[int]): If set, `on_body` is invoked once at least
+                this many bytes have arrived, or the body is done.
+                See :meth:`HttpClientConnection.request()`.
+
+        Returns:
+            Http2ClientStream: Stream for the HTTP/2 request/response exchange.
+            Its `completion_future` contains an exception if no connection could be made for it.
+        """
+        return Http2ClientStream._new_from_stream_manager(
+            self, request, on_response, on_body, on_body_buffer_mode, on_body_min_chunk_size)
+
+
+def _body_as_memoryview(on_body_buffer_mode: Optional[str]) -> bool:
+    if on_body_buffer_mode is None or on_body_buffer_mode == "bytes":
+        return False
+    if on_body_buffer_mode == "memoryview":
+        return True
+    raise ValueError("'on_body_buffer_mode' must be \"bytes\" or \"memoryview\"")
+
+
 class HttpStreamBase(NativeResource):
     """Base for HTTP stream classes.
 
     Attributes:
         connection: The HTTP connection this stream belongs to.
+            None for streams made by an :class:`Http2StreamManager`.
         completion_future: Future that completes when the operation finishes.
     """
     __slots__ = ('_connection', '_completion_future', '_on_body_cb')
@@ -526,7 +885,9 @@ class HttpClientStreamBase(HttpStreamBase):
                      request: 'HttpRequest',
                      on_response: Optional[Callable[..., None]] = None,
                      on_body: Optional[Callable[..., None]] = None,
-                     http2_manual_write: bool = False) -> None:
+                     http2_manual_write: bool = False,
+                     on_body_buffer_mode: Optional[str] = None,
+                     on_body_min_chunk_size: Optional[int] = None) -> None:
         assert isinstance(connection, HttpClientConnectionBase)
         assert isinstance(request, HttpRequest)
         assert callable(on_response) or on_response is None
@@ -540,7 +901,32 @@ class HttpClientStreamBase(HttpStreamBase):
         # keep HttpRequest alive until stream completes
         self._request = request
         self._version = connection.version
-        self._binding = _awscrt.http_client_stream_new(self, connection, request, http2_manual_write)
+        self._binding = _awscrt.http_client_stream_new(
+            self, connection, request, http2_manual_write, _body_as_memoryview(on_body_buffer_mode),
+            on_body_min_chunk_size or 0)
+
+    def _init_from_stream_manager(self,
+                                  stream_manager: 'Http2StreamManager',
+                                  request: 'HttpRequest',
+                                  on_response: Optional[Callable[..., None]] = None,
+                                  on_body: Optional[Callable[..., None]] = None,
+                                  on_body_buffer_mode: Optional[str] = None,
+                                  on_body_min_chunk_size: Optional[int] = None) -> None:
+        assert isinstance(request, HttpRequest)
+        assert callable(on_response) or on_response is None
+        assert callable(on_body) or on_body is None
+
+        # The stream manager picks the connection, which isn't exposed
+        super().__init__(None, on_body)
+
+        self._on_response_cb = on_response
+        self._response_status_code = None
+
+        # keep HttpRequest alive until stream completes
+        self._request = request
+        self._version = HttpVersion.Http2
+        self._binding = _awscrt.http2_stream_manager_acquire_stream(
+            stream_manager, self, request, _body_as_memoryview(on_body_buffer_mode), on_body_min_chunk_size or 0)
 
     @property
     def version(self) -> HttpVersion:
@@ -583,6 +969,10 @@ class HttpClientStreamBase(HttpStreamBase):
 
         Args:
             increment_size (int): Number of bytes to increment the window by.
+
+        Raises:
+            RuntimeError: If the stream came from :meth:`Http2StreamManager.request()`
+                and hasn't been acquired on a connection yet.
         """
         _awscrt.http_stream_update_window(self, increment_size)
 
@@ -608,8 +998,11 @@ class HttpClientStream(HttpClientStreamBase):
                  connection: HttpClientConnection,
                  request: 'HttpRequest',
                  on_response: Optional[Callable[..., None]] = None,
-                 on_body: Optional[Callable[..., None]] = None) -> None:
-        self._init_common(connection, request, on_response, on_body)
+                 on_body: Optional[Callable[..., None]] = None,
+                 on_body_buffer_mode: Optional[str] = None,
+                 on_body_min_chunk_size: Optional[int] = None) -> None:
+        self._init_common(connection, request, on_response, on_body,
+                          on_body_buffer_mode=on_body_buffer_mode, on_body_min_chunk_size=on_body_min_chunk_size)
 
     def activate(self) -> None:
         """Begin sending the request.
@@ -628,9 +1021,26 @@ class Http2ClientStream(HttpClientStreamBase):
                  request: 'HttpRequest',
                  on_response: Optional[Callable[..., None]] = None,
                  on_body: Optional[Callable[..., None]] = None,
-                 manual_write: bool = False) -> None:
+                 manual_write: bool = False,
+                 on_body_buffer_mode: Optional[str] = None,
+                 on_body_min_chunk_size: Optional[int] = None) -> None:
         self._remote_end_stream_future = Future()
-        self._init_common(connection, request, on_response, on_body, manual_write)
+        self._init_common(connection, request, on_response, on_body, manual_write, on_body_buffer_mode,
+                          on_body_min_chunk_size)
+
+    @classmethod
+    def _new_from_stream_manager(cls,
+                                 stream_manager: Http2StreamManager,
+                                 request: 'HttpRequest',
+                                 on_response: Optional[Callable[..., None]] = None,
+                                 on_body: Optional[Callable[..., None]] = None,
+                                 on_body_buffer_mode: Optional[str] = None,
+                                 on_body_min_chunk_size: Optional[int] = None) -> 'Http2ClientStream':
+        stream = cls.__new__(cls)
+        stream._remote_end_stream_future = Future()
+        stream._init_from_stream_manager(
+            stream_manager, request, on_response, on_body, on_body_buffer_mode, on_body_min_chunk_size)
+        return stream
 
     @property
     def remote_end_stream_future(self) -> "concurrent.futures.Future":
@@ -677,6 +1087,9 @@ class Http2ClientStream(HttpClientStreamBase):
 
         The HTTP stream does nothing until this is called. Call activate() when you
         are ready for its callbacks and events to fire.
+
+        Streams from :meth:`Http2StreamManager.request()` are activated by the manager,
+        so this does nothing for them.
         """
         _awscrt.http_client_stream_activate(self)
 
@@ -692,8 +1105,9 @@ class Http2ClientStream(HttpClientStreamBase):
         which accepts an async generator.
 
         Args:
-            data_stream (Union[InputStream, Any]): Data to write. If not an InputStream,
-                it will be wrapped in one. Can be None to send an empty chunk.
+            data_stream (Union[InputStream, Any]): Data to write, as a binary I/O stream or
+                bytes-like object. If not an InputStream, it will be wrapped in one.
+                Can be None to send an empty chunk.
 
             end_stream (bool): True to indicate this is the last chunk and no more data
                 will be sent. False if more chunks will follow.
@@ -762,7 +1176,10 @@ class HttpRequest(HttpMessageBase):
         path (str): HTTP path-and-query value. Default value is "/".
         headers (Optional[HttpHeaders]): Optional headers. If None specified,
             an empty :class:`HttpHeaders` is created.
-        body_stream(Optional[Union[InputStream, io.IOBase]]): Optional body as binary stream.
+        body_stream(Optional[Union[InputStream, io.IOBase, bytes-like object]]): Optional body as binary stream.
+            An in-memory body (ex: bytes, bytearray, memoryview) may be passed directly.
+            Native code reads it without calling into Python, which is faster than wrapping it
+            in :class:`io.BytesIO`.
     """
 
     __slots__ = ()
@@ -1116,3 +1533,29 @@ class _HttpClientConnectionCore:
             # convert the list of tuple to list of Http2Setting
             settings = [Http2Setting(Http2SettingID(id), value) for id, value in native_settings]
             self._on_remote_settings_changed_from_user(settings)
+
+
+class _HttpConnectionAcquisitionCore:
+    '''
+    Private class to deliver the result of HttpClientConnectionManager.acquire_connection()
+    '''
+
+    def __init__(self, manager: HttpClientConnectionManager, acquire_future: Future) -> None:
+        self._host_name = manager.host_name
+        self._port = manager.port
+        self._acquire_future = acquire_future
+
+    def _on_acquired(self, binding: Any, error_code: int, http_version: HttpVersion) -> None:
+        if error_code != 0:
+            self._acquire_future.set_exception(awscrt.exceptions.from_code(error_code))
+            return
+        if http_version == HttpVersion.Http2:
+            connection = Http2ClientConnection()
+        else:
+            connection = HttpClientConnection()
+
+        connection._host_name = self._host_name
+        connection._port = self._port
+        connection._binding = binding
+        connection._version = HttpVersion(http_version)
+        self._acquire_future.set_result(connection)
@@ -738,22 +738,36 @@ def is_alpn_available():
 class InputStream(NativeResource):
     """InputStream allows `awscrt` native code to read from Python binary I/O classes.
 
+    It can also wrap an in-memory bytes-like object (ex: bytes, bytearray, memoryview).
+    Native code then reads directly from its buffer, without calling into Python.
+    The buffer is held until the InputStream is destroyed, so a bytearray can't be resized until then.
+
     Args:
-        stream (io.IOBase): Python binary I/O stream to wrap.
+        stream (Union[io.IOBase, bytes-like object]): Python binary I/O stream, or contiguous
+            bytes-like object, to wrap.
     """
     __slots__ = ('_stream')
     # TODO: Implement IOBase interface so Python can read from this class as well.
 
     def __init__(self, stream):
         # duck-type instead of checking inheritance from IOBase.
-        # At the least, stream must have read()
-        if not callable(getattr(stream, 'read', None)):
-            raise TypeError('I/O stream type expected')
+        # At the least, stream must have read(), or support the buffer protocol
+        is_io = callable(getattr(stream, 'read', None))
+        if not is_io:
+            try:
+                is_contiguous = memoryview(stream).c_contiguous
+            except TypeError:
+                raise TypeError('I/O stream type or bytes-like object expected') from None
+            if not is_contiguous:
+                raise TypeError('bytes-like object must be C-contiguous')
         assert not isinstance(stream, InputStream)
 
         super().__init__()
         self._stream = stream
-        self._binding = _awscrt.input_stream_new(self)
+        if is_io:
+            self._binding = _awscrt.input_stream_new(self)
+        else:
+            self._binding = _awscrt.input_stream_new_from_buffer(self, stream)
 
     def _read_into_memoryview(self, m):
         # Read into memoryview m.
@@ -784,7 +798,8 @@ class InputStream(NativeResource):
         Given some stream type, returns an :class:`InputStream`.
 
         Args:
-            stream (Union[io.IOBase, InputStream, None]): Binary I/O stream to wrap.
+            stream (Union[io.IOBase, bytes-like object, InputStream, None]): Binary I/O stream
+                or bytes-like object to wrap.
             allow_none (bool): Whether to allow `stream` to be None.
                 If False (default), and `stream` is None, an exception is raised.
 
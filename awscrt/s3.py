@@ -6,17 +6,121 @@ S3 client
 # SPDX-License-Identifier: Apache-2.0.
 
 import _awscrt
-from concurrent.futures import Future
+from concurrent.futures import CancelledError, Future
 from awscrt import NativeResource
-from awscrt.http import HttpRequest
+from awscrt.http import HttpHeaders, HttpRequest
 from awscrt.io import ClientBootstrap, TlsConnectionOptions
 from awscrt.auth import AwsCredentialsProvider, AwsSignatureType, AwsSignedBodyHeaderType, AwsSignedBodyValue, \
     AwsSigningAlgorithm, AwsSigningConfig
+import awscrt.checksums
 import awscrt.exceptions
 import threading
-from dataclasses import dataclass
-from typing import List, Optional, Tuple, Sequence
+from dataclasses import asdict, dataclass, field, replace
+from typing import Dict, List, Optional, Tuple, Sequence
 from enum import IntEnum
+import base64
+import fnmatch
+import functools
+import hashlib
+import io
+import json
+import os
+import re
+import struct
+import sys
+import tempfile
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from urllib.parse import quote
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape as _xml_escape
+
+# Part size used by streaming operations when neither the user nor the client chose one.
+# The read window must be able to hold at least one whole part, so it's easier to reason about a fixed size.
+_DEFAULT_STREAMING_PART_SIZE = 8 * 1024 * 1024
+
+# Default budget, in parts, of data buffered by streaming operations.
+_DEFAULT_STREAMING_BUFFERED_PARTS = 4
+
+# Default number of transfers in flight for batch operations.
+_DEFAULT_BATCH_MAX_CONCURRENCY = 64
+
+# Default number of pages requested at once when listing objects across common prefixes.
+_DEFAULT_LIST_MAX_CONCURRENCY = 16
+
+# Number of keys S3 returns per ListObjectsV2 page, unless asked for fewer.
+_LIST_MAX_KEYS = 1000
+
+# Default and limits for the part size of multipart copies.
+_DEFAULT_COPY_PART_SIZE = 128 * 1024 * 1024
+_MIN_COPY_PART_SIZE = 5 * 1024 * 1024
+_MAX_COPY_PART_SIZE = 5 * 1024 * 1024 * 1024
+_MAX_UPLOAD_PARTS = 10000
+# Headers of the source a multipart copy passes on to the new object, like CopyObject does
+_COPY_METADATA_HEADERS = ("content-type", "content-encoding", "content-language", "content-disposition",
+                          "cache-control", "expires")
+
+# Default sizes of the tiers of an S3ObjectCache
+_DEFAULT_CACHE_MEMORY_LIMIT = 256 * 1024 * 1024
+_DEFAULT_CACHE_DISK_LIMIT = 4 * 1024 * 1024 * 1024
+
+# Request headers that make a GET_OBJECT conditional, which bypasses the S3ObjectCache
+_CONDITIONAL_HEADERS = ("If-Match", "If-None-Match", "If-Modified-Since", "If-Unmodified-Since")
+
+# Defaults and limits for S3Autotuner
+_DEFAULT_AUTOTUNE_CONNECTIONS = 32
+_MIN_AUTOTUNE_PART_SIZE = 5 * 1024 * 1024
+_MAX_AUTOTUNE_PART_SIZE = 256 * 1024 * 1024
+_MAX_AUTOTUNE_CONNECTIONS = 1024
+# Connections are scaled by this factor at each step of the search
+_AUTOTUNE_CONNECTIONS_STEP = 1.5
+# A step must improve throughput by this fraction to be kept
+_AUTOTUNE_MIN_IMPROVEMENT = 0.05
+# Parts should take this many times longer to transfer than the time to their first byte
+_AUTOTUNE_PART_TIME_TO_LATENCY = 8
+# Once settled, the search resumes after this many requests, in case conditions changed
+_AUTOTUNE_REPROBE_INTERVAL = 20
+
+# Defaults for coalescing the ranges of S3Client.get_ranges():
+# ranges closer than this are read with one request, as a round trip costs more than reading the gap,
+_DEFAULT_RANGES_MAX_GAP = 1024 * 1024
+# unless that would make the request larger than this.
+_DEFAULT_RANGES_MAX_REQUEST_SIZE = 32 * 1024 * 1024
+
+# Defaults for S3ThroughputCoordinator
+_DEFAULT_COORDINATED_THROUGHPUT_GBPS = 10.0
+# aws-c-s3 sizes a client's connections at 10 per 4 Gbps of its throughput target
+_CONNECTIONS_PER_GBPS = 2.5
+# A process without requests in flight keeps its share this long after its last request
+_DEFAULT_COORDINATOR_LEASE_SECS = 10.0
+# Where process liveness can't be checked, a process that hasn't been seen this long is assumed gone
+_COORDINATOR_STALE_SECS = 600.0
+# Layout of a participant of an S3ThroughputCoordinator in its state file: pid, token, requests in flight, last seen
+_COORDINATOR_RECORD = struct.Struct("<qQqd")
+# Requests finishing within this long of each other are written to the state file at once
+_COORDINATOR_FLUSH_DELAY_SECS = 0.05
+# While a process is known to other participants, requests starting within this long of the last
+# update of the state file use the share it gave, instead of updating the file again
+_COORDINATOR_REFRESH_SECS = 1.0
+# How long to retry taking the lock of the state file, before falling back on the last known share
+_COORDINATOR_LOCK_TIMEOUT_SECS = 0.1
+
+# Defaults for S3RangeHedging
+_DEFAULT_HEDGE_PERCENTILE = 95.0
+_DEFAULT_HEDGE_MIN_SAMPLES = 20
+_DEFAULT_HEDGE_MAX_FRACTION = 0.05
+# Number of recent request durations the hedging threshold is computed from
+_HEDGE_WINDOW = 200
+
+# Size of the chunks a file is read in, to compute its checksum
+_CHECKSUM_READ_SIZE = 1024 * 1024
+
+# aws_s3_recv_file_options.AWS_S3_RECV_FILE_WRITE_TO_POSITION
+_RECV_FILE_WRITE_TO_POSITION = 3
+
+# Layout of one request attempt's metrics, as packed by the C layer (see s_s3_request_on_telemetry())
+_S3_METRICS_RECORD = struct.Struct("!32s48sIIiiQQQQqqqqqqQQB")
 
 
 class CrossProcessLock(NativeResource):
@@ -70,6 +174,14 @@ class S3RequestType(IntEnum):
     Put Object S3 request
     """
 
+    COPY_OBJECT = 3
+    """
+    Copy Object S3 request.
+    The request must have an `x-amz-copy-source` header naming the source object.
+    Large objects are copied with a multipart upload, using parts of at least 128 MiB.
+    See :meth:`S3Client.copy_object()` to choose the part size.
+    """
+
 
 class S3RequestTlsMode(IntEnum):
     """TLS mode for S3 request"""
@@ -137,6 +249,14 @@ class S3ChecksumLocation(IntEnum):
     """
 
 
+# Algorithms whose checksums of consecutive data can be combined: checksum function, combine function, size in bytes
+_CRC_FUNCTIONS = {
+    S3ChecksumAlgorithm.CRC32: (awscrt.checksums.crc32, awscrt.checksums.combine_crc32, 4),
+    S3ChecksumAlgorithm.CRC32C: (awscrt.checksums.crc32c, awscrt.checksums.combine_crc32c, 4),
+    S3ChecksumAlgorithm.CRC64NVME: (awscrt.checksums.crc64nvme, awscrt.checksums.combine_crc64nvme, 8),
+}
+
+
 @dataclass
 class S3ChecksumConfig:
     """Configures how the S3Client calculates and verifies checksums."""
@@ -153,6 +273,40 @@ class S3ChecksumConfig:
     validate_response: bool = False
     """Whether to retrieve and validate response checksums."""
 
+    full_object_checksum: bool = False
+    """
+    If True, a :attr:`~S3RequestType.PUT_OBJECT` request also reports the checksum of each part
+    it uploaded, and of the whole object, from :attr:`S3Request.upload_checksum` once it succeeds.
+    The part checksums are the ones the client computed while sending the parts, and they're
+    combined into the full-object checksum (see :mod:`awscrt.checksums`), so the data isn't read again.
+    `algorithm` must be a CRC, for the part checksums to be combinable, and `location` must be set.
+    An upload too small to be split into parts reports the checksum S3 returns for it.
+    """
+
+
+@dataclass
+class S3UploadChecksum:
+    """Checksums of the data of a :attr:`~S3RequestType.PUT_OBJECT` request,
+    computed while it uploaded. See :attr:`S3ChecksumConfig.full_object_checksum`."""
+
+    algorithm: S3ChecksumAlgorithm
+    """Algorithm of the checksums."""
+
+    checksum: int
+    """Checksum of the whole object."""
+
+    part_size: int
+    """Size of the parts `part_checksums` are computed over. The last part may be smaller."""
+
+    part_checksums: List[int]
+    """Checksum of each part, in order."""
+
+    @property
+    def checksum_base64(self):
+        """str: Checksum of the whole object, base64-encoded as in the `x-amz-checksum-*` headers
+        of objects with a full-object checksum."""
+        return base64.b64encode(self.checksum.to_bytes(_CRC_FUNCTIONS[self.algorithm][2], "big")).decode()
+
 
 @dataclass
 class S3FileIoOptions:
@@ -197,459 +351,3435 @@ class S3FileIoOptions:
     """
 
 
-class S3Client(NativeResource):
-    """S3 client
+@dataclass
+class S3TransferProgress:
+    """Progress of a batch of transfers. See :meth:`S3BatchTransfer.progress()`."""
 
-    Keyword Args:
-        bootstrap (Optional [ClientBootstrap]): Client bootstrap to use when initiating socket connection.
-            If None is provided, the default singleton is used.
+    total: int = 0
+    """Number of transfers in the batch."""
 
-        region (str): Region that the S3 bucket lives in.
+    succeeded: int = 0
+    """Number of transfers that finished successfully."""
 
-        tls_mode (Optional[S3RequestTlsMode]):  How TLS should be used while performing the request
+    failed: int = 0
+    """Number of transfers that failed."""
 
-            If this is :attr:`S3RequestTlsMode.ENABLED`:
-                If `tls_connection_options` is set, then those TLS options will be used
-                If `tls_connection_options` is unset, then default TLS options will be used
+    in_flight: int = 0
+    """Number of transfers in progress."""
 
-            If this is :attr:`S3RequestTlsMode.DISABLED`:
-                No TLS options will be used, regardless of `tls_connection_options` value.
+    bytes_transferred: int = 0
+    """Number of bytes transferred so far, across all transfers."""
 
-        signing_config (Optional[AwsSigningConfig]): Configuration for signing of the client.
-            Use :func:`create_default_s3_signing_config()` to create the default config.
+    skipped: int = 0
+    """Number of files left out of a directory transfer because they were unchanged. Not counted in `total`."""
 
-            If not set, a default config will be used with anonymous credentials and skip signing the request.
 
-            If set:
-                Credentials provider is required. Other configs are all optional, and will be default to what
-                    needs to sign the request for S3, only overrides when Non-zero/Not-empty is set.
+@dataclass
+class S3TransferFailure:
+    """A transfer from a batch that didn't succeed. See :class:`S3BatchTransfer`."""
 
-                S3 Client will derive the right config for signing process based on this.
+    key: str
+    """Object key."""
 
-            Notes:
+    filepath: str
+    """Local file path."""
 
-                1. For SIGV4_S3EXPRESS, S3 client will use the credentials in the config to derive the S3 Express
-                    credentials that are used in the signing process.
-                2. Client may make modifications to signing config before passing it on to signer.
+    error: Exception
+    """Why the transfer failed. An :class:`S3ResponseError` if S3 sent an unsuccessful response.
+    Transfers never started because the batch was cancelled fail with AWS_ERROR_S3_CANCELED."""
 
-        credential_provider (Optional[AwsCredentialsProvider]): Deprecated, prefer `signing_config` instead.
-            Credentials providers source the :class:`~awscrt.auth.AwsCredentials` needed to sign an authenticated AWS request.
-            If None is provided, the request will not be signed.
 
-        tls_connection_options (Optional[TlsConnectionOptions]): Optional TLS Options to be used
-            for each connection, unless `tls_mode` is :attr:`S3RequestTlsMode.DISABLED`
+@dataclass
+class S3ObjectSummary:
+    """An object listed by :meth:`S3Client.list_objects()`."""
 
-        part_size (Optional[int]): Size, in bytes, of parts that files will be downloaded or uploaded in.
-            If not set, a dynamic default part size will be used based on the throughput target, memory_limit_in_bytes.
-            Note: for :attr:`S3RequestType.PUT_OBJECT` request, client will adjust the part size to meet the service limits.
-            (max number of parts per upload is 10,000, minimum upload part size is 5 MiB)
+    key: str
+    """Object key."""
 
-        multipart_upload_threshold (Optional[int]): The size threshold in bytes, for when to use multipart uploads.
-            This only affects :attr:`S3RequestType.PUT_OBJECT` request.
-            Uploads over this size will use the multipart upload strategy.
-            Uploads this size or less will use a single request.
-            If not set, maximal of `part_size` and 5 MiB will be used.
+    size: int
+    """Object size, in bytes."""
 
-        throughput_target_gbps (Optional[float]): Throughput target in
-            Gigabits per second (Gbps) that we are trying to reach.
-            You can also use `get_recommended_throughput_target_gbps()` to get recommended value for your system.
-            10.0 Gbps by default (may change in future)
+    etag: str
+    """Object ETag, with its surrounding quotes."""
 
-        enable_s3express (Optional[bool]): To enable S3 Express support for the client.
-            The typical usage for a S3 Express request is to set this to true and let the request to be
-            signed with `AwsSigningAlgorithm.V4_S3EXPRESS`, either from the client-level `signing_config`
-            or the request-level override.
+    last_modified: str
+    """When the object was last modified, as an ISO 8601 string (ex: "2009-10-12T17:50:30.000Z")."""
 
-        memory_limit (Optional[int]): Memory limit, in bytes, of how much memory
-            client can use for buffering data for requests.
-            If not set, client will try to pick up from environment variable before chose the default.
-            Default values scale with target throughput and are currently
-            between 2GiB and 24GiB (may change in future)
+    storage_class: str
+    """Object storage class (ex: "STANDARD")."""
 
-        network_interface_names (Optional[Sequence(str)]):
-            **THIS IS AN EXPERIMENTAL AND UNSTABLE API.**
-            A sequence of network interface names. The client will distribute the
-            connections across network interfaces. If any interface name is invalid, goes down,
-            or has any issues like network access, you will see connection failures.
-            This option is only supported on Linux, MacOS, and platforms that have either SO_BINDTODEVICE or IP_BOUND_IF. It
-            is not supported on Windows. `AWS_ERROR_PLATFORM_NOT_SUPPORTED` will be raised on unsupported platforms. On
-            Linux, SO_BINDTODEVICE is used and requires kernel version >= 5.7 or root privileges.
 
-        fio_options (Optional[S3FileIoOptions]):
-            If set, this controls how the client interact with file I/O.
-            If not set, a default options will be created to avoid memory issue based on the size of file.
-            Note: Only applies when the request created with `send_filepath`
+@dataclass
+class S3RequestAttemptMetrics:
+    """Metrics of one attempt of one of the HTTP requests a :class:`S3Request` is split into.
+    See :class:`S3RequestMetrics`.
 
-        max_active_connections_override (Optional[int]):
-            When set, this will cap the number of active connections for the meta request.
-            When not set, the client will determine this value based on `throughput_target_gbps`. (Recommended)
+    Durations are in nanoseconds, and are None if the attempt didn't get that far.
     """
 
-    __slots__ = ('shutdown_event', '_region')
+    operation_name: str
+    """S3 operation of the request (ex: "GetObject", "UploadPart")."""
 
-    def __init__(
-            self,
-            *,
-            bootstrap=None,
-            region,
-            tls_mode=None,
-            signing_config=None,
-            credential_provider=None,
-            tls_connection_options=None,
-            part_size=None,
-            multipart_upload_threshold=None,
-            throughput_target_gbps=None,
-            enable_s3express=False,
-            memory_limit=None,
-            network_interface_names: Optional[Sequence[str]] = None,
-            fio_options: Optional['S3FileIoOptions'] = None,
-            max_active_connections_override: Optional[int] = None):
-        assert isinstance(bootstrap, ClientBootstrap) or bootstrap is None
-        assert isinstance(region, str)
-        assert isinstance(signing_config, AwsSigningConfig) or signing_config is None
-        assert isinstance(credential_provider, AwsCredentialsProvider) or credential_provider is None
-        assert isinstance(tls_connection_options, TlsConnectionOptions) or tls_connection_options is None
-        assert isinstance(part_size, int) or part_size is None
-        assert isinstance(
-            throughput_target_gbps,
-            int) or isinstance(
-            throughput_target_gbps,
-            float) or throughput_target_gbps is None
-        assert isinstance(enable_s3express, bool) or enable_s3express is None
-        assert isinstance(network_interface_names, Sequence) or network_interface_names is None
-        assert isinstance(fio_options, S3FileIoOptions) or fio_options is None
-        assert isinstance(max_active_connections_override, int) or max_active_connections_override is None
+    ip_address: Optional[str]
+    """IP address the request was sent to. None if no connection was acquired."""
 
-        if credential_provider and signing_config:
-            raise ValueError("'credential_provider' has been deprecated in favor of 'signing_config'.  "
-                             "Both parameters may not be set.")
+    part_number: int
+    """Part number, for requests transferring a part of the object. 0 otherwise."""
 
-        super().__init__()
+    retry_attempt: int
+    """0 for the first attempt of a request, 1 for its first retry, etc."""
 
-        shutdown_event = threading.Event()
+    response_status: int
+    """HTTP status code of the response. 0 if no response was received."""
 
-        def on_shutdown():
-            shutdown_event.set()
+    error_code: int
+    """CRT error code the attempt failed with. 0 if it succeeded."""
 
-        self._region = region
-        self.shutdown_event = shutdown_event
+    part_range_start: int
+    """Offset in the object of the first byte of the part."""
 
-        if not bootstrap:
-            bootstrap = ClientBootstrap.get_or_create_static_default()
+    part_range_end: int
+    """Offset in the object of the last byte of the part (inclusive)."""
 
-        s3_client_core = _S3ClientCore(
-            bootstrap,
-            credential_provider,
-            signing_config,
-            tls_connection_options)
+    start_timestamp_ns: int
+    """When the attempt started, as monotonic clock nanoseconds."""
 
-        # C layer uses 0 to indicate defaults
-        if tls_mode is None:
-            tls_mode = 0
-        if part_size is None:
-            part_size = 0
-        if multipart_upload_threshold is None:
-            multipart_upload_threshold = 0
-        if throughput_target_gbps is None:
-            throughput_target_gbps = 0
-        if memory_limit is None:
-            memory_limit = 0
-        if network_interface_names is not None:
-            # ensure this is a list, so it's simpler to process in C
-            if not isinstance(network_interface_names, list):
-                network_interface_names = list(network_interface_names)
-        if max_active_connections_override is None:
-            max_active_connections_override = 0
-        fio_options_set = False
-        should_stream = False
-        disk_throughput_gbps = 0.0
-        direct_io = False
-        if fio_options is not None:
-            fio_options_set = True
-            should_stream = fio_options.should_stream
-            disk_throughput_gbps = fio_options.disk_throughput_gbps
-            direct_io = fio_options.direct_io
+    end_timestamp_ns: int
+    """When the attempt ended, as monotonic clock nanoseconds."""
 
-        self._binding = _awscrt.s3_client_new(
-            bootstrap,
-            signing_config,
-            credential_provider,
-            tls_connection_options,
-            on_shutdown,
-            region,
-            tls_mode,
-            part_size,
-            multipart_upload_threshold,
-            throughput_target_gbps,
-            enable_s3express,
-            memory_limit,
-            network_interface_names,
-            fio_options_set,
-            should_stream,
-            disk_throughput_gbps,
-            direct_io,
-            max_active_connections_override,
-            s3_client_core)
+    conn_acquire_ns: Optional[int]
+    """Time waiting for a connection. Includes DNS resolution, connecting, and the TLS handshake
+    if a new connection had to be established."""
 
-    def make_request(
-            self,
-            *,
-            type,
-            request,
-            operation_name=None,
-            recv_filepath=None,
-            send_filepath=None,
-            signing_config=None,
-            credential_provider=None,
-            checksum_config=None,
-            part_size=None,
-            multipart_upload_threshold=None,
-            fio_options=None,
-            max_active_connections_override=None,
-            on_headers=None,
-            on_body=None,
-            on_done=None,
-            on_progress=None):
-        """Create the Request to the the S3 server,
-        :attr:`~S3RequestType.GET_OBJECT`/:attr:`~S3RequestType.PUT_OBJECT` requests are split it into multi-part
-        requests under the hood for acceleration.
+    sign_ns: Optional[int]
+    """Time signing the request."""
 
-        Keyword Args:
-            type (S3RequestType): The type of S3 request passed in,
-                :attr:`~S3RequestType.GET_OBJECT`/:attr:`~S3RequestType.PUT_OBJECT` can be accelerated
+    send_ns: Optional[int]
+    """Time sending the request, including its body."""
 
-            request (HttpRequest): The overall outgoing API request for S3 operation.
-                If the request body is a file, set send_filepath for better performance.
+    time_to_first_byte_ns: Optional[int]
+    """Time from starting to send the request, until the first byte of the response."""
 
-            operation_name(Optional[str]): S3 operation name (e.g. "CreateBucket").
-                This MUST be set when `type` is :attr:`~S3RequestType.DEFAULT`.
-                It is ignored for other types, since the operation is implicitly known.
-                See `S3 API documentation
-                <https://docs.aws.amazon.com/AmazonS3/latest/API/API_Operations_Amazon_Simple_Storage_Service.html>`_
-                for the canonical list of names.
+    receive_ns: Optional[int]
+    """Time receiving the response."""
 
-                This name is used to fill out details in metrics and error reports.
-                It also drives some operation-specific behavior.
-                If you pass the wrong name, you risk getting the wrong behavior.
+    retry_delay_ns: Optional[int]
+    """Time waiting before this attempt, if it's a retry."""
 
-                For example, every operation except "GetObject" has its response checked
-                for error, even if the HTTP status-code was 200 OK
-                (see `knowledge center <https://repost.aws/knowledge-center/s3-resolve-200-internalerror>`_).
-                If you used the :attr:`~S3RequestType.DEFAULT` type to do
-                `GetObject <https://docs.aws.amazon.com/AmazonS3/latest/API/API_GetObject.html>`_,
-                but mis-named it "Download", and the object looked like XML with an error code,
-                then the request would fail. You risk logging the full response body,
-                and leaking sensitive data.
+    total_ns: int
+    """Total duration of the attempt."""
 
-            recv_filepath (Optional[str]): Optional file path. If set, the
-                response body is written directly to a file and the
-                `on_body` callback is not invoked. This should give better
-                performance than writing to file from the `on_body` callback.
+    connection_id: int
+    """Opaque identifier of the connection used. 0 if no connection was acquired."""
 
-            send_filepath (Optional[str]): Optional file path. If set, the
-                request body is read directly from a file and the
-                request's `body_stream` is ignored. This should give better
-                performance than reading a file from a stream.
+    is_https: bool
+    """Whether the request was sent over TLS."""
 
-            signing_config (Optional[AwsSigningConfig]): Configuration for signing of the request to override the configuration from client.
-                Use :func:`create_default_s3_signing_config()` to create the default config.
+    @property
+    def num_bytes(self) -> int:
+        """Size of the part transferred. 0 for requests that don't transfer a part of the object."""
+        if self.part_number == 0 or self.part_range_end < self.part_range_start:
+            return 0
+        return self.part_range_end - self.part_range_start + 1
 
-                If None is provided, the client configuration will be used.
+    @property
+    def throughput_bytes_per_sec(self) -> Optional[float]:
+        """Throughput of the part transfer on its connection, or None if nothing was transferred."""
+        transfer_ns = max(self.send_ns or 0, self.receive_ns or 0)
+        if not self.num_bytes or not transfer_ns or self.error_code:
+            return None
+        return self.num_bytes * 1e9 / transfer_ns
 
-                If set:
-                    All fields are optional. The credentials will be resolve from client if not set.
-                    S3 Client will derive the right config for signing process based on this.
 
-                Notes:
+class S3RequestMetrics:
+    """Metrics of every attempt of every HTTP request a :class:`S3Request` was split into,
+    in the order they finished.
 
-                    1. For SIGV4_S3EXPRESS, S3 client will use the credentials in the config to derive the S3 Express
-                        credentials that are used in the signing process.
-                    2. Client may make modifications to signing config before passing it on to signer.
+    The records are held packed, as they were collected by the native layer, and
+    each :class:`S3RequestAttemptMetrics` is only built when it's accessed.
+    See :meth:`S3Request.get_metrics()`.
+    """
 
-            credential_provider (Optional[AwsCredentialsProvider]):  Deprecated, prefer `signing_config` instead.
-                Credentials providers source the :class:`~awscrt.auth.AwsCredentials` needed to sign an authenticated AWS request, for this request only.
-                If None is provided, the client configuration will be used.
+    __slots__ = ('_records',)
 
-            checksum_config (Optional[S3ChecksumConfig]): Optional checksum settings.
+    def __init__(self, records: bytes):
+        self._records = records
 
-            part_size (Optional[int]): Size, in bytes, of parts that files will be downloaded or uploaded in.
-                If not set, the part size configured for the client will be used, which defaults to a dynamic value based on
-                the throughput target, memory_limit_in_bytes and the requested object size.
-                Note: for :attr:`S3RequestType.PUT_OBJECT` request, client will adjust the part size to meet the service limits.
-                (max number of parts per upload is 10,000, minimum upload part size is 5 MiB)
+    def __len__(self):
+        return len(self._records) // _S3_METRICS_RECORD.size
 
-            multipart_upload_threshold (Optional[int]): The size threshold in bytes, for when to use multipart uploads.
-                This only affects :attr:`S3RequestType.PUT_OBJECT` request.
-                Uploads over this size will use the multipart upload strategy.
+    def __getitem__(self, index) -> S3RequestAttemptMetrics:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("metrics index out of range")
+        fields = _S3_METRICS_RECORD.unpack_from(self._records, index * _S3_METRICS_RECORD.size)
+        return _attempt_metrics_from_record(fields)
+
+    def __iter__(self):
+        for fields in _S3_METRICS_RECORD.iter_unpack(self._records):
+            yield _attempt_metrics_from_record(fields)
+
+    @property
+    def num_retries(self) -> int:
+        """Number of attempts that were retries."""
+        return sum(1 for fields in _S3_METRICS_RECORD.iter_unpack(self._records) if fields[3] > 0)
+
+    @property
+    def bytes_transferred(self) -> int:
+        """Number of bytes of the object transferred by successful attempts."""
+        return sum(attempt.num_bytes for attempt in self if attempt.error_code == 0)
+
+
+@dataclass
+class S3ClientMetrics:
+    """Totals across the requests of a :class:`S3Client` created with `enable_metrics`.
+    See :meth:`S3Client.get_metrics()`.
+
+    Only requests that have finished are counted. Durations are in nanoseconds.
+    """
+
+    num_requests: int = 0
+    """Number of :class:`S3Request` finished."""
+
+    num_attempts: int = 0
+    """Number of HTTP request attempts the requests were split into, including retries."""
+
+    num_retries: int = 0
+    """Number of attempts that were retries."""
+
+    num_failed_attempts: int = 0
+    """Number of attempts that failed."""
+
+    bytes_transferred: int = 0
+    """Number of bytes of objects transferred by successful attempts."""
+
+    total_conn_acquire_ns: int = 0
+    """Sum of the time attempts spent waiting for a connection."""
+
+    max_conn_acquire_ns: int = 0
+    """Longest time an attempt spent waiting for a connection."""
+
+    total_time_to_first_byte_ns: int = 0
+    """Sum of the time to first byte of the attempts."""
+
+    num_connections: int = 0
+    """Number of distinct connections used."""
+
+    attempts_per_ip_address: Dict[str, int] = field(default_factory=dict)
+    """Number of attempts sent to each IP address."""
+
+
+class S3ObjectCache:
+    """
+    Cache of :attr:`~S3RequestType.GET_OBJECT` responses, for the `object_cache` of :class:`S3Client`.
+
+    Once a response is cached, repeating the GET (same host, path and Range) sends a conditional
+    request, with `If-None-Match` set to the cached ETag. If the object is unchanged, S3 responds
+    "304 Not Modified" without a body, and the cached response is replayed through the request's
+    callbacks, `recv_filepath` and :attr:`S3Request.finished_future`, exactly as if it was downloaded again.
+    If the object changed, the new response is delivered as usual, and replaces the cached one.
+
+    Responses are held in memory, up to `memory_limit` bytes. If `disk_dir` is set, responses
+    evicted from memory move to files in that directory, up to `disk_limit` bytes.
+    The least recently used responses are evicted first.
+    The cache is thread-safe, and may be shared by several clients.
+
+    GETs made with `recv_buffer`, `resume_token`, `checkpoint_filepath`, or conditional headers
+    of their own, bypass the cache.
+
+    Keyword Args:
+        memory_limit (Optional[int]): Size, in bytes, of the memory tier. Default is 256 MiB.
+
+        disk_dir (Optional[str]): Directory for the disk tier. The directory is created if necessary.
+            If not set, there's no disk tier.
+
+        disk_limit (Optional[int]): Size, in bytes, of the disk tier. Default is 4 GiB.
+            Ignored if `disk_dir` is not set.
+
+        max_object_size (Optional[int]): Responses with a larger body aren't cached.
+            Default is the size of the largest tier.
+    """
+
+    def __init__(self, *, memory_limit=None, disk_dir=None, disk_limit=None, max_object_size=None):
+        assert isinstance(memory_limit, int) or memory_limit is None
+        assert isinstance(disk_limit, int) or disk_limit is None
+        assert isinstance(max_object_size, int) or max_object_size is None
+
+        if memory_limit is None:
+            memory_limit = _DEFAULT_CACHE_MEMORY_LIMIT
+        if disk_limit is None:
+            disk_limit = _DEFAULT_CACHE_DISK_LIMIT if disk_dir is not None else 0
+        if disk_dir is None:
+            disk_limit = 0
+        if memory_limit < 0 or disk_limit < 0:
+            raise ValueError("Cache limits cannot be negative")
+        if max_object_size is None:
+            max_object_size = max(memory_limit, disk_limit)
+
+        self._memory_limit = memory_limit
+        self._disk_dir = os.fspath(disk_dir) if disk_dir is not None else None
+        self._disk_limit = disk_limit
+        self._max_object_size = max_object_size
+        if self._disk_dir is not None:
+            os.makedirs(self._disk_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Key -> _S3CachedObject, from least to most recently used
+        self._memory = OrderedDict()
+        self._disk = OrderedDict()
+        self._memory_size = 0
+        self._disk_size = 0
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._memory) + len(self._disk)
+
+    @property
+    def memory_size(self):
+        """int: Number of bytes of response bodies held in memory."""
+        return self._memory_size
+
+    @property
+    def disk_size(self):
+        """int: Number of bytes of response bodies held on disk."""
+        return self._disk_size
+
+    @property
+    def hits(self):
+        """int: Number of GETs served from the cache, because the object was unchanged."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """int: Number of GETs that had to download the object, because it wasn't cached or had changed."""
+        return self._misses
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            for cached in self._disk.values():
+                _remove_file(cached.filepath)
+            self._memory.clear()
+            self._disk.clear()
+            self._memory_size = 0
+            self._disk_size = 0
+
+    def _lookup(self, key):
+        with self._lock:
+            for tier in (self._memory, self._disk):
+                cached = tier.get(key)
+                if cached is not None:
+                    tier.move_to_end(key)
+                    return cached
+            return None
+
+    def _on_revalidated(self, key, cached):
+        """The object is unchanged, returns the body of the cached response. None if it's been evicted since."""
+        with self._lock:
+            if self._memory.get(key) is cached:
+                self._hits += 1
+                return cached.body
+            if self._disk.get(key) is not cached:
+                return None
+        try:
+            with open(cached.filepath, "rb") as f:
+                body = f.read()
+        except OSError:
+            return None
+        with self._lock:
+            self._hits += 1
+        if len(body) <= self._memory_limit:
+            # Promote to the memory tier
+            self._store(key, cached.etag, cached.status_code, cached.headers, body)
+        return body
+
+    def _on_missed(self):
+        with self._lock:
+            self._misses += 1
+
+    def _store(self, key, etag, status_code, headers, body):
+        size = len(body)
+        if size > self._max_object_size:
+            return
+        cached = _S3CachedObject(etag, status_code, headers, size, bytes(body))
+        with self._lock:
+            self._discard_locked(key)
+            if size <= self._memory_limit:
+                self._memory[key] = cached
+                self._memory_size += size
+            else:
+                self._demote_locked(key, cached)
+            self._evict_locked()
+
+    def _discard_locked(self, key):
+        cached = self._memory.pop(key, None)
+        if cached is not None:
+            self._memory_size -= cached.size
+        cached = self._disk.pop(key, None)
+        if cached is not None:
+            self._disk_size -= cached.size
+            _remove_file(cached.filepath)
+
+    def _demote_locked(self, key, cached):
+        """Move a response to the disk tier, or drop it if there's no room"""
+        if cached.size > self._disk_limit:
+            return
+        filepath = os.path.join(self._disk_dir, hashlib.sha256(repr(key).encode()).hexdigest())
+        tmp_filepath = filepath + ".tmp"
+        try:
+            with open(tmp_filepath, "wb") as f:
+                f.write(cached.body)
+            os.replace(tmp_filepath, filepath)
+        except OSError:
+            return
+        self._disk[key] = _S3CachedObject(cached.etag, cached.status_code, cached.headers, cached.size,
+                                          filepath=filepath)
+        self._disk_size += cached.size
+
+    def _evict_locked(self):
+        while self._memory_size > self._memory_limit:
+            key, cached = self._memory.popitem(last=False)
+            self._memory_size -= cached.size
+            if self._disk_dir is not None:
+                self._demote_locked(key, cached)
+        while self._disk_size > self._disk_limit:
+            key, cached = self._disk.popitem(last=False)
+            self._disk_size -= cached.size
+            _remove_file(cached.filepath)
+
+
+class _S3CachedObject:
+    '''
+    Private class for a response held by S3ObjectCache, in memory (body) or on disk (filepath)
+    '''
+    __slots__ = ('etag', 'status_code', 'headers', 'size', 'body', 'filepath')
+
+    def __init__(self, etag, status_code, headers, size, body=None, filepath=None):
+        self.etag = etag
+        self.status_code = status_code
+        self.headers = headers
+        self.size = size
+        self.body = body
+        self.filepath = filepath
+
+
+@dataclass
+class S3AutotuneSample:
+    """Measurements of one request, made by an :class:`S3Autotuner`. See :attr:`S3Autotuner.history`."""
+
+    part_size: int
+    """Part size the request was made with."""
+
+    max_active_connections: int
+    """Maximum number of active connections the request was made with."""
+
+    bytes_transferred: int
+    """Number of bytes of the object transferred."""
+
+    throughput_bytes_per_sec: float
+    """Achieved throughput of the request, from its first part starting to its last part ending."""
+
+    connection_throughput_bytes_per_sec: float
+    """Median throughput of a part transfer, on its connection."""
+
+    time_to_first_byte_ns: int
+    """Median time to first byte of the parts."""
+
+
+class S3Autotuner:
+    """
+    Tunes the part size and number of active connections of :attr:`~S3RequestType.GET_OBJECT`
+    and :attr:`~S3RequestType.PUT_OBJECT` requests, toward the best observed throughput.
+    Pass it as the `autotuner` of an :class:`S3Client`.
+
+    A request's part size and connection count are fixed once it starts, so tuning happens across requests:
+    each multipart request made without an explicit `part_size` or `max_active_connections_override`
+    uses the current settings, and its metrics (see :class:`S3RequestMetrics`) are fed back once it finishes.
+
+    *   The number of active connections is searched for by hill climbing: it's scaled up or down
+        while throughput keeps improving, and settles on the best value found. The search resumes
+        periodically, in case conditions changed.
+
+    *   The part size is chosen so a part takes several times longer to transfer than the latency
+        to its first byte, based on the measured per-connection throughput and time to first byte.
+        Small parts spend a larger share of their time waiting for the first byte.
+
+    Requests running concurrently on the client share its connections, so their throughput
+    measurements are noisy. Tuning works best when the client runs one large transfer at a time.
+    Read :attr:`part_size` and :attr:`max_active_connections` to log the chosen values.
+
+    Keyword Args:
+        initial_part_size (Optional[int]): Part size to start with. Default is 8 MiB.
+
+        initial_max_active_connections (Optional[int]): Number of active connections to start with. Default is 32.
+
+        min_part_size (Optional[int]): Smallest part size to use. Default is 5 MiB, the minimum S3 allows for uploads.
+
+        max_part_size (Optional[int]): Largest part size to use. Default is 256 MiB.
+
+        max_connections (Optional[int]): Largest number of active connections to use. Default is 1024.
+    """
+
+    def __init__(
+            self,
+            *,
+            initial_part_size=None,
+            initial_max_active_connections=None,
+            min_part_size=None,
+            max_part_size=None,
+            max_connections=None):
+        if initial_part_size is None:
+            initial_part_size = _DEFAULT_STREAMING_PART_SIZE
+        if initial_max_active_connections is None:
+            initial_max_active_connections = _DEFAULT_AUTOTUNE_CONNECTIONS
+        if min_part_size is None:
+            min_part_size = _MIN_AUTOTUNE_PART_SIZE
+        if max_part_size is None:
+            max_part_size = _MAX_AUTOTUNE_PART_SIZE
+        if max_connections is None:
+            max_connections = _MAX_AUTOTUNE_CONNECTIONS
+        if min_part_size <= 0 or min_part_size > max_part_size:
+            raise ValueError("'min_part_size' must be positive, and no larger than 'max_part_size'")
+        if max_connections <= 0:
+            raise ValueError("'max_connections' must be positive")
+
+        self._min_part_size = min_part_size
+        self._max_part_size = max_part_size
+        self._max_connections = max_connections
+
+        self._lock = threading.Lock()
+        self._part_size = min(max(initial_part_size, min_part_size), max_part_size)
+        self._connections = min(max(initial_max_active_connections, 1), max_connections)
+        # Best throughput observed, and the number of connections that achieved it
+        self._best_throughput = 0.0
+        self._best_connections = self._connections
+        # Direction the number of connections is moving in: 1 (up), -1 (down), or 0 once settled
+        self._direction = 1
+        self._num_reversals = 0
+        self._num_settled_samples = 0
+        self._history = deque(maxlen=100)
+
+    @property
+    def part_size(self):
+        """int: Part size the next request will use."""
+        return self._part_size
+
+    @property
+    def max_active_connections(self):
+        """int: Maximum number of active connections the next request will use."""
+        return self._connections
+
+    @property
+    def best_throughput_bytes_per_sec(self):
+        """float: Best throughput observed. 0 until a request has been measured."""
+        return self._best_throughput
+
+    @property
+    def history(self):
+        """List[S3AutotuneSample]: Measurements of the most recent requests, oldest first."""
+        with self._lock:
+            return list(self._history)
+
+    def _settings(self):
+        with self._lock:
+            return self._part_size, self._connections
+
+    def _observe(self, part_size, connections, metrics):
+        parts = [attempt for attempt in metrics if attempt.part_number and not attempt.error_code]
+        if len(parts) < 2:
+            # Too small to say anything about multipart throughput
+            return
+        bytes_transferred = sum(attempt.num_bytes for attempt in parts)
+        duration_ns = max(a.end_timestamp_ns for a in parts) - min(a.start_timestamp_ns for a in parts)
+        connection_throughputs = sorted(a.throughput_bytes_per_sec for a in parts if a.throughput_bytes_per_sec)
+        latencies = sorted(a.time_to_first_byte_ns for a in parts if a.time_to_first_byte_ns is not None)
+        if duration_ns <= 0 or not connection_throughputs or not latencies:
+            return
+        sample = S3AutotuneSample(
+            part_size=part_size,
+            max_active_connections=connections,
+            bytes_transferred=bytes_transferred,
+            throughput_bytes_per_sec=bytes_transferred * 1e9 / duration_ns,
+            connection_throughput_bytes_per_sec=connection_throughputs[len(connection_throughputs) // 2],
+            time_to_first_byte_ns=latencies[len(latencies) // 2])
+
+        with self._lock:
+            self._history.append(sample)
+            self._tune_part_size(sample)
+            if connections == self._connections:
+                # Requests started before the last change don't say anything about the current setting
+                self._tune_connections(sample.throughput_bytes_per_sec)
+
+    def _tune_part_size(self, sample):
+        part_size = sample.connection_throughput_bytes_per_sec * sample.time_to_first_byte_ns / 1e9 \
+            * _AUTOTUNE_PART_TIME_TO_LATENCY
+        # Round up to a whole MiB, and move at most 2x per request, to damp noise
+        mib = 1024 * 1024
+        part_size = int(-(-part_size // mib) * mib)
+        part_size = min(max(part_size, self._part_size // 2), self._part_size * 2)
+        self._part_size = min(max(part_size, self._min_part_size), self._max_part_size)
+
+    def _tune_connections(self, throughput):
+        if self._direction == 0:
+            # Settled. Track the current throughput, and search again every so often.
+            self._best_throughput = throughput
+            self._num_settled_samples += 1
+            if self._num_settled_samples >= _AUTOTUNE_REPROBE_INTERVAL:
+                self._num_settled_samples = 0
+                self._num_reversals = 0
+                self._direction = 1
+                self._step_connections(self._best_connections)
+            return
+
+        if throughput > self._best_throughput * (1 + _AUTOTUNE_MIN_IMPROVEMENT):
+            self._best_throughput = throughput
+            self._best_connections = self._connections
+        else:
+            # No better, try the other direction from the best setting, then settle on it
+            self._num_reversals += 1
+            if self._num_reversals >= 2:
+                self._direction = 0
+                self._connections = self._best_connections
+                return
+            self._direction = -self._direction
+        self._step_connections(self._best_connections)
+
+    def _step_connections(self, connections):
+        if self._direction > 0:
+            stepped = max(connections + 1, int(connections * _AUTOTUNE_CONNECTIONS_STEP))
+        else:
+            stepped = int(connections / _AUTOTUNE_CONNECTIONS_STEP)
+        stepped = min(max(stepped, 1), self._max_connections)
+        if stepped == connections:
+            # Can't go further this way
+            self._direction = 0
+        self._connections = stepped
+
+
+@dataclass
+class S3ResumeToken:
+    """State of a paused upload, or of a failed or paused download, to resume it with
+    :meth:`S3Client.make_request()`. See :attr:`S3Request.resume_token`.
+
+    Persist it with `dataclasses.asdict()`, and rebuild it with `S3ResumeToken(**fields)`,
+    or let `checkpoint_filepath` do that for you.
+    """
+
+    type: S3RequestType
+    """Type of the request: :attr:`~S3RequestType.GET_OBJECT` or :attr:`~S3RequestType.PUT_OBJECT`."""
+
+    part_size: int
+    """Part size the request was using."""
+
+    total_num_parts: int = 0
+    """Number of parts the transfer was split into. 0 if unknown."""
+
+    num_parts_completed: int = 0
+    """Number of parts completed."""
+
+    upload_id: Optional[str] = None
+    """Multipart upload ID. Uploads only."""
+
+    etag: Optional[str] = None
+    """ETag of the object being downloaded. Downloads only."""
+
+    object_size: int = 0
+    """Size of the object being downloaded. Downloads only."""
+
+    object_range_start: int = 0
+    """Offset in the object of the first byte of the download. Downloads only."""
+
+    object_range_end: int = 0
+    """Offset in the object of the last byte of the download (inclusive). Downloads only."""
+
+    continuous_downloaded_bytes: int = 0
+    """Number of bytes written to the file from `object_range_start`, without gaps. Downloads only.
+    0 if unknown, in which case the size of the partially downloaded file is used."""
+
+
+@dataclass
+class S3BufferPoolUsage:
+    """Memory usage of an :class:`S3BufferPool`. See :meth:`S3BufferPool.get_usage()`."""
+
+    memory_limit: int
+    """Memory limit of the pool."""
+
+    allocated: int
+    """Memory allocated by the pool: buffers in use, and released buffers kept for reuse."""
+
+    used: int
+    """Memory in buffers in use."""
+
+    reserved: int
+    """Memory reserved for buffers that aren't in use yet."""
+
+    forced: int
+    """Memory granted even though it exceeded the limit, to requests that couldn't wait.
+    Included in `used` and `reserved`."""
+
+    num_pending: int
+    """Number of requests for memory waiting for some to be released."""
+
+
+class S3BufferPool(NativeResource):
+    """
+    Pool of part buffers, which several :class:`S3Client` instances can share, so one memory limit
+    governs the part buffers of all of them. Pass it as the `buffer_pool` of each client.
+
+    Without a shared pool, each client gets a pool of its own, sized by its `memory_limit`,
+    so a process running several clients can use several times the memory it expects.
+
+    Requests of all clients sharing the pool wait for memory in the order they asked for it.
+    Released buffers of `part_size` are kept for reuse, until the clients go idle or the
+    memory is needed for buffers of another size.
+    The pool is released once it and all clients created with it are gone.
+
+    Keyword Args:
+        memory_limit (int): Memory limit, in bytes, of how much memory the clients sharing
+            the pool can use for buffering data for requests.
+
+        part_size (Optional[int]): Size of the buffers the pool keeps for reuse. Set it to the
+            part size most of the clients use. Default is 8 MiB.
+    """
+
+    __slots__ = ('_memory_limit', '_part_size')
+
+    def __init__(self, *, memory_limit, part_size=None):
+        assert isinstance(memory_limit, int)
+        assert isinstance(part_size, int) or part_size is None
+
+        super().__init__()
+
+        if part_size is None:
+            part_size = _DEFAULT_STREAMING_PART_SIZE
+        if part_size <= 0 or memory_limit < part_size:
+            raise ValueError("'part_size' must be positive, and no larger than 'memory_limit'")
+
+        self._memory_limit = memory_limit
+        self._part_size = part_size
+        self._binding = _awscrt.s3_buffer_pool_new(memory_limit, part_size)
+
+    @property
+    def memory_limit(self):
+        """int: Memory limit, in bytes, the pool was created with."""
+        return self._memory_limit
+
+    @property
+    def part_size(self):
+        """int: Part size the pool is optimized for."""
+        return self._part_size
+
+    def get_usage(self):
+        """
+        Returns:
+            S3BufferPoolUsage: Current memory usage of the pool, across all clients sharing it.
+        """
+        return S3BufferPoolUsage(*_awscrt.s3_buffer_pool_get_usage(self))
+
+
+@dataclass
+class S3ThroughputShare:
+    """Share of an :class:`S3ThroughputCoordinator`'s throughput a process gets.
+    See :meth:`S3ThroughputCoordinator.get_share()`."""
+
+    num_participants: int
+    """Number of processes sharing the throughput, including this one."""
+
+    throughput_target_gbps: float
+    """Throughput target of this process, in gigabits per second."""
+
+    max_active_connections: int
+    """Maximum number of active connections of this process, across its requests."""
+
+
+class S3ThroughputCoordinator:
+    """
+    Splits the throughput of a host fairly between the processes using S3, so their clients don't
+    each target the full bandwidth of the network and fight each other.
+    Pass it as the `throughput_coordinator` of each :class:`S3Client` of the process.
+
+    Processes coordinating with the same `scope_name` keep track of each other in a small state file,
+    in the temporary directory, updated under a :class:`CrossProcessLock`. A process takes part
+    while it has requests in flight, and for `lease_secs` after its last request finished.
+    Each of the `N` processes taking part gets `1/N` of the throughput and connections.
+
+    Connections are split when requests start: each :attr:`~S3RequestType.GET_OBJECT` and
+    :attr:`~S3RequestType.PUT_OBJECT` request made without an explicit `max_active_connections_override`
+    gets an equal part of the process's connections, shared with its other requests in flight.
+    A request keeps its connections until it finishes, so shares adjust as requests come and go.
+    While a process has requests in flight, the requests it starts within a second of its last
+    update of the state file reuse the share it got then, so other processes joining or leaving
+    are noticed within about a second. If the state file or its lock can't be used, the last
+    known share is used. Connections chosen by an :class:`S3Autotuner` are capped at the request's share.
+
+    Keyword Args:
+        scope_name (str): Name shared by the processes that coordinate.
+            May only contain letters, digits, '.', '_' and '-'.
+
+        throughput_target_gbps (Optional[float]): Throughput target of the whole host, in gigabits per second.
+            Default is :func:`get_recommended_throughput_target_gbps()`, or 10 Gbps if unknown.
+            Clients without a `throughput_target_gbps` of their own use this value.
+
+        max_active_connections (Optional[int]): Maximum number of active connections of the whole host.
+            Default is the number of connections S3Client would use for `throughput_target_gbps`.
+
+        lease_secs (Optional[float]): How long a process keeps its share after its last request finished,
+            so processes making requests back to back aren't constantly joining and leaving. Default is 10.
+    """
+
+    def __init__(self, scope_name, *, throughput_target_gbps=None, max_active_connections=None, lease_secs=None):
+        assert isinstance(scope_name, str)
+        assert isinstance(throughput_target_gbps, (int, float)) or throughput_target_gbps is None
+        assert isinstance(max_active_connections, int) or max_active_connections is None
+        assert isinstance(lease_secs, (int, float)) or lease_secs is None
+
+        if not re.fullmatch(r"[A-Za-z0-9._-]+", scope_name):
+            raise ValueError("'scope_name' may only contain letters, digits, '.', '_' and '-'")
+        if throughput_target_gbps is None:
+            throughput_target_gbps = get_recommended_throughput_target_gbps() or _DEFAULT_COORDINATED_THROUGHPUT_GBPS
+        if max_active_connections is None:
+            max_active_connections = max(1, int(throughput_target_gbps * _CONNECTIONS_PER_GBPS))
+        if lease_secs is None:
+            lease_secs = _DEFAULT_COORDINATOR_LEASE_SECS
+        if throughput_target_gbps <= 0 or max_active_connections <= 0 or lease_secs < 0:
+            raise ValueError("'throughput_target_gbps' and 'max_active_connections' must be positive, "
+                             "and 'lease_secs' can't be negative")
+
+        self._scope_name = scope_name
+        self._throughput_target_gbps = float(throughput_target_gbps)
+        self._max_active_connections = max_active_connections
+        self._lease_secs = lease_secs
+        self._state_filepath = os.path.join(tempfile.gettempdir(), "aws-crt-s3-throughput-" + scope_name)
+        self._cross_process_lock = CrossProcessLock("aws-crt-s3-throughput-" + scope_name)
+        # Identifies this coordinator among the participants of its process
+        self._token = int.from_bytes(os.urandom(8), "little")
+
+        # Protects the in-memory state. Never held while the state file is updated.
+        self._lock = threading.Lock()
+        self._num_requests = 0
+        self._num_participants = 1
+        # Whether the state file counts this process as having requests in flight, and when that was written
+        self._synced_active = False
+        self._last_sync_time = 0.0
+        # Timer writing the requests that finished to the state file
+        self._flush_timer = None
+        # Serializes updates of the state file by this coordinator
+        self._sync_lock = threading.Lock()
+
+    @property
+    def scope_name(self):
+        """str: Name shared by the processes that coordinate."""
+        return self._scope_name
+
+    @property
+    def throughput_target_gbps(self):
+        """float: Throughput target of the whole host, in gigabits per second."""
+        return self._throughput_target_gbps
+
+    @property
+    def max_active_connections(self):
+        """int: Maximum number of active connections of the whole host."""
+        return self._max_active_connections
+
+    def get_share(self):
+        """
+        Returns:
+            S3ThroughputShare: Current share of this process, as if it made a request now.
+        """
+        num_participants = self._sync()
+        return S3ThroughputShare(
+            num_participants=num_participants,
+            throughput_target_gbps=self._throughput_target_gbps / num_participants,
+            max_active_connections=max(1, self._max_active_connections // num_participants))
+
+    def close(self):
+        """Stops taking part right away, rather than once the lease expires.
+        Requests made afterwards take part again."""
+        with self._lock:
+            timer, self._flush_timer = self._flush_timer, None
+        if timer is not None:
+            timer.cancel()
+        self._sync(leave=True)
+
+    def _acquire(self):
+        """Registers a request in flight. Returns the number of connections it may use."""
+        with self._lock:
+            self._num_requests += 1
+            num_requests = self._num_requests
+            num_participants = self._num_participants
+            # Other processes only care whether this one has requests in flight, which they already know
+            fresh = self._synced_active and time.monotonic() - self._last_sync_time < _COORDINATOR_REFRESH_SECS
+        if not fresh:
+            num_participants = self._sync()
+        return max(1, self._max_active_connections // num_participants // num_requests)
+
+    def _release(self):
+        """Unregisters a request in flight. Called from a CRT thread when the request finishes,
+        so the state file is updated later, by a timer."""
+        with self._lock:
+            self._num_requests -= 1
+            if self._flush_timer is not None:
+                return
+            timer = self._flush_timer = threading.Timer(_COORDINATOR_FLUSH_DELAY_SECS, self._flush)
+        timer.daemon = True
+        timer.start()
+
+    def _flush(self):
+        with self._lock:
+            self._flush_timer = None
+        self._sync()
+
+    def _sync(self, leave=False):
+        """Writes this process's number of requests in flight to the state file,
+        and returns the number of participants."""
+        with self._sync_lock:
+            with self._lock:
+                num_requests = self._num_requests
+            num_participants = self._write_state(num_requests, leave)
+            with self._lock:
+                if num_participants is not None:
+                    self._num_participants = num_participants
+                    self._synced_active = num_requests > 0 and not leave
+                    self._last_sync_time = time.monotonic()
+                return self._num_participants
+
+    def _write_state(self, num_requests, leave):
+        """Updates this process's record in the state file. Returns the number of participants,
+        or None if the state file or its lock can't be used."""
+        pid = os.getpid()
+        deadline = time.monotonic() + _COORDINATOR_LOCK_TIMEOUT_SECS
+        while True:
+            try:
+                self._cross_process_lock.acquire()
+                break
+            except RuntimeError:
+                # Usually held by another process, which only holds it briefly. But the lock
+                # may also be unusable (ex: permissions), so don't wait for it indefinitely.
+                if time.monotonic() >= deadline:
+                    return None
+                time.sleep(0.001)
+        now = time.time()
+        try:
+            with open(self._state_filepath, "a+b") as f:
+                f.seek(0)
+                data = f.read()
+                # A process that died while writing may have left a partial record
+                data = data[:len(data) - len(data) % _COORDINATOR_RECORD.size]
+                records = [record for record in _COORDINATOR_RECORD.iter_unpack(data)
+                           if not (record[0] == pid and record[1] == self._token) and
+                           self._is_participant(*record, now)]
+                if not leave:
+                    records.append((pid, self._token, max(0, num_requests), now))
+                f.seek(0)
+                f.truncate()
+                f.write(b"".join(_COORDINATOR_RECORD.pack(*record) for record in records))
+        except OSError:
+            # Without the shared state, fall back on the last known share
+            return None
+        finally:
+            self._cross_process_lock.release()
+        return max(1, len(records))
+
+    def _is_participant(self, pid, token, num_active, last_seen, now):
+        if sys.platform != "win32":
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                return False
+            except OSError:
+                # Exists, but belongs to another user
+                pass
+        elif now - last_seen > _COORDINATOR_STALE_SECS:
+            return False
+        return num_active > 0 or now - last_seen <= self._lease_secs
+
+
+@dataclass
+class S3RangeHedgingStats:
+    """Statistics of an :class:`S3RangeHedging`. See :meth:`S3RangeHedging.get_stats()`."""
+
+    num_requests: int
+    """Number of requests watched."""
+
+    num_hedged: int
+    """Number of requests that were slow enough to start a duplicate."""
+
+    num_hedges_won: int
+    """Number of duplicates that finished before the request they duplicated."""
+
+    threshold_secs: Optional[float]
+    """Current duration after which a request is duplicated. None until there are enough samples."""
+
+
+class S3RangeHedging:
+    """
+    Hedges against straggling requests of :meth:`S3Client.get_ranges()`: a request still running
+    once it's taken longer than most requests do gets a duplicate, and whichever finishes first
+    is used while the other is cancelled. Pass it as the `range_hedging` of an :class:`S3Client`.
+
+    Only :meth:`S3Client.get_ranges()` is hedged. The parts of a :meth:`S3Client.make_request()`,
+    including a :attr:`~S3RequestType.GET_OBJECT`, are scheduled by the native layer, which can't
+    duplicate them. To hedge the parts of a large download, read it with :meth:`S3Client.get_ranges()`
+    as part-sized ranges, with a `max_request_size` of one part.
+
+    The threshold is the `percentile` of the durations of recent requests, so it adapts to
+    the request size and network conditions. Requests should be of similar size for it to be meaningful.
+    At most `max_hedged_fraction` of the requests are duplicated, so hedging doesn't
+    add much load when everything is slow.
+
+    Keyword Args:
+        percentile (Optional[float]): Percentile of recent request durations after which
+            a request is duplicated. Default is 95.
+
+        min_samples (Optional[int]): Number of requests that must finish before any is duplicated. Default is 20.
+
+        max_hedged_fraction (Optional[float]): Largest fraction of the requests that may be duplicated.
+            Default is 0.05.
+    """
+
+    def __init__(self, *, percentile=None, min_samples=None, max_hedged_fraction=None):
+        if percentile is None:
+            percentile = _DEFAULT_HEDGE_PERCENTILE
+        if min_samples is None:
+            min_samples = _DEFAULT_HEDGE_MIN_SAMPLES
+        if max_hedged_fraction is None:
+            max_hedged_fraction = _DEFAULT_HEDGE_MAX_FRACTION
+        if not 0 < percentile < 100:
+            raise ValueError("'percentile' must be between 0 and 100")
+        if min_samples <= 0:
+            raise ValueError("'min_samples' must be positive")
+        if not 0 <= max_hedged_fraction <= 1:
+            raise ValueError("'max_hedged_fraction' must be between 0 and 1")
+
+        self._percentile = percentile
+        self._min_samples = min_samples
+        self._max_hedged_fraction = max_hedged_fraction
+
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=_HEDGE_WINDOW)
+        # Requests in flight that may be hedged, by id. See _S3HedgeWatch.
+        self._watched = {}
+        self._next_id = 0
+        self._num_requests = 0
+        self._num_hedged = 0
+        self._num_hedges_won = 0
+
+    def get_stats(self):
+        """
+        Returns:
+            S3RangeHedgingStats: Statistics of the requests watched so far.
+        """
+        with self._lock:
+            return S3RangeHedgingStats(
+                num_requests=self._num_requests,
+                num_hedged=self._num_hedged,
+                num_hedges_won=self._num_hedges_won,
+                threshold_secs=self._threshold())
+
+    def _watch(self, on_straggler):
+        """Watches a request that just started. `on_straggler` is called to start its duplicate,
+        if it's too slow. Returns an id to pass to _on_finished()."""
+        with self._lock:
+            watch_id = self._next_id
+            self._next_id += 1
+            self._num_requests += 1
+            watch = self._watched[watch_id] = _S3HedgeWatch(time.monotonic(), on_straggler)
+            threshold = self._threshold()
+            if threshold is not None:
+                self._start_timer(watch_id, watch, threshold)
+            return watch_id
+
+    def _on_finished(self, watch_id, duration_secs, hedge_won=False):
+        """Stops watching a request. `duration_secs` is how long the successful attempt took, or None if it failed."""
+        with self._lock:
+            watch = self._watched.pop(watch_id, None)
+            if watch is not None and watch.timer is not None:
+                watch.timer.cancel()
+            if hedge_won:
+                self._num_hedges_won += 1
+            if duration_secs is None:
+                return
+            had_threshold = self._threshold() is not None
+            self._samples.append(duration_secs)
+            threshold = self._threshold()
+            if not had_threshold and threshold is not None:
+                # Requests that started before there were enough samples weren't timed yet
+                for other_id, other in self._watched.items():
+                    self._start_timer(other_id, other, threshold)
+
+    def _threshold(self):
+        if len(self._samples) < self._min_samples:
+            return None
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(len(samples) * self._percentile / 100))]
+
+    def _start_timer(self, watch_id, watch, threshold):
+        """Times a watched request, to check it once it's been running for `threshold`. Call with the lock held."""
+        delay = max(0.0, watch.start_time + threshold - time.monotonic())
+        watch.timer = threading.Timer(delay, self._on_timer, (watch_id,))
+        watch.timer.daemon = True
+        watch.timer.start()
+
+    def _on_timer(self, watch_id):
+        with self._lock:
+            watch = self._watched.get(watch_id)
+            if watch is None:
+                return
+            # The threshold may have grown since the timer started
+            threshold = self._threshold()
+            if time.monotonic() - watch.start_time < threshold:
+                self._start_timer(watch_id, watch, threshold)
+                return
+            # A request is only hedged once, or not at all if too many were
+            del self._watched[watch_id]
+            if self._num_hedged >= self._num_requests * self._max_hedged_fraction:
+                return
+            self._num_hedged += 1
+        watch.on_straggler()
+
+
+class _S3HedgeWatch:
+    '''
+    Private class for a request watched by S3RangeHedging
+    '''
+    __slots__ = ('start_time', 'on_straggler', 'timer')
+
+    def __init__(self, start_time, on_straggler):
+        self.start_time = start_time
+        self.on_straggler = on_straggler
+        # Timer checking the request once it's been running for the threshold, None until there's a threshold
+        self.timer = None
+
+
+class S3Client(NativeResource):
+    """S3 client
+
+    Keyword Args:
+        bootstrap (Optional [ClientBootstrap]): Client bootstrap to use when initiating socket connection.
+            If None is provided, the default singleton is used.
+
+        region (str): Region that the S3 bucket lives in.
+
+        tls_mode (Optional[S3RequestTlsMode]):  How TLS should be used while performing the request
+
+            If this is :attr:`S3RequestTlsMode.ENABLED`:
+                If `tls_connection_options` is set, then those TLS options will be used
+                If `tls_connection_options` is unset, then default TLS options will be used
+
+            If this is :attr:`S3RequestTlsMode.DISABLED`:
+                No TLS options will be used, regardless of `tls_connection_options` value.
+
+        signing_config (Optional[AwsSigningConfig]): Configuration for signing of the client.
+            Use :func:`create_default_s3_signing_config()` to create the default config.
+
+            If not set, a default config will be used with anonymous credentials and skip signing the request.
+
+            If set:
+                Credentials provider is required. Other configs are all optional, and will be default to what
+                    needs to sign the request for S3, only overrides when Non-zero/Not-empty is set.
+
+                S3 Client will derive the right config for signing process based on this.
+
+            Notes:
+
+                1. For SIGV4_S3EXPRESS, S3 client will use the credentials in the config to derive the S3 Express
+                    credentials that are used in the signing process.
+                2. Client may make modifications to signing config before passing it on to signer.
+
+        credential_provider (Optional[AwsCredentialsProvider]): Deprecated, prefer `signing_config` instead.
+            Credentials providers source the :class:`~awscrt.auth.AwsCredentials` needed to sign an authenticated AWS request.
+            If None is provided, the request will not be signed.
+
+        tls_connection_options (Optional[TlsConnectionOptions]): Optional TLS Options to be used
+            for each connection, unless `tls_mode` is :attr:`S3RequestTlsMode.DISABLED`
+
+        part_size (Optional[int]): Size, in bytes, of parts that files will be downloaded or uploaded in.
+            If not set, a dynamic default part size will be used based on the throughput target, memory_limit_in_bytes.
+            Note: for :attr:`S3RequestType.PUT_OBJECT` request, client will adjust the part size to meet the service limits.
+            (max number of parts per upload is 10,000, minimum upload part size is 5 MiB)
+
+        multipart_upload_threshold (Optional[int]): The size threshold in bytes, for when to use multipart uploads.
+            This only affects :attr:`S3RequestType.PUT_OBJECT` request.
+            Uploads over this size will use the multipart upload strategy.
+            Uploads this size or less will use a single request.
+            If not set, maximal of `part_size` and 5 MiB will be used.
+
+        throughput_target_gbps (Optional[float]): Throughput target in
+            Gigabits per second (Gbps) that we are trying to reach.
+            You can also use `get_recommended_throughput_target_gbps()` to get recommended value for your system.
+            10.0 Gbps by default (may change in future)
+            With a `throughput_coordinator`, its throughput target is the default.
+
+        enable_s3express (Optional[bool]): To enable S3 Express support for the client.
+            The typical usage for a S3 Express request is to set this to true and let the request to be
+            signed with `AwsSigningAlgorithm.V4_S3EXPRESS`, either from the client-level `signing_config`
+            or the request-level override.
+
+        memory_limit (Optional[int]): Memory limit, in bytes, of how much memory
+            client can use for buffering data for requests.
+            If not set, client will try to pick up from environment variable before chose the default.
+            Default values scale with target throughput and are currently
+            between 2GiB and 24GiB (may change in future)
+            May not be set together with `buffer_pool`, whose memory limit is used instead.
+
+        network_interface_names (Optional[Sequence(str)]):
+            **THIS IS AN EXPERIMENTAL AND UNSTABLE API.**
+            A sequence of network interface names. The client will distribute the
+            connections across network interfaces. If any interface name is invalid, goes down,
+            or has any issues like network access, you will see connection failures.
+            This option is only supported on Linux, MacOS, and platforms that have either SO_BINDTODEVICE or IP_BOUND_IF. It
+            is not supported on Windows. `AWS_ERROR_PLATFORM_NOT_SUPPORTED` will be raised on unsupported platforms. On
+            Linux, SO_BINDTODEVICE is used and requires kernel version >= 5.7 or root privileges.
+
+        fio_options (Optional[S3FileIoOptions]):
+            If set, this controls how the client interact with file I/O.
+            If not set, a default options will be created to avoid memory issue based on the size of file.
+            Note: Only applies when the request created with `send_filepath`
+
+        max_active_connections_override (Optional[int]):
+            When set, this will cap the number of active connections for the meta request.
+            When not set, the client will determine this value based on `throughput_target_gbps`. (Recommended)
+
+        enable_read_backpressure (bool):
+            **THIS IS AN EXPERIMENTAL AND UNSTABLE API.**
+            Set to True to prevent response data from downloading faster than you can handle it.
+            If False (default), no backpressure is applied and data downloads as fast as possible.
+            If True, each :attr:`S3RequestType.GET_OBJECT` request has a flow-control window that shrinks
+            as response body data is delivered to `on_body`. `initial_read_window` determines the
+            starting size of each request's window. No further body data is delivered once the window
+            reaches 0, call :meth:`S3Request.increment_read_window()` to keep data flowing.
+            Parts cannot download in parallel unless the window is large enough to hold multiple parts,
+            and a part is only delivered once the window can hold all of it.
+
+        initial_read_window (Optional[int]): The starting size, in bytes, of each request's flow-control window.
+            Ignored unless `enable_read_backpressure` is True. If set to 0 or not set,
+            requests will not start downloading until the window is incremented.
+
+        enable_metrics (bool): Set to True to collect the metrics of every request attempt, for every request.
+            They're available per request from :meth:`S3Request.get_metrics()`, and totalled for the client
+            by :meth:`get_metrics()`. If False (default), only requests made with `on_telemetry` collect metrics.
+
+        object_cache (Optional[S3ObjectCache]): Cache to serve repeated :attr:`~S3RequestType.GET_OBJECT`
+            requests from, revalidating them with S3. See :class:`S3ObjectCache`.
+
+        autotuner (Optional[S3Autotuner]): If set, the part size and number of active connections of
+            :attr:`~S3RequestType.GET_OBJECT` and :attr:`~S3RequestType.PUT_OBJECT` requests are tuned
+            from the throughput of previous requests. Requests setting `part_size` or
+            `max_active_connections_override` themselves aren't tuned. See :class:`S3Autotuner`.
+
+        buffer_pool (Optional[S3BufferPool]): Pool of part buffers to share with other clients, so one
+            memory limit governs all of them. If not set, the client creates a pool of its own,
+            sized by `memory_limit`. See :class:`S3BufferPool`.
+
+        throughput_coordinator (Optional[S3ThroughputCoordinator]): If set, the connections of
+            :attr:`~S3RequestType.GET_OBJECT` and :attr:`~S3RequestType.PUT_OBJECT` requests are limited
+            to this process's fair share of the host's throughput, split with other processes using
+            the same scope. See :class:`S3ThroughputCoordinator`.
+
+        range_hedging (Optional[S3RangeHedging]): If set, requests of :meth:`get_ranges()` that take much
+            longer than usual are duplicated, and whichever finishes first is used. See :class:`S3RangeHedging`.
+    """
+
+    __slots__ = ('shutdown_event', '_region', '_part_size', '_enable_read_backpressure', '_initial_read_window',
+                 '_metrics', '_object_cache', '_autotuner', '_buffer_pool',
+                 '_throughput_coordinator', '_range_hedging')
+
+    def __init__(
+            self,
+            *,
+            bootstrap=None,
+            region,
+            tls_mode=None,
+            signing_config=None,
+            credential_provider=None,
+            tls_connection_options=None,
+            part_size=None,
+            multipart_upload_threshold=None,
+            throughput_target_gbps=None,
+            enable_s3express=False,
+            memory_limit=None,
+            network_interface_names: Optional[Sequence[str]] = None,
+            fio_options: Optional['S3FileIoOptions'] = None,
+            max_active_connections_override: Optional[int] = None,
+            enable_read_backpressure: bool = False,
+            initial_read_window: Optional[int] = None,
+            enable_metrics: bool = False,
+            object_cache: Optional['S3ObjectCache'] = None,
+            autotuner: Optional['S3Autotuner'] = None,
+            buffer_pool: Optional[S3BufferPool] = None,
+            throughput_coordinator: Optional[S3ThroughputCoordinator] = None,
+            range_hedging: Optional[S3RangeHedging] = None):
+        assert isinstance(bootstrap, ClientBootstrap) or bootstrap is None
+        assert isinstance(region, str)
+        assert isinstance(signing_config, AwsSigningConfig) or signing_config is None
+        assert isinstance(credential_provider, AwsCredentialsProvider) or credential_provider is None
+        assert isinstance(tls_connection_options, TlsConnectionOptions) or tls_connection_options is None
+        assert isinstance(part_size, int) or part_size is None
+        assert isinstance(
+            throughput_target_gbps,
+            int) or isinstance(
+            throughput_target_gbps,
+            float) or throughput_target_gbps is None
+        assert isinstance(enable_s3express, bool) or enable_s3express is None
+        assert isinstance(network_interface_names, Sequence) or network_interface_names is None
+        assert isinstance(fio_options, S3FileIoOptions) or fio_options is None
+        assert isinstance(max_active_connections_override, int) or max_active_connections_override is None
+        assert isinstance(enable_read_backpressure, bool)
+        assert isinstance(initial_read_window, int) or initial_read_window is None
+        assert isinstance(enable_metrics, bool)
+        assert isinstance(object_cache, S3ObjectCache) or object_cache is None
+        assert isinstance(autotuner, S3Autotuner) or autotuner is None
+        assert isinstance(buffer_pool, S3BufferPool) or buffer_pool is None
+        assert isinstance(throughput_coordinator, S3ThroughputCoordinator) or throughput_coordinator is None
+        assert isinstance(range_hedging, S3RangeHedging) or range_hedging is None
+
+        if credential_provider and signing_config:
+            raise ValueError("'credential_provider' has been deprecated in favor of 'signing_config'.  "
+                             "Both parameters may not be set.")
+        if buffer_pool is not None and memory_limit is not None:
+            raise ValueError("'memory_limit' may not be set together with 'buffer_pool'.")
+
+        super().__init__()
+
+        shutdown_event = threading.Event()
+
+        def on_shutdown():
+            shutdown_event.set()
+
+        self._region = region
+        self._part_size = part_size
+        self._enable_read_backpressure = enable_read_backpressure
+        self._initial_read_window = initial_read_window or 0
+        self._metrics = _S3ClientMetricsAggregator() if enable_metrics else None
+        self._object_cache = object_cache
+        self._autotuner = autotuner
+        # Keeps the pool alive for as long as the client
+        self._buffer_pool = buffer_pool
+        self._throughput_coordinator = throughput_coordinator
+        self._range_hedging = range_hedging
+        self.shutdown_event = shutdown_event
+
+        if not bootstrap:
+            bootstrap = ClientBootstrap.get_or_create_static_default()
+
+        s3_client_core = _S3ClientCore(
+            bootstrap,
+            credential_provider,
+            signing_config,
+            tls_connection_options)
+
+        # C layer uses 0 to indicate defaults
+        if tls_mode is None:
+            tls_mode = 0
+        if part_size is None:
+            part_size = 0
+        if multipart_upload_threshold is None:
+            multipart_upload_threshold = 0
+        if throughput_target_gbps is None and throughput_coordinator is not None:
+            # Sized for the whole host, so the client can use it all when it's alone. Requests are limited to its share.
+            throughput_target_gbps = throughput_coordinator.throughput_target_gbps
+        if throughput_target_gbps is None:
+            throughput_target_gbps = 0
+        if buffer_pool is not None:
+            # The client schedules work assuming the limit of the pool it uses
+            memory_limit = buffer_pool.memory_limit
+        if memory_limit is None:
+            memory_limit = 0
+        if network_interface_names is not None:
+            # ensure this is a list, so it's simpler to process in C
+            if not isinstance(network_interface_names, list):
+                network_interface_names = list(network_interface_names)
+        if max_active_connections_override is None:
+            max_active_connections_override = 0
+        if initial_read_window is None:
+            initial_read_window = 0
+        fio_options_set = False
+        should_stream = False
+        disk_throughput_gbps = 0.0
+        direct_io = False
+        if fio_options is not None:
+            fio_options_set = True
+            should_stream = fio_options.should_stream
+            disk_throughput_gbps = fio_options.disk_throughput_gbps
+            direct_io = fio_options.direct_io
+
+        self._binding = _awscrt.s3_client_new(
+            bootstrap,
+            signing_config,
+            credential_provider,
+            tls_connection_options,
+            on_shutdown,
+            region,
+            tls_mode,
+            part_size,
+            multipart_upload_threshold,
+            throughput_target_gbps,
+            enable_s3express,
+            memory_limit,
+            network_interface_names,
+            fio_options_set,
+            should_stream,
+            disk_throughput_gbps,
+            direct_io,
+            max_active_connections_override,
+            enable_read_backpressure,
+            initial_read_window,
+            buffer_pool,
+            s3_client_core)
+
+    def make_request(
+            self,
+            *,
+            type,
+            request,
+            operation_name=None,
+            recv_filepath=None,
+            send_filepath=None,
+            signing_config=None,
+            credential_provider=None,
+            checksum_config=None,
+            part_size=None,
+            multipart_upload_threshold=None,
+            fio_options=None,
+            max_active_connections_override=None,
+            on_headers=None,
+            on_body=None,
+            on_done=None,
+            on_progress=None,
+            on_body_buffer_mode=None,
+            recv_buffer=None,
+            resume_token=None,
+            checkpoint_filepath=None,
+            on_telemetry=None):
+        """Create the Request to the the S3 server,
+        :attr:`~S3RequestType.GET_OBJECT`/:attr:`~S3RequestType.PUT_OBJECT` requests are split it into multi-part
+        requests under the hood for acceleration.
+
+        Keyword Args:
+            type (S3RequestType): The type of S3 request passed in,
+                :attr:`~S3RequestType.GET_OBJECT`/:attr:`~S3RequestType.PUT_OBJECT` can be accelerated
+
+            request (HttpRequest): The overall outgoing API request for S3 operation.
+                If the request body is a file, set send_filepath for better performance.
+
+            operation_name(Optional[str]): S3 operation name (e.g. "CreateBucket").
+                This MUST be set when `type` is :attr:`~S3RequestType.DEFAULT`.
+                It is ignored for other types, since the operation is implicitly known.
+                See `S3 API documentation
+                <https://docs.aws.amazon.com/AmazonS3/latest/API/API_Operations_Amazon_Simple_Storage_Service.html>`_
+                for the canonical list of names.
+
+                This name is used to fill out details in metrics and error reports.
+                It also drives some operation-specific behavior.
+                If you pass the wrong name, you risk getting the wrong behavior.
+
+                For example, every operation except "GetObject" has its response checked
+                for error, even if the HTTP status-code was 200 OK
+                (see `knowledge center <https://repost.aws/knowledge-center/s3-resolve-200-internalerror>`_).
+                If you used the :attr:`~S3RequestType.DEFAULT` type to do
+                `GetObject <https://docs.aws.amazon.com/AmazonS3/latest/API/API_GetObject.html>`_,
+                but mis-named it "Download", and the object looked like XML with an error code,
+                then the request would fail. You risk logging the full response body,
+                and leaking sensitive data.
+
+            recv_filepath (Optional[str]): Optional file path. If set, the
+                response body is written directly to a file and the
+                `on_body` callback is not invoked. This should give better
+                performance than writing to file from the `on_body` callback.
+
+            send_filepath (Optional[str]): Optional file path. If set, the
+                request body is read directly from a file and the
+                request's `body_stream` is ignored. This should give better
+                performance than reading a file from a stream.
+
+            signing_config (Optional[AwsSigningConfig]): Configuration for signing of the request to override the configuration from client.
+                Use :func:`create_default_s3_signing_config()` to create the default config.
+
+                If None is provided, the client configuration will be used.
+
+                If set:
+                    All fields are optional. The credentials will be resolve from client if not set.
+                    S3 Client will derive the right config for signing process based on this.
+
+                Notes:
+
+                    1. For SIGV4_S3EXPRESS, S3 client will use the credentials in the config to derive the S3 Express
+                        credentials that are used in the signing process.
+                    2. Client may make modifications to signing config before passing it on to signer.
+
+            credential_provider (Optional[AwsCredentialsProvider]):  Deprecated, prefer `signing_config` instead.
+                Credentials providers source the :class:`~awscrt.auth.AwsCredentials` needed to sign an authenticated AWS request, for this request only.
+                If None is provided, the client configuration will be used.
+
+            checksum_config (Optional[S3ChecksumConfig]): Optional checksum settings.
+
+            part_size (Optional[int]): Size, in bytes, of parts that files will be downloaded or uploaded in.
+                If not set, the part size configured for the client will be used, which defaults to a dynamic value based on
+                the throughput target, memory_limit_in_bytes and the requested object size.
+                Note: for :attr:`S3RequestType.PUT_OBJECT` request, client will adjust the part size to meet the service limits.
+                (max number of parts per upload is 10,000, minimum upload part size is 5 MiB)
+
+            multipart_upload_threshold (Optional[int]): The size threshold in bytes, for when to use multipart uploads.
+                This only affects :attr:`S3RequestType.PUT_OBJECT` request.
+                Uploads over this size will use the multipart upload strategy.
                 Uploads this size or less will use a single request.
                 If set, this should be at least `part_size`.
                 If not set, `part_size` adjusted by client will be used as the threshold.
                 If both `part_size` and `multipart_upload_threshold` are not set,
                 the values from `aws_s3_client_config` are used.
 
-            fio_options (Optional[S3FileIoOptions]):
-                If set, this overrides the client fio_options to control how this request interact with file I/O.
-                If not set, a default options will be created to avoid memory issue based on the size of file.
-                Note: Only applies when the request created with `send_filepath`
+            fio_options (Optional[S3FileIoOptions]):
+                If set, this overrides the client fio_options to control how this request interact with file I/O.
+                If not set, a default options will be created to avoid memory issue based on the size of file.
+                Note: Only applies when the request created with `send_filepath`
+
+            max_active_connections_override (Optional[int]):
+                When set, this will cap the number of active connections for the meta request.
+                When not set, the client will determine it based on client side settings. (Recommended)
+
+            on_headers: Optional callback invoked as the response received, and even the API request
+                has been split into multiple parts, this callback will only be invoked once as
+                it's just making one API request to S3.
+                The function should take the following arguments and return nothing:
+
+                    *   `status_code` (int): Response status code.
+
+                    *   `headers` (List[Tuple[str, str]]): Response headers as a
+                        list of (name,value) pairs.
+
+                    *   `**kwargs` (dict): Forward-compatibility kwargs.
+
+            on_body: Optional callback invoked 0+ times as the response body received from S3 server.
+                If simply writing to a file, use `recv_filepath` instead of `on_body` for better performance.
+                If reading into memory you own, use `recv_buffer` instead of `on_body` to avoid per-chunk copies.
+                The function should take the following arguments and return nothing:
+
+                    *   `chunk` (buffer): Response body data (not necessarily
+                        a whole "chunk" of chunked encoding).
+
+                    *   `offset` (int): The offset of the chunk started in the whole body.
+
+                    *   `**kwargs` (dict): Forward-compatibility kwargs.
+
+                See `on_body_buffer_mode` for the type of `chunk`.
+
+            on_done: Optional callback invoked when the request has finished the job.
+                The function should take the following arguments and return nothing:
+
+                    *   `error` (Optional[Exception]): None if the request was
+                        successfully sent and valid response received, or an Exception
+                        if it failed.
+
+                    *   `error_headers` (Optional[List[Tuple[str, str]]]): If request
+                        failed because server side sent an unsuccessful response, the headers
+                        of the response is provided here. Else None will be returned.
+
+                    *   `error_body` (Optional[bytes]): If request failed because server
+                        side sent an unsuccessful response, the body of the response is
+                        provided here. Else None will be returned.
+
+                    *   `error_operation_name` (Optional[str]): If request failed
+                        because server side sent and unsuccessful response, this
+                        is the name of the S3 operation it was responding to.
+                        For example, if a :attr:`~S3RequestType.PUT_OBJECT` fails
+                        this could be "PutObject", "CreateMultipartUpload", "UploadPart",
+                        "CompleteMultipartUpload", or others. For :attr:`~S3RequestType.DEFAULT`,
+                        this is the `operation_name` passed to :meth:`S3Client.make_request()`.
+                        This will be None if the request failed for another reason,
+                        or the S3 operation name is unknown.
+
+                    *   `status_code` (Optional[int]): HTTP response status code (if available).
+                        If request failed because server side sent an unsuccessful response,
+                        this is its status code. If the operation was successful,
+                        this is the final response's status code. If the operation
+                        failed for another reason, None is returned.
+
+                    *   `did_validate_checksum` (bool):
+                            Was the server side checksum compared against a calculated checksum of the response body.
+                            This may be false even if :attr:`S3ChecksumConfig.validate_response` was set because
+                            the object was uploaded without a checksum, or downloaded differently from how it's uploaded.
+
+                    *   `checksum_validation_algorithm` (Optional[S3ChecksumAlgorithm]): The checksum algorithm used to validate the response.
+
+                    *   `**kwargs` (dict): Forward-compatibility kwargs.
+
+            on_progress: Optional callback invoked when part of the transfer is done to report the progress.
+                The function should take the following arguments and return nothing:
+
+                    *   `progress` (int): Number of bytes of data that just get transferred
+
+                    *   `**kwargs` (dict): Forward-compatibility kwargs.
+
+            on_body_buffer_mode (Optional[str]): How `chunk` is passed to the `on_body` callback.
+
+                *   "bytes" (default): `chunk` is a new `bytes` object, copied from the native buffer.
+
+                *   "memoryview": `chunk` is a read-only `memoryview` of a buffer that's reused
+                    between callbacks, saving a new allocation for every part. The buffer is only
+                    reused once no views of it remain, so a `chunk` (or slice of it, or object
+                    exporting its buffer, ex: `numpy.frombuffer(chunk)`) kept past the callback stays
+                    valid, but then the next part needs a new buffer.
+
+                Either way, the data is copied out of the native buffer, which is only valid during
+                the callback. "memoryview" saves allocations, not that copy. To have the body written
+                straight into memory or a file without going through `on_body`, use `recv_buffer`
+                or `recv_filepath`.
+
+            recv_buffer (Optional[buffer]): Optional writable, contiguous object supporting the buffer protocol
+                (ex: `bytearray`, `memoryview`, `mmap.mmap`, a numpy array). If set, the response body is
+                copied directly into this buffer as parts arrive, in the native layer and without calling
+                into Python, and the `on_body` callback is not invoked. The first byte of the response body
+                is written at offset 0 of the buffer, so for a ranged GET the buffer holds just the requested range.
+                The buffer must be large enough for the whole response body, or the request fails
+                with `AWS_ERROR_SHORT_BUFFER`. The buffer is held until the request is complete and must
+                not be resized (ex: a `bytearray` cannot be resized while the request holds it).
+                Cannot be combined with `recv_filepath`.
+
+            resume_token (Optional[S3ResumeToken]): Resume a paused upload, or a failed or paused download,
+                from its :attr:`S3Request.resume_token`. The request must be the same as the original one.
+
+                *   :attr:`~S3RequestType.PUT_OBJECT`: the multipart upload continues, skipping parts
+                    already uploaded. The body must be the same. If `checksum_config` sets an algorithm,
+                    the skipped parts are checksummed and compared to the ones already uploaded.
+
+                *   :attr:`~S3RequestType.GET_OBJECT`: requires `recv_filepath`, which must hold the data
+                    downloaded so far. Only the rest of the object is downloaded, into the rest of the file.
+                    The download is conditional on the object's ETag, so it fails with status 412 if the
+                    object changed. Response checksums are validated as usual for the parts downloaded.
+
+            checkpoint_filepath (Optional[str]): File to persist resume state in, so a request can be resumed
+                even by another process. If the file exists, the request resumes from it, as if its
+                contents were passed as `resume_token`. If the request is paused, or a download fails,
+                its resume token is written to the file, and once the request succeeds the file is removed.
+                Downloads also write the file as soon as the response starts,
+                so a download interrupted by a crash can resume from the data in `recv_filepath`.
+
+            on_telemetry: Optional callback invoked once the request finishes, just before `on_done`,
+                with the metrics of every HTTP request attempt it was split into.
+                Setting it makes the request collect metrics, even if the client wasn't
+                created with `enable_metrics`. The function should take the following arguments and return nothing:
+
+                    *   `metrics` (:class:`S3RequestMetrics`): Metrics of each attempt.
+
+                    *   `**kwargs` (dict): Forward-compatibility kwargs.
+
+        Returns:
+            S3Request
+        """
+        return S3Request(
+            client=self,
+            type=type,
+            request=request,
+            operation_name=operation_name,
+            recv_filepath=recv_filepath,
+            send_filepath=send_filepath,
+            signing_config=signing_config,
+            credential_provider=credential_provider,
+            checksum_config=checksum_config,
+            part_size=part_size,
+            multipart_upload_threshold=multipart_upload_threshold,
+            fio_options=fio_options,
+            max_active_connections_override=max_active_connections_override,
+            on_headers=on_headers,
+            on_body=on_body,
+            on_done=on_done,
+            on_progress=on_progress,
+            on_body_buffer_mode=on_body_buffer_mode,
+            recv_buffer=recv_buffer,
+            resume_token=resume_token,
+            checkpoint_filepath=checkpoint_filepath,
+            on_telemetry=on_telemetry,
+            region=self._region)
+
+    def get_metrics(self):
+        """Totals of the metrics of the requests that finished so far.
+        The client must be created with `enable_metrics` set True.
+
+        Returns:
+            S3ClientMetrics
+        """
+        if self._metrics is None:
+            raise ValueError("S3Client must be created with enable_metrics=True")
+        return self._metrics.snapshot()
+
+    def open_read(
+            self,
+            *,
+            request,
+            max_buffered_bytes=None,
+            part_size=None,
+            signing_config=None,
+            checksum_config=None,
+            max_active_connections_override=None):
+        """Start a :attr:`~S3RequestType.GET_OBJECT` request and return a file-like object
+        to read the response body from, sequentially.
+
+        Parts are still downloaded in parallel, but no more than `max_buffered_bytes` of the body
+        is held in memory waiting to be read: when the reader falls behind, fetching of further parts
+        pauses until the buffered data is read. This lets objects of any size be streamed with bounded memory.
+
+        The client must be created with `enable_read_backpressure` set True.
+
+        Keyword Args:
+            request (HttpRequest): The GetObject request. May contain a Range header.
+
+            max_buffered_bytes (Optional[int]): Budget, in bytes, for body data received but not yet read.
+                Must be at least `part_size`. A larger budget allows more parts to download in parallel.
+                Default is 4 times `part_size`. If the client's `initial_read_window` is larger,
+                that is used instead.
+
+            part_size (Optional[int]): Size, in bytes, of the parts to download.
+                Default is the client's `part_size`, or 8 MiB if that is not set.
+
+            signing_config (Optional[AwsSigningConfig]): See :meth:`make_request()`.
+
+            checksum_config (Optional[S3ChecksumConfig]): See :meth:`make_request()`.
+
+            max_active_connections_override (Optional[int]): See :meth:`make_request()`.
+
+        Returns:
+            S3ObjectReader
+        """
+        if not self._enable_read_backpressure:
+            raise ValueError("open_read() requires the S3Client to be created with enable_read_backpressure=True")
+
+        if part_size is None:
+            part_size = self._part_size or _DEFAULT_STREAMING_PART_SIZE
+        if max_buffered_bytes is None:
+            max_buffered_bytes = part_size * _DEFAULT_STREAMING_BUFFERED_PARTS
+        if max_buffered_bytes < part_size:
+            # A part is only delivered once the window can hold all of it, so a smaller budget never makes progress
+            raise ValueError("'max_buffered_bytes' must be at least 'part_size'")
+
+        return S3ObjectReader(
+            client=self,
+            request=request,
+            max_buffered_bytes=max_buffered_bytes,
+            part_size=part_size,
+            signing_config=signing_config,
+            checksum_config=checksum_config,
+            max_active_connections_override=max_active_connections_override)
+
+    def open_write(
+            self,
+            *,
+            request,
+            part_size=None,
+            max_queued_bytes=None,
+            signing_config=None,
+            checksum_config=None,
+            max_active_connections_override=None,
+            on_progress=None):
+        """Start a :attr:`~S3RequestType.PUT_OBJECT` request and return a file-like object
+        to write the object's data to. The object may be of unknown length.
+
+        Written data is pushed straight into the upload's part buffers, and parts are uploaded
+        in parallel as soon as they fill up. Up to `max_queued_bytes` of written data may be waiting
+        to be accepted by the upload, after which `write()` blocks until there is room.
+
+        The upload completes when the writer is closed. If the writer is used in a `with` statement
+        and an exception is raised, the upload is cancelled instead.
+
+        Keyword Args:
+            request (HttpRequest): The PutObject request. Its `body_stream` must not be set.
+                Content-Length may be omitted if the size of the object is unknown.
+
+            part_size (Optional[int]): See :meth:`make_request()`.
+
+            max_queued_bytes (Optional[int]): Budget, in bytes, for written data not yet accepted by
+                the upload. Default is 2 times `part_size`, or 2 times the client's `part_size`, or 16 MiB.
+
+            signing_config (Optional[AwsSigningConfig]): See :meth:`make_request()`.
+
+            checksum_config (Optional[S3ChecksumConfig]): See :meth:`make_request()`.
+
+            max_active_connections_override (Optional[int]): See :meth:`make_request()`.
+
+            on_progress: See :meth:`make_request()`.
+
+        Returns:
+            S3ObjectWriter
+        """
+        if request.body_stream is not None:
+            raise ValueError("The request's 'body_stream' must not be set, data is passed to write()")
+
+        if max_queued_bytes is None:
+            max_queued_bytes = (part_size or self._part_size or _DEFAULT_STREAMING_PART_SIZE) * 2
+
+        return S3ObjectWriter(
+            client=self,
+            request=request,
+            part_size=part_size,
+            max_queued_bytes=max_queued_bytes,
+            signing_config=signing_config,
+            checksum_config=checksum_config,
+            max_active_connections_override=max_active_connections_override,
+            on_progress=on_progress)
+
+    def download_many(
+            self,
+            *,
+            bucket,
+            items,
+            max_concurrency=None,
+            checksum_config=None,
+            endpoint=None):
+        """Download many objects to local files, as a batch.
+
+        The batch is scheduled natively: no Python objects or callbacks are involved per object,
+        so this scales to many small objects much better than calling :meth:`make_request()` for each.
+        Use the returned :class:`S3BatchTransfer` to follow progress and get the outcome.
+
+        Keyword Args:
+            bucket (str): Bucket to download from.
+
+            items (Iterable[Tuple]): `(key, filepath)` or `(key, filepath, range)` tuples.
+                `filepath` is created or replaced, its directory must exist.
+                `range` is an optional Range header value (ex: "bytes=0-1023"), to download part of the object.
+
+            max_concurrency (Optional[int]): Maximum number of objects to download at once. Default is 64.
+
+            checksum_config (Optional[S3ChecksumConfig]): Optional checksum settings, for every object.
+
+            endpoint (Optional[str]): Host to send requests to, using path-style addressing (ex: "localhost:8080").
+                If None, requests go to the virtual-hosted-style endpoint "{bucket}.s3.{region}.amazonaws.com".
+
+        Returns:
+            S3BatchTransfer
+        """
+        return S3BatchTransfer(
+            client=self,
+            type=S3RequestType.GET_OBJECT,
+            bucket=bucket,
+            items=items,
+            max_concurrency=max_concurrency,
+            checksum_config=checksum_config,
+            endpoint=endpoint)
+
+    def upload_many(
+            self,
+            *,
+            bucket,
+            items,
+            max_concurrency=None,
+            checksum_config=None,
+            endpoint=None):
+        """Upload many local files to objects, as a batch.
+
+        The batch is scheduled natively: no Python objects or callbacks are involved per object,
+        so this scales to many small objects much better than calling :meth:`make_request()` for each.
+        Use the returned :class:`S3BatchTransfer` to follow progress and get the outcome.
+
+        Keyword Args:
+            bucket (str): Bucket to upload to.
+
+            items (Iterable[Tuple[str, str]]): `(key, filepath)` tuples.
+
+            max_concurrency (Optional[int]): Maximum number of objects to upload at once. Default is 64.
+
+            checksum_config (Optional[S3ChecksumConfig]): Optional checksum settings, for every object.
+
+            endpoint (Optional[str]): Host to send requests to, using path-style addressing (ex: "localhost:8080").
+                If None, requests go to the virtual-hosted-style endpoint "{bucket}.s3.{region}.amazonaws.com".
+
+        Returns:
+            S3BatchTransfer
+        """
+        return S3BatchTransfer(
+            client=self,
+            type=S3RequestType.PUT_OBJECT,
+            bucket=bucket,
+            items=items,
+            max_concurrency=max_concurrency,
+            checksum_config=checksum_config,
+            endpoint=endpoint)
+
+    def upload_directory(
+            self,
+            *,
+            bucket,
+            directory,
+            prefix="",
+            include=None,
+            exclude=None,
+            skip_unchanged="size_mtime",
+            max_concurrency=None,
+            checksum_config=None,
+            endpoint=None):
+        """Upload the files of a local directory tree to objects, like `aws s3 sync`.
+
+        The tree is walked, and the objects under `prefix` are listed to find the files that changed,
+        before this returns. The transfers are then scheduled natively, as a batch (see :meth:`upload_many()`).
+
+        Keyword Args:
+            bucket (str): Bucket to upload to.
+
+            directory (str): Local directory to upload. Symbolic links to directories aren't followed.
+
+            prefix (str): Prefix of the keys. A file's key is `prefix` followed by its path
+                relative to `directory`, with '/' separators (ex: prefix "backup/" and file "a/b.txt"
+                give key "backup/a/b.txt").
+
+            include (Optional[Sequence[str]]): If set, only files whose relative path matches one of these
+                glob patterns are uploaded (ex: `["*.parquet"]`). Patterns use '/' separators,
+                and '*' matches across them.
+
+            exclude (Optional[Sequence[str]]): Files whose relative path matches one of these
+                glob patterns aren't uploaded, even if they match `include`.
+
+            skip_unchanged (Optional[str]): How to find files that don't need uploading:
+
+                *   "size_mtime": the object has the same size, and was modified after the file.
+                *   "checksum": the object has the same size, and its ETag is the MD5 of the file.
+                    Objects uploaded in parts have ETags that aren't MD5s, those are compared as with
+                    "size_mtime". Objects encrypted with SSE-KMS never match.
+                *   None: upload every file.
+
+            max_concurrency (Optional[int]): Maximum number of files to upload at once. Default is 64.
+
+            checksum_config (Optional[S3ChecksumConfig]): Optional checksum settings, for every object.
+
+            endpoint (Optional[str]): Host to send requests to, using path-style addressing (ex: "localhost:8080").
+                If None, requests go to the virtual-hosted-style endpoint "{bucket}.s3.{region}.amazonaws.com".
+
+        Returns:
+            S3DirectoryTransfer
+        """
+        return S3DirectoryTransfer(
+            client=self,
+            type=S3RequestType.PUT_OBJECT,
+            bucket=bucket,
+            directory=directory,
+            prefix=prefix,
+            include=include,
+            exclude=exclude,
+            skip_unchanged=skip_unchanged,
+            max_concurrency=max_concurrency,
+            checksum_config=checksum_config,
+            endpoint=endpoint)
+
+    def download_directory(
+            self,
+            *,
+            bucket,
+            directory,
+            prefix="",
+            include=None,
+            exclude=None,
+            skip_unchanged="size_mtime",
+            max_concurrency=None,
+            checksum_config=None,
+            endpoint=None):
+        """Download the objects under a prefix to a local directory tree, like `aws s3 sync`.
+
+        The objects are listed, and the tree is checked for files that are already up to date,
+        before this returns. The transfers are then scheduled natively, as a batch (see :meth:`download_many()`).
+        Downloaded files get the modification time of their object.
+
+        Keyword Args:
+            bucket (str): Bucket to download from.
+
+            directory (str): Local directory to download to. It's created if it doesn't exist, and so are
+                its subdirectories. Keys ending with '/', and keys that would resolve to a path outside
+                `directory` (ex: with a ".." component), aren't downloaded.
+
+            prefix (str): Prefix of the keys to download. An object's file path is its key after `prefix`,
+                relative to `directory` (ex: prefix "backup/" and key "backup/a/b.txt" give file "a/b.txt").
+
+            include (Optional[Sequence[str]]): If set, only objects whose relative path matches one of these
+                glob patterns are downloaded. Patterns use '/' separators, and '*' matches across them.
+
+            exclude (Optional[Sequence[str]]): Objects whose relative path matches one of these
+                glob patterns aren't downloaded, even if they match `include`.
+
+            skip_unchanged (Optional[str]): How to find objects that don't need downloading:
+
+                *   "size_mtime": the file has the same size, and was modified after the object.
+                *   "checksum": the file has the same size, and its MD5 is the object's ETag.
+                    Objects uploaded in parts have ETags that aren't MD5s, those are compared as with
+                    "size_mtime". Objects encrypted with SSE-KMS never match.
+                *   None: download every object.
+
+            max_concurrency (Optional[int]): Maximum number of objects to download at once. Default is 64.
+
+            checksum_config (Optional[S3ChecksumConfig]): Optional checksum settings, for every object.
+
+            endpoint (Optional[str]): Host to send requests to, using path-style addressing (ex: "localhost:8080").
+                If None, requests go to the virtual-hosted-style endpoint "{bucket}.s3.{region}.amazonaws.com".
+
+        Returns:
+            S3DirectoryTransfer
+        """
+        return S3DirectoryTransfer(
+            client=self,
+            type=S3RequestType.GET_OBJECT,
+            bucket=bucket,
+            directory=directory,
+            prefix=prefix,
+            include=include,
+            exclude=exclude,
+            skip_unchanged=skip_unchanged,
+            max_concurrency=max_concurrency,
+            checksum_config=checksum_config,
+            endpoint=endpoint)
+
+    def list_objects(
+            self,
+            bucket,
+            prefix="",
+            delimiter=None,
+            *,
+            fan_out=False,
+            max_keys=None,
+            max_concurrency=None,
+            endpoint=None):
+        """List objects in a bucket, using ListObjectsV2.
+
+        Returns an iterator of :class:`S3ObjectSummary`, which fetches pages as it's consumed.
+        Each page is parsed natively, and the next page is requested as soon as the previous
+        one arrives, so it's downloading while the current page is consumed.
+        Requests go through this client's connections and use its signing config.
+
+        Args:
+            bucket (str): Bucket to list.
+
+            prefix (str): Only list keys starting with this prefix.
+
+            delimiter (Optional[str]): Group keys sharing a prefix up to this delimiter (ex: "/")
+                into common prefixes, instead of listing them.
+                The common prefixes are collected in :attr:`S3ObjectLister.common_prefixes`.
+
+        Keyword Args:
+            fan_out (bool): If True, list each common prefix too, recursively, with several
+                pages requested in parallel. Every object under `prefix` is listed, like when
+                there's no delimiter, but large buckets with many prefixes are listed much faster.
+                Objects are no longer listed in key order. Requires a `delimiter`.
+
+            max_keys (Optional[int]): Maximum number of keys per page. Default is 1000.
+
+            max_concurrency (Optional[int]): Maximum number of pages requested at once, with `fan_out`.
+                Default is 16.
+
+            endpoint (Optional[str]): Host to send requests to, using path-style addressing (ex: "localhost:8080").
+                If None, requests go to the virtual-hosted-style endpoint "{bucket}.s3.{region}.amazonaws.com".
+
+        Returns:
+            S3ObjectLister
+        """
+        return S3ObjectLister(
+            client=self,
+            bucket=bucket,
+            prefix=prefix,
+            delimiter=delimiter,
+            fan_out=fan_out,
+            max_keys=max_keys,
+            max_concurrency=max_concurrency,
+            endpoint=endpoint)
+
+    def copy_object(
+            self,
+            *,
+            source_bucket,
+            source_key,
+            bucket,
+            key,
+            part_size=None,
+            max_active_connections_override=None,
+            headers=None,
+            on_progress=None,
+            endpoint=None):
+        """Copy an object server-side, without its data going through this machine.
+
+        Objects larger than `part_size` are copied with a multipart upload,
+        copying ranges of the source with UploadPartCopy requests in parallel.
+        Smaller objects are copied with a single CopyObject request.
+        The copy starts immediately, and runs concurrently with other requests on this client.
+
+        Keyword Args:
+            source_bucket (str): Bucket to copy from.
+
+            source_key (str): Key of the object to copy.
+
+            bucket (str): Bucket to copy to.
+
+            key (str): Key of the new object.
+
+            part_size (Optional[int]): Size, in bytes, of the ranges copied by each UploadPartCopy.
+                Must be between 5 MiB and 5 GiB. Default is 128 MiB. If the object
+                would need more than 10,000 parts, the part size is increased.
+
+            max_active_connections_override (Optional[int]): Maximum number of parts copied at once.
+                If None, every part is requested at once, and the client's connection limits apply.
+
+            headers (Optional[List[Tuple[str, str]]]): Extra headers for the CopyObject
+                or CreateMultipartUpload request (ex: `x-amz-storage-class`).
+                A multipart copy keeps the source's Content-Type, Content-Encoding, Content-Language,
+                Content-Disposition, Cache-Control, Expires and `x-amz-meta-*` headers, except those
+                set here, or all of them if `x-amz-metadata-directive` is `REPLACE`.
+
+            on_progress: Optional callback invoked as parts are copied.
+                The function should take the following arguments and return nothing:
+
+                    *   `progress` (int): Number of bytes copied since the last
+                        invocation of this callback.
+
+            endpoint (Optional[str]): Host to send requests to, using path-style addressing (ex: "localhost:8080").
+                If None, requests go to the virtual-hosted-style endpoint "{bucket}.s3.{region}.amazonaws.com".
+
+        Returns:
+            S3CopyObject
+        """
+        copy = S3CopyObject(
+            client=self,
+            source_bucket=source_bucket,
+            source_key=source_key,
+            bucket=bucket,
+            key=key,
+            part_size=part_size,
+            max_active_connections_override=max_active_connections_override,
+            headers=headers,
+            on_progress=on_progress,
+            endpoint=endpoint)
+        copy._start()
+        return copy
+
+    def copy_many(
+            self,
+            *,
+            items,
+            max_concurrency=None,
+            part_size=None,
+            max_active_connections_override=None,
+            on_progress=None,
+            endpoint=None):
+        """Copy many objects server-side. See :meth:`copy_object()`.
+
+        Keyword Args:
+            items (Iterable[Tuple[str, str, str, str]]): `(source_bucket, source_key, bucket, key)` tuples.
+
+            max_concurrency (Optional[int]): Maximum number of objects copied at once.
+                The rest wait for a copy to finish before starting. Default is 64.
+
+            part_size (Optional[int]): Part size for each copy. See :meth:`copy_object()`.
+
+            max_active_connections_override (Optional[int]): Maximum number of parts copied at once,
+                for each copy. See :meth:`copy_object()`.
+
+            on_progress: Optional callback invoked as parts are copied, for every copy.
+                See :meth:`copy_object()`.
+
+            endpoint (Optional[str]): Host to send requests to, using path-style addressing (ex: "localhost:8080").
+
+        Returns:
+            List[S3CopyObject]: One per item, in order. Cancelling a copy that hasn't started
+            yet prevents it from starting.
+        """
+        assert isinstance(max_concurrency, int) or max_concurrency is None
+        if max_concurrency is None:
+            max_concurrency = _DEFAULT_BATCH_MAX_CONCURRENCY
+        if max_concurrency <= 0:
+            raise ValueError("'max_concurrency' must be positive")
+
+        copies = [
+            S3CopyObject(
+                client=self,
+                source_bucket=source_bucket,
+                source_key=source_key,
+                bucket=bucket,
+                key=key,
+                part_size=part_size,
+                max_active_connections_override=max_active_connections_override,
+                on_progress=on_progress,
+                endpoint=endpoint)
+            for source_bucket, source_key, bucket, key in items]
+        _start_with_concurrency(copies, max_concurrency)
+        return copies
+
+    def get_small(self, *, bucket, key, endpoint=None):
+        """Get a small object, in a single GetObject request.
+
+        A lightweight alternative to :meth:`make_request()` for objects of a few KiB, when making very many requests.
+        The request is sent once as-is, without being split into parts, and the body is collected natively:
+        Python is called once per request, with the whole body, and no :class:`S3Request` is created.
+        Objects larger than the client's part size should use :meth:`make_request()`,
+        which downloads the parts of large objects in parallel.
+
+        Keyword Args:
+            bucket (str): Bucket of the object.
+
+            key (str): Key of the object.
+
+            endpoint (Optional[str]): Host to send requests to, using path-style addressing (ex: "localhost:8080").
+                If None, requests go to the virtual-hosted-style endpoint "{bucket}.s3.{region}.amazonaws.com".
+
+        Returns:
+            concurrent.futures.Future: Resolves to the body of the object, as `bytes`.
+            Fails with :class:`S3ResponseError` if S3 sends an unsuccessful response.
+        """
+        future = Future()
+        _awscrt.s3_client_make_small_request(
+            self,
+            "GET",
+            _object_host(bucket, self._region, endpoint),
+            _object_path(bucket, key, endpoint),
+            None,
+            "GetObject",
+            functools.partial(_on_small_request_done, future, "GetObject"))
+        return future
+
+    def put_small(self, *, bucket, key, body, endpoint=None):
+        """Put a small object, in a single PutObject request.
+
+        A lightweight alternative to :meth:`make_request()` for objects of a few KiB, when making very many requests.
+        The body is copied once, and sent as-is, without Python input stream callbacks.
+        Python is called once, when the request finishes, and no :class:`S3Request` is created.
+        Objects larger than the client's `multipart_upload_threshold` should use :meth:`make_request()`,
+        which uploads the parts of large objects in parallel.
 
-            max_active_connections_override (Optional[int]):
-                When set, this will cap the number of active connections for the meta request.
-                When not set, the client will determine it based on client side settings. (Recommended)
+        Keyword Args:
+            bucket (str): Bucket to put the object in.
 
-            on_headers: Optional callback invoked as the response received, and even the API request
-                has been split into multiple parts, this callback will only be invoked once as
-                it's just making one API request to S3.
-                The function should take the following arguments and return nothing:
+            key (str): Key of the object.
 
-                    *   `status_code` (int): Response status code.
+            body (buffer): Data of the object, as any contiguous object supporting the buffer protocol
+                (ex: `bytes`, `bytearray`, `memoryview`). It may be changed once this returns.
 
-                    *   `headers` (List[Tuple[str, str]]): Response headers as a
-                        list of (name,value) pairs.
+            endpoint (Optional[str]): Host to send requests to, using path-style addressing (ex: "localhost:8080").
+                If None, requests go to the virtual-hosted-style endpoint "{bucket}.s3.{region}.amazonaws.com".
 
-                    *   `**kwargs` (dict): Forward-compatibility kwargs.
+        Returns:
+            concurrent.futures.Future: Resolves to the ETag of the new object, with its surrounding quotes.
+            Fails with :class:`S3ResponseError` if S3 sends an unsuccessful response.
+        """
+        assert body is not None
 
-            on_body: Optional callback invoked 0+ times as the response body received from S3 server.
-                If simply writing to a file, use `recv_filepath` instead of `on_body` for better performance.
-                The function should take the following arguments and return nothing:
+        future = Future()
+        _awscrt.s3_client_make_small_request(
+            self,
+            "PUT",
+            _object_host(bucket, self._region, endpoint),
+            _object_path(bucket, key, endpoint),
+            body,
+            "PutObject",
+            functools.partial(_on_small_request_done, future, "PutObject"))
+        return future
+
+    def get_ranges(
+            self,
+            *,
+            bucket,
+            key,
+            ranges,
+            max_gap=None,
+            max_request_size=None,
+            checksum_config=None,
+            endpoint=None):
+        """Read many byte ranges of an object, concurrently.
 
-                    *   `chunk` (buffer): Response body data (not necessarily
-                        a whole "chunk" of chunked encoding).
+        Suited to columnar formats (ex: Parquet, ORC) that read many small ranges of a file.
+        Ranges are sorted, and ranges that overlap or are less than `max_gap` bytes apart are coalesced
+        into a single GET_OBJECT request. Every request starts at once, so they share the client's
+        pooled connections, and large ones are split into parts downloaded in parallel.
+        The response bodies are received straight into memory, without per-chunk Python callbacks.
 
-                    *   `offset` (int): The offset of the chunk started in the whole body.
+        Keyword Args:
+            bucket (str): Bucket of the object.
 
-                    *   `**kwargs` (dict): Forward-compatibility kwargs.
+            key (str): Key of the object.
 
-            on_done: Optional callback invoked when the request has finished the job.
-                The function should take the following arguments and return nothing:
+            ranges (Sequence[Tuple[int, int]]): `(start, end)` byte ranges to read, like slices: `end` is exclusive.
+                Ranges may overlap, and be in any order. A range that extends beyond the end of the object
+                is truncated. A range that starts beyond the end of the object fails the read.
 
-                    *   `error` (Optional[Exception]): None if the request was
-                        successfully sent and valid response received, or an Exception
-                        if it failed.
+            max_gap (Optional[int]): Ranges separated by fewer bytes than this are read
+                with one request, reading the gap too. Default is 1 MiB. Use 0 to only coalesce ranges that touch.
 
-                    *   `error_headers` (Optional[List[Tuple[str, str]]]): If request
-                        failed because server side sent an unsuccessful response, the headers
-                        of the response is provided here. Else None will be returned.
+            max_request_size (Optional[int]): Ranges aren't coalesced into a request larger than this.
+                A single range larger than this is still read with one request. Default is 32 MiB.
 
-                    *   `error_body` (Optional[bytes]): If request failed because server
-                        side sent an unsuccessful response, the body of the response is
-                        provided here. Else None will be returned.
+            checksum_config (Optional[S3ChecksumConfig]): Optional checksum settings.
 
-                    *   `error_operation_name` (Optional[str]): If request failed
-                        because server side sent and unsuccessful response, this
-                        is the name of the S3 operation it was responding to.
-                        For example, if a :attr:`~S3RequestType.PUT_OBJECT` fails
-                        this could be "PutObject", "CreateMultipartUpload", "UploadPart",
-                        "CompleteMultipartUpload", or others. For :attr:`~S3RequestType.DEFAULT`,
-                        this is the `operation_name` passed to :meth:`S3Client.make_request()`.
-                        This will be None if the request failed for another reason,
-                        or the S3 operation name is unknown.
+            endpoint (Optional[str]): Host to send requests to, using path-style addressing (ex: "localhost:8080").
+                If None, requests go to the virtual-hosted-style endpoint "{bucket}.s3.{region}.amazonaws.com".
+
+        Returns:
+            concurrent.futures.Future: Resolves to a list with a `memoryview` of the data of each range,
+            in the order of `ranges`. Views of coalesced ranges share a buffer. If any request fails,
+            the others are cancelled, and the future raises the first failure.
+        """
+        assert isinstance(max_gap, int) or max_gap is None
+        assert isinstance(max_request_size, int) or max_request_size is None
+
+        if max_gap is None:
+            max_gap = _DEFAULT_RANGES_MAX_GAP
+        if max_request_size is None:
+            max_request_size = _DEFAULT_RANGES_MAX_REQUEST_SIZE
+        if max_gap < 0:
+            raise ValueError("'max_gap' cannot be negative")
+        if max_request_size <= 0:
+            raise ValueError("'max_request_size' must be positive")
+
+        ranges = list(ranges)
+        for start, end in ranges:
+            if start < 0 or end < start:
+                raise ValueError("Invalid range ({}, {})".format(start, end))
+
+        get_ranges = _S3GetRanges(
+            self,
+            _object_host(bucket, self._region, endpoint),
+            _object_path(bucket, key, endpoint),
+            ranges,
+            _coalesce_ranges(ranges, max_gap, max_request_size),
+            checksum_config)
+        get_ranges._start()
+        return get_ranges.finished_future
+
+
+class S3Request(NativeResource):
+    """S3 request
+    Create a new S3Request with :meth:`S3Client.make_request()`
+
+    Attributes:
+        finished_future (concurrent.futures.Future): Future that will
+            resolve when the s3 request has finished successfully.
+            If the error happens, the Future will contain an exception
+            indicating why it failed. Note: Future will set before on_done invoked
+
+        shutdown_event (threading.Event): Signals when underlying threads and
+            structures have all finished shutting down. Shutdown begins when the
+            S3Request object is destroyed.
+    """
+    __slots__ = ('_finished_future', 'shutdown_event', '_core')
+
+    def __init__(
+            self,
+            *,
+            client,
+            type,
+            request,
+            operation_name=None,
+            recv_filepath=None,
+            send_filepath=None,
+            signing_config=None,
+            credential_provider=None,
+            checksum_config=None,
+            part_size=None,
+            multipart_upload_threshold=None,
+            fio_options=None,
+            max_active_connections_override=None,
+            on_headers=None,
+            on_body=None,
+            on_done=None,
+            on_progress=None,
+            on_body_buffer_mode=None,
+            recv_buffer=None,
+            send_using_async_writes=False,
+            resume_token=None,
+            checkpoint_filepath=None,
+            on_telemetry=None,
+            region=None):
+        assert isinstance(client, S3Client)
+        assert isinstance(request, HttpRequest)
+        assert isinstance(resume_token, S3ResumeToken) or resume_token is None
+        assert callable(on_headers) or on_headers is None
+        assert callable(on_body) or on_body is None
+        assert callable(on_done) or on_done is None
+        assert callable(on_telemetry) or on_telemetry is None
+        assert isinstance(part_size, int) or part_size is None
+        assert isinstance(multipart_upload_threshold, int) or multipart_upload_threshold is None
+        assert isinstance(fio_options, S3FileIoOptions) or fio_options is None
+        assert isinstance(max_active_connections_override, int) or max_active_connections_override is None
+
+        if type == S3RequestType.DEFAULT and not operation_name:
+            raise ValueError("'operation_name' must be set when using S3RequestType.DEFAULT")
+
+        if on_body_buffer_mode is None:
+            on_body_buffer_mode = "bytes"
+        if on_body_buffer_mode not in ("bytes", "memoryview"):
+            raise ValueError("'on_body_buffer_mode' must be \"bytes\" or \"memoryview\"")
+
+        if recv_buffer is not None and recv_filepath is not None:
+            raise ValueError("'recv_buffer' and 'recv_filepath' cannot both be set")
+
+        if checkpoint_filepath is not None:
+            checkpoint_filepath = os.fspath(checkpoint_filepath)
+            if resume_token is None:
+                resume_token = _read_checkpoint(checkpoint_filepath)
+
+        # Repeated GETs are revalidated against the cached response, if any
+        object_cache = None
+        cache_key = None
+        cached_object = None
+        if (client._object_cache is not None and type == S3RequestType.GET_OBJECT and recv_buffer is None
+                and resume_token is None and checkpoint_filepath is None
+                and not any(request.headers.get(name) for name in _CONDITIONAL_HEADERS)):
+            object_cache = client._object_cache
+            cache_key = (request.headers.get("Host"), request.path, request.headers.get("Range"))
+            cached_object = object_cache._lookup(cache_key)
+            if cached_object is not None:
+                request = _request_with_headers(request, [("If-None-Match", cached_object.etag)])
+
+        # Bytes of the response body that were already downloaded, when resuming a download
+        resume_offset = 0
+        recv_file_option = 0
+        recv_file_position = 0
+        upload_resume_token = None
+        if resume_token is not None:
+            if resume_token.type != type:
+                raise ValueError("'resume_token' is for a different type of request")
+            if type == S3RequestType.GET_OBJECT:
+                if recv_filepath is None:
+                    raise ValueError("'recv_filepath' must be set to resume a download")
+                request, resume_offset = _resume_download(request, recv_filepath, resume_token)
+                if resume_offset:
+                    recv_file_option = _RECV_FILE_WRITE_TO_POSITION
+                    recv_file_position = resume_offset
+            elif type == S3RequestType.PUT_OBJECT:
+                upload_resume_token = (
+                    resume_token.upload_id,
+                    resume_token.part_size,
+                    resume_token.total_num_parts,
+                    resume_token.num_parts_completed)
+            else:
+                raise ValueError("Only GET_OBJECT and PUT_OBJECT requests can be resumed")
+
+        autotuner = None
+        if (client._autotuner is not None and type in (S3RequestType.GET_OBJECT, S3RequestType.PUT_OBJECT)
+                and part_size is None and max_active_connections_override is None and resume_token is None):
+            autotuner = client._autotuner
+            part_size, max_active_connections_override = autotuner._settings()
+
+        upload_checksum_algorithm = None
+        if checksum_config is not None and checksum_config.full_object_checksum:
+            if type != S3RequestType.PUT_OBJECT:
+                raise ValueError("'full_object_checksum' is only supported by PUT_OBJECT requests")
+            if checksum_config.algorithm not in _CRC_FUNCTIONS:
+                raise ValueError("'full_object_checksum' requires a CRC checksum algorithm")
+            if checksum_config.location is None:
+                raise ValueError("'full_object_checksum' requires a checksum 'location'")
+            upload_checksum_algorithm = checksum_config.algorithm
+
+        throughput_coordinator = None
+        if client._throughput_coordinator is not None and type in (S3RequestType.GET_OBJECT, S3RequestType.PUT_OBJECT):
+            throughput_coordinator = client._throughput_coordinator
+            share = throughput_coordinator._acquire()
+            if max_active_connections_override is None:
+                max_active_connections_override = share
+            elif autotuner is not None:
+                max_active_connections_override = min(max_active_connections_override, share)
+
+        super().__init__()
+
+        self._finished_future = Future()
+        self.shutdown_event = threading.Event()
+
+        # C layer uses 0 to indicate defaults
+        if part_size is None:
+            part_size = 0
+        if multipart_upload_threshold is None:
+            multipart_upload_threshold = 0
+        checksum_algorithm = 0
+        checksum_location = 0
+        validate_response_checksum = False
+        if checksum_config is not None:
+            if checksum_config.algorithm is not None:
+                checksum_algorithm = checksum_config.algorithm.value
+            if checksum_config.location is not None:
+                checksum_location = checksum_config.location.value
+            validate_response_checksum = checksum_config.validate_response
+        fio_options_set = False
+        should_stream = False
+        disk_throughput_gbps = 0.0
+        direct_io = False
+        if fio_options is not None:
+            fio_options_set = True
+            should_stream = fio_options.should_stream
+            disk_throughput_gbps = fio_options.disk_throughput_gbps
+            direct_io = fio_options.direct_io
+        if max_active_connections_override is None:
+            max_active_connections_override = 0
+
+        s3_request_core = _S3RequestCore(
+            request,
+            self._finished_future,
+            self.shutdown_event,
+            signing_config,
+            credential_provider,
+            on_headers,
+            on_body,
+            on_done,
+            on_progress,
+            type=type,
+            part_size=part_size or client._part_size or _DEFAULT_STREAMING_PART_SIZE,
+            resume_offset=resume_offset,
+            checkpoint_filepath=checkpoint_filepath,
+            on_telemetry=on_telemetry,
+            client_metrics=client._metrics,
+            object_cache=object_cache,
+            cache_key=cache_key,
+            cached_object=cached_object,
+            recv_filepath=recv_filepath,
+            body_as_memoryview=on_body_buffer_mode == "memoryview",
+            autotuner=autotuner,
+            max_active_connections=max_active_connections_override,
+            throughput_coordinator=throughput_coordinator,
+            upload_checksum_algorithm=upload_checksum_algorithm)
+        self._core = s3_request_core
+
+        try:
+            self._binding = _awscrt.s3_client_make_meta_request(
+                self,
+                client,
+                request,
+                type,
+                operation_name,
+                signing_config,
+                credential_provider,
+                recv_filepath,
+                send_filepath,
+                region,
+                checksum_algorithm,
+                checksum_location,
+                validate_response_checksum,
+                part_size,
+                multipart_upload_threshold,
+                fio_options_set,
+                should_stream,
+                disk_throughput_gbps,
+                direct_io,
+                max_active_connections_override,
+                on_body_buffer_mode == "memoryview",
+                recv_buffer,
+                send_using_async_writes,
+                recv_file_option,
+                recv_file_position,
+                upload_resume_token,
+                s3_request_core._collect_metrics,
+                upload_checksum_algorithm is not None,
+                s3_request_core)
+        except BaseException:
+            if throughput_coordinator is not None:
+                throughput_coordinator._release()
+            raise
+
+    @property
+    def finished_future(self):
+        return self._finished_future
+
+    @property
+    def upload_checksum(self):
+        """Optional[S3UploadChecksum]: Checksums of the uploaded data, set before :attr:`finished_future`
+        completes successfully, if the request was made with :attr:`S3ChecksumConfig.full_object_checksum`."""
+        return self._core._upload_checksum
+
+    @property
+    def resume_token(self):
+        """Optional[S3ResumeToken]: Token to resume this request with :meth:`S3Client.make_request()`.
+        Set by :meth:`pause()` for a :attr:`~S3RequestType.PUT_OBJECT`, and before :attr:`finished_future`
+        completes for a :attr:`~S3RequestType.GET_OBJECT` that fails or is paused.
+        None if the request didn't get far enough to be resumable."""
+        return self._core._resume_token
+
+    def cancel(self):
+        _awscrt.s3_meta_request_cancel(self)
+
+    def get_metrics(self):
+        """Metrics of the HTTP request attempts that finished so far.
+        Only collected if the request was made with `on_telemetry`, or the client with `enable_metrics`.
+
+        Returns:
+            Optional[S3RequestMetrics]: None if metrics aren't collected.
+        """
+        if not self._core._collect_metrics:
+            return None
+        return S3RequestMetrics(_awscrt.s3_meta_request_get_metrics(self._binding))
+
+    def pause(self):
+        """Pause the request, so it can be resumed later from :attr:`resume_token`.
+
+        Only :attr:`~S3RequestType.GET_OBJECT` and :attr:`~S3RequestType.PUT_OBJECT` requests can be paused.
+
+        *   :attr:`~S3RequestType.PUT_OBJECT`: the token is available as soon as this returns, unless
+            the multipart upload wasn't created yet. Requests in flight are cancelled,
+            and :attr:`finished_future` fails with AWS_ERROR_S3_PAUSED once they've wound down.
+
+        *   :attr:`~S3RequestType.GET_OBJECT`: the download is cancelled, and :attr:`finished_future`
+            fails with AWS_ERROR_S3_CANCELED. The token is built from the response headers and
+            the data written to `recv_filepath`, and is available once :attr:`finished_future` completes.
+        """
+        if self._core._type == S3RequestType.GET_OBJECT:
+            # aws-c-s3 can only pause uploads. Downloads resume from the data already in recv_filepath.
+            _awscrt.s3_meta_request_cancel(self)
+        else:
+            self._core._on_paused(_awscrt.s3_meta_request_pause(self._binding))
+
+    def increment_read_window(self, increment_size):
+        """Increment the flow-control window, so that response data continues downloading.
+
+        Only has an effect if the client was created with `enable_read_backpressure` set True.
+        See :class:`S3Client` for details.
+
+        Args:
+            increment_size (int): Number of bytes to add to the window.
+        """
+        assert isinstance(increment_size, int)
+        if increment_size < 0:
+            raise ValueError("'increment_size' must be non-negative")
+        _awscrt.s3_meta_request_increment_read_window(self, increment_size)
+
+
+class S3ObjectReader(io.RawIOBase):
+    """Read-only, non-seekable file-like object streaming the body of an object.
+
+    Create with :meth:`S3Client.open_read()`. Reads block until data is available,
+    and raise the request's error once the data received before the failure has been read.
+    Closing the reader before the whole body is read cancels the download.
+
+    Attributes:
+        status_code (Optional[int]): Response status code, once the response headers are received.
+
+        headers (Optional[List[Tuple[str, str]]]): Response headers, once they are received.
+
+        finished_future (concurrent.futures.Future): Future that resolves when the download finishes.
+    """
+
+    def __init__(
+            self,
+            *,
+            client,
+            request,
+            max_buffered_bytes,
+            part_size,
+            signing_config=None,
+            checksum_config=None,
+            max_active_connections_override=None):
+        super().__init__()
+        self.status_code = None
+        self.headers = None
+
+        # Condition protecting the state shared with the CRT threads delivering parts
+        self._cond = threading.Condition()
+        # Received parts not yet read, keyed by their offset in the object
+        self._parts = {}
+        # Object offset of the next byte to read. None until known.
+        self._next_offset = _get_range_start(request)
+        self._done = False
+        self._error = None
+
+        # Part being read. Only touched by the reading thread.
+        self._current = None
+        self._current_pos = 0
+
+        self._request = client.make_request(
+            type=S3RequestType.GET_OBJECT,
+            request=request,
+            signing_config=signing_config,
+            checksum_config=checksum_config,
+            part_size=part_size,
+            max_active_connections_override=max_active_connections_override,
+            on_headers=self._on_headers,
+            on_body=self._on_body,
+            on_done=self._on_done)
+
+        # Each request's window starts at the client's initial_read_window, open it up to our budget
+        if max_buffered_bytes > client._initial_read_window:
+            self._request.increment_read_window(max_buffered_bytes - client._initial_read_window)
+
+    @property
+    def finished_future(self):
+        return self._request.finished_future
+
+    def _on_headers(self, status_code, headers, **kwargs):
+        self.status_code = status_code
+        self.headers = headers
+
+    def _on_body(self, chunk, offset, **kwargs):
+        with self._cond:
+            self._parts[offset] = chunk
+            if self._next_offset is None:
+                # No Range to tell where the body starts, and parts are delivered in order, so this is the start
+                self._next_offset = offset
+            self._cond.notify()
+
+    def _on_done(self, error, **kwargs):
+        with self._cond:
+            self._done = True
+            self._error = error
+            self._cond.notify()
+
+    def readable(self):
+        return True
+
+    def _next_part(self, block):
+        """Return the next part in order, or None if it isn't available yet and `block` is False,
+        or the body is complete."""
+        with self._cond:
+            while True:
+                part = self._parts.pop(self._next_offset, None)
+                if part is not None:
+                    self._next_offset += len(part)
+                    return part
+                if self._done:
+                    if self._error is not None:
+                        raise self._error
+                    return None
+                if not block:
+                    return None
+                self._cond.wait()
+
+    def readinto(self, b):
+        """Read up to len(b) bytes into `b`, blocking until at least 1 byte is available.
+
+        Returns:
+            Number of bytes read, 0 at the end of the body.
+        """
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+        view = memoryview(b).cast('B')
+        total = 0
+        while total < len(view):
+            if self._current is None:
+                # Only block if nothing has been read yet
+                part = self._next_part(block=(total == 0))
+                if part is None:
+                    break
+                self._current = memoryview(part)
+                self._current_pos = 0
+
+            n = min(len(view) - total, len(self._current) - self._current_pos)
+            view[total:total + n] = self._current[self._current_pos:self._current_pos + n]
+            total += n
+            self._current_pos += n
+            if self._current_pos == len(self._current):
+                # The whole part has left our buffer, let the CRT download that much more
+                self._request.increment_read_window(len(self._current))
+                self._current = None
+        return total
+
+    def close(self):
+        """Close the reader, cancelling the download if it's still in progress."""
+        if not self.closed:
+            if not self._request.finished_future.done():
+                self._request.cancel()
+            with self._cond:
+                self._parts.clear()
+            self._current = None
+        super().close()
+
+
+class S3ObjectWriter(io.RawIOBase):
+    """Write-only, non-seekable file-like object uploading an object.
+
+    Create with :meth:`S3Client.open_write()`. `close()` completes the upload, blocking until it
+    finishes, and raises the request's error if it failed. `abort()` cancels the upload.
+
+    Attributes:
+        finished_future (concurrent.futures.Future): Future that resolves when the upload finishes.
+    """
+
+    def __init__(
+            self,
+            *,
+            client,
+            request,
+            part_size,
+            max_queued_bytes,
+            signing_config=None,
+            checksum_config=None,
+            max_active_connections_override=None,
+            on_progress=None):
+        super().__init__()
+
+        # Condition protecting the state shared with the CRT threads completing writes
+        self._cond = threading.Condition()
+        # Pending (data, eof) writes. The CRT only allows 1 write in flight at a time.
+        self._queue = deque()
+        self._queued_bytes = 0
+        self._max_queued_bytes = max_queued_bytes
+        self._write_in_flight = False
+        # True while some thread is submitting writes, so completions that fire synchronously don't recurse
+        self._pumping = False
+        self._error = None
+
+        self._request = S3Request(
+            client=client,
+            type=S3RequestType.PUT_OBJECT,
+            request=request,
+            signing_config=signing_config,
+            checksum_config=checksum_config,
+            part_size=part_size,
+            max_active_connections_override=max_active_connections_override,
+            on_done=self._on_done,
+            on_progress=on_progress,
+            send_using_async_writes=True,
+            region=client._region)
+
+    @property
+    def finished_future(self):
+        return self._request.finished_future
+
+    def writable(self):
+        return True
+
+    def _on_done(self, error, **kwargs):
+        with self._cond:
+            if self._error is None:
+                self._error = error
+            self._cond.notify_all()
+
+    def _on_write_complete(self, error_code):
+        with self._cond:
+            self._write_in_flight = False
+            data, _ = self._queue.popleft()
+            if data is not None:
+                self._queued_bytes -= len(data)
+            if error_code and self._error is None:
+                self._error = awscrt.exceptions.from_code(error_code)
+            self._cond.notify_all()
+        self._pump()
+
+    def _pump(self):
+        """Submit queued writes, one at a time."""
+        with self._cond:
+            if self._pumping:
+                return
+            self._pumping = True
+        try:
+            while True:
+                with self._cond:
+                    if self._write_in_flight or not self._queue or self._error is not None:
+                        self._pumping = False
+                        return
+                    self._write_in_flight = True
+                    data, eof = self._queue[0]
+                _awscrt.s3_meta_request_write(self._request, data, eof, self._on_write_complete)
+        except BaseException:
+            with self._cond:
+                self._pumping = False
+            raise
+
+    def _enqueue(self, data, eof):
+        """Queue a write. Returns False if the upload already failed."""
+        with self._cond:
+            if self._error is not None:
+                return False
+            self._queue.append((data, eof))
+            if data is not None:
+                self._queued_bytes += len(data)
+        self._pump()
+        return True
+
+    def write(self, b):
+        """Write bytes-like data, blocking while `max_queued_bytes` of earlier data is waiting to be accepted.
+        `bytes` are passed without copying, other buffers are copied so the caller may reuse them.
+
+        Returns:
+            Number of bytes written, always len(b).
+        """
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+        data = b if isinstance(b, bytes) else memoryview(b).tobytes()
+        if not data:
+            return 0
+
+        with self._cond:
+            while self._queued_bytes > 0 and self._queued_bytes + len(data) > self._max_queued_bytes \
+                    and self._error is None:
+                self._cond.wait()
+        if not self._enqueue(data, False):
+            raise self._error
+        return len(data)
+
+    def close(self):
+        """Complete the upload, blocking until it finishes.
+
+        Raises:
+            S3ResponseError: If the request fails due to an unsuccessful response from S3.
+        """
+        if not self.closed:
+            super().close()
+            # If the upload already failed, it finishes on its own and the future holds the reason
+            self._enqueue(None, True)
+            self._request.finished_future.result()
+
+    def abort(self):
+        """Cancel the upload, without waiting for it to finish."""
+        if not self.closed:
+            super().close()
+            self._request.cancel()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    def __del__(self):
+        # Never complete an upload from the garbage collector, the data may be truncated.
+        # There's nothing to abort if __init__ failed before the request was made.
+        if getattr(self, '_request', None) is not None:
+            self.abort()
+
+
+class S3ObjectLister:
+    """Iterator of :class:`S3ObjectSummary`, listing a bucket's objects.
+    Create with :meth:`S3Client.list_objects()`.
+
+    Pages are buffered ahead of the consumer, up to the number of keys in `max_concurrency` pages.
+    Iteration raises the error of the first page request that fails.
+    Closing the lister before the end cancels requests in progress.
+
+    Attributes:
+        common_prefixes (List[str]): Common prefixes received so far, if listing with a delimiter
+            and without `fan_out`. Complete once iteration ends.
+    """
+
+    def __init__(
+            self,
+            *,
+            client,
+            bucket,
+            prefix="",
+            delimiter=None,
+            fan_out=False,
+            max_keys=None,
+            max_concurrency=None,
+            endpoint=None):
+        assert isinstance(client, S3Client)
+        assert isinstance(prefix, str)
+        assert isinstance(delimiter, str) or delimiter is None
+        assert isinstance(max_keys, int) or max_keys is None
+        assert isinstance(max_concurrency, int) or max_concurrency is None
+
+        if fan_out and not delimiter:
+            raise ValueError("'fan_out' requires a 'delimiter'")
+        if max_keys is not None and max_keys <= 0:
+            raise ValueError("'max_keys' must be positive")
+        if max_concurrency is None:
+            max_concurrency = _DEFAULT_LIST_MAX_CONCURRENCY
+        if max_concurrency <= 0:
+            raise ValueError("'max_concurrency' must be positive")
+
+        self.common_prefixes = []
+
+        self._client = client
+        self._bucket = bucket
+        self._delimiter = delimiter
+        self._fan_out = fan_out
+        self._max_keys = max_keys
+        self._max_concurrency = max_concurrency
+        self._endpoint = endpoint
+        self._host = _object_host(bucket, client._region, endpoint)
+        self._max_buffered_keys = (max_keys or _LIST_MAX_KEYS) * max_concurrency
+
+        # Condition protecting the state shared with the CRT threads delivering pages
+        self._cond = threading.Condition()
+        # Objects received, not yet consumed
+        self._objects = deque()
+        # Pages not requested yet, as (prefix, continuation_token)
+        self._pending = deque([(prefix, None)])
+        # Page requests in progress
+        self._requests = set()
+        self._error = None
+        self._closed = False
+
+        self._schedule()
+
+    def __iter__(self):
+        return self
 
-                    *   `status_code` (Optional[int]): HTTP response status code (if available).
-                        If request failed because server side sent an unsuccessful response,
-                        this is its status code. If the operation was successful,
-                        this is the final response's status code. If the operation
-                        failed for another reason, None is returned.
+    def __next__(self):
+        with self._cond:
+            while True:
+                if self._error is not None:
+                    raise self._error
+                if self._objects:
+                    summary = self._objects.popleft()
+                    break
+                if self._closed or (not self._pending and not self._requests):
+                    raise StopIteration
+                self._cond.wait()
+
+            # Consuming made room in the buffer, maybe for another page
+            start = self._pending and len(self._requests) < self._max_concurrency and \
+                len(self._objects) < self._max_buffered_keys
+
+        if start:
+            self._schedule()
+        return summary
+
+    def _schedule(self):
+        """Request pending pages, while under the concurrency and buffer limits."""
+        while True:
+            with self._cond:
+                if self._closed or self._error is not None or not self._pending or \
+                        len(self._requests) >= self._max_concurrency or \
+                        len(self._objects) >= self._max_buffered_keys:
+                    return
+                prefix, continuation_token = self._pending.popleft()
+                page = _S3ListObjectsPage(self, prefix)
+                self._requests.add(page)
 
-                    *   `did_validate_checksum` (bool):
-                            Was the server side checksum compared against a calculated checksum of the response body.
-                            This may be false even if :attr:`S3ChecksumConfig.validate_response` was set because
-                            the object was uploaded without a checksum, or downloaded differently from how it's uploaded.
+            try:
+                request = self._client.make_request(
+                    type=S3RequestType.DEFAULT,
+                    operation_name="ListObjectsV2",
+                    request=self._new_page_request(prefix, continuation_token),
+                    on_body=page.on_body,
+                    on_done=page.on_done)
+            except Exception as e:
+                self._on_page_done(page, e, None)
+                raise
+
+            with self._cond:
+                # Only hold the request while it's in progress. The native request keeps the page's
+                # callbacks alive until it's destroyed, so a finished page holding it would be a cycle.
+                if page in self._requests:
+                    page.request = request
+
+    def _new_page_request(self, prefix, continuation_token):
+        query = [("list-type", "2"), ("prefix", prefix)]
+        if self._delimiter is not None:
+            query.append(("delimiter", self._delimiter))
+        if self._max_keys is not None:
+            query.append(("max-keys", str(self._max_keys)))
+        if continuation_token is not None:
+            query.append(("continuation-token", continuation_token))
+
+        query_string = "&".join("{}={}".format(name, quote(value, safe="~")) for name, value in query)
+        path = _object_path(self._bucket, "", self._endpoint) + "?" + query_string
+        return HttpRequest("GET", path, HttpHeaders([("host", self._host)]))
+
+    def _on_page_done(self, page, error, body):
+        if error is None:
+            try:
+                objects, common_prefixes, next_continuation_token = _awscrt.s3_parse_list_objects_v2(body)
+            except Exception as e:
+                error = e
+
+        siblings = []
+        with self._cond:
+            self._requests.discard(page)
+            page.request = None
+            if error is not None:
+                if self._error is None and not self._closed:
+                    self._error = error
+                    # The listing has failed, the other pages in progress are of no use
+                    self._pending.clear()
+                    siblings = [p.request for p in self._requests if p.request is not None]
+            elif not self._closed:
+                self._objects.extend(S3ObjectSummary(*o) for o in objects)
+                if next_continuation_token is not None:
+                    # Continue this prefix before moving on to others, to keep keys in order when possible
+                    self._pending.appendleft((page.prefix, next_continuation_token))
+                if self._fan_out:
+                    self._pending.extend((p, None) for p in common_prefixes)
+                else:
+                    self.common_prefixes.extend(common_prefixes)
+            self._cond.notify()
+
+        for request in siblings:
+            request.cancel()
+
+        if error is None:
+            # Request the next page right away, so it's ready by the time this one is consumed
+            self._schedule()
+
+    def close(self):
+        """Stop listing, cancelling requests in progress."""
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._objects.clear()
+            requests = [page.request for page in self._requests if page.request is not None]
+            self._cond.notify()
+        for request in requests:
+            request.cancel()
 
-                    *   `checksum_validation_algorithm` (Optional[S3ChecksumAlgorithm]): The checksum algorithm used to validate the response.
+    def __enter__(self):
+        return self
 
-                    *   `**kwargs` (dict): Forward-compatibility kwargs.
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-            on_progress: Optional callback invoked when part of the transfer is done to report the progress.
-                The function should take the following arguments and return nothing:
 
-                    *   `progress` (int): Number of bytes of data that just get transferred
+class _S3ListObjectsPage:
+    '''
+    Private class accumulating the body of one ListObjectsV2 page, for S3ObjectLister
+    '''
 
-                    *   `**kwargs` (dict): Forward-compatibility kwargs.
+    def __init__(self, lister, prefix):
+        self.lister = lister
+        self.prefix = prefix
+        self.request = None
+        self.body = bytearray()
 
-        Returns:
-            S3Request
-        """
-        return S3Request(
-            client=self,
-            type=type,
-            request=request,
-            operation_name=operation_name,
-            recv_filepath=recv_filepath,
-            send_filepath=send_filepath,
-            signing_config=signing_config,
-            credential_provider=credential_provider,
-            checksum_config=checksum_config,
-            part_size=part_size,
-            multipart_upload_threshold=multipart_upload_threshold,
-            fio_options=fio_options,
-            max_active_connections_override=max_active_connections_override,
-            on_headers=on_headers,
-            on_body=on_body,
-            on_done=on_done,
-            on_progress=on_progress,
-            region=self._region)
+    def on_body(self, chunk, **kwargs):
+        self.body.extend(chunk)
 
+    def on_done(self, error, **kwargs):
+        self.lister._on_page_done(self, error, self.body)
 
-class S3Request(NativeResource):
-    """S3 request
-    Create a new S3Request with :meth:`S3Client.make_request()`
 
-    Attributes:
-        finished_future (concurrent.futures.Future): Future that will
-            resolve when the s3 request has finished successfully.
-            If the error happens, the Future will contain an exception
-            indicating why it failed. Note: Future will set before on_done invoked
+class S3CopyObject:
+    """A server-side copy of an object.
+    Create with :meth:`S3Client.copy_object()` or :meth:`S3Client.copy_many()`.
 
-        shutdown_event (threading.Event): Signals when underlying threads and
-            structures have all finished shutting down. Shutdown begins when the
-            S3Request object is destroyed.
+    The source is checked with a HeadObject request, to learn its size and ETag.
+    If it's larger than the part size, the copy is split into UploadPartCopy requests,
+    each conditional on the source's ETag, so a source modified mid-copy fails the copy
+    instead of producing a mix of versions. A failed or cancelled multipart copy is aborted.
+    Like CopyObject, a multipart copy keeps the source's metadata, which is passed from
+    the HeadObject response to CreateMultipartUpload.
+
+    Attributes:
+        finished_future (concurrent.futures.Future): Future that resolves to None when the copy
+            completes, or raises an exception if it fails.
     """
-    __slots__ = ('_finished_future', 'shutdown_event')
 
     def __init__(
             self,
             *,
             client,
-            type,
-            request,
-            operation_name=None,
-            recv_filepath=None,
-            send_filepath=None,
-            signing_config=None,
-            credential_provider=None,
-            checksum_config=None,
+            source_bucket,
+            source_key,
+            bucket,
+            key,
             part_size=None,
-            multipart_upload_threshold=None,
-            fio_options=None,
             max_active_connections_override=None,
-            on_headers=None,
-            on_body=None,
-            on_done=None,
+            headers=None,
             on_progress=None,
-            region=None):
+            endpoint=None):
         assert isinstance(client, S3Client)
-        assert isinstance(request, HttpRequest)
-        assert callable(on_headers) or on_headers is None
-        assert callable(on_body) or on_body is None
-        assert callable(on_done) or on_done is None
         assert isinstance(part_size, int) or part_size is None
-        assert isinstance(multipart_upload_threshold, int) or multipart_upload_threshold is None
-        assert isinstance(fio_options, S3FileIoOptions) or fio_options is None
         assert isinstance(max_active_connections_override, int) or max_active_connections_override is None
+        assert callable(on_progress) or on_progress is None
 
-        if type == S3RequestType.DEFAULT and not operation_name:
-            raise ValueError("'operation_name' must be set when using S3RequestType.DEFAULT")
+        if part_size is None:
+            part_size = _DEFAULT_COPY_PART_SIZE
+        if part_size < _MIN_COPY_PART_SIZE or part_size > _MAX_COPY_PART_SIZE:
+            raise ValueError("'part_size' must be between 5 MiB and 5 GiB")
+        if max_active_connections_override is not None and max_active_connections_override <= 0:
+            raise ValueError("'max_active_connections_override' must be positive")
+
+        self._client = client
+        self._source_bucket = source_bucket
+        self._source_key = source_key
+        self._bucket = bucket
+        self._key = key
+        self._part_size = part_size
+        self._max_parts_in_flight = max_active_connections_override
+        self._headers = headers
+        self._on_progress = on_progress
+        self._endpoint = endpoint
+        self._copy_source = "/{}/{}".format(source_bucket, quote(source_key, safe="/~"))
+        self._finished_future = Future()
+
+        self._lock = threading.Lock()
+        # Requests in progress
+        self._requests = set()
+        self._canceled = False
+        # Multipart state
+        self._upload_id = None
+        self._source_etag = None
+        self._ranges = deque()
+        self._num_parts = 0
+        self._part_etags = {}
+        self._error = None
+        self._aborting = False
+        self._finished = False
+
+    @property
+    def finished_future(self):
+        return self._finished_future
+
+    def cancel(self):
+        """Cancel the copy. The future fails with :class:`concurrent.futures.CancelledError`."""
+        with self._lock:
+            self._canceled = True
+        self._fail(CancelledError())
+
+    def _start(self):
+        self._send("HeadObject", "HEAD", self._source_bucket, self._source_key, on_complete=self._on_head_done)
+
+    def _send(self, operation_name, method, bucket, key, *, query=None, headers=None, body=None, on_complete):
+        """Send one request, calling `on_complete(headers, body)` if it succeeds, or failing the copy."""
+        with self._lock:
+            if self._canceled or self._error is not None or self._finished:
+                return
+            request = _S3CopySubrequest(self, on_complete)
+            self._requests.add(request)
+
+        path = _object_path(bucket, key, self._endpoint)
+        if query:
+            path += "?" + "&".join(
+                name if value is None else "{}={}".format(name, quote(value, safe="~")) for name, value in query)
+        http_headers = HttpHeaders([("host", _object_host(bucket, self._client._region, self._endpoint))])
+        if headers:
+            http_headers.add_pairs(headers)
+        if body is not None:
+            http_headers.add("Content-Length", str(len(body)))
+
+        try:
+            s3_request = self._client.make_request(
+                type=S3RequestType.DEFAULT,
+                operation_name=operation_name,
+                request=HttpRequest(method, path, http_headers, body),
+                on_headers=request.on_headers,
+                on_body=request.on_body,
+                on_done=request.on_done)
+        except Exception as e:
+            with self._lock:
+                self._requests.discard(request)
+            self._fail(e)
+            return
+
+        with self._lock:
+            # Only hold the request while it's in progress. The native request keeps the subrequest's
+            # callbacks alive until it's destroyed, so a finished subrequest holding it would be a cycle.
+            if request in self._requests:
+                request.s3_request = s3_request
+            stopped = self._canceled or self._error is not None
+        if stopped:
+            s3_request.cancel()
+
+    def _on_request_done(self, request):
+        with self._lock:
+            self._requests.discard(request)
+            request.s3_request = None
+        if request.error is not None:
+            self._fail(request.error)
+        else:
+            # Even after a failure, a request that succeeded may have created state to clean up
+            try:
+                request.on_complete(request.headers, bytes(request.body))
+            except Exception as e:
+                self._fail(e)
+        self._finish_if_failed()
+
+    def _on_head_done(self, headers, body):
+        headers = HttpHeaders(headers)
+        content_length = int(headers.get("Content-Length"))
+        if content_length <= self._part_size:
+            copy_headers = [("x-amz-copy-source", self._copy_source)]
+            if self._headers:
+                copy_headers.extend(self._headers)
+
+            def on_copy_done(headers, body):
+                if self._on_progress is not None:
+                    self._on_progress(content_length)
+                self._finish(None)
+
+            self._send("CopyObject", "PUT", self._bucket, self._key, headers=copy_headers, on_complete=on_copy_done)
+            return
+
+        # Grow the part size if the object wouldn't fit in the maximum number of parts
+        part_size = max(self._part_size, -(-content_length // _MAX_UPLOAD_PARTS))
+        with self._lock:
+            self._source_etag = headers.get("ETag")
+            for part_number, start in enumerate(range(0, content_length, part_size), start=1):
+                self._ranges.append((part_number, start, min(start + part_size, content_length) - 1))
+            self._num_parts = len(self._ranges)
+
+        self._send("CreateMultipartUpload", "POST", self._bucket, self._key,
+                   query=[("uploads", None)], headers=self._create_headers(headers), on_complete=self._on_create_done)
+
+    def _create_headers(self, source_headers):
+        """Headers for CreateMultipartUpload: the caller's, and the source's metadata they don't replace."""
+        headers = []
+        replaced = set()
+        replace_all = False
+        for name, value in self._headers or ():
+            if name.lower() == "x-amz-metadata-directive":
+                # CopyObject only, CreateMultipartUpload always takes the metadata it's given
+                replace_all = value.upper() == "REPLACE"
+                continue
+            headers.append((name, value))
+            replaced.add(name.lower())
+        if not replace_all:
+            for name, value in source_headers:
+                lower_name = name.lower()
+                if lower_name not in replaced and (
+                        lower_name in _COPY_METADATA_HEADERS or lower_name.startswith("x-amz-meta-")):
+                    headers.append((name, value))
+        return headers
+
+    def _on_create_done(self, headers, body):
+        with self._lock:
+            self._upload_id = _xml_find_text(body, "UploadId")
+        self._copy_parts()
+
+    def _copy_parts(self):
+        """Start copying parts, up to the limit in flight."""
+        while True:
+            with self._lock:
+                if not self._ranges or self._canceled or self._error is not None:
+                    return
+                if self._max_parts_in_flight is not None and len(self._requests) >= self._max_parts_in_flight:
+                    return
+                part_number, start, end = self._ranges.popleft()
+
+            headers = [
+                ("x-amz-copy-source", self._copy_source),
+                ("x-amz-copy-source-range", "bytes={}-{}".format(start, end)),
+            ]
+            if self._source_etag:
+                headers.append(("x-amz-copy-source-if-match", self._source_etag))
+
+            def on_part_done(headers, body, part_number=part_number, length=end - start + 1):
+                self._on_part_done(part_number, length, body)
+
+            self._send("UploadPartCopy", "PUT", self._bucket, self._key,
+                       query=[("partNumber", str(part_number)), ("uploadId", self._upload_id)],
+                       headers=headers, on_complete=on_part_done)
+
+    def _on_part_done(self, part_number, length, body):
+        etag = _xml_find_text(body, "ETag")
+        with self._lock:
+            self._part_etags[part_number] = etag
+            all_done = len(self._part_etags) == self._num_parts
+        if self._on_progress is not None:
+            self._on_progress(length)
+
+        if not all_done:
+            self._copy_parts()
+            return
+
+        parts = "".join(
+            "<Part><PartNumber>{}</PartNumber><ETag>{}</ETag></Part>".format(number, _xml_escape(etag))
+            for number, etag in sorted(self._part_etags.items()))
+        body = "<CompleteMultipartUpload>{}</CompleteMultipartUpload>".format(parts).encode()
+        self._send("CompleteMultipartUpload", "POST", self._bucket, self._key,
+                   query=[("uploadId", self._upload_id)], body=body,
+                   on_complete=lambda headers, body: self._finish(None))
+
+    def _finish(self, error):
+        with self._lock:
+            if self._finished or (error is None and self._error is not None):
+                return
+            self._finished = True
+        if error is None:
+            self._finished_future.set_result(None)
+        else:
+            self._finished_future.set_exception(error)
+
+    def _fail(self, error):
+        with self._lock:
+            if self._finished or self._error is not None:
+                return
+            self._error = error
+            requests = [r.s3_request for r in self._requests if r.s3_request is not None]
+
+        for request in requests:
+            request.cancel()
+        self._finish_if_failed()
+
+    def _finish_if_failed(self):
+        """Once a failed copy has no requests left, abort its multipart upload if any, and fail the future."""
+        with self._lock:
+            if self._error is None or self._finished or self._requests or self._aborting:
+                return
+            upload_id = self._upload_id
+            self._aborting = upload_id is not None
+
+        if upload_id is None:
+            self._finish(self._error)
+            return
+
+        request = HttpRequest(
+            "DELETE",
+            _object_path(self._bucket, self._key, self._endpoint) + "?uploadId=" + quote(upload_id, safe="~"),
+            HttpHeaders([("host", _object_host(self._bucket, self._client._region, self._endpoint))]))
+        try:
+            self._client.make_request(
+                type=S3RequestType.DEFAULT,
+                operation_name="AbortMultipartUpload",
+                request=request,
+                on_done=lambda **kwargs: self._finish(self._error))
+        except Exception:
+            self._finish(self._error)
+
+
+class _S3CopySubrequest:
+    '''
+    Private class collecting the response of one request sent by S3CopyObject
+    '''
+
+    def __init__(self, copy, on_complete):
+        self.copy = copy
+        self.on_complete = on_complete
+        self.s3_request = None
+        self.headers = None
+        self.body = bytearray()
+        self.error = None
+
+    def on_headers(self, status_code, headers, **kwargs):
+        self.headers = headers
+
+    def on_body(self, chunk, **kwargs):
+        self.body.extend(chunk)
+
+    def on_done(self, error, **kwargs):
+        self.error = error
+        self.copy._on_request_done(self)
+
+
+class S3BatchTransfer(NativeResource):
+    """A batch of transfers between objects and local files.
+    Create with :meth:`S3Client.download_many()` or :meth:`S3Client.upload_many()`.
+
+    Attributes:
+        finished_future (concurrent.futures.Future): Future that resolves when every transfer
+            has finished. Its result is the list of :class:`S3TransferFailure`, in batch order,
+            which is empty if every transfer succeeded. The future does not fail because
+            individual transfers did.
+    """
+    __slots__ = ('_finished_future', '_total')
+
+    def __init__(
+            self,
+            *,
+            client,
+            type,
+            bucket,
+            items,
+            max_concurrency=None,
+            checksum_config=None,
+            endpoint=None):
+        assert isinstance(client, S3Client)
+        assert isinstance(max_concurrency, int) or max_concurrency is None
+
+        if max_concurrency is None:
+            max_concurrency = _DEFAULT_BATCH_MAX_CONCURRENCY
+        if max_concurrency <= 0:
+            raise ValueError("'max_concurrency' must be positive")
 
         super().__init__()
 
         self._finished_future = Future()
-        self.shutdown_event = threading.Event()
 
-        # C layer uses 0 to indicate defaults
-        if part_size is None:
-            part_size = 0
-        if multipart_upload_threshold is None:
-            multipart_upload_threshold = 0
+        host = _object_host(bucket, client._region, endpoint)
+        keys = []
+        filepaths = []
+        native_items = []
+        for item in items:
+            key, filepath = item[0], item[1]
+            range_header = item[2] if len(item) > 2 else None
+            if type != S3RequestType.GET_OBJECT and range_header is not None:
+                raise ValueError("A range can only be given for downloads")
+            filepath = os.fspath(filepath)
+            keys.append(key)
+            filepaths.append(filepath)
+            native_items.append((_object_path(bucket, key, endpoint), filepath, range_header))
+        self._total = len(native_items)
+
         checksum_algorithm = 0
         checksum_location = 0
         validate_response_checksum = False
@@ -659,58 +3789,151 @@ class S3Request(NativeResource):
             if checksum_config.location is not None:
                 checksum_location = checksum_config.location.value
             validate_response_checksum = checksum_config.validate_response
-        fio_options_set = False
-        should_stream = False
-        disk_throughput_gbps = 0.0
-        direct_io = False
-        if fio_options is not None:
-            fio_options_set = True
-            should_stream = fio_options.should_stream
-            disk_throughput_gbps = fio_options.disk_throughput_gbps
-            direct_io = fio_options.direct_io
-        if max_active_connections_override is None:
-            max_active_connections_override = 0
 
-        s3_request_core = _S3RequestCore(
-            request,
-            self._finished_future,
-            self.shutdown_event,
-            signing_config,
-            credential_provider,
-            on_headers,
-            on_body,
-            on_done,
-            on_progress)
+        core = _S3BatchTransferCore(keys, filepaths, self._finished_future)
 
-        self._binding = _awscrt.s3_client_make_meta_request(
-            self,
+        self._binding = _awscrt.s3_batch_new(
             client,
-            request,
             type,
-            operation_name,
-            signing_config,
-            credential_provider,
-            recv_filepath,
-            send_filepath,
-            region,
+            host,
+            native_items,
+            max_concurrency,
             checksum_algorithm,
             checksum_location,
             validate_response_checksum,
-            part_size,
-            multipart_upload_threshold,
-            fio_options_set,
-            should_stream,
-            disk_throughput_gbps,
-            direct_io,
-            max_active_connections_override,
-            s3_request_core)
+            core)
 
     @property
     def finished_future(self):
         return self._finished_future
 
+    def progress(self):
+        """Returns:
+            S3TransferProgress: Current progress of the batch.
+        """
+        succeeded, failed, in_flight, bytes_transferred = _awscrt.s3_batch_get_progress(self._binding)
+        return S3TransferProgress(
+            total=self._total,
+            succeeded=succeeded,
+            failed=failed,
+            in_flight=in_flight,
+            bytes_transferred=bytes_transferred)
+
     def cancel(self):
-        _awscrt.s3_meta_request_cancel(self)
+        """Cancel transfers in progress, and don't start any more."""
+        _awscrt.s3_batch_cancel(self._binding)
+
+
+class S3DirectoryTransfer:
+    """Transfers between a local directory tree and the objects under a prefix.
+    Create with :meth:`S3Client.upload_directory()` or :meth:`S3Client.download_directory()`.
+
+    Attributes:
+        finished_future (concurrent.futures.Future): Future that resolves when every transfer
+            has finished. Its result is the list of :class:`S3TransferFailure`, which is empty
+            if every transfer succeeded. The future does not fail because individual transfers did.
+
+        skipped (List[str]): Keys of the files or objects that weren't transferred because they were unchanged.
+    """
+
+    def __init__(
+            self,
+            *,
+            client,
+            type,
+            bucket,
+            directory,
+            prefix="",
+            include=None,
+            exclude=None,
+            skip_unchanged="size_mtime",
+            max_concurrency=None,
+            checksum_config=None,
+            endpoint=None):
+        assert isinstance(prefix, str)
+        if skip_unchanged not in ("size_mtime", "checksum", None):
+            raise ValueError("'skip_unchanged' must be \"size_mtime\", \"checksum\" or None")
+        include = list(include) if include is not None else None
+        exclude = list(exclude) if exclude is not None else []
+
+        self.finished_future = Future()
+        self.skipped = []
+
+        directory = os.fspath(directory)
+        # Objects by key, to compare against
+        objects = {}
+        if type == S3RequestType.GET_OBJECT or skip_unchanged is not None:
+            for summary in client.list_objects(bucket, prefix, endpoint=endpoint):
+                objects[summary.key] = summary
+
+        items = []
+        # (filepath, modification time) of files to set once downloaded
+        mtimes = {}
+        if type == S3RequestType.PUT_OBJECT:
+            for relpath, filepath, stat in _walk_directory(directory):
+                if not _matches_filters(relpath, include, exclude):
+                    continue
+                key = prefix + relpath
+                summary = objects.get(key)
+                if summary is not None and _is_unchanged(skip_unchanged, summary, filepath, stat, upload=True):
+                    self.skipped.append(key)
+                else:
+                    items.append((key, filepath))
+        else:
+            made_dirs = set()
+            for key, summary in objects.items():
+                relpath = key[len(prefix):].lstrip("/")
+                parts = relpath.split("/")
+                if not relpath or key.endswith("/") or any(part in ("", ".", "..") for part in parts):
+                    continue
+                if not _matches_filters(relpath, include, exclude):
+                    continue
+                filepath = os.path.join(directory, *parts)
+                try:
+                    stat = os.stat(filepath)
+                except OSError:
+                    stat = None
+                if stat is not None and _is_unchanged(skip_unchanged, summary, filepath, stat, upload=False):
+                    self.skipped.append(key)
+                    continue
+                parent = os.path.dirname(filepath)
+                if parent not in made_dirs:
+                    os.makedirs(parent, exist_ok=True)
+                    made_dirs.add(parent)
+                items.append((key, filepath))
+                mtimes[filepath] = _parse_last_modified(summary.last_modified)
+
+        self._batch = S3BatchTransfer(
+            client=client,
+            type=type,
+            bucket=bucket,
+            items=items,
+            max_concurrency=max_concurrency,
+            checksum_config=checksum_config,
+            endpoint=endpoint)
+        self._batch.finished_future.add_done_callback(lambda future: self._on_batch_done(future, mtimes))
+
+    def _on_batch_done(self, batch_future, mtimes):
+        failures = batch_future.result()
+        # Downloaded files get the modification time of their object, so they compare as unchanged next time
+        failed = set(failure.filepath for failure in failures)
+        for filepath, mtime in mtimes.items():
+            if filepath not in failed and mtime is not None:
+                try:
+                    os.utime(filepath, (mtime, mtime))
+                except OSError:
+                    pass
+        self.finished_future.set_result(failures)
+
+    def progress(self):
+        """Returns:
+            S3TransferProgress: Current progress of the transfers.
+        """
+        return replace(self._batch.progress(), skipped=len(self.skipped))
+
+    def cancel(self):
+        """Cancel transfers in progress, and don't start any more."""
+        self._batch.cancel()
 
 
 class S3ResponseError(awscrt.exceptions.AwsCrtError):
@@ -779,7 +4002,23 @@ class _S3RequestCore:
             on_headers=None,
             on_body=None,
             on_done=None,
-            on_progress=None):
+            on_progress=None,
+            *,
+            type=None,
+            part_size=0,
+            resume_offset=0,
+            checkpoint_filepath=None,
+            on_telemetry=None,
+            client_metrics=None,
+            object_cache=None,
+            cache_key=None,
+            cached_object=None,
+            recv_filepath=None,
+            body_as_memoryview=False,
+            autotuner=None,
+            max_active_connections=0,
+            throughput_coordinator=None,
+            upload_checksum_algorithm=None):
 
         # Stores exception raised in on_headers or on_body callback so that we can rethrow it in the on_done callback
         self._python_callback_exception = None
@@ -795,7 +4034,57 @@ class _S3RequestCore:
         self._finished_future = finish_future
         self._shutdown_event = shutdown_event
 
+        self._type = type
+        self._part_size = part_size
+        self._resume_offset = resume_offset
+        self._checkpoint_filepath = checkpoint_filepath
+        self._resume_token = None
+        # Download resume token built from the response headers, with the bytes written left unknown
+        self._download_token = None
+
+        self._on_telemetry_cb = on_telemetry
+        self._client_metrics = client_metrics
+        self._autotuner = autotuner
+        self._max_active_connections = max_active_connections
+        self._throughput_coordinator = throughput_coordinator
+        # Algorithm of the checksums reported by upload_checksum, if requested
+        self._upload_checksum_algorithm = upload_checksum_algorithm
+        self._upload_checksum = None
+        # Base64 checksum of the object in the PutObject response, used if the upload wasn't split into parts
+        self._response_checksum = None
+        self._collect_metrics = on_telemetry is not None or client_metrics is not None or autotuner is not None
+
+        self._object_cache = object_cache
+        self._cache_key = cache_key
+        self._cached_object = cached_object
+        self._recv_filepath = recv_filepath
+        self._body_as_memoryview = body_as_memoryview
+        # (etag, status_code, headers) of a response being downloaded into the cache, and its body
+        self._caching_response = None
+        self._caching_body = None
+        # Object offset of the first byte of the response being cached. Body offsets are relative to the object.
+        self._caching_origin = 0
+
     def _on_headers(self, status_code, headers):
+        if self._upload_checksum_algorithm is not None:
+            checksum_header = "x-amz-checksum-" + self._upload_checksum_algorithm.name.lower()
+            for name, value in headers:
+                if name.lower() == checksum_header:
+                    self._response_checksum = value
+        if self._object_cache is not None:
+            if status_code == 304 and self._cached_object is not None:
+                # Cached response is replayed once the request finishes
+                return True
+            self._start_caching(status_code, headers)
+        if self._type == S3RequestType.GET_OBJECT:
+            self._download_token = _download_token_from_headers(headers, self._part_size, self._resume_offset)
+            if self._checkpoint_filepath is not None and self._download_token is not None:
+                # Checkpoint as soon as the object is known, so the download can resume after a crash
+                try:
+                    _write_checkpoint(self._checkpoint_filepath, self._download_token)
+                except OSError as e:
+                    self._python_callback_exception = e
+                    return False
         if self._on_headers_cb:
             try:
                 self._on_headers_cb(status_code=status_code, headers=headers)
@@ -805,6 +4094,14 @@ class _S3RequestCore:
                 return False
 
     def _on_body(self, chunk, offset):
+        if self._caching_body is not None:
+            start = offset - self._caching_origin
+            end = start + len(chunk)
+            if start < 0 or end > len(self._caching_body):
+                # Outside of what Content-Length and Content-Range said, don't cache
+                self._caching_body = None
+            else:
+                self._caching_body[start:end] = chunk
         if self._on_body_cb:
             try:
                 self._on_body_cb(chunk=chunk, offset=offset)
@@ -816,6 +4113,31 @@ class _S3RequestCore:
     def _on_shutdown(self):
         self._shutdown_event.set()
 
+    def _on_upload_review(self, parts):
+        """Called before a multipart upload completes, with the (size, base64 checksum) of each part"""
+        part_checksums = [self._decode_checksum(checksum) for size, checksum in parts]
+        if not parts or None in part_checksums:
+            return
+        combine_fn = _CRC_FUNCTIONS[self._upload_checksum_algorithm][1]
+        checksum = part_checksums[0]
+        for part_checksum, (size, _) in zip(part_checksums[1:], parts[1:]):
+            checksum = combine_fn(checksum, part_checksum, size)
+        self._upload_checksum = S3UploadChecksum(
+            algorithm=self._upload_checksum_algorithm,
+            checksum=checksum,
+            part_size=parts[0][0],
+            part_checksums=part_checksums)
+
+    def _decode_checksum(self, checksum_base64):
+        """Returns the CRC of a base64 checksum, or None if it isn't a checksum of the upload's algorithm"""
+        try:
+            checksum = base64.b64decode(checksum_base64, validate=True)
+        except ValueError:
+            return None
+        if not checksum or len(checksum) != _CRC_FUNCTIONS[self._upload_checksum_algorithm][2]:
+            return None
+        return int.from_bytes(checksum, "big")
+
     def _on_finish(
             self,
             error_code,
@@ -824,11 +4146,48 @@ class _S3RequestCore:
             error_body,
             error_operation_name,
             did_validate_checksum,
-            checksum_validation_algorithm):
+            checksum_validation_algorithm,
+            bytes_transferred=0):
+        if error_code:
+            self._upload_checksum = None
+        elif self._upload_checksum is None and self._response_checksum is not None:
+            # A single PutObject, whose checksum is the checksum of its only part
+            checksum = self._decode_checksum(self._response_checksum)
+            if checksum is not None:
+                self._upload_checksum = S3UploadChecksum(
+                    algorithm=self._upload_checksum_algorithm,
+                    checksum=checksum,
+                    part_size=bytes_transferred,
+                    part_checksums=[checksum])
+
+        if self._throughput_coordinator is not None:
+            self._throughput_coordinator._release()
+
         # If C layer gives status_code 0, that means "unknown"
         if status_code == 0:
             status_code = None
 
+        # Exception raised by a callback while replaying a cached response
+        replay_exception = None
+        if self._object_cache is not None:
+            if status_code == 304 and self._cached_object is not None:
+                if self._replay_cached_response():
+                    replay_exception = self._python_callback_exception
+                    error_code = 0
+                    status_code = self._cached_object.status_code
+                    error_headers = None
+                    error_body = None
+                    error_operation_name = None
+            elif not error_code:
+                self._finish_caching()
+
+        if error_code and self._download_token is not None and self._recv_filepath is not None:
+            self._on_download_interrupted(bytes_transferred)
+        if self._checkpoint_filepath is not None:
+            # Once done, or if the object changed since the checkpoint, the checkpoint is of no use
+            if not error_code or (status_code == 412 and self._resume_offset):
+                _remove_file(self._checkpoint_filepath)
+
         error = None
         if error_code:
             error = awscrt.exceptions.from_code(error_code)
@@ -849,6 +4208,9 @@ class _S3RequestCore:
                         body=error_body,
                         operation_name=error_operation_name)
             self._finished_future.set_exception(error)
+        elif replay_exception is not None:
+            error = replay_exception
+            self._finished_future.set_exception(error)
         else:
             self._finished_future.set_result(None)
 
@@ -871,6 +4233,298 @@ class _S3RequestCore:
         if self._on_progress_cb:
             self._on_progress_cb(progress)
 
+    def _start_caching(self, status_code, headers):
+        self._object_cache._on_missed()
+        headers_view = HttpHeaders(headers)
+        etag = headers_view.get("ETag")
+        try:
+            size = int(headers_view.get("Content-Length"))
+        except (TypeError, ValueError):
+            return
+        if etag and size <= self._object_cache._max_object_size:
+            self._caching_response = (etag, status_code, headers)
+            self._caching_origin = _response_body_origin(headers_view)
+            if self._recv_filepath is None:
+                self._caching_body = bytearray(size)
+
+    def _finish_caching(self):
+        if self._caching_response is None:
+            return
+        etag, status_code, headers = self._caching_response
+        body = self._caching_body
+        if self._recv_filepath is not None:
+            try:
+                with open(self._recv_filepath, "rb") as f:
+                    body = f.read()
+            except OSError:
+                return
+        if body is not None:
+            self._object_cache._store(self._cache_key, etag, status_code, headers, body)
+
+    def _replay_cached_response(self):
+        """
+        Deliver the cached response, as if it was just downloaded.
+        Returns False if it's not cached anymore, in which case the request fails with its 304.
+        An exception raised by a callback stops delivery, and is stored in _python_callback_exception.
+        """
+        body = self._object_cache._on_revalidated(self._cache_key, self._cached_object)
+        if body is None:
+            return False
+        try:
+            if self._on_headers_cb:
+                self._on_headers_cb(status_code=self._cached_object.status_code, headers=self._cached_object.headers)
+            if self._recv_filepath is not None:
+                with open(self._recv_filepath, "wb") as f:
+                    f.write(body)
+            elif self._on_body_cb:
+                # Offsets are in the object, as for a downloaded response
+                origin = _response_body_origin(HttpHeaders(self._cached_object.headers))
+                view = memoryview(body)
+                chunk_size = self._part_size or len(body)
+                for start in range(0, len(body), chunk_size):
+                    chunk = view[start:start + chunk_size]
+                    self._on_body_cb(
+                        chunk=chunk if self._body_as_memoryview else bytes(chunk), offset=origin + start)
+            if self._on_progress_cb and body:
+                self._on_progress_cb(len(body))
+        except BaseException as e:
+            self._python_callback_exception = e
+        return True
+
+    def _on_metrics(self, records):
+        metrics = S3RequestMetrics(records)
+        if self._client_metrics is not None:
+            self._client_metrics.add(metrics)
+        if self._autotuner is not None:
+            self._autotuner._observe(self._part_size, self._max_active_connections, metrics)
+        if self._on_telemetry_cb:
+            self._on_telemetry_cb(metrics=metrics)
+
+    def _on_paused(self, token):
+        if token is None:
+            # Paused before the multipart upload was created, there's nothing to resume
+            return
+        type, part_size, total_num_parts, num_parts_completed, upload_id = token
+        self._resume_token = S3ResumeToken(
+            type=S3RequestType(type),
+            part_size=part_size,
+            total_num_parts=total_num_parts,
+            num_parts_completed=num_parts_completed,
+            upload_id=upload_id or None)
+        if self._checkpoint_filepath is not None:
+            _write_checkpoint(self._checkpoint_filepath, self._resume_token)
+
+    def _on_download_interrupted(self, bytes_written):
+        # This request may itself be resuming, count from the start of the original download
+        self._resume_token = replace(
+            self._download_token, continuous_downloaded_bytes=self._resume_offset + bytes_written)
+        if self._checkpoint_filepath is not None:
+            try:
+                _write_checkpoint(self._checkpoint_filepath, self._resume_token)
+            except OSError:
+                # The checkpoint written with the headers still lets the download resume, from the file's size
+                pass
+
+
+class _S3GetRanges:
+    '''
+    Private class for the state of S3Client.get_ranges()
+    '''
+
+    def __init__(self, client, host, path, ranges, requests, checksum_config):
+        self._client = client
+        self._host = host
+        self._path = path
+        self._ranges = ranges
+        self._requests = requests
+        self._checksum_config = checksum_config
+        self._hedging = client._range_hedging
+        self.finished_future = Future()
+
+        self._lock = threading.Lock()
+        self._s3_requests = []
+        self._num_remaining = len(requests)
+        self._results = [memoryview(b"")] * len(ranges)
+        self._error = None
+
+    def _start(self):
+        if not self._requests:
+            self.finished_future.set_result(self._results)
+            return
+        for request_start, request_end, indices in self._requests:
+            if not self._start_attempt(_S3RangeRequest(request_start, request_end, indices)):
+                return
+
+    def _start_attempt(self, range_request, is_hedge=False):
+        """Starts a request for the range, or its duplicate. Returns False if the read is over."""
+        buffer = bytearray(range_request.end - range_request.start)
+        headers = HttpHeaders([
+            ("host", self._host),
+            ("Range", "bytes={}-{}".format(range_request.start, range_request.end - 1)),
+        ])
+
+        # Body may be shorter than requested, if the range goes beyond the end of the object
+        received = {}
+
+        def on_headers(status_code, headers, **kwargs):
+            content_length = HttpHeaders(headers).get("Content-Length")
+            if content_length is not None:
+                received["len"] = int(content_length)
+
+        def on_done(error, **kwargs):
+            self._on_attempt_done(range_request, is_hedge, error, memoryview(buffer)[:received.get("len")],
+                                  time.monotonic() - start_time)
+
+        with self._lock:
+            if self._error is not None or range_request.done:
+                return False
+            range_request.num_running += 1
+        if self._hedging is not None and not is_hedge:
+            # Watched before starting, in case it finishes right away
+            range_request.watch_id = self._hedging._watch(lambda: self._start_attempt(range_request, is_hedge=True))
+
+        start_time = time.monotonic()
+        try:
+            s3_request = self._client.make_request(
+                type=S3RequestType.GET_OBJECT,
+                request=HttpRequest("GET", self._path, headers),
+                checksum_config=self._checksum_config,
+                recv_buffer=buffer,
+                on_headers=on_headers,
+                on_done=on_done)
+        except Exception as e:
+            self._on_attempt_done(range_request, is_hedge, e, None, None)
+            return False
+        with self._lock:
+            stopped = self._error is not None
+            # Already finished, or the other attempt won
+            late = range_request.done
+            if not stopped and not late:
+                range_request.s3_requests[is_hedge] = s3_request
+                self._s3_requests.append(s3_request)
+        if stopped or late:
+            s3_request.cancel()
+        return not stopped
+
+    def _on_attempt_done(self, range_request, is_hedge, error, body, duration_secs):
+        with self._lock:
+            range_request.num_running -= 1
+            # The first attempt to succeed wins. An attempt failing only fails the read if the other isn't running.
+            won = not range_request.done and self._error is None and (error is None or range_request.num_running == 0)
+            if won:
+                range_request.done = True
+                loser = range_request.s3_requests.get(not is_hedge)
+        if self._hedging is not None and range_request.watch_id is not None:
+            self._hedging._on_finished(
+                range_request.watch_id,
+                duration_secs if won and error is None else None,
+                hedge_won=won and error is None and is_hedge)
+        if not won:
+            return
+        if loser is not None:
+            loser.cancel()
+
+        with self._lock:
+            if self._error is not None:
+                return
+            if error is not None:
+                self._error = error
+                to_cancel = self._s3_requests
+                self._s3_requests = []
+            else:
+                for index in range_request.indices:
+                    start, end = self._ranges[index]
+                    self._results[index] = body[start - range_request.start:end - range_request.start]
+                self._num_remaining -= 1
+                if self._num_remaining > 0:
+                    return
+        if error is not None:
+            for s3_request in to_cancel:
+                s3_request.cancel()
+            self.finished_future.set_exception(error)
+        else:
+            self.finished_future.set_result(self._results)
+
+
+class _S3RangeRequest:
+    '''
+    Private class for one request of S3Client.get_ranges(), and its duplicate if it's hedged
+    '''
+
+    def __init__(self, start, end, indices):
+        self.start = start
+        self.end = end
+        self.indices = indices
+        # Id of the request for S3RangeHedging, if it's watched
+        self.watch_id = None
+        # Rest is protected by the lock of the _S3GetRanges
+        self.s3_requests = {}
+        self.num_running = 0
+        self.done = False
+
+
+class _S3ClientMetricsAggregator:
+    '''
+    Private class totalling the metrics of every request of an S3Client
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = S3ClientMetrics()
+        self._connection_ids = set()
+
+    def add(self, metrics):
+        with self._lock:
+            totals = self._totals
+            totals.num_requests += 1
+            for attempt in metrics:
+                totals.num_attempts += 1
+                if attempt.retry_attempt:
+                    totals.num_retries += 1
+                if attempt.error_code:
+                    totals.num_failed_attempts += 1
+                else:
+                    totals.bytes_transferred += attempt.num_bytes
+                if attempt.conn_acquire_ns is not None:
+                    totals.total_conn_acquire_ns += attempt.conn_acquire_ns
+                    totals.max_conn_acquire_ns = max(totals.max_conn_acquire_ns, attempt.conn_acquire_ns)
+                if attempt.time_to_first_byte_ns is not None:
+                    totals.total_time_to_first_byte_ns += attempt.time_to_first_byte_ns
+                if attempt.connection_id:
+                    self._connection_ids.add(attempt.connection_id)
+                if attempt.ip_address:
+                    ips = totals.attempts_per_ip_address
+                    ips[attempt.ip_address] = ips.get(attempt.ip_address, 0) + 1
+            totals.num_connections = len(self._connection_ids)
+
+    def snapshot(self):
+        with self._lock:
+            return replace(self._totals, attempts_per_ip_address=dict(self._totals.attempts_per_ip_address))
+
+
+class _S3BatchTransferCore:
+    '''
+    Private class to receive the completion of an S3BatchTransfer from C land
+    '''
+
+    def __init__(self, keys, filepaths, finished_future):
+        self._keys = keys
+        self._filepaths = filepaths
+        self._finished_future = finished_future
+
+    def _on_complete(self, failures):
+        results = []
+        for index, error_code, status_code in failures:
+            error = awscrt.exceptions.from_code(error_code)
+            if status_code >= 300 and isinstance(error, awscrt.exceptions.AwsCrtError):
+                error = S3ResponseError(
+                    code=error.code,
+                    name=error.name,
+                    message=error.message,
+                    status_code=status_code)
+            results.append(S3TransferFailure(key=self._keys[index], filepath=self._filepaths[index], error=error))
+        self._finished_future.set_result(results)
+
 
 def create_default_s3_signing_config(*, region: str, credential_provider: AwsCredentialsProvider, **kwargs):
     """Create a default `AwsSigningConfig` for S3 service.
@@ -899,6 +4553,317 @@ def create_default_s3_signing_config(*, region: str, credential_provider: AwsCre
     )
 
 
+def _new_object_request(method, bucket, key, region, *, endpoint=None, headers=None, body_stream=None):
+    """
+    Private helper to build the HttpRequest for an object-level S3 operation.
+
+    If `endpoint` is None, the virtual-hosted-style endpoint "{bucket}.s3.{region}.amazonaws.com" is used.
+    Otherwise `endpoint` is used as the host and the bucket is put in the path (path-style).
+    """
+    host = _object_host(bucket, region, endpoint)
+    request_headers = HttpHeaders([("host", host)])
+    if headers:
+        request_headers.add_pairs(headers)
+    return HttpRequest(method, _object_path(bucket, key, endpoint), request_headers, body_stream)
+
+
+def _object_host(bucket, region, endpoint=None):
+    """Private helper returning the host to address `bucket` at. See `_new_object_request()`."""
+    if endpoint is None:
+        return "{}.s3.{}.amazonaws.com".format(bucket, region)
+    return endpoint
+
+
+def _object_path(bucket, key, endpoint=None):
+    """Private helper returning the request path for `key`. See `_new_object_request()`."""
+    if endpoint is None:
+        return "/" + quote(key, safe="/~")
+    return "/{}/{}".format(quote(bucket, safe=""), quote(key, safe="/~"))
+
+
+def _attempt_metrics_from_record(fields):
+    """Private helper building S3RequestAttemptMetrics from the fields of an unpacked _S3_METRICS_RECORD."""
+    (operation_name, ip_address, part_number, retry_attempt, response_status, error_code,
+     part_range_start, part_range_end, start_timestamp_ns, end_timestamp_ns,
+     conn_acquire_ns, sign_ns, send_ns, time_to_first_byte_ns, receive_ns, retry_delay_ns,
+     total_ns, connection_id, is_https) = fields
+
+    def optional_ns(value):
+        # C layer uses -1 to indicate the metric isn't available
+        return None if value < 0 else value
+
+    ip_address = ip_address.rstrip(b"\0").decode()
+    return S3RequestAttemptMetrics(
+        operation_name=operation_name.rstrip(b"\0").decode(),
+        ip_address=ip_address or None,
+        part_number=part_number,
+        retry_attempt=retry_attempt,
+        response_status=response_status,
+        error_code=error_code,
+        part_range_start=part_range_start,
+        part_range_end=part_range_end,
+        start_timestamp_ns=start_timestamp_ns,
+        end_timestamp_ns=end_timestamp_ns,
+        conn_acquire_ns=optional_ns(conn_acquire_ns),
+        sign_ns=optional_ns(sign_ns),
+        send_ns=optional_ns(send_ns),
+        time_to_first_byte_ns=optional_ns(time_to_first_byte_ns),
+        receive_ns=optional_ns(receive_ns),
+        retry_delay_ns=optional_ns(retry_delay_ns),
+        total_ns=total_ns,
+        connection_id=connection_id,
+        is_https=bool(is_https))
+
+
+def _response_body_origin(headers):
+    """Private helper returning the object offset of the first byte of a GET response body, from its Content-Range."""
+    byte_range = _parse_byte_range(headers.get("Content-Range"))
+    return byte_range[0] if byte_range else 0
+
+
+def _parse_byte_range(value):
+    """
+    Private helper returning (start, end) from a Range ("bytes=START-END")
+    or Content-Range ("bytes START-END/SIZE") header, or None if it doesn't have both ends.
+    """
+    if not value:
+        return None
+    match = re.match(r"bytes[ =](\d+)-(\d+)", value)
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def _read_checkpoint(filepath):
+    """Private helper returning the S3ResumeToken persisted at `filepath`, or None if there's none."""
+    try:
+        with open(filepath, "r") as f:
+            fields = json.load(f)
+    except FileNotFoundError:
+        return None
+    fields["type"] = S3RequestType(fields["type"])
+    return S3ResumeToken(**fields)
+
+
+def _write_checkpoint(filepath, token):
+    """Private helper persisting an S3ResumeToken to `filepath`, atomically replacing any previous one."""
+    fields = asdict(token)
+    fields["type"] = int(token.type)
+    tmp_filepath = filepath + ".tmp"
+    with open(tmp_filepath, "w") as f:
+        json.dump(fields, f)
+    os.replace(tmp_filepath, filepath)
+
+
+def _remove_file(filepath):
+    try:
+        os.remove(filepath)
+    except FileNotFoundError:
+        pass
+
+
+def _download_token_from_headers(headers, part_size, resume_offset):
+    """
+    Private helper building a download S3ResumeToken from the response headers of a GET_OBJECT,
+    with the number of downloaded bytes left unknown. Returns None if the headers don't identify the object.
+    """
+    headers = HttpHeaders(headers)
+    etag = headers.get("ETag")
+    if not etag:
+        return None
+    content_range = headers.get("Content-Range")
+    if content_range:
+        # "bytes START-END/SIZE"
+        match = re.match(r"bytes (\d+)-(\d+)/(\d+|\*)", content_range)
+        if not match:
+            return None
+        start, end = int(match.group(1)), int(match.group(2))
+        object_size = int(match.group(3)) if match.group(3) != "*" else 0
+    else:
+        object_size = int(headers.get("Content-Length", 0))
+        if object_size == 0:
+            return None
+        start, end = 0, object_size - 1
+    return S3ResumeToken(
+        type=S3RequestType.GET_OBJECT,
+        part_size=part_size,
+        etag=etag,
+        object_size=object_size,
+        object_range_start=start - resume_offset,
+        object_range_end=end)
+
+
+def _resume_download(request, recv_filepath, token):
+    """
+    Private helper returning (request, resume_offset): the request for the part of a download
+    that's missing from `recv_filepath`, and the number of bytes already in the file.
+    If the download can't be resumed, the original request is returned, with an offset of 0.
+    """
+    try:
+        file_size = os.path.getsize(recv_filepath)
+    except OSError:
+        file_size = 0
+
+    resume_offset = token.continuous_downloaded_bytes or file_size
+    if not token.etag or resume_offset == 0 or resume_offset > file_size:
+        return request, 0
+
+    range_size = token.object_range_end - token.object_range_start + 1
+    if resume_offset >= range_size:
+        # Everything is downloaded. Fetch the last byte again, so the request still checks the object is unchanged.
+        resume_offset = range_size - 1
+
+    return _request_with_headers(request, [
+        ("Range", "bytes={}-{}".format(token.object_range_start + resume_offset, token.object_range_end)),
+        ("If-Match", token.etag),
+    ]), resume_offset
+
+
+def _request_with_headers(request, headers):
+    """Private helper returning a copy of the HttpRequest, with the (name, value) headers set."""
+    new_headers = HttpHeaders(list(request.headers))
+    for name, value in headers:
+        new_headers.set(name, value)
+    return HttpRequest(request.method, request.path, new_headers, request.body_stream)
+
+
+def _on_small_request_done(future, operation_name, error_code, status_code, body, etag):
+    """Private helper completing the future of S3Client.get_small() or put_small(). Called from C land."""
+    if error_code:
+        error = awscrt.exceptions.from_code(error_code)
+        if status_code >= 300 and isinstance(error, awscrt.exceptions.AwsCrtError):
+            error = S3ResponseError(
+                code=error.code,
+                name=error.name,
+                message=error.message,
+                status_code=status_code,
+                body=body,
+                operation_name=operation_name)
+        future.set_exception(error)
+    elif operation_name == "GetObject":
+        # An empty body comes as None
+        future.set_result(body or b"")
+    else:
+        future.set_result(etag)
+
+
+def _walk_directory(directory):
+    """
+    Private helper yielding (relative path with '/' separators, path, os.stat_result) for each file
+    under a directory. os.scandir() gets the type, and on some platforms the stat, of each entry
+    while reading the directory, without a system call per file.
+    """
+    pending = [("", directory)]
+    while pending:
+        relative_dir, path = pending.pop()
+        with os.scandir(path) as entries:
+            for entry in entries:
+                relpath = relative_dir + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((relpath + "/", entry.path))
+                elif entry.is_file():
+                    yield relpath, entry.path, entry.stat()
+
+
+def _matches_filters(relpath, include, exclude):
+    if include is not None and not any(fnmatch.fnmatchcase(relpath, pattern) for pattern in include):
+        return False
+    return not any(fnmatch.fnmatchcase(relpath, pattern) for pattern in exclude)
+
+
+def _parse_last_modified(last_modified):
+    """Private helper returning an S3 LastModified (ex: "2009-10-12T17:50:30.000Z") as a POSIX timestamp,
+    or None if it can't be parsed."""
+    for format in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ"):
+        try:
+            return datetime.strptime(last_modified, format).replace(tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            pass
+    return None
+
+
+def _is_unchanged(skip_unchanged, summary, filepath, stat, upload):
+    """Private helper telling whether a file and an object are the same, and don't need to be transferred."""
+    if skip_unchanged is None or summary.size != stat.st_size:
+        return False
+    etag = summary.etag.strip('"')
+    if skip_unchanged == "checksum" and len(etag) == 32 and "-" not in etag:
+        md5 = hashlib.md5()
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHECKSUM_READ_SIZE), b""):
+                md5.update(chunk)
+        return md5.hexdigest() == etag
+    last_modified = _parse_last_modified(summary.last_modified)
+    if last_modified is None:
+        return False
+    # S3 times have a precision of a second. Uploads need the object to be newer than the file, downloads the reverse.
+    if upload:
+        return int(stat.st_mtime) <= last_modified
+    return int(stat.st_mtime) >= int(last_modified)
+
+
+def _xml_find_text(body, tag):
+    """Private helper returning the text of the first `tag` element in an S3 XML response, ignoring namespaces."""
+    for element in ElementTree.fromstring(body).iter():
+        if element.tag == tag or element.tag.endswith("}" + tag):
+            return element.text
+    raise ValueError("S3 response is missing <{}>".format(tag))
+
+
+def _coalesce_ranges(ranges, max_gap, max_request_size):
+    """
+    Private helper grouping (start, end) ranges, end exclusive, into the ranges to request.
+    Returns a list of (start, end, indices), where `indices` are the indices in `ranges` of the ranges it covers.
+    Empty ranges aren't covered by any request.
+    """
+    requests = []
+    for index in sorted((i for i, (start, end) in enumerate(ranges) if end > start), key=lambda i: ranges[i]):
+        start, end = ranges[index]
+        if requests:
+            last_start, last_end, indices = requests[-1]
+            if start - last_end <= max_gap and max(end, last_end) - last_start <= max_request_size:
+                requests[-1] = (last_start, max(end, last_end), indices)
+                indices.append(index)
+                continue
+        requests.append((start, end, [index]))
+    return requests
+
+
+def _start_with_concurrency(operations, max_concurrency):
+    """
+    Private helper to _start() operations that have a `finished_future`,
+    keeping at most `max_concurrency` of them in progress.
+    """
+    pending = deque(operations)
+    lock = threading.Lock()
+
+    def start_next(future=None):
+        with lock:
+            if not pending:
+                return
+            operation = pending.popleft()
+        operation.finished_future.add_done_callback(start_next)
+        operation._start()
+
+    for _ in range(min(max_concurrency, len(pending))):
+        start_next()
+
+
+def _get_range_start(request):
+    """
+    Private helper returning the object offset a GET request's body starts at,
+    or None if it can't be known before the response (ex: suffix range "bytes=-N").
+    """
+    range_header = request.headers.get("Range")
+    if range_header is None:
+        return 0
+    unit, _, spec = range_header.strip().partition("=")
+    start = spec.split("-", 1)[0].strip()
+    if unit.strip().lower() != "bytes" or not start.isdigit():
+        return None
+    return int(start)
+
+
 def get_ec2_instance_type():
     """
         First this function will check it's running on EC2 via. attempting to read DMI info to avoid making IMDS calls.
@@ -0,0 +1,330 @@
+"""
+Benchmark S3Client against a local S3-compatible server, so runs need no AWS account or network access.
+
+Usage: python s3_local_benchmark.py [--object-size SIZES] [--part-size SIZES] [--concurrency COUNTS]
+                                    [--operations get,put] [--body-modes callback,memoryview,native] [--tls]
+
+Every combination of object size, part size, concurrency, operation and body mode is a scenario.
+Each scenario runs in a fresh process, so peak RSS is its own, and reports:
+    Gbps            Bytes moved per second of wall time, median of --runs.
+    CPU s/GB        CPU seconds used by the client process (all threads) per GB moved.
+    Peak RSS        High-water mark of the client process's resident memory.
+    Py calls/GB     Python callbacks per GB: on_body calls for GET, body stream reads for PUT.
+    Py s/GB         CPU seconds per GB spent over the "native" body mode of the same scenario,
+                    which moves bodies without calling into Python (recv_filepath/send_filepath).
+
+The server (test/s3_mock_server.py) runs in its own process and serves synthetic objects,
+so nothing is stored. It's written in Python and is the throughput ceiling for large objects:
+compare numbers between builds on the same machine, rather than against real S3.
+"""
+from awscrt.s3 import S3Client, S3RequestTlsMode, S3RequestType, create_default_s3_signing_config
+from awscrt.io import ClientBootstrap, ClientTlsContext, DefaultHostResolver, EventLoopGroup, TlsContextOptions
+from awscrt.auth import AwsCredentialsProvider
+from awscrt.http import HttpHeaders, HttpRequest
+from test.s3_mock_server import PATTERN, SYNTHETIC_PREFIX
+import argparse
+import io
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None  # not available on Windows
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test', 's3_mock_server.py')
+BODY_MODES = ('callback', 'memoryview', 'native')
+GB = 1000 ** 3
+
+_SIZE_SUFFIXES = {'': 1, 'KiB': 1024, 'MiB': 1024 ** 2, 'GiB': 1024 ** 3, 'KB': 1000, 'MB': 1000 ** 2, 'GB': GB}
+
+
+def parse_size(text):
+    """Parses a size like "8MiB" or "1048576" into bytes"""
+    text = text.strip()
+    number = text.rstrip('KMGiB')
+    return int(float(number) * _SIZE_SUFFIXES[text[len(number):]])
+
+
+def format_size(size):
+    for suffix in ('GiB', 'MiB', 'KiB'):
+        if size >= _SIZE_SUFFIXES[suffix] and size % _SIZE_SUFFIXES[suffix] == 0:
+            return '{}{}'.format(size // _SIZE_SUFFIXES[suffix], suffix)
+    return str(size)
+
+
+def parse_list(parse):
+    return lambda text: [parse(item) for item in text.split(',') if item.strip()]
+
+
+def peak_rss_bytes():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class PatternStream(io.RawIOBase):
+    """Readable body of `size` pattern bytes. Counts the reads, each of which is a call from native code."""
+
+    def __init__(self, size):
+        self._size = size
+        self._position = 0
+        self._pattern = memoryview(PATTERN)
+        self.calls = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: self._size}[whence]
+        self._position = base + offset
+        return self._position
+
+    def readinto(self, buffer):
+        self.calls += 1
+        length = min(len(buffer), self._size - self._position)
+        written = 0
+        while written < length:
+            offset = (self._position + written) % len(PATTERN)
+            n = min(length - written, len(PATTERN) - offset)
+            buffer[written:written + n] = self._pattern[offset:offset + n]
+            written += n
+        self._position += length
+        return length
+
+
+def new_client(scenario):
+    event_loop_group = EventLoopGroup()
+    host_resolver = DefaultHostResolver(event_loop_group)
+    bootstrap = ClientBootstrap(event_loop_group, host_resolver)
+    # The server doesn't check signatures, but requests are still signed, as they would be against S3
+    credential_provider = AwsCredentialsProvider.new_static('AKIDLOCALBENCHMARK', 'local-benchmark-secret')
+
+    tls_connection_options = None
+    if scenario['tls']:
+        tls_ctx_opt = TlsContextOptions()
+        tls_ctx_opt.verify_peer = False  # the server uses a test certificate
+        tls_connection_options = ClientTlsContext(tls_ctx_opt).new_connection_options()
+        tls_connection_options.set_server_name('localhost')
+
+    return S3Client(
+        bootstrap=bootstrap,
+        region='us-east-1',
+        tls_mode=S3RequestTlsMode.ENABLED if scenario['tls'] else S3RequestTlsMode.DISABLED,
+        tls_connection_options=tls_connection_options,
+        signing_config=create_default_s3_signing_config(region='us-east-1', credential_provider=credential_provider),
+        part_size=scenario['part_size'],
+        multipart_upload_threshold=scenario['part_size'],
+        throughput_target_gbps=scenario['throughput_target_gbps'])
+
+
+def run_scenario(scenario):
+    """Runs a scenario in this process, and returns its results"""
+    s3_client = new_client(scenario)
+    size = scenario['object_size']
+    concurrency = scenario['concurrency']
+    mode = scenario['body_mode']
+    host = scenario['endpoint']
+    bucket = '/local-benchmark/'
+    get_path = '{}{}{}/object'.format(bucket, SYNTHETIC_PREFIX, size)
+
+    send_filepath = None
+    if scenario['operation'] == 'put' and mode == 'native':
+        with tempfile.NamedTemporaryFile(prefix='s3_local_benchmark_', delete=False) as file:
+            send_filepath = file.name
+            stream = PatternStream(size)
+            chunk = bytearray(len(PATTERN))
+            while True:
+                n = stream.readinto(chunk)
+                if not n:
+                    break
+                file.write(memoryview(chunk)[:n])
+
+    callback_calls = [0]
+
+    def on_body(chunk, **kwargs):
+        callback_calls[0] += 1
+
+    def start_request(index):
+        if scenario['operation'] == 'get':
+            request = HttpRequest('GET', get_path, HttpHeaders([('host', host)]))
+            if mode == 'native':
+                return s3_client.make_request(type=S3RequestType.GET_OBJECT, request=request, recv_filepath=os.devnull)
+            return s3_client.make_request(
+                type=S3RequestType.GET_OBJECT,
+                request=request,
+                on_body=on_body,
+                on_body_buffer_mode='memoryview' if mode == 'memoryview' else 'bytes')
+
+        path = '{}{}{}/upload-{}'.format(bucket, SYNTHETIC_PREFIX, size, index)
+        headers = HttpHeaders([('host', host), ('Content-Length', str(size))])
+        if send_filepath is not None:
+            request = HttpRequest('PUT', path, headers)
+            return s3_client.make_request(type=S3RequestType.PUT_OBJECT, request=request, send_filepath=send_filepath)
+        stream = PatternStream(size)
+        streams.append(stream)
+        request = HttpRequest('PUT', path, headers, stream)
+        return s3_client.make_request(type=S3RequestType.PUT_OBJECT, request=request)
+
+    def run_once():
+        requests = [start_request(i) for i in range(concurrency)]
+        for s3_request in requests:
+            s3_request.finished_future.result()
+
+    streams = []
+    try:
+        run_once()  # warm up connections and buffers
+        callback_calls[0] = 0
+        streams.clear()
+
+        seconds = []
+        cpu_start = time.process_time()
+        for _ in range(scenario['runs']):
+            start = time.perf_counter()
+            run_once()
+            seconds.append(time.perf_counter() - start)
+        cpu_seconds = time.process_time() - cpu_start
+    finally:
+        if send_filepath is not None:
+            os.remove(send_filepath)
+
+    total_bytes = size * concurrency * scenario['runs']
+    python_calls = callback_calls[0] + sum(stream.calls for stream in streams)
+    return {
+        'gbps': size * concurrency * 8 / statistics.median(seconds) / GB,
+        'cpu_secs_per_gb': cpu_seconds / (total_bytes / GB),
+        'peak_rss_bytes': peak_rss_bytes(),
+        'python_calls_per_gb': 0 if mode == 'native' else python_calls / (total_bytes / GB),
+    }
+
+
+def run_scenario_in_subprocess(scenario):
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--scenario', json.dumps(scenario)],
+        stdout=subprocess.PIPE,
+        universal_newlines=True)
+    if result.returncode != 0:
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class LocalServer:
+    """Runs test/s3_mock_server.py in its own process, so its CPU isn't counted against the client"""
+
+    def __init__(self, tls):
+        command = [sys.executable, SERVER_SCRIPT]
+        if tls:
+            command.append('--tls')
+        self._process = subprocess.Popen(command, stdout=subprocess.PIPE, universal_newlines=True)
+        self.endpoint = self._process.stdout.readline().strip()
+        if not self.endpoint:
+            self._process.kill()
+            raise RuntimeError('local S3 server failed to start')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._process.terminate()
+        self._process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--object-size', type=parse_list(parse_size), default='64MiB',
+                        help='Comma-separated object sizes (ex: "8MiB,1GiB")')
+    parser.add_argument('--part-size', type=parse_list(parse_size), default='8MiB',
+                        help='Comma-separated part sizes')
+    parser.add_argument('--concurrency', type=parse_list(int), default='1,8',
+                        help='Comma-separated counts of requests in flight at once')
+    parser.add_argument('--operations', type=parse_list(str), default='get,put', help='"get", "put", or both')
+    parser.add_argument('--body-modes', type=parse_list(str), default=','.join(BODY_MODES),
+                        help='Comma-separated body modes: ' + ', '.join(BODY_MODES))
+    parser.add_argument('--runs', type=int, default=3, help='Timed runs per scenario, after a warm-up run')
+    parser.add_argument('--throughput-target-gbps', type=float, default=10.0)
+    parser.add_argument('--tls', action='store_true', help='Use TLS between the client and the local server')
+    parser.add_argument('--json', metavar='PATH', help='Also write results to this file, as JSON')
+    parser.add_argument('--scenario', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(run_scenario(json.loads(args.scenario))))
+        return 0
+
+    for mode in args.body_modes:
+        if mode not in BODY_MODES:
+            parser.error('unknown body mode: {}'.format(mode))
+    for operation in args.operations:
+        if operation not in ('get', 'put'):
+            parser.error('unknown operation: {}'.format(operation))
+
+    header = '{:<4} {:<10} {:>8} {:>8} {:>5} {:>8} {:>9} {:>10} {:>12} {:>8}'.format(
+        'op', 'body', 'object', 'part', 'conc', 'Gbps', 'CPU s/GB', 'peak RSS', 'Py calls/GB', 'Py s/GB')
+    print(header)
+    print('-' * len(header))
+
+    results = []
+    failures = 0
+    with LocalServer(args.tls) as server:
+        for operation, size, part_size, concurrency in itertools.product(
+                args.operations, args.object_size, args.part_size, args.concurrency):
+            native_cpu = None
+            # native first, so the other modes can report their cost over it
+            for mode in sorted(args.body_modes, key=lambda m: m != 'native'):
+                scenario = {
+                    'endpoint': server.endpoint,
+                    'tls': args.tls,
+                    'operation': operation,
+                    'body_mode': mode,
+                    'object_size': size,
+                    'part_size': part_size,
+                    'concurrency': concurrency,
+                    'runs': args.runs,
+                    'throughput_target_gbps': args.throughput_target_gbps,
+                }
+                result = run_scenario_in_subprocess(scenario)
+                row = '{:<4} {:<10} {:>8} {:>8} {:>5}'.format(
+                    operation, mode, format_size(size), format_size(part_size), concurrency)
+                if result is None:
+                    failures += 1
+                    print(row + '  FAILED')
+                    continue
+
+                if mode == 'native':
+                    native_cpu = result['cpu_secs_per_gb']
+                    result['python_secs_per_gb'] = 0.0
+                elif native_cpu is not None:
+                    result['python_secs_per_gb'] = result['cpu_secs_per_gb'] - native_cpu
+                else:
+                    result['python_secs_per_gb'] = None
+
+                rss = result['peak_rss_bytes']
+                print(row + ' {:>8.2f} {:>9.3f} {:>10} {:>12.0f} {:>8}'.format(
+                    result['gbps'],
+                    result['cpu_secs_per_gb'],
+                    'n/a' if rss is None else '{:.0f}MiB'.format(rss / 1024 ** 2),
+                    result['python_calls_per_gb'],
+                    'n/a' if result['python_secs_per_gb'] is None else '{:.3f}'.format(result['python_secs_per_gb'])))
+                scenario.update(result)
+                del scenario['endpoint']
+                results.append(scenario)
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
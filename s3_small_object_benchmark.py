@@ -0,0 +1,116 @@
+"""
+Compare requests/sec of S3Client.get_small()/put_small() against make_request(), for small objects.
+
+Usage: python s3_small_object_benchmark.py (BUCKET [--region REGION] | --local) [--size BYTES] [--count N]
+                                          [--concurrency N]
+
+With --local, requests go to the local S3-compatible server (test/s3_mock_server.py), started in its own process,
+so runs need no AWS account or network access. Its per-request overhead is Python's, so compare numbers
+between builds on the same machine, rather than against real S3.
+"""
+from awscrt.s3 import S3Client, S3RequestTlsMode, S3RequestType, create_default_s3_signing_config
+from awscrt.io import ClientBootstrap, DefaultHostResolver, EventLoopGroup
+from awscrt.auth import AwsCredentialsProvider
+from awscrt.http import HttpHeaders, HttpRequest
+from s3_local_benchmark import LocalServer
+import argparse
+import contextlib
+import io
+import os
+import threading
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument("bucket", nargs="?", help="Bucket to use. Required unless --local is set")
+parser.add_argument("--local", action="store_true", help="Use a local S3-compatible server instead of S3")
+parser.add_argument("--region", default="us-west-2")
+parser.add_argument("--size", type=int, default=16 * 1024, help="Object size, in bytes")
+parser.add_argument("--count", type=int, default=2000, help="Requests per run")
+parser.add_argument("--concurrency", type=int, default=256, help="Requests in flight at once")
+parser.add_argument("--key-prefix", default="small-object-benchmark/")
+args = parser.parse_args()
+if args.local:
+    args.bucket = args.bucket or "small-object-benchmark"
+    args.region = "us-east-1"
+elif not args.bucket:
+    parser.error("BUCKET is required unless --local is set")
+
+server = LocalServer(tls=False) if args.local else contextlib.nullcontext()
+endpoint = server.endpoint if args.local else None
+
+event_loop_group = EventLoopGroup()
+host_resolver = DefaultHostResolver(event_loop_group)
+bootstrap = ClientBootstrap(event_loop_group, host_resolver)
+if args.local:
+    # The server doesn't check signatures, but requests are still signed, as they would be against S3
+    credential_provider = AwsCredentialsProvider.new_static("AKIDLOCALBENCHMARK", "local-benchmark-secret")
+else:
+    credential_provider = AwsCredentialsProvider.new_default_chain(bootstrap)
+s3_client = S3Client(
+    bootstrap=bootstrap,
+    region=args.region,
+    tls_mode=S3RequestTlsMode.DISABLED if args.local else None,
+    signing_config=create_default_s3_signing_config(region=args.region, credential_provider=credential_provider))
+
+if args.local:
+    # Path-style addressing
+    host = endpoint
+    path_prefix = "/{}/".format(args.bucket)
+else:
+    host = "{}.s3.{}.amazonaws.com".format(args.bucket, args.region)
+    path_prefix = "/"
+body = os.urandom(args.size)
+keys = ["{}{}".format(args.key_prefix, i % args.concurrency) for i in range(args.count)]
+
+
+def run(name, start_request):
+    """Runs start_request(key) for every key, keeping `concurrency` in flight. Returns requests/sec."""
+    in_flight = threading.Semaphore(args.concurrency)
+    failures = []
+    futures = []
+
+    def on_done(future):
+        if future.exception() is not None:
+            failures.append(future.exception())
+        in_flight.release()
+
+    start_time = time.perf_counter()
+    for key in keys:
+        in_flight.acquire()
+        future = start_request(key)
+        future.add_done_callback(on_done)
+        futures.append(future)
+    for future in futures:
+        future.exception()
+    elapsed = time.perf_counter() - start_time
+    requests_per_sec = len(keys) / elapsed
+    print("{:<24} {:>10.0f} requests/sec  ({} failed)".format(name, requests_per_sec, len(failures)))
+    return requests_per_sec
+
+
+def make_put(key):
+    headers = HttpHeaders([("host", host), ("Content-Length", str(len(body)))])
+    request = HttpRequest("PUT", path_prefix + key, headers, io.BytesIO(body))
+    return s3_client.make_request(type=S3RequestType.PUT_OBJECT, request=request).finished_future
+
+
+def make_get(key):
+    chunks = []
+    request = HttpRequest("GET", path_prefix + key, HttpHeaders([("host", host)]))
+    s3_request = s3_client.make_request(
+        type=S3RequestType.GET_OBJECT,
+        request=request,
+        on_body=lambda chunk, **kwargs: chunks.append(chunk))
+    return s3_request.finished_future
+
+
+with server:
+    print("{} requests of {} bytes, {} in flight, against {}".format(
+        args.count, args.size, args.concurrency, endpoint or host))
+    put_baseline = run("make_request PUT_OBJECT", make_put)
+    put_small = run("put_small", lambda key: s3_client.put_small(
+        bucket=args.bucket, key=key, body=body, endpoint=endpoint))
+    get_baseline = run("make_request GET_OBJECT", make_get)
+    get_small = run("get_small", lambda key: s3_client.get_small(bucket=args.bucket, key=key, endpoint=endpoint))
+    print("put speedup: {:.2f}x".format(put_small / put_baseline))
+    print("get speedup: {:.2f}x".format(get_small / get_baseline))
@@ -6,6 +6,10 @@
  */
 #include "module.h"
 
+struct aws_http_connection;
+struct aws_http_connection_manager;
+struct aws_http2_setting;
+struct aws_http2_stream_manager;
 struct aws_http_headers;
 struct aws_http_message;
 struct aws_http_proxy_options;
@@ -20,6 +24,17 @@ struct aws_http_proxy_options;
  */
 bool aws_py_http_proxy_options_init(struct aws_http_proxy_options *proxy_options, PyObject *py_proxy_options);
 
+/**
+ * Convert python list of Http2Setting to a C array of aws_http2_setting, allocated with the allocator.
+ * *out_settings is NULL if the list is empty, and must otherwise be freed by the caller.
+ * Returns AWS_OP_ERR and sets python exception if error occurred.
+ */
+int aws_py_http2_settings_from_list(
+    PyObject *initial_settings_py,
+    struct aws_allocator *allocator,
+    struct aws_http2_setting *out_settings[],
+    size_t *out_size);
+
 /**
  * Close the connection if it's open.
  */
@@ -40,12 +55,53 @@ PyObject *aws_py_http2_connection_update_window(PyObject *self, PyObject *args);
  */
 PyObject *aws_py_http_stream_update_window(PyObject *self, PyObject *args);
 
+/**
+ * Switch how body data of an HTTP stream is passed to python: as a memoryview (True), or as bytes (False).
+ * Applies to body data that arrives afterwards.
+ */
+PyObject *aws_py_http_stream_set_body_buffer_mode(PyObject *self, PyObject *args);
+
 /**
  * Create a new connection. returns void. The on_setup callback will be invoked
  * upon either success or failure of the connection.
  */
 PyObject *aws_py_http_client_connection_new(PyObject *self, PyObject *args);
 
+/**
+ * Create a new HTTP/1.1 connection manager. Returns a capsule.
+ */
+PyObject *aws_py_http_connection_manager_new(PyObject *self, PyObject *args);
+
+/**
+ * Acquire a connection from the manager. returns void. The py_core's _on_acquired() will be invoked
+ * with the connection's capsule upon success, or an error code upon failure.
+ */
+PyObject *aws_py_http_connection_manager_acquire_connection(PyObject *self, PyObject *args);
+
+/**
+ * Give a connection back to the manager it was acquired from.
+ */
+PyObject *aws_py_http_connection_manager_release_connection(PyObject *self, PyObject *args);
+
+/**
+ * Create capsule to bind a connection acquired from a manager.
+ * Destroying the capsule gives the connection back to the manager, if it wasn't already released.
+ */
+PyObject *aws_py_http_connection_new_from_manager(
+    struct aws_http_connection *native,
+    struct aws_http_connection_manager *manager);
+
+/**
+ * Create a new HTTP/2 stream manager. Returns a capsule.
+ */
+PyObject *aws_py_http2_stream_manager_new(PyObject *self, PyObject *args);
+
+/**
+ * Make a request on a stream from the stream manager. Returns the stream's capsule.
+ * The stream is activated once the manager has a connection for it.
+ */
+PyObject *aws_py_http2_stream_manager_acquire_stream(PyObject *self, PyObject *args);
+
 PyObject *aws_py_http_client_stream_new(PyObject *self, PyObject *args);
 PyObject *aws_py_http_client_stream_activate(PyObject *self, PyObject *args);
 
@@ -83,6 +139,8 @@ PyObject *aws_py_http_headers_clear(PyObject *self, PyObject *args);
  * If NULL is returned, a python error has been set */
 
 struct aws_http_connection *aws_py_get_http_connection(PyObject *connection);
+struct aws_http_connection_manager *aws_py_get_http_connection_manager(PyObject *manager);
+struct aws_http2_stream_manager *aws_py_get_http2_stream_manager(PyObject *manager);
 struct aws_http_stream *aws_py_get_http_stream(PyObject *stream);
 struct aws_http_message *aws_py_get_http_message(PyObject *http_message);
 struct aws_http_headers *aws_py_get_http_headers(PyObject *http_headers);
@@ -0,0 +1,191 @@
+/**
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0.
+ */
+#include "http.h"
+
+#include "io.h"
+
+#include <aws/http/connection.h>
+#include <aws/http/http2_stream_manager.h>
+#include <aws/http/proxy.h>
+#include <aws/io/socket.h>
+
+static const char *s_capsule_name_http2_stream_manager = "aws_http2_stream_manager";
+
+struct http2_stream_manager_binding {
+    struct aws_http2_stream_manager *native;
+
+    /* Shutdown callback, reference cleared after invoking callback */
+    PyObject *on_shutdown;
+};
+
+static void s_destroy(struct http2_stream_manager_binding *manager) {
+    Py_XDECREF(manager->on_shutdown);
+    aws_mem_release(aws_py_get_allocator(), manager);
+}
+
+struct aws_http2_stream_manager *aws_py_get_http2_stream_manager(PyObject *manager) {
+    AWS_PY_RETURN_NATIVE_FROM_BINDING(
+        manager, s_capsule_name_http2_stream_manager, "Http2StreamManager", http2_stream_manager_binding);
+}
+
+/* Invoked when the python object gets cleaned up */
+static void s_stream_manager_capsule_destructor(PyObject *capsule) {
+    struct http2_stream_manager_binding *manager = PyCapsule_GetPointer(capsule, s_capsule_name_http2_stream_manager);
+
+    if (manager->native) {
+        /* Shutdown completes once streams that are still in flight have completed */
+        aws_http2_stream_manager_release(manager->native);
+    } else {
+        /* we hit this branch if things failed part way through setting up the binding,
+         * before the native aws_http2_stream_manager could be created. */
+        s_destroy(manager);
+    }
+}
+
+/* Callback from C land, invoked when the underlying shutdown process finished */
+static void s_stream_manager_shutdown_complete(void *user_data) {
+    struct http2_stream_manager_binding *manager = user_data;
+
+    PyGILState_STATE state;
+    if (aws_py_gilstate_ensure(&state)) {
+        return; /* Python has shut down. Nothing matters anymore, but don't crash */
+    }
+
+    PyObject *result = PyObject_CallFunction(manager->on_shutdown, NULL);
+    if (result) {
+        Py_DECREF(result);
+    } else {
+        /* Callback might fail during application shutdown */
+        PyErr_WriteUnraisable(PyErr_Occurred());
+    }
+
+    s_destroy(manager);
+
+    PyGILState_Release(state);
+}
+
+PyObject *aws_py_http2_stream_manager_new(PyObject *self, PyObject *args) {
+    (void)self;
+
+    struct aws_allocator *allocator = aws_py_get_allocator();
+
+    PyObject *bootstrap_py;                             /* O */
+    struct aws_byte_cursor host_name;                   /* s# */
+    uint32_t port;                                      /* I */
+    PyObject *socket_options_py;                        /* O */
+    PyObject *tls_options_py;                           /* O */
+    PyObject *proxy_options_py;                         /* O */
+    PyObject *initial_settings_py;                      /* O */
+    int prior_knowledge;                                /* p */
+    Py_ssize_t max_connections;                         /* n */
+    Py_ssize_t ideal_concurrent_streams_per_connection; /* n */
+    Py_ssize_t max_concurrent_streams_per_connection;   /* n */
+    int close_connection_on_server_error;               /* p */
+    PyObject *on_shutdown_py;                           /* O */
+    if (!PyArg_ParseTuple(
+            args,
+            "Os#IOOOOpnnnpO",
+            &bootstrap_py,
+            &host_name.ptr,
+            &host_name.len,
+            &port,
+            &socket_options_py,
+            &tls_options_py,
+            &proxy_options_py,
+            &initial_settings_py,
+            &prior_knowledge,
+            &max_connections,
+            &ideal_concurrent_streams_per_connection,
+            &max_concurrent_streams_per_connection,
+            &close_connection_on_server_error,
+            &on_shutdown_py)) {
+        return NULL;
+    }
+
+    struct aws_client_bootstrap *bootstrap = aws_py_get_client_bootstrap(bootstrap_py);
+    if (!bootstrap) {
+        return NULL;
+    }
+
+    struct aws_tls_connection_options *tls_options = NULL;
+    if (tls_options_py != Py_None) {
+        tls_options = aws_py_get_tls_connection_options(tls_options_py);
+        if (!tls_options) {
+            return NULL;
+        }
+    }
+
+    struct aws_socket_options socket_options;
+    if (!aws_py_socket_options_init(&socket_options, socket_options_py)) {
+        return NULL;
+    }
+
+    /* proxy options are optional */
+    struct aws_http_proxy_options proxy_options_storage;
+    struct aws_http_proxy_options *proxy_options = NULL;
+    if (proxy_options_py != Py_None) {
+        proxy_options = &proxy_options_storage;
+        if (!aws_py_http_proxy_options_init(proxy_options, proxy_options_py)) {
+            return NULL;
+        }
+    }
+
+    if (max_connections <= 0 || ideal_concurrent_streams_per_connection < 0 ||
+        max_concurrent_streams_per_connection < 0) {
+        PyErr_SetString(PyExc_ValueError, "Connection and stream limits must not be negative");
+        return NULL;
+    }
+
+    struct aws_http2_setting *http2_settings = NULL;
+    size_t http2_settings_count = 0;
+    if (initial_settings_py != Py_None) {
+        if (aws_py_http2_settings_from_list(initial_settings_py, allocator, &http2_settings, &http2_settings_count)) {
+            return NULL;
+        }
+    }
+
+    PyObject *capsule = NULL;
+    struct http2_stream_manager_binding *manager =
+        aws_mem_calloc(allocator, 1, sizeof(struct http2_stream_manager_binding));
+
+    capsule = PyCapsule_New(manager, s_capsule_name_http2_stream_manager, s_stream_manager_capsule_destructor);
+    if (!capsule) {
+        aws_mem_release(allocator, manager);
+        goto done;
+    }
+
+    manager->on_shutdown = on_shutdown_py;
+    Py_INCREF(manager->on_shutdown);
+
+    /* The manager copies everything it needs out of these options */
+    struct aws_http2_stream_manager_options options = {
+        .bootstrap = bootstrap,
+        .socket_options = &socket_options,
+        .tls_connection_options = tls_options,
+        .http2_prior_knowledge = prior_knowledge != 0,
+        .host = host_name,
+        .port = port,
+        .initial_settings_array = http2_settings,
+        .num_initial_settings = http2_settings_count,
+        .proxy_options = proxy_options,
+        .shutdown_complete_user_data = manager,
+        .shutdown_complete_callback = s_stream_manager_shutdown_complete,
+        .close_connection_on_server_error = close_connection_on_server_error != 0,
+        .ideal_concurrent_streams_per_connection = (size_t)ideal_concurrent_streams_per_connection,
+        .max_concurrent_streams_per_connection = (size_t)max_concurrent_streams_per_connection,
+        .max_connections = (size_t)max_connections,
+    };
+
+    manager->native = aws_http2_stream_manager_new(allocator, &options);
+    if (!manager->native) {
+        PyErr_SetAwsLastError();
+        Py_CLEAR(capsule);
+        goto done;
+    }
+
+done:
+    aws_mem_release(allocator, http2_settings);
+    return capsule;
+}
@@ -9,6 +9,7 @@
 #include <aws/common/array_list.h>
 #include <aws/common/ref_count.h>
 #include <aws/http/connection.h>
+#include <aws/http/connection_manager.h>
 #include <aws/http/proxy.h>
 #include <aws/http/request_response.h>
 #include <aws/io/socket.h>
@@ -22,12 +23,18 @@ static const char *s_capsule_name_http_connection = "aws_http_connection";
  *   thread to invoke callbacks (e.g. s_on_connection_shutdown) with a valid binding. The shutdown callback
  *   is the last callback invoked by the connection thread, so it releases this ref.
  * - The last release (ref_count 1→0) calls s_connection_destroy().
+ * - Connections acquired from an HttpClientConnectionManager have no callbacks of their own, the manager has them.
+ *   Their binding only has the capsule's ref, and the capsule gives the connection back to the manager,
+ *   unless it was already released, in which case native is NULL.
  */
 struct http_connection_binding {
     struct aws_http_connection *native;
     /* Reference to python object that reference to other related python object to keep it alive */
     PyObject *py_core;
 
+    /* Manager the connection was acquired from, or NULL. Holds a reference to keep the manager alive. */
+    struct aws_http_connection_manager *manager;
+
     struct aws_ref_count ref_count;
 };
 
@@ -46,11 +53,38 @@ struct aws_http_connection *aws_py_get_http_connection(PyObject *connection) {
 static void s_connection_capsule_destructor(PyObject *capsule) {
     struct http_connection_binding *connection = PyCapsule_GetPointer(capsule, s_capsule_name_http_connection);
 
-    aws_http_connection_release(connection->native);
+    if (connection->manager) {
+        if (connection->native) {
+            aws_http_connection_manager_release_connection(connection->manager, connection->native);
+        }
+        aws_http_connection_manager_release(connection->manager);
+    } else {
+        aws_http_connection_release(connection->native);
+    }
 
     aws_ref_count_release(&connection->ref_count);
 }
 
+PyObject *aws_py_http_connection_new_from_manager(
+    struct aws_http_connection *native,
+    struct aws_http_connection_manager *manager) {
+
+    struct http_connection_binding *connection =
+        aws_mem_calloc(aws_py_get_allocator(), 1, sizeof(struct http_connection_binding));
+    aws_ref_count_init(&connection->ref_count, connection, s_connection_destroy);
+
+    PyObject *capsule = PyCapsule_New(connection, s_capsule_name_http_connection, s_connection_capsule_destructor);
+    if (!capsule) {
+        aws_ref_count_release(&connection->ref_count);
+        return NULL;
+    }
+
+    connection->native = native;
+    aws_http_connection_manager_acquire(manager);
+    connection->manager = manager;
+    return capsule;
+}
+
 static void s_on_connection_shutdown(struct aws_http_connection *native_connection, int error_code, void *user_data) {
     (void)native_connection;
     struct http_connection_binding *connection = user_data;
@@ -134,8 +168,7 @@ static void s_on_client_connection_setup(
     PyGILState_Release(state);
 }
 
-/* Function to convert Python list of Http2Setting to C array of aws_http2_setting */
-static int s_convert_http2_settings(
+int aws_py_http2_settings_from_list(
     PyObject *initial_settings_py,
     struct aws_allocator *allocator,
     struct aws_http2_setting *out_settings[],
@@ -298,7 +331,7 @@ PyObject *aws_py_http_client_connection_new(PyObject *self, PyObject *args) {
 
     if (initial_settings_py != Py_None) {
         /* Get the array from the pylist */
-        if (s_convert_http2_settings(initial_settings_py, allocator, &http2_settings, &http2_settings_count)) {
+        if (aws_py_http2_settings_from_list(initial_settings_py, allocator, &http2_settings, &http2_settings_count)) {
             goto done;
         }
         http2_options.initial_settings_array = http2_settings;
@@ -403,7 +436,10 @@ PyObject *aws_py_http_connection_close(PyObject *self, PyObject *args) {
         return NULL;
     }
 
-    aws_http_connection_close(connection->native);
+    /* NULL if the connection was released back to its manager */
+    if (connection->native) {
+        aws_http_connection_close(connection->native);
+    }
     Py_RETURN_NONE;
 }
 
@@ -419,12 +455,49 @@ PyObject *aws_py_http_connection_is_open(PyObject *self, PyObject *args) {
         return NULL;
     }
 
-    if (aws_http_connection_is_open(connection->native)) {
+    if (connection->native && aws_http_connection_is_open(connection->native)) {
         Py_RETURN_TRUE;
     }
     Py_RETURN_FALSE;
 }
 
+PyObject *aws_py_http_connection_manager_release_connection(PyObject *self, PyObject *args) {
+    (void)self;
+    PyObject *manager_py;
+    PyObject *capsule;
+    if (!PyArg_ParseTuple(args, "OO", &manager_py, &capsule)) {
+        return NULL;
+    }
+
+    struct aws_http_connection_manager *manager = aws_py_get_http_connection_manager(manager_py);
+    if (!manager) {
+        return NULL;
+    }
+
+    struct http_connection_binding *connection = PyCapsule_GetPointer(capsule, s_capsule_name_http_connection);
+    if (!connection) {
+        return NULL;
+    }
+
+    if (connection->manager != manager) {
+        PyErr_SetString(PyExc_ValueError, "Connection was not acquired from this HttpClientConnectionManager");
+        return NULL;
+    }
+
+    if (!connection->native) {
+        PyErr_SetString(PyExc_RuntimeError, "Connection was already released");
+        return NULL;
+    }
+
+    /* From hereon, the connection may be handed to someone else, so this binding can't touch it again */
+    struct aws_http_connection *native = connection->native;
+    connection->native = NULL;
+    if (aws_http_connection_manager_release_connection(manager, native)) {
+        return PyErr_AwsLastError();
+    }
+    Py_RETURN_NONE;
+}
+
 PyObject *aws_py_http2_connection_update_window(PyObject *self, PyObject *args) {
     (void)self;
     PyObject *capsule;
@@ -438,7 +511,9 @@ PyObject *aws_py_http2_connection_update_window(PyObject *self, PyObject *args)
         return NULL;
     }
 
-    aws_http2_connection_update_window(connection->native, increment_size);
+    if (connection->native) {
+        aws_http2_connection_update_window(connection->native, increment_size);
+    }
 
     Py_RETURN_NONE;
 }
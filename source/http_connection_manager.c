@@ -0,0 +1,251 @@
+/**
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0.
+ */
+#include "http.h"
+
+#include "io.h"
+
+#include <aws/http/connection.h>
+#include <aws/http/connection_manager.h>
+#include <aws/http/proxy.h>
+#include <aws/io/socket.h>
+
+static const char *s_capsule_name_http_connection_manager = "aws_http_connection_manager";
+
+struct http_connection_manager_binding {
+    struct aws_http_connection_manager *native;
+
+    /* Shutdown callback, reference cleared after invoking callback */
+    PyObject *on_shutdown;
+};
+
+/* State for one acquire_connection() call, freed once its callback has run */
+struct http_connection_acquisition {
+    /* Holds a reference, so the manager can't finish shutting down before the connection is wrapped */
+    struct aws_http_connection_manager *manager;
+    /* Python object whose _on_acquired() is invoked with the result */
+    PyObject *py_core;
+};
+
+static void s_destroy(struct http_connection_manager_binding *manager) {
+    Py_XDECREF(manager->on_shutdown);
+    aws_mem_release(aws_py_get_allocator(), manager);
+}
+
+struct aws_http_connection_manager *aws_py_get_http_connection_manager(PyObject *manager) {
+    AWS_PY_RETURN_NATIVE_FROM_BINDING(
+        manager,
+        s_capsule_name_http_connection_manager,
+        "HttpClientConnectionManager",
+        http_connection_manager_binding);
+}
+
+/* Invoked when the python object gets cleaned up */
+static void s_connection_manager_capsule_destructor(PyObject *capsule) {
+    struct http_connection_manager_binding *manager =
+        PyCapsule_GetPointer(capsule, s_capsule_name_http_connection_manager);
+
+    if (manager->native) {
+        /* Shutdown completes once connections that are still acquired have been released */
+        aws_http_connection_manager_release(manager->native);
+    } else {
+        /* we hit this branch if things failed part way through setting up the binding,
+         * before the native aws_http_connection_manager could be created. */
+        s_destroy(manager);
+    }
+}
+
+/* Callback from C land, invoked when the underlying shutdown process finished */
+static void s_connection_manager_shutdown_complete(void *user_data) {
+    struct http_connection_manager_binding *manager = user_data;
+
+    PyGILState_STATE state;
+    if (aws_py_gilstate_ensure(&state)) {
+        return; /* Python has shut down. Nothing matters anymore, but don't crash */
+    }
+
+    PyObject *result = PyObject_CallFunction(manager->on_shutdown, NULL);
+    if (result) {
+        Py_DECREF(result);
+    } else {
+        /* Callback might fail during application shutdown */
+        PyErr_WriteUnraisable(PyErr_Occurred());
+    }
+
+    s_destroy(manager);
+
+    PyGILState_Release(state);
+}
+
+PyObject *aws_py_http_connection_manager_new(PyObject *self, PyObject *args) {
+    (void)self;
+
+    struct aws_allocator *allocator = aws_py_get_allocator();
+
+    PyObject *bootstrap_py;           /* O */
+    struct aws_byte_cursor host_name; /* s# */
+    uint32_t port;                    /* I */
+    PyObject *socket_options_py;      /* O */
+    PyObject *tls_options_py;         /* O */
+    PyObject *proxy_options_py;       /* O */
+    Py_ssize_t max_connections;       /* n */
+    uint64_t max_connection_idle_ms;  /* K */
+    PyObject *on_shutdown_py;         /* O */
+    if (!PyArg_ParseTuple(
+            args,
+            "Os#IOOOnKO",
+            &bootstrap_py,
+            &host_name.ptr,
+            &host_name.len,
+            &port,
+            &socket_options_py,
+            &tls_options_py,
+            &proxy_options_py,
+            &max_connections,
+            &max_connection_idle_ms,
+            &on_shutdown_py)) {
+        return NULL;
+    }
+
+    struct aws_client_bootstrap *bootstrap = aws_py_get_client_bootstrap(bootstrap_py);
+    if (!bootstrap) {
+        return NULL;
+    }
+
+    struct aws_tls_connection_options *tls_options = NULL;
+    if (tls_options_py != Py_None) {
+        tls_options = aws_py_get_tls_connection_options(tls_options_py);
+        if (!tls_options) {
+            return NULL;
+        }
+    }
+
+    struct aws_socket_options socket_options;
+    if (!aws_py_socket_options_init(&socket_options, socket_options_py)) {
+        return NULL;
+    }
+
+    /* proxy options are optional */
+    struct aws_http_proxy_options proxy_options_storage;
+    struct aws_http_proxy_options *proxy_options = NULL;
+    if (proxy_options_py != Py_None) {
+        proxy_options = &proxy_options_storage;
+        if (!aws_py_http_proxy_options_init(proxy_options, proxy_options_py)) {
+            return NULL;
+        }
+    }
+
+    if (max_connections <= 0) {
+        PyErr_SetString(PyExc_ValueError, "max_connections must be positive");
+        return NULL;
+    }
+
+    struct http_connection_manager_binding *manager =
+        aws_mem_calloc(allocator, 1, sizeof(struct http_connection_manager_binding));
+
+    PyObject *capsule =
+        PyCapsule_New(manager, s_capsule_name_http_connection_manager, s_connection_manager_capsule_destructor);
+    if (!capsule) {
+        aws_mem_release(allocator, manager);
+        return NULL;
+    }
+
+    manager->on_shutdown = on_shutdown_py;
+    Py_INCREF(manager->on_shutdown);
+
+    /* The manager copies everything it needs out of these options */
+    struct aws_http_connection_manager_options options = {
+        .bootstrap = bootstrap,
+        .initial_window_size = SIZE_MAX,
+        .socket_options = &socket_options,
+        .tls_connection_options = tls_options,
+        .proxy_options = proxy_options,
+        .host = host_name,
+        .port = port,
+        .max_connections = (size_t)max_connections,
+        .shutdown_complete_user_data = manager,
+        .shutdown_complete_callback = s_connection_manager_shutdown_complete,
+        .max_connection_idle_in_milliseconds = max_connection_idle_ms,
+    };
+
+    manager->native = aws_http_connection_manager_new(allocator, &options);
+    if (!manager->native) {
+        PyErr_SetAwsLastError();
+        Py_DECREF(capsule);
+        return NULL;
+    }
+
+    return capsule;
+}
+
+static void s_on_connection_acquired(struct aws_http_connection *native_connection, int error_code, void *user_data) {
+    struct http_connection_acquisition *acquisition = user_data;
+    struct aws_http_connection_manager *manager = acquisition->manager;
+
+    PyGILState_STATE state;
+    if (aws_py_gilstate_ensure(&state)) {
+        /* Python has shut down. Nothing matters anymore, but don't crash */
+        if (native_connection) {
+            aws_http_connection_manager_release_connection(manager, native_connection);
+        }
+        aws_http_connection_manager_release(manager);
+        return;
+    }
+
+    enum aws_http_version http_version = AWS_HTTP_VERSION_UNKNOWN;
+    PyObject *capsule = NULL;
+    if (!error_code) {
+        capsule = aws_py_http_connection_new_from_manager(native_connection, manager);
+        if (capsule) {
+            http_version = aws_http_connection_get_version(native_connection);
+        } else {
+            PyErr_WriteUnraisable(PyErr_Occurred());
+            aws_http_connection_manager_release_connection(manager, native_connection);
+            error_code = AWS_ERROR_UNKNOWN;
+        }
+    }
+
+    PyObject *result = PyObject_CallMethod(
+        acquisition->py_core, "_on_acquired", "(Oii)", capsule ? capsule : Py_None, error_code, http_version);
+    if (result) {
+        Py_DECREF(result);
+    } else {
+        /* Callback might fail during application shutdown */
+        PyErr_WriteUnraisable(PyErr_Occurred());
+    }
+
+    /* If python didn't keep the capsule, its destructor gives the connection back to the manager */
+    Py_XDECREF(capsule);
+    Py_DECREF(acquisition->py_core);
+    aws_mem_release(aws_py_get_allocator(), acquisition);
+    aws_http_connection_manager_release(manager);
+
+    PyGILState_Release(state);
+}
+
+PyObject *aws_py_http_connection_manager_acquire_connection(PyObject *self, PyObject *args) {
+    (void)self;
+
+    PyObject *manager_py;
+    PyObject *py_core;
+    if (!PyArg_ParseTuple(args, "OO", &manager_py, &py_core)) {
+        return NULL;
+    }
+
+    struct aws_http_connection_manager *manager = aws_py_get_http_connection_manager(manager_py);
+    if (!manager) {
+        return NULL;
+    }
+
+    struct http_connection_acquisition *acquisition =
+        aws_mem_calloc(aws_py_get_allocator(), 1, sizeof(struct http_connection_acquisition));
+    aws_http_connection_manager_acquire(manager);
+    acquisition->manager = manager;
+    acquisition->py_core = py_core;
+    Py_INCREF(py_core);
+
+    /* The callback may fire synchronously, on this thread, if an idle connection is available */
+    aws_http_connection_manager_acquire_connection(manager, s_on_connection_acquired, acquisition);
+    Py_RETURN_NONE;
+}
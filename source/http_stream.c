@@ -5,6 +5,8 @@
 #include "http.h"
 #include "io.h"
 
+#include <aws/common/atomics.h>
+#include <aws/http/http2_stream_manager.h>
 #include <aws/http/request_response.h>
 
 static const char *s_capsule_name_http_stream = "aws_http_stream";
@@ -14,8 +16,15 @@ static const char *s_capsule_name_http_stream = "aws_http_stream";
 #define HEADERS_RESERVED_BYTES 1024
 
 struct http_stream_binding {
+    /* Stream made on a connection. NULL for streams from an Http2StreamManager, see acquired_native */
     struct aws_http_stream *native;
 
+    /* Stream made by an Http2StreamManager. The acquire callback publishes it from the event-loop thread,
+     * racing with python threads that may already be calling update_window(), so it's only accessed atomically.
+     * Until it's set, there is no native stream to act on. */
+    bool from_stream_manager;
+    struct aws_atomic_var acquired_native;
+
     /* Weak reference proxy to python self.
      * NOTE: The python self is forced to stay alive until on_complete fires.
      * We do this by INCREFing when activate() is called, and DECREFing when on_complete fires. */
@@ -28,12 +37,45 @@ struct http_stream_binding {
     struct aws_byte_buf received_headers;
     size_t received_headers_count; /* Buffer contains 2x strings per header */
 
-    /* Dependencies that must outlive this */
+    /* Dependencies that must outlive this: the connection, or the Http2StreamManager the stream came from */
     PyObject *connection;
+
+    /* If nonzero, body data is passed to python as a read-only memoryview of a copy in body_pool,
+     * a bytearray that's reused once python lets go of it, instead of being copied into new bytes.
+     * Python may switch it while body data arrives (see http_stream_set_body_buffer_mode),
+     * so it's only accessed atomically. */
+    struct aws_atomic_var body_as_memoryview;
+    PyObject *body_pool;
+
+    /* If nonzero, body data is coalesced in body_buffer and passed to python once this many bytes
+     * have arrived, or the body is done, rather than once per read from the socket */
+    size_t body_min_chunk_size;
+    struct aws_byte_buf body_buffer;
+
+    /* Error from passing coalesced body data to python, after it was too late to fail the stream.
+     * Reported by on_complete instead. */
+    int body_error_code;
 };
 
 struct aws_http_stream *aws_py_get_http_stream(PyObject *stream) {
-    AWS_PY_RETURN_NATIVE_FROM_BINDING(stream, s_capsule_name_http_stream, "HttpStreamBase", http_stream_binding);
+    struct http_stream_binding *binding = aws_py_get_binding(stream, s_capsule_name_http_stream, "HttpStreamBase");
+    if (!binding) {
+        return NULL;
+    }
+
+    if (binding->from_stream_manager) {
+        struct aws_http_stream *native = aws_atomic_load_ptr(&binding->acquired_native);
+        if (!native) {
+            PyErr_SetString(
+                PyExc_RuntimeError, "Stream has not been acquired from the Http2StreamManager yet, try again later");
+        }
+        return native;
+    }
+
+    if (!binding->native) {
+        PyErr_SetString(PyExc_TypeError, "Expected valid 'HttpStreamBase', but '_binding.native' is NULL");
+    }
+    return binding->native;
 }
 
 static int s_on_incoming_headers(
@@ -149,19 +191,12 @@ done:
     return aws_result;
 }
 
-static int s_on_incoming_body(
-    struct aws_http_stream *native_stream,
-    const struct aws_byte_cursor *data,
-    void *user_data) {
-
-    (void)native_stream;
-
-    struct http_stream_binding *stream = user_data;
-
-    if (data->len > PY_SSIZE_T_MAX) {
+/* Pass body data to python */
+static int s_deliver_body(struct http_stream_binding *stream, struct aws_byte_cursor data) {
+    if (data.len > PY_SSIZE_T_MAX) {
         return aws_raise_error(AWS_ERROR_OVERFLOW_DETECTED);
     }
-    Py_ssize_t data_len = (Py_ssize_t)data->len;
+    Py_ssize_t data_len = (Py_ssize_t)data.len;
 
     int aws_result = AWS_OP_SUCCESS;
 
@@ -171,31 +206,115 @@ static int s_on_incoming_body(
         return AWS_OP_ERR; /* Python has shut down. Nothing matters anymore, but don't crash */
     }
 
-    PyObject *result = PyObject_CallMethod(stream->self_proxy, "_on_body", "(y#)", (const char *)data->ptr, data_len);
-    if (!result) {
+    PyObject *chunk = NULL;
+    if (aws_atomic_load_int(&stream->body_as_memoryview)) {
+        /* data may be freed or reused once this returns, so python gets a view of a copy it owns */
+        chunk = aws_py_memory_view_from_pooled_copy(&stream->body_pool, data);
+    } else {
+        chunk = PyBytes_FromStringAndSize((const char *)data.ptr, data_len);
+    }
+    if (!chunk) {
         aws_result = aws_py_raise_error();
         goto done;
     }
-    Py_DECREF(result);
+
+    PyObject *result = PyObject_CallMethod(stream->self_proxy, "_on_body", "(O)", chunk);
+    if (result) {
+        Py_DECREF(result);
+    } else {
+        aws_result = aws_py_raise_error();
+    }
 
 done:
+    Py_XDECREF(chunk);
     PyGILState_Release(state);
     /*************** GIL RELEASE ***************/
 
     return aws_result;
 }
 
+/* Pass any coalesced body data to python */
+static int s_flush_body_buffer(struct http_stream_binding *stream) {
+    if (stream->body_buffer.len == 0) {
+        return AWS_OP_SUCCESS;
+    }
+
+    int aws_result = s_deliver_body(stream, aws_byte_cursor_from_buf(&stream->body_buffer));
+    aws_byte_buf_reset(&stream->body_buffer, false);
+    return aws_result;
+}
+
+static int s_on_incoming_body(
+    struct aws_http_stream *native_stream,
+    const struct aws_byte_cursor *data,
+    void *user_data) {
+
+    (void)native_stream;
+
+    struct http_stream_binding *stream = user_data;
+
+    if (stream->body_min_chunk_size == 0) {
+        return s_deliver_body(stream, *data);
+    }
+
+    struct aws_byte_cursor remaining = *data;
+    while (remaining.len > 0) {
+        if (stream->body_buffer.len == 0 && remaining.len >= stream->body_min_chunk_size) {
+            /* Big enough already, pass it along without copying */
+            return s_deliver_body(stream, remaining);
+        }
+
+        /* Buffer is allocated on first use, so small responses never need it */
+        if (!stream->body_buffer.buffer &&
+            aws_byte_buf_init(&stream->body_buffer, aws_py_get_allocator(), stream->body_min_chunk_size)) {
+            return AWS_OP_ERR;
+        }
+
+        size_t space = stream->body_buffer.capacity - stream->body_buffer.len;
+        struct aws_byte_cursor piece = aws_byte_cursor_advance(&remaining, aws_min_size(space, remaining.len));
+        aws_byte_buf_write_from_whole_cursor(&stream->body_buffer, piece);
+
+        if (stream->body_buffer.len == stream->body_buffer.capacity) {
+            if (s_flush_body_buffer(stream)) {
+                return AWS_OP_ERR;
+            }
+        }
+    }
+
+    return AWS_OP_SUCCESS;
+}
+
 static void s_on_stream_complete(struct aws_http_stream *native_stream, int error_code, void *user_data) {
     (void)native_stream;
     struct http_stream_binding *stream = user_data;
 
+    /* Body data still being coalesced goes to python before the stream completes */
+    if (s_flush_body_buffer(stream)) {
+        stream->body_error_code = aws_last_error();
+    }
+    if (!error_code) {
+        error_code = stream->body_error_code;
+    }
+
     /*************** GIL ACQUIRE ***************/
     PyGILState_STATE state;
     if (aws_py_gilstate_ensure(&state)) {
         return; /* Python has shut down. Nothing matters anymore, but don't crash */
     }
 
-    PyObject *result = PyObject_CallMethod(stream->self_proxy, "_on_complete", "(i)", error_code);
+    /* The stream manager doesn't forward on_h2_remote_end_stream to us, but a stream can only complete
+     * successfully after the peer sent END_STREAM, so report it now. */
+    PyObject *result = NULL;
+    if (stream->from_stream_manager && !error_code) {
+        result = PyObject_CallMethod(stream->self_proxy, "_on_h2_remote_end_stream", "()");
+        if (result) {
+            Py_DECREF(result);
+        } else {
+            PyErr_WriteUnraisable(PyErr_Occurred());
+        }
+    }
+
+    result = PyObject_CallMethod(stream->self_proxy, "_on_complete", "(i)", error_code);
     if (result) {
         Py_DECREF(result);
     } else {
@@ -217,6 +336,11 @@ static void s_on_h2_remote_end_stream(struct aws_http_stream *native_stream, voi
     (void)native_stream;
     struct http_stream_binding *stream = user_data;
 
+    /* Body data still being coalesced goes to python before it learns the body is done */
+    if (s_flush_body_buffer(stream)) {
+        stream->body_error_code = aws_last_error();
+    }
+
     /*************** GIL ACQUIRE ***************/
     PyGILState_STATE state;
     if (aws_py_gilstate_ensure(&state)) {
@@ -239,8 +363,11 @@ static void s_stream_capsule_destructor(PyObject *http_stream_capsule) {
      * 2) Stream successfully reached end of life, and on_complete has already fired. */
 
     aws_http_stream_release(stream->native);
+    aws_http_stream_release(aws_atomic_load_ptr(&stream->acquired_native));
     Py_XDECREF(stream->self_proxy);
     aws_byte_buf_clean_up(&stream->received_headers);
+    aws_byte_buf_clean_up(&stream->body_buffer);
+    Py_XDECREF(stream->body_pool);
     Py_XDECREF(stream->connection);
 
     aws_mem_release(aws_py_get_allocator(), stream);
@@ -255,7 +382,22 @@ PyObject *aws_py_http_client_stream_new(PyObject *self, PyObject *args) {
     PyObject *py_connection = NULL;
     PyObject *py_request = NULL;
     int http2_manual_write = 0;
-    if (!PyArg_ParseTuple(args, "OOOp", &py_stream, &py_connection, &py_request, &http2_manual_write)) {
+    int body_as_memoryview = 0;
+    Py_ssize_t body_min_chunk_size = 0;
+    if (!PyArg_ParseTuple(
+            args,
+            "OOOppn",
+            &py_stream,
+            &py_connection,
+            &py_request,
+            &http2_manual_write,
+            &body_as_memoryview,
+            &body_min_chunk_size)) {
+        return NULL;
+    }
+
+    if (body_min_chunk_size < 0) {
+        PyErr_SetString(PyExc_ValueError, "on_body_min_chunk_size must not be negative");
         return NULL;
     }
 
@@ -284,6 +426,8 @@ PyObject *aws_py_http_client_stream_new(PyObject *self, PyObject *args) {
 
     stream->connection = py_connection;
     Py_INCREF(stream->connection);
+    aws_atomic_init_int(&stream->body_as_memoryview, body_as_memoryview != 0);
+    stream->body_min_chunk_size = (size_t)body_min_chunk_size;
 
     stream->self_proxy = PyWeakref_NewProxy(py_stream, NULL);
     if (!stream->self_proxy) {
@@ -323,6 +467,107 @@ error:
     return NULL;
 }
 
+static void s_on_stream_acquired(struct aws_http_stream *native_stream, int error_code, void *user_data) {
+    struct http_stream_binding *stream = user_data;
+
+    if (error_code) {
+        /* No stream was made, so on_complete won't fire. Complete with the error here instead. */
+        s_on_stream_complete(NULL, error_code, stream);
+        return;
+    }
+
+    /* The manager has already activated the stream. Its other callbacks fire after this, on the same thread. */
+    aws_atomic_store_ptr(&stream->acquired_native, native_stream);
+}
+
+PyObject *aws_py_http2_stream_manager_acquire_stream(PyObject *self, PyObject *args) {
+    (void)self;
+
+    struct aws_allocator *allocator = aws_py_get_allocator();
+
+    PyObject *py_manager = NULL;
+    PyObject *py_stream = NULL;
+    PyObject *py_request = NULL;
+    int body_as_memoryview = 0;
+    Py_ssize_t body_min_chunk_size = 0;
+    if (!PyArg_ParseTuple(
+            args, "OOOpn", &py_manager, &py_stream, &py_request, &body_as_memoryview, &body_min_chunk_size)) {
+        return NULL;
+    }
+
+    if (body_min_chunk_size < 0) {
+        PyErr_SetString(PyExc_ValueError, "on_body_min_chunk_size must not be negative");
+        return NULL;
+    }
+
+    struct aws_http2_stream_manager *native_manager = aws_py_get_http2_stream_manager(py_manager);
+    if (!native_manager) {
+        return NULL;
+    }
+
+    struct aws_http_message *native_request = aws_py_get_http_message(py_request);
+    if (!native_request) {
+        return NULL;
+    }
+
+    struct http_stream_binding *stream = aws_mem_calloc(allocator, 1, sizeof(struct http_stream_binding));
+
+    /* From hereon, we need to clean up if errors occur.
+     * Fortunately, the capsule destructor will clean up anything stored inside http_stream_binding */
+
+    PyObject *capsule = PyCapsule_New(stream, s_capsule_name_http_stream, s_stream_capsule_destructor);
+    if (!capsule) {
+        aws_mem_release(allocator, stream);
+        return NULL;
+    }
+
+    stream->connection = py_manager;
+    Py_INCREF(stream->connection);
+    stream->from_stream_manager = true;
+    aws_atomic_init_ptr(&stream->acquired_native, NULL);
+    aws_atomic_init_int(&stream->body_as_memoryview, body_as_memoryview != 0);
+    stream->body_min_chunk_size = (size_t)body_min_chunk_size;
+
+    stream->self_proxy = PyWeakref_NewProxy(py_stream, NULL);
+    if (!stream->self_proxy) {
+        goto error;
+    }
+
+    if (aws_byte_buf_init(&stream->received_headers, allocator, HEADERS_RESERVED_BYTES)) {
+        PyErr_SetAwsLastError();
+        goto error;
+    }
+
+    /* The manager copies these, and keeps the request alive until the stream is made */
+    struct aws_http_make_request_options request_options = {
+        .self_size = sizeof(request_options),
+        .request = native_request,
+        .on_response_headers = s_on_incoming_headers,
+        .on_response_header_block_done = s_on_incoming_header_block_done,
+        .on_response_body = s_on_incoming_body,
+        .on_complete = s_on_stream_complete,
+        .on_h2_remote_end_stream = s_on_h2_remote_end_stream,
+        .user_data = stream,
+    };
+
+    struct aws_http2_stream_manager_acquire_stream_options acquire_options = {
+        .callback = s_on_stream_acquired,
+        .user_data = stream,
+        .options = &request_options,
+    };
+
+    /* Force python self to stay alive until on_complete callback.
+     * Done first, since the acquire callback may fire synchronously with an error. */
+    Py_INCREF(py_stream);
+    aws_http2_stream_manager_acquire_stream(native_manager, &acquire_options);
+
+    return capsule;
+
+error:
+    Py_DECREF(capsule);
+    return NULL;
+}
+
 PyObject *aws_py_http_client_stream_activate(PyObject *self, PyObject *args) {
     (void)self;
 
@@ -331,6 +576,16 @@ PyObject *aws_py_http_client_stream_activate(PyObject *self, PyObject *args) {
         return NULL;
     }
 
+    struct http_stream_binding *binding = aws_py_get_binding(py_stream, s_capsule_name_http_stream, "HttpStreamBase");
+    if (!binding) {
+        return NULL;
+    }
+
+    if (binding->from_stream_manager) {
+        /* The manager activates the stream itself, once it's acquired. Nothing to do. */
+        Py_RETURN_NONE;
+    }
+
     struct aws_http_stream *native_stream = aws_py_get_http_stream(py_stream);
     if (!native_stream) {
         return NULL;
@@ -410,3 +665,20 @@ PyObject *aws_py_http2_client_stream_write_data(PyObject *self, PyObject *args)
     }
     Py_RETURN_NONE;
 }
+
+PyObject *aws_py_http_stream_set_body_buffer_mode(PyObject *self, PyObject *args) {
+    (void)self;
+    PyObject *py_stream;
+    int body_as_memoryview; /* p - boolean predicate */
+    if (!PyArg_ParseTuple(args, "Op", &py_stream, &body_as_memoryview)) {
+        return NULL;
+    }
+
+    struct http_stream_binding *stream = aws_py_get_binding(py_stream, s_capsule_name_http_stream, "HttpStreamBase");
+    if (!stream) {
+        return NULL;
+    }
+
+    aws_atomic_store_int(&stream->body_as_memoryview, body_as_memoryview != 0);
+    Py_RETURN_NONE;
+}
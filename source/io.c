@@ -830,9 +830,9 @@ int s_aws_input_stream_py_get_length(struct aws_input_stream *stream, int64_t *o
     return aws_raise_error(AWS_ERROR_UNIMPLEMENTED);
 }
 
-void s_aws_input_stream_py_acquire(struct aws_input_stream *stream) {
-    struct aws_input_stream_py_impl *impl = AWS_CONTAINER_OF(stream, struct aws_input_stream_py_impl, base);
-    size_t pre_ref = aws_atomic_fetch_add(&impl->c_ref, 1);
+/* Keep python self alive while C holds references to the stream */
+static void s_py_self_acquire(struct aws_atomic_var *c_ref, PyObject *py_self) {
+    size_t pre_ref = aws_atomic_fetch_add(c_ref, 1);
     if (pre_ref == 0) {
         /* Only acquire the python ref when it's a new C ref */
         /*************** GIL ACQUIRE ***************/
@@ -840,15 +840,14 @@ void s_aws_input_stream_py_acquire(struct aws_input_stream *stream) {
         if (aws_py_gilstate_ensure(&state)) {
             return; /* Python has shut down. Nothing matters anymore, but don't crash */
         }
-        Py_INCREF(impl->py_self);
+        Py_INCREF(py_self);
         PyGILState_Release(state);
         /*************** GIL RELEASE ***************/
     }
 }
 
-void s_aws_input_stream_py_release(struct aws_input_stream *stream) {
-    struct aws_input_stream_py_impl *impl = AWS_CONTAINER_OF(stream, struct aws_input_stream_py_impl, base);
-    size_t pre_ref = aws_atomic_fetch_sub(&impl->c_ref, 1);
+static void s_py_self_release(struct aws_atomic_var *c_ref, PyObject *py_self) {
+    size_t pre_ref = aws_atomic_fetch_sub(c_ref, 1);
     if (pre_ref == 1) {
         /* Only release the python ref when all the C refs gone */
         /*************** GIL ACQUIRE ***************/
@@ -856,12 +855,22 @@ void s_aws_input_stream_py_release(struct aws_input_stream *stream) {
         if (aws_py_gilstate_ensure(&state)) {
             return; /* Python has shut down. Nothing matters anymore, but don't crash */
         }
-        Py_DECREF(impl->py_self);
+        Py_DECREF(py_self);
         PyGILState_Release(state);
         /*************** GIL RELEASE ***************/
     }
 }
 
+void s_aws_input_stream_py_acquire(struct aws_input_stream *stream) {
+    struct aws_input_stream_py_impl *impl = AWS_CONTAINER_OF(stream, struct aws_input_stream_py_impl, base);
+    s_py_self_acquire(&impl->c_ref, impl->py_self);
+}
+
+void s_aws_input_stream_py_release(struct aws_input_stream *stream) {
+    struct aws_input_stream_py_impl *impl = AWS_CONTAINER_OF(stream, struct aws_input_stream_py_impl, base);
+    s_py_self_release(&impl->c_ref, impl->py_self);
+}
+
 static struct aws_input_stream_vtable s_aws_input_stream_py_vtable = {
     .seek = s_aws_input_stream_py_seek,
     .read = s_aws_input_stream_py_read,
@@ -871,6 +880,92 @@ static struct aws_input_stream_vtable s_aws_input_stream_py_vtable = {
     .release = s_aws_input_stream_py_release,
 };
 
+/* aws_input_stream implementation that reads directly from a python object supporting the buffer protocol.
+ * Reads don't call into python or need the GIL: while the buffer is held, its memory can't move or be resized. */
+struct aws_input_stream_py_buffer_impl {
+    struct aws_input_stream base;
+    struct aws_allocator *allocator;
+
+    /* Held for the lifetime of the stream, released by the capsule destructor */
+    Py_buffer view;
+    size_t position;
+
+    /* Track the refcount from C land */
+    struct aws_atomic_var c_ref;
+
+    /* Pointer to python self. The stream will have a same lifetime as the python Object */
+    PyObject *py_self;
+};
+
+static int s_aws_input_stream_py_buffer_seek(
+    struct aws_input_stream *stream,
+    int64_t offset,
+    enum aws_stream_seek_basis basis) {
+
+    struct aws_input_stream_py_buffer_impl *impl =
+        AWS_CONTAINER_OF(stream, struct aws_input_stream_py_buffer_impl, base);
+
+    int64_t length = (int64_t)impl->view.len;
+    int64_t start = (basis == AWS_SSB_BEGIN) ? 0 : length;
+    if (offset < -start || offset > length - start) {
+        return aws_raise_error(AWS_IO_STREAM_INVALID_SEEK_POSITION);
+    }
+
+    impl->position = (size_t)(start + offset);
+    return AWS_OP_SUCCESS;
+}
+
+static int s_aws_input_stream_py_buffer_read(struct aws_input_stream *stream, struct aws_byte_buf *dest) {
+    struct aws_input_stream_py_buffer_impl *impl =
+        AWS_CONTAINER_OF(stream, struct aws_input_stream_py_buffer_impl, base);
+
+    size_t remaining = (size_t)impl->view.len - impl->position;
+    size_t amount = aws_min_size(dest->capacity - dest->len, remaining);
+    aws_byte_buf_write(dest, (const uint8_t *)impl->view.buf + impl->position, amount);
+    impl->position += amount;
+
+    return AWS_OP_SUCCESS;
+}
+
+static int s_aws_input_stream_py_buffer_get_status(struct aws_input_stream *stream, struct aws_stream_status *status) {
+    struct aws_input_stream_py_buffer_impl *impl =
+        AWS_CONTAINER_OF(stream, struct aws_input_stream_py_buffer_impl, base);
+
+    status->is_valid = true;
+    status->is_end_of_stream = impl->position == (size_t)impl->view.len;
+
+    return AWS_OP_SUCCESS;
+}
+
+static int s_aws_input_stream_py_buffer_get_length(struct aws_input_stream *stream, int64_t *out_length) {
+    struct aws_input_stream_py_buffer_impl *impl =
+        AWS_CONTAINER_OF(stream, struct aws_input_stream_py_buffer_impl, base);
+
+    *out_length = (int64_t)impl->view.len;
+    return AWS_OP_SUCCESS;
+}
+
+static void s_aws_input_stream_py_buffer_acquire(struct aws_input_stream *stream) {
+    struct aws_input_stream_py_buffer_impl *impl =
+        AWS_CONTAINER_OF(stream, struct aws_input_stream_py_buffer_impl, base);
+    s_py_self_acquire(&impl->c_ref, impl->py_self);
+}
+
+static void s_aws_input_stream_py_buffer_release(struct aws_input_stream *stream) {
+    struct aws_input_stream_py_buffer_impl *impl =
+        AWS_CONTAINER_OF(stream, struct aws_input_stream_py_buffer_impl, base);
+    s_py_self_release(&impl->c_ref, impl->py_self);
+}
+
+static struct aws_input_stream_vtable s_aws_input_stream_py_buffer_vtable = {
+    .seek = s_aws_input_stream_py_buffer_seek,
+    .read = s_aws_input_stream_py_buffer_read,
+    .get_status = s_aws_input_stream_py_buffer_get_status,
+    .get_length = s_aws_input_stream_py_buffer_get_length,
+    .acquire = s_aws_input_stream_py_buffer_acquire,
+    .release = s_aws_input_stream_py_buffer_release,
+};
+
 /**
  * Begin aws_input_stream <--> InputStream binding code.
  * This is distinct from the aws_input_stream_from_pyobject() code because
@@ -914,6 +1009,50 @@ PyObject *aws_py_input_stream_new(PyObject *self, PyObject *args) {
     return py_capsule;
 }
 
+static void s_input_stream_py_buffer_capsule_destructor(PyObject *py_capsule) {
+    struct aws_input_stream *stream = PyCapsule_GetPointer(py_capsule, s_capsule_name_input_stream);
+    struct aws_input_stream_py_buffer_impl *impl =
+        AWS_CONTAINER_OF(stream, struct aws_input_stream_py_buffer_impl, base);
+    PyBuffer_Release(&impl->view);
+    aws_mem_release(impl->allocator, impl);
+}
+
+PyObject *aws_py_input_stream_new_from_buffer(PyObject *self, PyObject *args) {
+    (void)self;
+
+    PyObject *py_self;
+    PyObject *py_buffer;
+    if (!PyArg_ParseTuple(args, "OO", &py_self, &py_buffer)) {
+        return NULL;
+    }
+
+    struct aws_allocator *alloc = aws_py_get_allocator();
+    struct aws_input_stream_py_buffer_impl *impl =
+        aws_mem_calloc(alloc, 1, sizeof(struct aws_input_stream_py_buffer_impl));
+
+    /* Raises TypeError if py_buffer isn't a bytes-like object, or BufferError if it isn't contiguous.
+     * InputStream.__init__() checks both first, so python sees TypeError either way. */
+    if (PyObject_GetBuffer(py_buffer, &impl->view, PyBUF_SIMPLE)) {
+        aws_mem_release(alloc, impl);
+        return NULL;
+    }
+
+    impl->allocator = alloc;
+    impl->base.vtable = &s_aws_input_stream_py_buffer_vtable;
+    impl->py_self = py_self;
+    aws_atomic_init_int(&impl->c_ref, 0);
+    /* Lifetime of the impl will be the same as py_capsule and being handled by python */
+    PyObject *py_capsule =
+        PyCapsule_New(&impl->base, s_capsule_name_input_stream, s_input_stream_py_buffer_capsule_destructor);
+
+    if (!py_capsule) {
+        PyBuffer_Release(&impl->view);
+        aws_mem_release(impl->allocator, impl);
+    }
+
+    return py_capsule;
+}
+
 struct aws_input_stream *aws_py_get_input_stream(PyObject *input_stream) {
     return aws_py_get_binding(input_stream, s_capsule_name_input_stream, "InputStream");
 }
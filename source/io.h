@@ -70,6 +70,12 @@ PyObject *aws_py_tls_connection_options_set_server_name(PyObject *self, PyObject
  */
 PyObject *aws_py_input_stream_new(PyObject *self, PyObject *args);
 
+/**
+ * Create a new aws_input_stream, which reads directly from a python bytes-like object,
+ * to be managed by a Python capsule.
+ */
+PyObject *aws_py_input_stream_new_from_buffer(PyObject *self, PyObject *args);
+
 /**
  * Create a new aws_pkcs11_lib to be managed by a Python capsule.
  */
@@ -746,6 +746,41 @@ PyObject *aws_py_memory_view_from_byte_buffer(struct aws_byte_buf *buf) {
     return PyMemoryView_FromMemory(mem_start, mem_size, PyBUF_WRITE);
 }
 
+PyObject *aws_py_memory_view_from_pooled_copy(PyObject **pool, struct aws_byte_cursor data) {
+    if (data.len > PY_SSIZE_T_MAX) {
+        PyErr_SetString(PyExc_OverflowError, "Buffer exceeds PY_SSIZE_T_MAX");
+        return NULL;
+    }
+
+    /* Every memoryview of the bytearray (including slices of those views) holds a reference to it.
+     * If python kept any, leave the bytearray to them and start a new one. */
+    if (*pool && Py_REFCNT(*pool) > 1) {
+        Py_CLEAR(*pool);
+    }
+
+    if (*pool) {
+        if (PyByteArray_Resize(*pool, (Py_ssize_t)data.len)) {
+            return NULL;
+        }
+        if (data.len > 0) {
+            memcpy(PyByteArray_AsString(*pool), data.ptr, data.len);
+        }
+    } else {
+        *pool = PyByteArray_FromStringAndSize((const char *)data.ptr, (Py_ssize_t)data.len);
+        if (!*pool) {
+            return NULL;
+        }
+    }
+
+    PyObject *writable_view = PyMemoryView_FromObject(*pool);
+    if (!writable_view) {
+        return NULL;
+    }
+    PyObject *view = PyObject_CallMethod(writable_view, "toreadonly", NULL);
+    Py_DECREF(writable_view);
+    return view;
+}
+
 PyObject *aws_py_weakref_get_ref(PyObject *ref) {
     /* If Python >= 3.13 */
 #if PY_VERSION_HEX >= 0x030D0000
@@ -953,6 +988,7 @@ static PyMethodDef s_module_methods[] = {
     AWS_PY_METHOD_DEF(init_python_logging, METH_VARARGS),
     AWS_PY_METHOD_DEF(logger_log, METH_VARARGS),
     AWS_PY_METHOD_DEF(input_stream_new, METH_VARARGS),
+    AWS_PY_METHOD_DEF(input_stream_new_from_buffer, METH_VARARGS),
     AWS_PY_METHOD_DEF(pkcs11_lib_new, METH_VARARGS),
 
     /* MQTT Client */
@@ -1048,7 +1084,13 @@ static PyMethodDef s_module_methods[] = {
     AWS_PY_METHOD_DEF(http_connection_is_open, METH_VARARGS),
     AWS_PY_METHOD_DEF(http2_connection_update_window, METH_VARARGS),
     AWS_PY_METHOD_DEF(http_stream_update_window, METH_VARARGS),
+    AWS_PY_METHOD_DEF(http_stream_set_body_buffer_mode, METH_VARARGS),
     AWS_PY_METHOD_DEF(http_client_connection_new, METH_VARARGS),
+    AWS_PY_METHOD_DEF(http_connection_manager_new, METH_VARARGS),
+    AWS_PY_METHOD_DEF(http_connection_manager_acquire_connection, METH_VARARGS),
+    AWS_PY_METHOD_DEF(http_connection_manager_release_connection, METH_VARARGS),
+    AWS_PY_METHOD_DEF(http2_stream_manager_new, METH_VARARGS),
+    AWS_PY_METHOD_DEF(http2_stream_manager_acquire_stream, METH_VARARGS),
     AWS_PY_METHOD_DEF(http_client_stream_new, METH_VARARGS),
     AWS_PY_METHOD_DEF(http_client_stream_activate, METH_VARARGS),
     AWS_PY_METHOD_DEF(http2_client_stream_write_data, METH_VARARGS),
@@ -1114,6 +1156,15 @@ static PyMethodDef s_module_methods[] = {
     AWS_PY_METHOD_DEF(s3_client_new, METH_VARARGS),
     AWS_PY_METHOD_DEF(s3_client_make_meta_request, METH_VARARGS),
     AWS_PY_METHOD_DEF(s3_meta_request_cancel, METH_VARARGS),
+    AWS_PY_METHOD_DEF(s3_meta_request_increment_read_window, METH_VARARGS),
+    AWS_PY_METHOD_DEF(s3_meta_request_write, METH_VARARGS),
+    AWS_PY_METHOD_DEF(s3_meta_request_pause, METH_VARARGS),
+    AWS_PY_METHOD_DEF(s3_meta_request_get_metrics, METH_VARARGS),
+    AWS_PY_METHOD_DEF(s3_batch_new, METH_VARARGS),
+    AWS_PY_METHOD_DEF(s3_batch_get_progress, METH_VARARGS),
+    AWS_PY_METHOD_DEF(s3_batch_cancel, METH_VARARGS),
+    AWS_PY_METHOD_DEF(s3_client_make_small_request, METH_VARARGS),
+    AWS_PY_METHOD_DEF(s3_parse_list_objects_v2, METH_VARARGS),
     AWS_PY_METHOD_DEF(s3_get_ec2_instance_type, METH_NOARGS),
     AWS_PY_METHOD_DEF(s3_is_crt_s3_optimized_for_system, METH_NOARGS),
     AWS_PY_METHOD_DEF(s3_get_recommended_throughput_target_gbps, METH_NOARGS),
@@ -1121,6 +1172,8 @@ static PyMethodDef s_module_methods[] = {
     AWS_PY_METHOD_DEF(s3_cross_process_lock_new, METH_VARARGS),
     AWS_PY_METHOD_DEF(s3_cross_process_lock_acquire, METH_VARARGS),
     AWS_PY_METHOD_DEF(s3_cross_process_lock_release, METH_VARARGS),
+    AWS_PY_METHOD_DEF(s3_buffer_pool_new, METH_VARARGS),
+    AWS_PY_METHOD_DEF(s3_buffer_pool_get_usage, METH_VARARGS),
 
     /* WebSocket */
     AWS_PY_METHOD_DEF(websocket_client_connect, METH_VARARGS),
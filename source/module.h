@@ -107,6 +107,14 @@ PyObject *aws_py_get_error_message(PyObject *self, PyObject *args);
 /* Create a write-only memoryview from the remaining free space in an aws_byte_buf */
 PyObject *aws_py_memory_view_from_byte_buffer(struct aws_byte_buf *buf);
 
+/**
+ * Copy data into a python-owned bytearray, reused between calls, and return a read-only memoryview of it.
+ * *pool holds the bytearray between calls (start with NULL, Py_XDECREF when done).
+ * The bytearray is only reused once python holds no views of it. Otherwise a new one replaces it,
+ * so views kept by python stay valid and unchanged. Requires the GIL.
+ */
+PyObject *aws_py_memory_view_from_pooled_copy(PyObject **pool, struct aws_byte_cursor data);
+
 /* Python 3.13+ changed the function to get a reference from WeakRef. This function is an abstraction over two different
  * APIs since we support Python versions before 3.13. Returns a strong reference if non-null, which you must release. */
 
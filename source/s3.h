@@ -16,12 +16,28 @@ PyObject *aws_py_s3_client_new(PyObject *self, PyObject *args);
 PyObject *aws_py_s3_client_make_meta_request(PyObject *self, PyObject *args);
 
 PyObject *aws_py_s3_meta_request_cancel(PyObject *self, PyObject *args);
+PyObject *aws_py_s3_meta_request_increment_read_window(PyObject *self, PyObject *args);
+PyObject *aws_py_s3_meta_request_write(PyObject *self, PyObject *args);
+PyObject *aws_py_s3_meta_request_pause(PyObject *self, PyObject *args);
+PyObject *aws_py_s3_meta_request_get_metrics(PyObject *self, PyObject *args);
+
+PyObject *aws_py_s3_batch_new(PyObject *self, PyObject *args);
+PyObject *aws_py_s3_batch_get_progress(PyObject *self, PyObject *args);
+PyObject *aws_py_s3_batch_cancel(PyObject *self, PyObject *args);
+
+PyObject *aws_py_s3_client_make_small_request(PyObject *self, PyObject *args);
+
+PyObject *aws_py_s3_parse_list_objects_v2(PyObject *self, PyObject *args);
 
 PyObject *aws_py_s3_cross_process_lock_new(PyObject *self, PyObject *args);
 PyObject *aws_py_s3_cross_process_lock_acquire(PyObject *self, PyObject *args);
 PyObject *aws_py_s3_cross_process_lock_release(PyObject *self, PyObject *args);
 
+PyObject *aws_py_s3_buffer_pool_new(PyObject *self, PyObject *args);
+PyObject *aws_py_s3_buffer_pool_get_usage(PyObject *self, PyObject *args);
+
 struct aws_s3_client *aws_py_get_s3_client(PyObject *s3_client);
+struct aws_s3_buffer_pool *aws_py_get_s3_buffer_pool(PyObject *s3_buffer_pool);
 struct aws_s3_meta_request *aws_py_get_s3_meta_request(PyObject *s3_client);
 
 #endif /* AWS_CRT_PYTHON_S3_H */
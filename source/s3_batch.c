@@ -0,0 +1,492 @@
+/**
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0.
+ */
+#include "s3.h"
+
+#include <aws/common/mutex.h>
+#include <aws/common/ref_count.h>
+#include <aws/common/string.h>
+#include <aws/http/request_response.h>
+#include <aws/s3/s3_client.h>
+
+/**
+ * A batch of GET_OBJECT/PUT_OBJECT transfers between objects and local files.
+ * Items are scheduled natively, keeping at most `max_concurrency` meta requests in flight,
+ * and starting the next item from the previous one's finish callback.
+ * Python is only called once, when every item has finished.
+ */
+
+static const char *s_capsule_name_s3_batch = "aws_s3_batch";
+
+struct s3_batch_binding;
+
+struct s3_batch_item {
+    struct s3_batch_binding *batch;
+    struct aws_string *path;
+    struct aws_string *filepath;
+    /* Optional Range header value */
+    struct aws_string *range;
+
+    /* Following fields are protected by the batch lock */
+    struct aws_s3_meta_request *native;
+    bool finished;
+    int error_code;
+    int response_status;
+};
+
+struct s3_batch_binding {
+    struct aws_allocator *allocator;
+    struct aws_s3_client *client;
+    enum aws_s3_meta_request_type type;
+    struct aws_string *host;
+    struct aws_s3_checksum_config checksum_config;
+    size_t max_concurrency;
+
+    struct s3_batch_item *items;
+    size_t num_items;
+
+    /* One reference for the python capsule, plus one per meta request that hasn't shut down */
+    struct aws_ref_count ref_count;
+
+    struct aws_mutex lock;
+    struct {
+        size_t next_index;
+        size_t num_in_flight;
+        size_t num_succeeded;
+        size_t num_failed;
+        uint64_t bytes_transferred;
+        bool canceled;
+        bool completion_delivered;
+    } synced_data;
+
+    /* Python object with the _on_complete() method. Released once completion is delivered. */
+    PyObject *py_core;
+};
+
+static void s_s3_batch_destroy(void *user_data) {
+    struct s3_batch_binding *batch = user_data;
+
+    for (size_t i = 0; i < batch->num_items; ++i) {
+        aws_string_destroy(batch->items[i].path);
+        aws_string_destroy(batch->items[i].filepath);
+        aws_string_destroy(batch->items[i].range);
+    }
+    aws_mem_release(batch->allocator, batch->items);
+    aws_string_destroy(batch->host);
+    aws_s3_client_release(batch->client);
+    aws_mutex_clean_up(&batch->lock);
+    aws_mem_release(batch->allocator, batch);
+}
+
+/* Deliver completion to python, if every item is finished. Must not be called with the lock held. */
+static void s_s3_batch_complete_if_done(struct s3_batch_binding *batch) {
+    bool complete = false;
+
+    /* BEGIN CRITICAL SECTION */
+    aws_mutex_lock(&batch->lock);
+    if (!batch->synced_data.completion_delivered && batch->synced_data.num_in_flight == 0 &&
+        (batch->synced_data.canceled || batch->synced_data.next_index == batch->num_items)) {
+        batch->synced_data.completion_delivered = true;
+        complete = true;
+    }
+    aws_mutex_unlock(&batch->lock);
+    /* END CRITICAL SECTION */
+
+    if (!complete) {
+        return;
+    }
+
+    /*************** GIL ACQUIRE ***************/
+    PyGILState_STATE state;
+    if (aws_py_gilstate_ensure(&state)) {
+        return; /* Python has shut down. Nothing matters anymore, but don't crash */
+    }
+
+    /* Build list of (index, error_code, status_code) for each item that didn't succeed.
+     * Items never started, due to cancellation, are reported with AWS_ERROR_S3_CANCELED. */
+    PyObject *failures = PyList_New(0);
+    if (!failures) {
+        PyErr_WriteUnraisable(batch->py_core);
+        goto done;
+    }
+    for (size_t i = 0; i < batch->num_items; ++i) {
+        struct s3_batch_item *item = &batch->items[i];
+        int error_code = item->finished ? item->error_code : AWS_ERROR_S3_CANCELED;
+        if (error_code == AWS_ERROR_SUCCESS) {
+            continue;
+        }
+        PyObject *failure = Py_BuildValue("(nii)", (Py_ssize_t)i, error_code, item->response_status);
+        if (!failure || PyList_Append(failures, failure)) {
+            Py_XDECREF(failure);
+            PyErr_WriteUnraisable(batch->py_core);
+            goto done;
+        }
+        Py_DECREF(failure);
+    }
+
+    PyObject *result = PyObject_CallMethod(batch->py_core, "_on_complete", "(O)", failures);
+    if (result) {
+        Py_DECREF(result);
+    } else {
+        PyErr_WriteUnraisable(batch->py_core);
+    }
+
+done:
+    Py_XDECREF(failures);
+    Py_CLEAR(batch->py_core);
+    PyGILState_Release(state);
+    /*************** GIL RELEASE ***************/
+}
+
+static void s_s3_batch_item_on_finish(
+    struct aws_s3_meta_request *meta_request,
+    const struct aws_s3_meta_request_result *meta_request_result,
+    void *user_data);
+
+static void s_s3_batch_item_on_shutdown(void *user_data) {
+    struct s3_batch_item *item = user_data;
+    aws_ref_count_release(&item->batch->ref_count);
+}
+
+static void s_s3_batch_item_on_progress(
+    struct aws_s3_meta_request *meta_request,
+    const struct aws_s3_meta_request_progress *progress,
+    void *user_data) {
+    (void)meta_request;
+    struct s3_batch_item *item = user_data;
+
+    aws_mutex_lock(&item->batch->lock);
+    item->batch->synced_data.bytes_transferred += progress->bytes_transferred;
+    aws_mutex_unlock(&item->batch->lock);
+}
+
+static int s_s3_batch_add_header(struct aws_http_message *message, const char *name, const struct aws_string *value) {
+    struct aws_http_header header = {
+        .name = aws_byte_cursor_from_c_str(name),
+        .value = aws_byte_cursor_from_string(value),
+    };
+    return aws_http_message_add_header(message, header);
+}
+
+static struct aws_s3_meta_request *s_s3_batch_item_start(struct s3_batch_item *item) {
+    struct s3_batch_binding *batch = item->batch;
+    struct aws_s3_meta_request *native = NULL;
+
+    struct aws_http_message *message = aws_http_message_new_request(batch->allocator);
+    if (aws_http_message_set_request_method(
+            message,
+            batch->type == AWS_S3_META_REQUEST_TYPE_PUT_OBJECT ? aws_byte_cursor_from_c_str("PUT")
+                                                               : aws_byte_cursor_from_c_str("GET")) ||
+        aws_http_message_set_request_path(message, aws_byte_cursor_from_string(item->path)) ||
+        s_s3_batch_add_header(message, "Host", batch->host)) {
+        goto done;
+    }
+    if (item->range && s_s3_batch_add_header(message, "Range", item->range)) {
+        goto done;
+    }
+
+    struct aws_byte_cursor filepath = aws_byte_cursor_from_string(item->filepath);
+    struct aws_s3_meta_request_options options = {
+        .type = batch->type,
+        .message = message,
+        .checksum_config = &batch->checksum_config,
+        .finish_callback = s_s3_batch_item_on_finish,
+        .shutdown_callback = s_s3_batch_item_on_shutdown,
+        .progress_callback = s_s3_batch_item_on_progress,
+        .user_data = item,
+    };
+    if (batch->type == AWS_S3_META_REQUEST_TYPE_PUT_OBJECT) {
+        options.send_filepath = filepath;
+    } else {
+        options.recv_filepath = filepath;
+    }
+
+    /* Signing config is NULL, so the client's is used */
+    native = aws_s3_client_make_meta_request(batch->client, &options);
+    if (native) {
+        aws_ref_count_acquire(&batch->ref_count);
+    }
+
+done:
+    aws_http_message_release(message);
+    return native;
+}
+
+/* Start items until max_concurrency are in flight. Must not be called with the lock held. */
+static void s_s3_batch_schedule(struct s3_batch_binding *batch) {
+    while (true) {
+        struct s3_batch_item *item = NULL;
+
+        /* BEGIN CRITICAL SECTION */
+        aws_mutex_lock(&batch->lock);
+        if (!batch->synced_data.canceled && batch->synced_data.next_index < batch->num_items &&
+            batch->synced_data.num_in_flight < batch->max_concurrency) {
+            item = &batch->items[batch->synced_data.next_index++];
+            batch->synced_data.num_in_flight++;
+        }
+        aws_mutex_unlock(&batch->lock);
+        /* END CRITICAL SECTION */
+
+        if (!item) {
+            break;
+        }
+
+        struct aws_s3_meta_request *native = s_s3_batch_item_start(item);
+        int error_code = native ? AWS_ERROR_SUCCESS : aws_last_error();
+
+        /* BEGIN CRITICAL SECTION */
+        aws_mutex_lock(&batch->lock);
+        if (!native) {
+            item->finished = true;
+            item->error_code = error_code ? error_code : AWS_ERROR_UNKNOWN;
+            batch->synced_data.num_in_flight--;
+            batch->synced_data.num_failed++;
+        } else if (!item->finished) {
+            item->native = native;
+            native = NULL;
+        }
+        aws_mutex_unlock(&batch->lock);
+        /* END CRITICAL SECTION */
+
+        /* If it already finished on another thread, we're responsible for releasing it */
+        aws_s3_meta_request_release(native);
+    }
+
+    s_s3_batch_complete_if_done(batch);
+}
+
+static void s_s3_batch_item_on_finish(
+    struct aws_s3_meta_request *meta_request,
+    const struct aws_s3_meta_request_result *meta_request_result,
+    void *user_data) {
+    (void)meta_request;
+    struct s3_batch_item *item = user_data;
+    struct s3_batch_binding *batch = item->batch;
+
+    /* BEGIN CRITICAL SECTION */
+    aws_mutex_lock(&batch->lock);
+    item->finished = true;
+    item->error_code = meta_request_result->error_code;
+    item->response_status = meta_request_result->response_status;
+    if (item->error_code) {
+        batch->synced_data.num_failed++;
+    } else {
+        batch->synced_data.num_succeeded++;
+    }
+    batch->synced_data.num_in_flight--;
+    /* If NULL, the scheduler hasn't stored it yet, and will release it */
+    struct aws_s3_meta_request *native = item->native;
+    item->native = NULL;
+    aws_mutex_unlock(&batch->lock);
+    /* END CRITICAL SECTION */
+
+    aws_s3_meta_request_release(native);
+
+    s_s3_batch_schedule(batch);
+}
+
+static void s_s3_batch_capsule_destructor(PyObject *capsule) {
+    struct s3_batch_binding *batch = PyCapsule_GetPointer(capsule, s_capsule_name_s3_batch);
+    aws_ref_count_release(&batch->ref_count);
+}
+
+static struct s3_batch_binding *s_get_s3_batch(PyObject *capsule) {
+    return PyCapsule_GetPointer(capsule, s_capsule_name_s3_batch);
+}
+
+/* Copy a python str into a new aws_string. Returns NULL, with python error set, on failure. */
+static struct aws_string *s_s3_batch_string_from_pyunicode(struct aws_allocator *allocator, PyObject *str) {
+    struct aws_byte_cursor cursor = aws_byte_cursor_from_pyunicode(str);
+    if (!cursor.ptr) {
+        PyErr_SetString(PyExc_TypeError, "Expected str");
+        return NULL;
+    }
+    return aws_string_new_from_cursor(allocator, &cursor);
+}
+
+PyObject *aws_py_s3_batch_new(PyObject *self, PyObject *args) {
+    (void)self;
+
+    struct aws_allocator *allocator = aws_py_get_allocator();
+
+    PyObject *s3_client_py;                            /* O */
+    int type;                                          /* i */
+    struct aws_byte_cursor host;                       /* s# */
+    PyObject *items_py;                                /* O */
+    Py_ssize_t max_concurrency;                        /* n */
+    enum aws_s3_checksum_algorithm checksum_algorithm; /* i */
+    enum aws_s3_checksum_location checksum_location;   /* i */
+    int validate_response_checksum;                    /* p - boolean predicate */
+    PyObject *py_core;                                 /* O */
+    if (!PyArg_ParseTuple(
+            args,
+            "Ois#OniipO",
+            &s3_client_py,
+            &type,
+            &host.ptr,
+            &host.len,
+            &items_py,
+            &max_concurrency,
+            &checksum_algorithm,
+            &checksum_location,
+            &validate_response_checksum,
+            &py_core)) {
+        return NULL;
+    }
+
+    struct aws_s3_client *s3_client = aws_py_get_s3_client(s3_client_py);
+    if (!s3_client) {
+        return NULL;
+    }
+
+    if (!PyList_Check(items_py)) {
+        PyErr_SetString(PyExc_TypeError, "Expected items to be a list.");
+        return NULL;
+    }
+    if (max_concurrency <= 0) {
+        PyErr_SetString(PyExc_ValueError, "max_concurrency must be positive.");
+        return NULL;
+    }
+
+    struct s3_batch_binding *batch = aws_mem_calloc(allocator, 1, sizeof(struct s3_batch_binding));
+    batch->allocator = allocator;
+    batch->client = aws_s3_client_acquire(s3_client);
+    batch->type = type;
+    batch->max_concurrency = (size_t)max_concurrency;
+    batch->checksum_config.checksum_algorithm = checksum_algorithm;
+    batch->checksum_config.location = checksum_location;
+    batch->checksum_config.validate_response_checksum = validate_response_checksum != 0;
+    batch->host = aws_string_new_from_cursor(allocator, &host);
+    aws_mutex_init(&batch->lock);
+    aws_ref_count_init(&batch->ref_count, batch, s_s3_batch_destroy);
+
+    /* From hereon, we need to clean up if errors occur */
+
+    PyObject *capsule = PyCapsule_New(batch, s_capsule_name_s3_batch, s_s3_batch_capsule_destructor);
+    if (!capsule) {
+        s_s3_batch_destroy(batch);
+        return NULL;
+    }
+
+    Py_ssize_t num_items = PyList_Size(items_py);
+    if (num_items < 0) {
+        goto error;
+    }
+    if (num_items > 0) {
+        batch->items = aws_mem_calloc(allocator, (size_t)num_items, sizeof(struct s3_batch_item));
+    }
+    batch->num_items = (size_t)num_items;
+
+    for (Py_ssize_t i = 0; i < num_items; ++i) {
+        struct s3_batch_item *item = &batch->items[i];
+        item->batch = batch;
+
+        PyObject *path_py = NULL;
+        PyObject *filepath_py = NULL;
+        PyObject *range_py = NULL;
+        bool strong_ref = false;
+#ifdef Py_GIL_DISABLED
+        PyObject *item_py = PyList_GetItemRef(items_py, i);
+        strong_ref = true;
+#else
+        PyObject *item_py = PyList_GetItem(items_py, i); /* Borrowed reference */
+#endif
+        if (!item_py) {
+            goto error;
+        }
+        bool parsed = PyArg_ParseTuple(item_py, "OOO", &path_py, &filepath_py, &range_py);
+        if (parsed) {
+            item->path = s_s3_batch_string_from_pyunicode(allocator, path_py);
+            item->filepath = item->path ? s_s3_batch_string_from_pyunicode(allocator, filepath_py) : NULL;
+            if (item->filepath && range_py != Py_None) {
+                item->range = s_s3_batch_string_from_pyunicode(allocator, range_py);
+            }
+            parsed = item->filepath && (range_py == Py_None || item->range);
+        }
+        if (strong_ref) {
+            Py_DECREF(item_py);
+        }
+        if (!parsed) {
+            goto error;
+        }
+    }
+
+    batch->py_core = py_core;
+    Py_INCREF(batch->py_core);
+
+    s_s3_batch_schedule(batch);
+
+    return capsule;
+
+error:
+    Py_DECREF(capsule);
+    return NULL;
+}
+
+PyObject *aws_py_s3_batch_get_progress(PyObject *self, PyObject *args) {
+    (void)self;
+
+    PyObject *capsule = NULL;
+    if (!PyArg_ParseTuple(args, "O", &capsule)) {
+        return NULL;
+    }
+
+    struct s3_batch_binding *batch = s_get_s3_batch(capsule);
+    if (!batch) {
+        return NULL;
+    }
+
+    aws_mutex_lock(&batch->lock);
+    size_t num_succeeded = batch->synced_data.num_succeeded;
+    size_t num_failed = batch->synced_data.num_failed;
+    size_t num_in_flight = batch->synced_data.num_in_flight;
+    uint64_t bytes_transferred = batch->synced_data.bytes_transferred;
+    aws_mutex_unlock(&batch->lock);
+
+    return Py_BuildValue("(nnnK)", num_succeeded, num_failed, num_in_flight, bytes_transferred);
+}
+
+PyObject *aws_py_s3_batch_cancel(PyObject *self, PyObject *args) {
+    (void)self;
+
+    PyObject *capsule = NULL;
+    if (!PyArg_ParseTuple(args, "O", &capsule)) {
+        return NULL;
+    }
+
+    struct s3_batch_binding *batch = s_get_s3_batch(capsule);
+    if (!batch) {
+        return NULL;
+    }
+
+    /* Stop scheduling, and grab a reference to everything in flight, so it can be canceled outside the lock */
+    struct aws_s3_meta_request **in_flight = NULL;
+    size_t num_in_flight = 0;
+
+    /* BEGIN CRITICAL SECTION */
+    aws_mutex_lock(&batch->lock);
+    batch->synced_data.canceled = true;
+    if (batch->synced_data.num_in_flight > 0) {
+        in_flight =
+            aws_mem_calloc(batch->allocator, batch->synced_data.num_in_flight, sizeof(struct aws_s3_meta_request *));
+        for (size_t i = 0; i < batch->synced_data.next_index && num_in_flight < batch->synced_data.num_in_flight; ++i) {
+            if (batch->items[i].native) {
+                in_flight[num_in_flight++] = aws_s3_meta_request_acquire(batch->items[i].native);
+            }
+        }
+    }
+    aws_mutex_unlock(&batch->lock);
+    /* END CRITICAL SECTION */
+
+    for (size_t i = 0; i < num_in_flight; ++i) {
+        aws_s3_meta_request_cancel(in_flight[i]);
+        aws_s3_meta_request_release(in_flight[i]);
+    }
+    aws_mem_release(batch->allocator, in_flight);
+
+    /* Nothing may have been in flight */
+    s_s3_batch_complete_if_done(batch);
+
+    Py_RETURN_NONE;
+}
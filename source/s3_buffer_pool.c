@@ -0,0 +1,357 @@
+/**
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0.
+ */
+#include "s3.h"
+
+#include <aws/common/linked_list.h>
+#include <aws/common/mutex.h>
+#include <aws/s3/s3_buffer_pool.h>
+
+/**
+ * A buffer pool that several clients can share, so one memory limit governs the part buffers of all of them.
+ * Implements the aws_s3_buffer_pool interface, and is handed to each client by its buffer pool factory.
+ *
+ * Reservations are granted in the order they arrive, while the memory reserved and used stays within the limit.
+ * Buffers of the pool's part size are kept for reuse once released, until the pool is trimmed or
+ * needs the memory for a buffer of another size.
+ */
+
+static const char *s_capsule_name_s3_buffer_pool = "aws_s3_buffer_pool";
+
+struct s3_shared_buffer_pool {
+    struct aws_s3_buffer_pool base;
+    struct aws_allocator *allocator;
+    size_t memory_limit;
+    size_t part_size;
+
+    struct aws_mutex lock;
+    struct {
+        /* Memory granted to tickets, whose buffers haven't been claimed yet */
+        size_t reserved;
+        /* Memory in buffers claimed by tickets */
+        size_t used;
+        /* Memory granted to tickets whose requests couldn't wait, whether claimed or not */
+        size_t forced;
+        /* Array of uint8_t *, released buffers of part_size kept for reuse */
+        struct aws_array_list free_buffers;
+        /* List of struct s3_pending_reservation, in the order they arrived */
+        struct aws_linked_list pending;
+    } synced_data;
+};
+
+struct s3_shared_buffer_ticket {
+    struct aws_s3_buffer_ticket base;
+    struct s3_shared_buffer_pool *pool;
+    size_t size;
+    bool forced;
+    /* Protected by the pool's lock */
+    uint8_t *buffer;
+};
+
+struct s3_pending_reservation {
+    struct aws_linked_list_node node;
+    struct aws_future_s3_buffer_ticket *future;
+    size_t size;
+    struct aws_s3_buffer_ticket *ticket;
+};
+
+static void s_ticket_destroy(void *user_data);
+
+static struct aws_byte_buf s_ticket_claim(struct aws_s3_buffer_ticket *ticket_base) {
+    struct s3_shared_buffer_ticket *ticket = ticket_base->impl;
+    struct s3_shared_buffer_pool *pool = ticket->pool;
+
+    /* BEGIN CRITICAL SECTION */
+    aws_mutex_lock(&pool->lock);
+    if (ticket->buffer == NULL) {
+        if (ticket->size == pool->part_size && aws_array_list_length(&pool->synced_data.free_buffers) > 0) {
+            aws_array_list_back(&pool->synced_data.free_buffers, &ticket->buffer);
+            aws_array_list_pop_back(&pool->synced_data.free_buffers);
+        } else {
+            ticket->buffer = aws_mem_acquire(pool->allocator, ticket->size);
+        }
+        pool->synced_data.reserved -= ticket->size;
+        pool->synced_data.used += ticket->size;
+    }
+    aws_mutex_unlock(&pool->lock);
+    /* END CRITICAL SECTION */
+
+    return aws_byte_buf_from_empty_array(ticket->buffer, ticket->size);
+}
+
+static struct aws_s3_buffer_ticket_vtable s_ticket_vtable = {
+    .claim = s_ticket_claim,
+};
+
+static struct aws_s3_buffer_ticket *s_ticket_new(struct s3_shared_buffer_pool *pool, size_t size, bool forced) {
+    struct s3_shared_buffer_ticket *ticket = aws_mem_calloc(pool->allocator, 1, sizeof(struct s3_shared_buffer_ticket));
+    ticket->base.vtable = &s_ticket_vtable;
+    ticket->base.impl = ticket;
+    aws_ref_count_init(&ticket->base.ref_count, ticket, s_ticket_destroy);
+    ticket->pool = pool;
+    aws_s3_buffer_pool_acquire(&pool->base);
+    ticket->size = size;
+    ticket->forced = forced;
+    return &ticket->base;
+}
+
+static size_t s_cached_size_synced(struct s3_shared_buffer_pool *pool) {
+    return aws_array_list_length(&pool->synced_data.free_buffers) * pool->part_size;
+}
+
+static void s_free_cached_buffers_synced(struct s3_shared_buffer_pool *pool, size_t max_cached_size) {
+    while (s_cached_size_synced(pool) > max_cached_size) {
+        uint8_t *buffer = NULL;
+        aws_array_list_back(&pool->synced_data.free_buffers, &buffer);
+        aws_array_list_pop_back(&pool->synced_data.free_buffers);
+        aws_mem_release(pool->allocator, buffer);
+    }
+}
+
+/* Returns a ticket if there's room for a buffer of this size, freeing cached buffers to make room if necessary */
+static struct aws_s3_buffer_ticket *s_try_reserve_synced(struct s3_shared_buffer_pool *pool, size_t size) {
+    size_t taken = pool->synced_data.reserved + pool->synced_data.used;
+    if (taken + size > pool->memory_limit) {
+        return NULL;
+    }
+
+    /* A buffer of the part size might come from the cache. Otherwise, make room for a new allocation. */
+    size_t room_for_cache = pool->memory_limit - taken;
+    if (size != pool->part_size || aws_array_list_length(&pool->synced_data.free_buffers) == 0) {
+        room_for_cache -= size;
+    }
+    s_free_cached_buffers_synced(pool, room_for_cache);
+
+    pool->synced_data.reserved += size;
+    return s_ticket_new(pool, size, false /*forced*/);
+}
+
+static void s_ticket_destroy(void *user_data) {
+    struct s3_shared_buffer_ticket *ticket = user_data;
+    struct s3_shared_buffer_pool *pool = ticket->pool;
+
+    struct aws_linked_list granted;
+    aws_linked_list_init(&granted);
+    struct aws_linked_list abandoned;
+    aws_linked_list_init(&abandoned);
+
+    /* BEGIN CRITICAL SECTION */
+    aws_mutex_lock(&pool->lock);
+    if (ticket->buffer) {
+        pool->synced_data.used -= ticket->size;
+        if (ticket->size == pool->part_size) {
+            aws_array_list_push_back(&pool->synced_data.free_buffers, &ticket->buffer);
+        } else {
+            aws_mem_release(pool->allocator, ticket->buffer);
+        }
+    } else {
+        pool->synced_data.reserved -= ticket->size;
+    }
+    if (ticket->forced) {
+        pool->synced_data.forced -= ticket->size;
+    }
+
+    /* Pending reservations are only done already if their request gave up on them (ex: it was cancelled) */
+    struct aws_linked_list_node *node = aws_linked_list_begin(&pool->synced_data.pending);
+    while (node != aws_linked_list_end(&pool->synced_data.pending)) {
+        struct s3_pending_reservation *pending = AWS_CONTAINER_OF(node, struct s3_pending_reservation, node);
+        node = aws_linked_list_next(node);
+        if (aws_future_s3_buffer_ticket_is_done(pending->future)) {
+            aws_linked_list_remove(&pending->node);
+            aws_linked_list_push_back(&abandoned, &pending->node);
+        }
+    }
+
+    while (!aws_linked_list_empty(&pool->synced_data.pending)) {
+        struct s3_pending_reservation *pending =
+            AWS_CONTAINER_OF(aws_linked_list_front(&pool->synced_data.pending), struct s3_pending_reservation, node);
+        pending->ticket = s_try_reserve_synced(pool, pending->size);
+        if (!pending->ticket) {
+            break;
+        }
+        aws_linked_list_pop_front(&pool->synced_data.pending);
+        aws_linked_list_push_back(&granted, &pending->node);
+    }
+    aws_mutex_unlock(&pool->lock);
+    /* END CRITICAL SECTION */
+
+    /* Complete futures outside the lock, their callbacks may release other tickets */
+    while (!aws_linked_list_empty(&abandoned)) {
+        struct s3_pending_reservation *pending =
+            AWS_CONTAINER_OF(aws_linked_list_pop_front(&abandoned), struct s3_pending_reservation, node);
+        aws_future_s3_buffer_ticket_release(pending->future);
+        aws_mem_release(pool->allocator, pending);
+    }
+    while (!aws_linked_list_empty(&granted)) {
+        struct s3_pending_reservation *pending =
+            AWS_CONTAINER_OF(aws_linked_list_pop_front(&granted), struct s3_pending_reservation, node);
+        /* If the request gave up in the meantime, the future releases the ticket */
+        aws_future_s3_buffer_ticket_set_result_by_move(pending->future, &pending->ticket);
+        aws_future_s3_buffer_ticket_release(pending->future);
+        aws_mem_release(pool->allocator, pending);
+    }
+
+    aws_mem_release(pool->allocator, ticket);
+    aws_s3_buffer_pool_release(&pool->base);
+}
+
+static struct aws_future_s3_buffer_ticket *s_pool_reserve(
+    struct aws_s3_buffer_pool *pool_base,
+    struct aws_s3_buffer_pool_reserve_meta meta) {
+
+    struct s3_shared_buffer_pool *pool = pool_base->impl;
+    struct aws_future_s3_buffer_ticket *future = aws_future_s3_buffer_ticket_new(pool->allocator);
+
+    /* Waiting wouldn't help, it can never fit */
+    if (meta.size > pool->memory_limit) {
+        aws_future_s3_buffer_ticket_set_error(future, AWS_ERROR_S3_PART_SIZE_EXCEEDS_MEMORY_LIMIT);
+        return future;
+    }
+
+    struct aws_s3_buffer_ticket *ticket = NULL;
+
+    /* BEGIN CRITICAL SECTION */
+    aws_mutex_lock(&pool->lock);
+    if (meta.can_block) {
+        /* The request can't make progress without it, so it's granted even if it exceeds the limit */
+        pool->synced_data.reserved += meta.size;
+        pool->synced_data.forced += meta.size;
+        ticket = s_ticket_new(pool, meta.size, true /*forced*/);
+    } else if (aws_linked_list_empty(&pool->synced_data.pending)) {
+        ticket = s_try_reserve_synced(pool, meta.size);
+    }
+
+    if (!ticket) {
+        struct s3_pending_reservation *pending =
+            aws_mem_calloc(pool->allocator, 1, sizeof(struct s3_pending_reservation));
+        pending->future = aws_future_s3_buffer_ticket_acquire(future);
+        pending->size = meta.size;
+        aws_linked_list_push_back(&pool->synced_data.pending, &pending->node);
+    }
+    aws_mutex_unlock(&pool->lock);
+    /* END CRITICAL SECTION */
+
+    if (ticket) {
+        aws_future_s3_buffer_ticket_set_result_by_move(future, &ticket);
+    }
+    return future;
+}
+
+static void s_pool_trim(struct aws_s3_buffer_pool *pool_base) {
+    struct s3_shared_buffer_pool *pool = pool_base->impl;
+
+    /* BEGIN CRITICAL SECTION */
+    aws_mutex_lock(&pool->lock);
+    s_free_cached_buffers_synced(pool, 0);
+    aws_mutex_unlock(&pool->lock);
+    /* END CRITICAL SECTION */
+}
+
+static struct aws_s3_buffer_pool_vtable s_pool_vtable = {
+    .reserve = s_pool_reserve,
+    .trim = s_pool_trim,
+};
+
+static void s_pool_destroy(void *user_data) {
+    struct s3_shared_buffer_pool *pool = user_data;
+
+    /* Clients release the pool once their requests are done, so nothing can be pending but abandoned reservations */
+    while (!aws_linked_list_empty(&pool->synced_data.pending)) {
+        struct s3_pending_reservation *pending = AWS_CONTAINER_OF(
+            aws_linked_list_pop_front(&pool->synced_data.pending), struct s3_pending_reservation, node);
+        aws_future_s3_buffer_ticket_release(pending->future);
+        aws_mem_release(pool->allocator, pending);
+    }
+
+    s_free_cached_buffers_synced(pool, 0);
+    aws_array_list_clean_up(&pool->synced_data.free_buffers);
+    aws_mutex_clean_up(&pool->lock);
+    aws_mem_release(pool->allocator, pool);
+}
+
+/* Invoked when the python object gets cleaned up. Clients using the pool keep it alive. */
+static void s_s3_buffer_pool_capsule_destructor(PyObject *capsule) {
+    struct s3_shared_buffer_pool *pool = PyCapsule_GetPointer(capsule, s_capsule_name_s3_buffer_pool);
+    aws_s3_buffer_pool_release(&pool->base);
+}
+
+PyObject *aws_py_s3_buffer_pool_new(PyObject *self, PyObject *args) {
+    (void)self;
+
+    struct aws_allocator *allocator = aws_py_get_allocator();
+
+    uint64_t memory_limit; /* K */
+    uint64_t part_size;    /* K */
+
+    if (!PyArg_ParseTuple(args, "KK", &memory_limit, &part_size)) {
+        return NULL;
+    }
+
+    struct s3_shared_buffer_pool *pool = aws_mem_calloc(allocator, 1, sizeof(struct s3_shared_buffer_pool));
+    pool->base.vtable = &s_pool_vtable;
+    pool->base.impl = pool;
+    aws_ref_count_init(&pool->base.ref_count, pool, s_pool_destroy);
+    pool->allocator = allocator;
+    pool->memory_limit = (size_t)memory_limit;
+    pool->part_size = (size_t)part_size;
+    aws_mutex_init(&pool->lock);
+    aws_array_list_init_dynamic(&pool->synced_data.free_buffers, allocator, 16, sizeof(uint8_t *));
+    aws_linked_list_init(&pool->synced_data.pending);
+
+    PyObject *capsule = PyCapsule_New(pool, s_capsule_name_s3_buffer_pool, s_s3_buffer_pool_capsule_destructor);
+    if (!capsule) {
+        aws_s3_buffer_pool_release(&pool->base);
+        return NULL;
+    }
+
+    return capsule;
+}
+
+struct aws_s3_buffer_pool *aws_py_get_s3_buffer_pool(PyObject *s3_buffer_pool) {
+    struct s3_shared_buffer_pool *pool =
+        aws_py_get_binding(s3_buffer_pool, s_capsule_name_s3_buffer_pool, "S3BufferPool");
+    if (!pool) {
+        return NULL;
+    }
+    return &pool->base;
+}
+
+PyObject *aws_py_s3_buffer_pool_get_usage(PyObject *self, PyObject *args) {
+    (void)self;
+
+    PyObject *pool_py; /* O */
+
+    if (!PyArg_ParseTuple(args, "O", &pool_py)) {
+        return NULL;
+    }
+
+    struct s3_shared_buffer_pool *pool = aws_py_get_binding(pool_py, s_capsule_name_s3_buffer_pool, "S3BufferPool");
+    if (!pool) {
+        return NULL;
+    }
+
+    /* BEGIN CRITICAL SECTION */
+    aws_mutex_lock(&pool->lock);
+    size_t reserved = pool->synced_data.reserved;
+    size_t used = pool->synced_data.used;
+    size_t forced = pool->synced_data.forced;
+    size_t cached = s_cached_size_synced(pool);
+    size_t num_pending = 0;
+    for (struct aws_linked_list_node *node = aws_linked_list_begin(&pool->synced_data.pending);
+         node != aws_linked_list_end(&pool->synced_data.pending);
+         node = aws_linked_list_next(node)) {
+        ++num_pending;
+    }
+    aws_mutex_unlock(&pool->lock);
+    /* END CRITICAL SECTION */
+
+    return Py_BuildValue(
+        "(KKKKKn)",
+        (unsigned long long)pool->memory_limit,
+        (unsigned long long)(used + cached),
+        (unsigned long long)used,
+        (unsigned long long)reserved,
+        (unsigned long long)forced,
+        (Py_ssize_t)num_pending);
+}
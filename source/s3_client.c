@@ -11,6 +11,7 @@
 #include <aws/common/cross_process_lock.h>
 #include <aws/common/hash_table.h>
 #include <aws/common/string.h>
+#include <aws/s3/s3_buffer_pool.h>
 #include <aws/s3/s3_client.h>
 
 static const char *s_capsule_name_s3_client = "aws_s3_client";
@@ -184,6 +185,17 @@ PyObject *aws_py_s3_cross_process_lock_release(PyObject *self, PyObject *args) {
     Py_RETURN_NONE;
 }
 
+/* Factory passed to aws_s3_client_new(), handing each client a reference to the shared pool */
+static struct aws_s3_buffer_pool *s_s3_shared_buffer_pool_factory(
+    struct aws_allocator *allocator,
+    struct aws_s3_buffer_pool_config config,
+    void *user_data) {
+
+    (void)allocator;
+    (void)config;
+    return aws_s3_buffer_pool_acquire(user_data);
+}
+
 struct s3_client_binding {
     struct aws_s3_client *native;
 
@@ -263,11 +275,14 @@ PyObject *aws_py_s3_client_new(PyObject *self, PyObject *args) {
     double disk_throughput_gbps;              /* d */
     int direct_io;                            /* p - boolean predicate */
     uint64_t max_active_connections_override; /* K */
+    int enable_read_backpressure;             /* p - boolean predicate */
+    uint64_t initial_read_window;             /* K */
+    PyObject *buffer_pool_py;                 /* O */
     PyObject *py_core;                        /* O */
 
     if (!PyArg_ParseTuple(
             args,
-            "OOOOOs#iKKdpKOppdpKO",
+            "OOOOOs#iKKdpKOppdpKpKOO",
             &bootstrap_py,
             &signing_config_py,
             &credential_provider_py,
@@ -287,10 +302,21 @@ PyObject *aws_py_s3_client_new(PyObject *self, PyObject *args) {
             &disk_throughput_gbps,
             &direct_io,
             &max_active_connections_override,
+            &enable_read_backpressure,
+            &initial_read_window,
+            &buffer_pool_py,
             &py_core)) {
         return NULL;
     }
 
+    struct aws_s3_buffer_pool *buffer_pool = NULL;
+    if (buffer_pool_py != Py_None) {
+        buffer_pool = aws_py_get_s3_buffer_pool(buffer_pool_py);
+        if (!buffer_pool) {
+            return NULL;
+        }
+    }
+
     struct aws_client_bootstrap *bootstrap = aws_py_get_client_bootstrap(bootstrap_py);
     if (!bootstrap) {
         return NULL;
@@ -412,6 +438,10 @@ PyObject *aws_py_s3_client_new(PyObject *self, PyObject *args) {
         /* If fio options not set, let native code to decide the default instead */
         .fio_opts = fio_options_set ? &fio_opts : NULL,
         .max_active_connections_override = max_active_connections_override,
+        .enable_read_backpressure = enable_read_backpressure != 0,
+        .initial_read_window = (size_t)initial_read_window,
+        .buffer_pool_factory_fn = buffer_pool ? s_s3_shared_buffer_pool_factory : NULL,
+        .buffer_pool_user_data = buffer_pool,
     };
 
     s3_client->native = aws_s3_client_new(allocator, &s3_config);
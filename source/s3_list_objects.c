@@ -0,0 +1,343 @@
+/**
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0.
+ */
+#include "s3.h"
+
+#include <aws/common/xml_parser.h>
+
+#include <string.h>
+
+/**
+ * Parsing of ListObjectsV2 response bodies.
+ * The whole page is parsed without the GIL, into plain C structures,
+ * and then converted to python objects in one pass.
+ */
+
+struct s3_listed_object {
+    struct aws_byte_buf key;
+    struct aws_byte_buf etag;
+    struct aws_byte_cursor last_modified;
+    struct aws_byte_cursor storage_class;
+    uint64_t size;
+};
+
+struct s3_list_objects_page {
+    struct aws_allocator *allocator;
+    /* Array of struct s3_listed_object */
+    struct aws_array_list objects;
+    /* Array of struct aws_byte_buf */
+    struct aws_array_list common_prefixes;
+    struct aws_byte_buf next_continuation_token;
+    bool is_truncated;
+};
+
+/* Append the UTF-8 encoding of an XML character reference's code point */
+static int s_append_code_point(struct aws_byte_buf *dest, uint64_t code_point) {
+    uint8_t encoded[4];
+    size_t len;
+    if (code_point == 0 || (code_point >= 0xD800 && code_point <= 0xDFFF) || code_point > 0x10FFFF) {
+        return aws_raise_error(AWS_ERROR_INVALID_XML);
+    }
+    if (code_point < 0x80) {
+        encoded[0] = (uint8_t)code_point;
+        len = 1;
+    } else if (code_point < 0x800) {
+        encoded[0] = (uint8_t)(0xC0 | (code_point >> 6));
+        encoded[1] = (uint8_t)(0x80 | (code_point & 0x3F));
+        len = 2;
+    } else if (code_point < 0x10000) {
+        encoded[0] = (uint8_t)(0xE0 | (code_point >> 12));
+        encoded[1] = (uint8_t)(0x80 | ((code_point >> 6) & 0x3F));
+        encoded[2] = (uint8_t)(0x80 | (code_point & 0x3F));
+        len = 3;
+    } else {
+        encoded[0] = (uint8_t)(0xF0 | (code_point >> 18));
+        encoded[1] = (uint8_t)(0x80 | ((code_point >> 12) & 0x3F));
+        encoded[2] = (uint8_t)(0x80 | ((code_point >> 6) & 0x3F));
+        encoded[3] = (uint8_t)(0x80 | (code_point & 0x3F));
+        len = 4;
+    }
+    struct aws_byte_cursor cursor = aws_byte_cursor_from_array(encoded, len);
+    return aws_byte_buf_append_dynamic(dest, &cursor);
+}
+
+/* Append the character an entity reference (including its '&' and ';') stands for */
+static int s_append_entity(struct aws_byte_buf *dest, struct aws_byte_cursor entity) {
+    static const struct {
+        const char *reference;
+        uint8_t character;
+    } s_predefined_entities[] = {
+        {"&amp;", '&'},
+        {"&lt;", '<'},
+        {"&gt;", '>'},
+        {"&quot;", '"'},
+        {"&apos;", '\''},
+    };
+    for (size_t i = 0; i < AWS_ARRAY_SIZE(s_predefined_entities); ++i) {
+        if (aws_byte_cursor_eq_c_str(&entity, s_predefined_entities[i].reference)) {
+            return aws_byte_buf_append_byte_dynamic(dest, s_predefined_entities[i].character);
+        }
+    }
+
+    /* Character reference: "&#NNN;" or "&#xHHH;" */
+    if (entity.len < 4 || entity.ptr[1] != '#') {
+        return aws_raise_error(AWS_ERROR_INVALID_XML);
+    }
+    struct aws_byte_cursor digits = aws_byte_cursor_from_array(entity.ptr + 2, entity.len - 3);
+    uint64_t code_point = 0;
+    if (digits.ptr[0] == 'x' || digits.ptr[0] == 'X') {
+        aws_byte_cursor_advance(&digits, 1);
+        if (digits.len == 0 || aws_byte_cursor_utf8_parse_u64_hex(digits, &code_point)) {
+            return aws_raise_error(AWS_ERROR_INVALID_XML);
+        }
+    } else if (aws_byte_cursor_utf8_parse_u64(digits, &code_point)) {
+        return aws_raise_error(AWS_ERROR_INVALID_XML);
+    }
+    return s_append_code_point(dest, code_point);
+}
+
+/* aws_xml_node_as_body() gives the raw text, so decode its entity references while appending it to dest */
+static int s_append_node_body(struct aws_xml_node *node, struct aws_byte_buf *dest) {
+    struct aws_byte_cursor body;
+    if (aws_xml_node_as_body(node, &body)) {
+        return AWS_OP_ERR;
+    }
+
+    while (body.len > 0) {
+        const uint8_t *ampersand = memchr(body.ptr, '&', body.len);
+        size_t text_len = ampersand ? (size_t)(ampersand - body.ptr) : body.len;
+        struct aws_byte_cursor text = aws_byte_cursor_advance(&body, text_len);
+        if (aws_byte_buf_append_dynamic(dest, &text)) {
+            return AWS_OP_ERR;
+        }
+        if (body.len == 0) {
+            break;
+        }
+
+        const uint8_t *semicolon = memchr(body.ptr, ';', body.len);
+        if (!semicolon) {
+            return aws_raise_error(AWS_ERROR_INVALID_XML);
+        }
+        struct aws_byte_cursor entity = aws_byte_cursor_advance(&body, (size_t)(semicolon - body.ptr) + 1);
+        if (s_append_entity(dest, entity)) {
+            return AWS_OP_ERR;
+        }
+    }
+    return AWS_OP_SUCCESS;
+}
+
+static int s_on_contents_child(struct aws_xml_node *node, void *user_data) {
+    struct s3_list_objects_page *page = user_data;
+    struct s3_listed_object *object = NULL;
+    aws_array_list_get_at_ptr(&page->objects, (void **)&object, aws_array_list_length(&page->objects) - 1);
+
+    struct aws_byte_cursor name = aws_xml_node_get_name(node);
+    if (aws_byte_cursor_eq_c_str(&name, "Key")) {
+        return s_append_node_body(node, &object->key);
+    }
+    if (aws_byte_cursor_eq_c_str(&name, "ETag")) {
+        return s_append_node_body(node, &object->etag);
+    }
+    if (aws_byte_cursor_eq_c_str(&name, "LastModified")) {
+        return aws_xml_node_as_body(node, &object->last_modified);
+    }
+    if (aws_byte_cursor_eq_c_str(&name, "StorageClass")) {
+        return aws_xml_node_as_body(node, &object->storage_class);
+    }
+    if (aws_byte_cursor_eq_c_str(&name, "Size")) {
+        struct aws_byte_cursor size;
+        if (aws_xml_node_as_body(node, &size)) {
+            return AWS_OP_ERR;
+        }
+        return aws_byte_cursor_utf8_parse_u64(size, &object->size);
+    }
+    return AWS_OP_SUCCESS;
+}
+
+static int s_on_common_prefixes_child(struct aws_xml_node *node, void *user_data) {
+    struct s3_list_objects_page *page = user_data;
+
+    struct aws_byte_cursor name = aws_xml_node_get_name(node);
+    if (aws_byte_cursor_eq_c_str(&name, "Prefix")) {
+        struct aws_byte_buf prefix;
+        aws_byte_buf_init(&prefix, page->allocator, 0);
+        if (s_append_node_body(node, &prefix)) {
+            aws_byte_buf_clean_up(&prefix);
+            return AWS_OP_ERR;
+        }
+        aws_array_list_push_back(&page->common_prefixes, &prefix);
+    }
+    return AWS_OP_SUCCESS;
+}
+
+static int s_on_list_bucket_result_child(struct aws_xml_node *node, void *user_data) {
+    struct s3_list_objects_page *page = user_data;
+
+    struct aws_byte_cursor name = aws_xml_node_get_name(node);
+    if (aws_byte_cursor_eq_c_str(&name, "Contents")) {
+        struct s3_listed_object object;
+        AWS_ZERO_STRUCT(object);
+        aws_byte_buf_init(&object.key, page->allocator, 0);
+        aws_byte_buf_init(&object.etag, page->allocator, 0);
+        aws_array_list_push_back(&page->objects, &object);
+        return aws_xml_node_traverse(node, s_on_contents_child, page);
+    }
+    if (aws_byte_cursor_eq_c_str(&name, "CommonPrefixes")) {
+        return aws_xml_node_traverse(node, s_on_common_prefixes_child, page);
+    }
+    if (aws_byte_cursor_eq_c_str(&name, "IsTruncated")) {
+        struct aws_byte_cursor value;
+        if (aws_xml_node_as_body(node, &value)) {
+            return AWS_OP_ERR;
+        }
+        page->is_truncated = aws_byte_cursor_eq_c_str_ignore_case(&value, "true");
+        return AWS_OP_SUCCESS;
+    }
+    if (aws_byte_cursor_eq_c_str(&name, "NextContinuationToken")) {
+        return s_append_node_body(node, &page->next_continuation_token);
+    }
+    return AWS_OP_SUCCESS;
+}
+
+static int s_on_root(struct aws_xml_node *node, void *user_data) {
+    struct aws_byte_cursor name = aws_xml_node_get_name(node);
+    if (!aws_byte_cursor_eq_c_str(&name, "ListBucketResult")) {
+        return aws_raise_error(AWS_ERROR_INVALID_XML);
+    }
+    return aws_xml_node_traverse(node, s_on_list_bucket_result_child, user_data);
+}
+
+static void s_page_clean_up(struct s3_list_objects_page *page) {
+    for (size_t i = 0; i < aws_array_list_length(&page->objects); ++i) {
+        struct s3_listed_object *object = NULL;
+        aws_array_list_get_at_ptr(&page->objects, (void **)&object, i);
+        aws_byte_buf_clean_up(&object->key);
+        aws_byte_buf_clean_up(&object->etag);
+    }
+    aws_array_list_clean_up(&page->objects);
+
+    for (size_t i = 0; i < aws_array_list_length(&page->common_prefixes); ++i) {
+        struct aws_byte_buf *prefix = NULL;
+        aws_array_list_get_at_ptr(&page->common_prefixes, (void **)&prefix, i);
+        aws_byte_buf_clean_up(prefix);
+    }
+    aws_array_list_clean_up(&page->common_prefixes);
+
+    aws_byte_buf_clean_up(&page->next_continuation_token);
+}
+
+static PyObject *s_str_from_buf(const struct aws_byte_buf *buf) {
+    return PyUnicode_FromStringAndSize((const char *)buf->buffer, (Py_ssize_t)buf->len);
+}
+
+/* Returns (objects, common_prefixes, next_continuation_token) for the parsed page */
+static PyObject *s_page_to_python(struct s3_list_objects_page *page) {
+    PyObject *objects = NULL;
+    PyObject *common_prefixes = NULL;
+    PyObject *next_continuation_token = NULL;
+
+    size_t num_objects = aws_array_list_length(&page->objects);
+    objects = PyList_New((Py_ssize_t)num_objects);
+    if (!objects) {
+        goto error;
+    }
+    for (size_t i = 0; i < num_objects; ++i) {
+        struct s3_listed_object *object = NULL;
+        aws_array_list_get_at_ptr(&page->objects, (void **)&object, i);
+        PyObject *object_py = Py_BuildValue(
+            "(s#Ks#s#s#)",
+            (const char *)object->key.buffer,
+            (Py_ssize_t)object->key.len,
+            (unsigned long long)object->size,
+            (const char *)object->etag.buffer,
+            (Py_ssize_t)object->etag.len,
+            (const char *)object->last_modified.ptr,
+            (Py_ssize_t)object->last_modified.len,
+            (const char *)object->storage_class.ptr,
+            (Py_ssize_t)object->storage_class.len);
+        if (!object_py) {
+            goto error;
+        }
+        PyList_SetItem(objects, (Py_ssize_t)i, object_py); /* Steals a reference */
+    }
+
+    size_t num_prefixes = aws_array_list_length(&page->common_prefixes);
+    common_prefixes = PyList_New((Py_ssize_t)num_prefixes);
+    if (!common_prefixes) {
+        goto error;
+    }
+    for (size_t i = 0; i < num_prefixes; ++i) {
+        struct aws_byte_buf *prefix = NULL;
+        aws_array_list_get_at_ptr(&page->common_prefixes, (void **)&prefix, i);
+        PyObject *prefix_py = s_str_from_buf(prefix);
+        if (!prefix_py) {
+            goto error;
+        }
+        PyList_SetItem(common_prefixes, (Py_ssize_t)i, prefix_py); /* Steals a reference */
+    }
+
+    if (page->is_truncated && page->next_continuation_token.len > 0) {
+        next_continuation_token = s_str_from_buf(&page->next_continuation_token);
+        if (!next_continuation_token) {
+            goto error;
+        }
+    } else {
+        next_continuation_token = Py_None;
+        Py_INCREF(next_continuation_token);
+    }
+
+    /* "N" steals the references */
+    return Py_BuildValue("(NNN)", objects, common_prefixes, next_continuation_token);
+
+error:
+    Py_XDECREF(objects);
+    Py_XDECREF(common_prefixes);
+    Py_XDECREF(next_continuation_token);
+    return NULL;
+}
+
+PyObject *aws_py_s3_parse_list_objects_v2(PyObject *self, PyObject *args) {
+    (void)self;
+
+    Py_buffer body_stack; /* s* */
+    if (!PyArg_ParseTuple(args, "s*", &body_stack)) {
+        return NULL;
+    }
+
+    struct aws_allocator *allocator = aws_py_get_allocator();
+    PyObject *result = NULL;
+
+    struct s3_list_objects_page page;
+    AWS_ZERO_STRUCT(page);
+    page.allocator = allocator;
+    aws_array_list_init_dynamic(&page.objects, allocator, 64, sizeof(struct s3_listed_object));
+    aws_array_list_init_dynamic(&page.common_prefixes, allocator, 0, sizeof(struct aws_byte_buf));
+    aws_byte_buf_init(&page.next_continuation_token, allocator, 0);
+
+    struct aws_xml_parser_options parser_options = {
+        .doc = aws_byte_cursor_from_array(body_stack.buf, (size_t)body_stack.len),
+        .max_depth = 16,
+        .on_root_encountered = s_on_root,
+        .user_data = &page,
+    };
+
+    int parse_result;
+    /* clang-format off */
+    Py_BEGIN_ALLOW_THREADS
+        parse_result = aws_xml_parse(allocator, &parser_options);
+    Py_END_ALLOW_THREADS
+
+    if (parse_result) {
+        PyErr_SetAwsLastError();
+        goto done;
+    }
+    /* clang-format on */
+
+    result = s_page_to_python(&page);
+
+done:
+    s_page_clean_up(&page);
+    PyBuffer_Release(&body_stack);
+    return result;
+}
@@ -11,23 +11,53 @@
 
 #include <aws/common/clock.h>
 #include <aws/common/file.h>
+#include <aws/common/mutex.h>
 #include <aws/http/request_response.h>
 #include <aws/io/file_utils.h>
+#include <aws/io/future.h>
 #include <aws/io/stream.h>
 #include <aws/s3/s3_client.h>
 
 static const char *s_capsule_name_s3_meta_request = "aws_s3_meta_request";
 
+/* Fixed-size string fields of a packed metrics record */
+#define S3_METRICS_OPERATION_NAME_LEN 32
+#define S3_METRICS_IP_ADDRESS_LEN 48
+/* Total size of a packed metrics record, see s_s3_request_on_telemetry() */
+#define S3_METRICS_RECORD_SIZE (S3_METRICS_OPERATION_NAME_LEN + S3_METRICS_IP_ADDRESS_LEN + 4 * 4 + 12 * 8 + 1)
+
 struct s3_meta_request_binding {
     struct aws_s3_meta_request *native;
 
     /* Reference to python object that reference to other related python object to keep it alive */
     PyObject *py_core;
 
+    /* If true, body chunks are delivered to python as a read-only memoryview of body_pool,
+     * a bytearray reused between callbacks. Otherwise, chunks are copied into new bytes. */
+    bool body_as_memoryview;
+    PyObject *body_pool;
+
+    /* If set, body chunks are copied straight into this caller-provided writable buffer
+     * without calling into python. The first byte of the response body lands at offset 0. */
+    Py_buffer recv_buffer;
+    bool has_recv_buffer;
+    bool recv_buffer_origin_set;
+    /* Object offset of the first byte of the response body */
+    uint64_t recv_buffer_origin;
+
     /* Batch up the transferred size in one sec. */
     uint64_t size_transferred;
+    /* Total transferred size. For a GET with recv_filepath, the bytes written to the file so far,
+     * since the body is written in order before its progress is reported. */
+    uint64_t total_transferred;
     /* The time stamp when the progress reported */
     uint64_t last_sampled_time;
+
+    /* If true, the metrics of each request attempt are packed into metrics_records.
+     * See s_s3_request_on_telemetry() for the layout. */
+    bool collect_metrics;
+    struct aws_mutex metrics_lock;
+    struct aws_byte_buf metrics_records;
 };
 
 struct aws_s3_meta_request *aws_py_get_s3_meta_request(PyObject *meta_request) {
@@ -36,7 +66,13 @@ struct aws_s3_meta_request *aws_py_get_s3_meta_request(PyObject *meta_request) {
 }
 
 static void s_destroy(struct s3_meta_request_binding *meta_request) {
+    if (meta_request->has_recv_buffer) {
+        PyBuffer_Release(&meta_request->recv_buffer);
+    }
     Py_XDECREF(meta_request->py_core);
+    Py_XDECREF(meta_request->body_pool);
+    aws_byte_buf_clean_up(&meta_request->metrics_records);
+    aws_mutex_clean_up(&meta_request->metrics_lock);
     aws_mem_release(aws_py_get_allocator(), meta_request);
 }
 
@@ -116,6 +152,7 @@ static int s_record_progress(struct s3_meta_request_binding *request_binding, ui
         /* Wow */
         return AWS_OP_ERR;
     }
+    request_binding->total_transferred = aws_add_u64_saturating(request_binding->total_transferred, length);
     uint64_t now;
     if (aws_high_res_clock_get_ticks(&now)) {
         return AWS_OP_ERR;
@@ -132,6 +169,32 @@ static int s_record_progress(struct s3_meta_request_binding *request_binding, ui
     return AWS_OP_SUCCESS;
 }
 
+/* Copy a body chunk into the caller-provided buffer. Runs without the GIL:
+ * the buffer export is held until the binding is destroyed, and body callbacks are delivered in order, one at a time.
+ */
+static int s_s3_request_copy_body_to_recv_buffer(
+    struct s3_meta_request_binding *request_binding,
+    const struct aws_byte_cursor *body,
+    uint64_t range_start) {
+
+    if (!request_binding->recv_buffer_origin_set) {
+        request_binding->recv_buffer_origin = range_start;
+        request_binding->recv_buffer_origin_set = true;
+    }
+
+    uint64_t offset = 0;
+    uint64_t end = 0;
+    if (aws_sub_u64_checked(range_start, request_binding->recv_buffer_origin, &offset) ||
+        aws_add_u64_checked(offset, body->len, &end) || end > (uint64_t)request_binding->recv_buffer.len) {
+        return aws_raise_error(AWS_ERROR_SHORT_BUFFER);
+    }
+
+    if (body->len > 0) {
+        memcpy((uint8_t *)request_binding->recv_buffer.buf + offset, body->ptr, body->len);
+    }
+    return AWS_OP_SUCCESS;
+}
+
 static int s_s3_request_on_body(
     struct aws_s3_meta_request *meta_request,
     const struct aws_byte_cursor *body,
@@ -139,26 +202,43 @@ static int s_s3_request_on_body(
     void *user_data) {
     (void)meta_request;
     struct s3_meta_request_binding *request_binding = user_data;
+    if (request_binding->has_recv_buffer) {
+        return s_s3_request_copy_body_to_recv_buffer(request_binding, body, range_start);
+    }
+
     bool error = true;
     /*************** GIL ACQUIRE ***************/
     PyGILState_STATE state;
+    PyObject *chunk = NULL;
     PyObject *result = NULL;
     if (aws_py_gilstate_ensure(&state)) {
         return AWS_OP_ERR; /* Python has shut down. Nothing matters anymore, but don't crash */
     }
 
-    result = PyObject_CallMethod(
-        request_binding->py_core, "_on_body", "(y#K)", (const char *)(body->ptr), (Py_ssize_t)body->len, range_start);
+    if (request_binding->body_as_memoryview) {
+        /* Not a view of the native buffer itself: that's freed once this callback returns,
+         * and python can't be stopped from keeping slices of a view past then. */
+        chunk = aws_py_memory_view_from_pooled_copy(&request_binding->body_pool, *body);
+    } else {
+        chunk = PyBytes_FromStringAndSize((const char *)body->ptr, (Py_ssize_t)body->len);
+    }
+    if (!chunk) {
+        PyErr_WriteUnraisable(request_binding->py_core);
+        goto done;
+    }
+
+    result = PyObject_CallMethod(request_binding->py_core, "_on_body", "(OK)", chunk, range_start);
 
     if (!result) {
         PyErr_WriteUnraisable(request_binding->py_core);
-        goto done;
+    } else {
+        /* If user's callback raises an exception, _S3RequestCore._on_body
+         * stores it to throw later and returns False */
+        error = (result == Py_False);
+        Py_DECREF(result);
     }
-    /* If user's callback raises an exception, _S3RequestCore._on_body
-     * stores it to throw later and returns False */
-    error = (result == Py_False);
-    Py_DECREF(result);
 done:
+    Py_XDECREF(chunk);
     PyGILState_Release(state);
     /*************** GIL RELEASE ***************/
     if (error) {
@@ -211,6 +291,22 @@ static void s_s3_request_on_finish(
         error_body = *(meta_request_result->error_response_body);
     }
 
+    if (request_binding->collect_metrics) {
+        /* Every attempt's telemetry has been delivered by now */
+        aws_mutex_lock(&request_binding->metrics_lock);
+        PyObject *records = PyBytes_FromStringAndSize(
+            (const char *)request_binding->metrics_records.buffer, (Py_ssize_t)request_binding->metrics_records.len);
+        aws_mutex_unlock(&request_binding->metrics_lock);
+        result = records ? PyObject_CallMethod(request_binding->py_core, "_on_metrics", "(O)", records) : NULL;
+        Py_XDECREF(records);
+        if (!result) {
+            PyErr_WriteUnraisable(request_binding->py_core);
+            /* We MUST keep going and invoke the final callback */
+        } else {
+            Py_DECREF(result);
+        }
+    }
+
     const char *operation_name = NULL;
     if (meta_request_result->error_response_operation_name != NULL) {
         operation_name = aws_string_c_str(meta_request_result->error_response_operation_name);
@@ -219,7 +315,7 @@ static void s_s3_request_on_finish(
     result = PyObject_CallMethod(
         request_binding->py_core,
         "_on_finish",
-        "(iiOy#sOi)",
+        "(iiOy#sOiK)",
         error_code,
         meta_request_result->response_status,
         header_list ? header_list : Py_None,
@@ -227,7 +323,8 @@ static void s_s3_request_on_finish(
         (Py_ssize_t)error_body.len,
         operation_name,
         meta_request_result->did_validate ? Py_True : Py_False,
-        (int)meta_request_result->validation_algorithm);
+        (int)meta_request_result->validation_algorithm,
+        (unsigned long long)request_binding->total_transferred);
 
     if (result) {
         Py_DECREF(result);
@@ -241,6 +338,167 @@ static void s_s3_request_on_finish(
     /*************** GIL RELEASE ***************/
 }
 
+/* Returns (type, part_size, total_num_parts, num_parts_completed, upload_id), or None if there's no token */
+static PyObject *s_resume_token_to_python(struct aws_s3_meta_request_resume_token *token) {
+    if (!token) {
+        Py_RETURN_NONE;
+    }
+    struct aws_byte_cursor upload_id = aws_s3_meta_request_resume_token_upload_id(token);
+    return Py_BuildValue(
+        "(iKnns#)",
+        (int)aws_s3_meta_request_resume_token_type(token),
+        (unsigned long long)aws_s3_meta_request_resume_token_part_size(token),
+        (Py_ssize_t)aws_s3_meta_request_resume_token_total_num_parts(token),
+        (Py_ssize_t)aws_s3_meta_request_resume_token_num_parts_completed(token),
+        (const char *)upload_id.ptr,
+        (Py_ssize_t)upload_id.len);
+}
+
+/* Write a string into a fixed-size, zero-padded field. Longer strings are truncated. */
+static void s_write_fixed_str(struct aws_byte_buf *buf, const struct aws_string *str, size_t field_len) {
+    size_t len = str ? aws_min_size(str->len, field_len) : 0;
+    if (len > 0) {
+        aws_byte_buf_write(buf, aws_string_bytes(str), len);
+    }
+    aws_byte_buf_write_u8_n(buf, 0, field_len - len);
+}
+
+/* Write an optional duration/timestamp, as -1 if the metric isn't available */
+static void s_write_optional_metric(
+    struct aws_byte_buf *buf,
+    const struct aws_s3_request_metrics *metrics,
+    int (*getter)(const struct aws_s3_request_metrics *, uint64_t *)) {
+    uint64_t value = 0;
+    if (getter(metrics, &value)) {
+        value = UINT64_MAX; /* -1 as int64 */
+    }
+    aws_byte_buf_write_be64(buf, value);
+}
+
+/* Time from starting to send the request, until the first byte of the response */
+static int s_get_time_to_first_byte_ns(const struct aws_s3_request_metrics *metrics, uint64_t *out_ns) {
+    uint64_t send_start = 0;
+    uint64_t receive_start = 0;
+    if (aws_s3_request_metrics_get_send_start_timestamp_ns(metrics, &send_start) ||
+        aws_s3_request_metrics_get_receive_start_timestamp_ns(metrics, &receive_start)) {
+        return AWS_OP_ERR;
+    }
+    *out_ns = receive_start > send_start ? receive_start - send_start : 0;
+    return AWS_OP_SUCCESS;
+}
+
+/**
+ * Invoked once per request attempt, serially, on the meta request's event thread.
+ * Packs the metrics into a fixed-size record, in network byte order,
+ * matching _S3_METRICS_RECORD in s3.py:
+ * operation_name (32s), ip_address (48s), part_number (I), retry_attempt (I), response_status (i), error_code (i),
+ * part_range_start (Q), part_range_end (Q), start_timestamp_ns (Q), end_timestamp_ns (Q),
+ * conn_acquire_ns (q), sign_ns (q), send_ns (q), time_to_first_byte_ns (q), receive_ns (q), retry_delay_ns (q),
+ * total_ns (Q), connection_id (Q), is_https (B)
+ */
+static void s_s3_request_on_telemetry(
+    struct aws_s3_meta_request *meta_request,
+    struct aws_s3_request_metrics *metrics,
+    void *user_data) {
+    (void)meta_request;
+    struct s3_meta_request_binding *request_binding = user_data;
+
+    const struct aws_string *operation_name = NULL;
+    aws_s3_request_metrics_get_operation_name(metrics, &operation_name);
+    const struct aws_string *ip_address = NULL;
+    aws_s3_request_metrics_get_ip_address(metrics, &ip_address);
+    uint32_t part_number = 0;
+    aws_s3_request_metrics_get_part_number(metrics, &part_number);
+    int response_status = 0;
+    aws_s3_request_metrics_get_response_status_code(metrics, &response_status);
+    uint64_t part_range_start = 0;
+    aws_s3_request_metrics_get_part_range_start(metrics, &part_range_start);
+    uint64_t part_range_end = 0;
+    aws_s3_request_metrics_get_part_range_end(metrics, &part_range_end);
+    uint64_t start_timestamp_ns = 0;
+    aws_s3_request_metrics_get_start_timestamp_ns(metrics, &start_timestamp_ns);
+    uint64_t end_timestamp_ns = 0;
+    aws_s3_request_metrics_get_end_timestamp_ns(metrics, &end_timestamp_ns);
+    uint64_t total_ns = 0;
+    aws_s3_request_metrics_get_total_duration_ns(metrics, &total_ns);
+    size_t connection_id = 0;
+    aws_s3_request_metrics_get_connection_id(metrics, &connection_id);
+
+    /* BEGIN CRITICAL SECTION */
+    aws_mutex_lock(&request_binding->metrics_lock);
+    struct aws_byte_buf *buf = &request_binding->metrics_records;
+    if (aws_byte_buf_reserve_relative(buf, S3_METRICS_RECORD_SIZE) == AWS_OP_SUCCESS) {
+        s_write_fixed_str(buf, operation_name, S3_METRICS_OPERATION_NAME_LEN);
+        s_write_fixed_str(buf, ip_address, S3_METRICS_IP_ADDRESS_LEN);
+        aws_byte_buf_write_be32(buf, part_number);
+        aws_byte_buf_write_be32(buf, aws_s3_request_metrics_get_retry_attempt(metrics));
+        aws_byte_buf_write_be32(buf, (uint32_t)response_status);
+        aws_byte_buf_write_be32(buf, (uint32_t)aws_s3_request_metrics_get_error_code(metrics));
+        aws_byte_buf_write_be64(buf, part_range_start);
+        aws_byte_buf_write_be64(buf, part_range_end);
+        aws_byte_buf_write_be64(buf, start_timestamp_ns);
+        aws_byte_buf_write_be64(buf, end_timestamp_ns);
+        s_write_optional_metric(buf, metrics, aws_s3_request_metrics_get_conn_acquire_duration_ns);
+        s_write_optional_metric(buf, metrics, aws_s3_request_metrics_get_signing_duration_ns);
+        s_write_optional_metric(buf, metrics, aws_s3_request_metrics_get_sending_duration_ns);
+        s_write_optional_metric(buf, metrics, s_get_time_to_first_byte_ns);
+        s_write_optional_metric(buf, metrics, aws_s3_request_metrics_get_receiving_duration_ns);
+        s_write_optional_metric(buf, metrics, aws_s3_request_metrics_get_retry_delay_duration_ns);
+        aws_byte_buf_write_be64(buf, total_ns);
+        aws_byte_buf_write_be64(buf, (uint64_t)connection_id);
+        aws_byte_buf_write_u8(buf, aws_s3_request_metrics_get_is_https(metrics) ? 1 : 0);
+    }
+    aws_mutex_unlock(&request_binding->metrics_lock);
+    /* END CRITICAL SECTION */
+}
+
+/* Invoked before a multipart upload completes, with the size and base64 checksum of each part it sent */
+static int s_s3_request_on_upload_review(
+    struct aws_s3_meta_request *meta_request,
+    const struct aws_s3_upload_review *review,
+    void *user_data) {
+    (void)meta_request;
+    struct s3_meta_request_binding *request_binding = user_data;
+
+    /*************** GIL ACQUIRE ***************/
+    PyGILState_STATE state;
+    if (aws_py_gilstate_ensure(&state)) {
+        return AWS_OP_SUCCESS; /* Python has shut down. Nothing matters anymore, but don't crash */
+    }
+
+    PyObject *result = NULL;
+    PyObject *parts = PyList_New((Py_ssize_t)review->part_count);
+    if (!parts) {
+        goto done;
+    }
+    for (size_t i = 0; i < review->part_count; ++i) {
+        const struct aws_s3_upload_part_review *part = &review->part_array[i];
+        PyObject *part_py = Py_BuildValue(
+            "(Ky#)",
+            (unsigned long long)part->size,
+            part->checksum.ptr ? (const char *)part->checksum.ptr : "",
+            (Py_ssize_t)part->checksum.len);
+        if (!part_py) {
+            goto done;
+        }
+        PyList_SetItem(parts, (Py_ssize_t)i, part_py); /* steals reference to part_py */
+    }
+
+    result = PyObject_CallMethod(request_binding->py_core, "_on_upload_review", "(O)", parts);
+
+done:
+    if (result) {
+        Py_DECREF(result);
+    } else {
+        /* The checksums are informational, don't fail the upload over them */
+        PyErr_WriteUnraisable(request_binding->py_core);
+    }
+    Py_XDECREF(parts);
+    PyGILState_Release(state);
+    /*************** GIL RELEASE ***************/
+    return AWS_OP_SUCCESS;
+}
+
 /* Invoked when S3Request._binding gets cleaned up.
  * DO NOT destroy the C binding struct or anything inside it yet.
  * The user might have let S3Request get GC'd,
@@ -337,10 +595,18 @@ PyObject *aws_py_s3_client_make_meta_request(PyObject *self, PyObject *args) {
     double disk_throughput_gbps;                       /* d */
     int direct_io;                                     /* p - boolean predicate */
     uint64_t max_active_connections_override;          /* K */
+    int body_as_memoryview;                            /* p - boolean predicate */
+    PyObject *recv_buffer_py;                          /* O */
+    int send_using_async_writes;                       /* p - boolean predicate */
+    int recv_file_option;                              /* i */
+    uint64_t recv_file_position;                       /* K */
+    PyObject *resume_token_py;                         /* O */
+    int collect_metrics;                               /* p - boolean predicate */
+    int review_upload;                                 /* p - boolean predicate */
     PyObject *py_core;                                 /* O */
     if (!PyArg_ParseTuple(
             args,
-            "OOOizOOzzs#iipKKppdpKO",
+            "OOOizOOzzs#iipKKppdpKpOpiKOppO",
             &py_s3_request,
             &s3_client_py,
             &http_request_py,
@@ -362,6 +628,14 @@ PyObject *aws_py_s3_client_make_meta_request(PyObject *self, PyObject *args) {
             &disk_throughput_gbps,
             &direct_io,
             &max_active_connections_override,
+            &body_as_memoryview,
+            &recv_buffer_py,
+            &send_using_async_writes,
+            &recv_file_option,
+            &recv_file_position,
+            &resume_token_py,
+            &collect_metrics,
+            &review_upload,
             &py_core)) {
         return NULL;
     }
@@ -404,17 +678,46 @@ PyObject *aws_py_s3_client_make_meta_request(PyObject *self, PyObject *args) {
         .validate_response_checksum = validate_response_checksum != 0,
     };
 
+    /* Upload resume token, from (upload_id, part_size, total_num_parts, num_parts_completed) */
+    struct aws_s3_meta_request_resume_token *resume_token = NULL;
+    if (resume_token_py != Py_None) {
+        struct aws_s3_upload_resume_token_options token_options;
+        AWS_ZERO_STRUCT(token_options);
+        Py_ssize_t total_num_parts = 0;
+        Py_ssize_t num_parts_completed = 0;
+        if (!PyArg_ParseTuple(
+                resume_token_py,
+                "s#Knn",
+                &token_options.upload_id.ptr,
+                &token_options.upload_id.len,
+                &token_options.part_size,
+                &total_num_parts,
+                &num_parts_completed)) {
+            return NULL;
+        }
+        token_options.total_num_parts = (size_t)total_num_parts;
+        token_options.num_parts_completed = (size_t)num_parts_completed;
+        resume_token = aws_s3_meta_request_resume_token_new_upload(allocator, &token_options);
+        if (!resume_token) {
+            return PyErr_AwsLastError();
+        }
+    }
+
     struct s3_meta_request_binding *meta_request = aws_mem_calloc(allocator, 1, sizeof(struct s3_meta_request_binding));
     if (!meta_request) {
+        aws_s3_meta_request_resume_token_release(resume_token);
         return PyErr_AwsLastError();
     }
 
+    aws_mutex_init(&meta_request->metrics_lock);
+
     /* From hereon, we need to clean up if errors occur */
 
     PyObject *capsule =
         PyCapsule_New(meta_request, s_capsule_name_s3_meta_request, s_s3_meta_request_capsule_destructor);
     if (!capsule) {
-        aws_mem_release(allocator, meta_request);
+        aws_s3_meta_request_resume_token_release(resume_token);
+        s_destroy(meta_request);
         return NULL;
     }
     struct aws_s3_file_io_options fio_opts = {
@@ -425,6 +728,19 @@ PyObject *aws_py_s3_client_make_meta_request(PyObject *self, PyObject *args) {
 
     meta_request->py_core = py_core;
     Py_INCREF(meta_request->py_core);
+    meta_request->body_as_memoryview = body_as_memoryview != 0;
+    meta_request->collect_metrics = collect_metrics != 0;
+    if (meta_request->collect_metrics) {
+        aws_byte_buf_init(&meta_request->metrics_records, allocator, S3_METRICS_RECORD_SIZE * 4);
+    }
+
+    if (recv_buffer_py != Py_None) {
+        /* Hold a writable, contiguous export of the buffer for the lifetime of the request */
+        if (PyObject_GetBuffer(recv_buffer_py, &meta_request->recv_buffer, PyBUF_CONTIG)) {
+            goto error;
+        }
+        meta_request->has_recv_buffer = true;
+    }
 
     struct aws_s3_meta_request_options s3_meta_request_opt = {
         .type = type,
@@ -434,16 +750,22 @@ PyObject *aws_py_s3_client_make_meta_request(PyObject *self, PyObject *args) {
         .checksum_config = &checksum_config,
         .send_filepath = aws_byte_cursor_from_c_str(send_filepath),
         .recv_filepath = aws_byte_cursor_from_c_str(recv_filepath),
+        .recv_file_option = recv_file_option,
+        .recv_file_position = recv_file_position,
+        .resume_token = resume_token,
         .headers_callback = s_s3_request_on_headers,
         .body_callback = s_s3_request_on_body,
         .finish_callback = s_s3_request_on_finish,
         .shutdown_callback = s_s3_request_on_shutdown,
         .progress_callback = s_s3_request_on_progress,
+        .telemetry_callback = meta_request->collect_metrics ? s_s3_request_on_telemetry : NULL,
+        .upload_review_callback = review_upload ? s_s3_request_on_upload_review : NULL,
         .part_size = part_size,
         .multipart_upload_threshold = multipart_upload_threshold,
         /* If fio options not set, let native code to decide the default instead */
         .fio_opts = fio_options_set ? &fio_opts : NULL,
         .max_active_connections_override = max_active_connections_override,
+        .send_using_async_writes = send_using_async_writes != 0,
         .user_data = meta_request,
     };
 
@@ -456,9 +778,12 @@ PyObject *aws_py_s3_client_make_meta_request(PyObject *self, PyObject *args) {
         goto error;
     }
 
+    /* The meta request holds its own reference */
+    aws_s3_meta_request_resume_token_release(resume_token);
     return capsule;
 
 error:
+    aws_s3_meta_request_resume_token_release(resume_token);
     Py_DECREF(capsule);
     return NULL;
 }
@@ -481,3 +806,146 @@ PyObject *aws_py_s3_meta_request_cancel(PyObject *self, PyObject *args) {
 
     Py_RETURN_NONE;
 }
+
+PyObject *aws_py_s3_meta_request_pause(PyObject *self, PyObject *args) {
+    (void)self;
+
+    PyObject *py_meta_request = NULL;
+    if (!PyArg_ParseTuple(args, "O", &py_meta_request)) {
+        return NULL;
+    }
+
+    struct s3_meta_request_binding *request_binding =
+        PyCapsule_GetPointer(py_meta_request, s_capsule_name_s3_meta_request);
+    if (!request_binding) {
+        return NULL;
+    }
+
+    struct aws_s3_meta_request_resume_token *resume_token = NULL;
+    if (aws_s3_meta_request_pause(request_binding->native, &resume_token)) {
+        return PyErr_AwsLastError();
+    }
+
+    PyObject *resume_token_py = s_resume_token_to_python(resume_token);
+    aws_s3_meta_request_resume_token_release(resume_token);
+    return resume_token_py;
+}
+
+PyObject *aws_py_s3_meta_request_get_metrics(PyObject *self, PyObject *args) {
+    (void)self;
+
+    PyObject *py_meta_request = NULL;
+    if (!PyArg_ParseTuple(args, "O", &py_meta_request)) {
+        return NULL;
+    }
+
+    struct s3_meta_request_binding *request_binding =
+        PyCapsule_GetPointer(py_meta_request, s_capsule_name_s3_meta_request);
+    if (!request_binding) {
+        return NULL;
+    }
+
+    /* Snapshot of the records packed so far */
+    aws_mutex_lock(&request_binding->metrics_lock);
+    PyObject *records = PyBytes_FromStringAndSize(
+        (const char *)request_binding->metrics_records.buffer, (Py_ssize_t)request_binding->metrics_records.len);
+    aws_mutex_unlock(&request_binding->metrics_lock);
+    return records;
+}
+
+PyObject *aws_py_s3_meta_request_increment_read_window(PyObject *self, PyObject *args) {
+    (void)self;
+
+    PyObject *py_meta_request = NULL;
+    uint64_t bytes = 0;
+    if (!PyArg_ParseTuple(args, "OK", &py_meta_request, &bytes)) {
+        return NULL;
+    }
+
+    struct aws_s3_meta_request *meta_request = aws_py_get_s3_meta_request(py_meta_request);
+    if (!meta_request) {
+        return NULL;
+    }
+
+    aws_s3_meta_request_increment_read_window(meta_request, bytes);
+
+    Py_RETURN_NONE;
+}
+
+/* Keeps the data of one aws_s3_meta_request_write() call alive until its future completes */
+struct s3_meta_request_write_context {
+    Py_buffer data;
+    bool has_data;
+    PyObject *on_complete;
+    struct aws_future_void *future;
+};
+
+static void s_s3_meta_request_on_write_complete(void *user_data) {
+    struct s3_meta_request_write_context *write_ctx = user_data;
+    int error_code = aws_future_void_get_error(write_ctx->future);
+
+    /*************** GIL ACQUIRE ***************/
+    PyGILState_STATE state;
+    if (aws_py_gilstate_ensure(&state)) {
+        return; /* Python has shut down. Nothing matters anymore, but don't crash */
+    }
+
+    if (write_ctx->has_data) {
+        PyBuffer_Release(&write_ctx->data);
+    }
+
+    PyObject *result = PyObject_CallFunction(write_ctx->on_complete, "(i)", error_code);
+    if (result) {
+        Py_DECREF(result);
+    } else {
+        PyErr_WriteUnraisable(write_ctx->on_complete);
+    }
+    Py_DECREF(write_ctx->on_complete);
+
+    aws_future_void_release(write_ctx->future);
+    aws_mem_release(aws_py_get_allocator(), write_ctx);
+
+    PyGILState_Release(state);
+    /*************** GIL RELEASE ***************/
+}
+
+PyObject *aws_py_s3_meta_request_write(PyObject *self, PyObject *args) {
+    (void)self;
+
+    PyObject *py_meta_request = NULL;
+    PyObject *data_py = NULL;
+    int eof = false;
+    PyObject *on_complete_py = NULL;
+    if (!PyArg_ParseTuple(args, "OOpO", &py_meta_request, &data_py, &eof, &on_complete_py)) {
+        return NULL;
+    }
+
+    struct aws_s3_meta_request *meta_request = aws_py_get_s3_meta_request(py_meta_request);
+    if (!meta_request) {
+        return NULL;
+    }
+
+    struct s3_meta_request_write_context *write_ctx =
+        aws_mem_calloc(aws_py_get_allocator(), 1, sizeof(struct s3_meta_request_write_context));
+
+    struct aws_byte_cursor data;
+    AWS_ZERO_STRUCT(data);
+    if (data_py != Py_None) {
+        /* The data must stay valid until the write completes */
+        if (PyObject_GetBuffer(data_py, &write_ctx->data, PyBUF_SIMPLE)) {
+            aws_mem_release(aws_py_get_allocator(), write_ctx);
+            return NULL;
+        }
+        write_ctx->has_data = true;
+        data = aws_byte_cursor_from_array(write_ctx->data.buf, (size_t)write_ctx->data.len);
+    }
+
+    write_ctx->on_complete = on_complete_py;
+    Py_INCREF(write_ctx->on_complete);
+
+    /* Never returns NULL. The callback may fire synchronously if the data was simply buffered. */
+    write_ctx->future = aws_s3_meta_request_write(meta_request, data, eof != 0);
+    aws_future_void_register_callback(write_ctx->future, s_s3_meta_request_on_write_complete, write_ctx);
+
+    Py_RETURN_NONE;
+}
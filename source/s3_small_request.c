@@ -0,0 +1,274 @@
+/**
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0.
+ */
+#include "s3.h"
+
+#include <aws/common/mutex.h>
+#include <aws/common/string.h>
+#include <aws/http/request_response.h>
+#include <aws/io/stream.h>
+#include <aws/s3/s3_client.h>
+
+/**
+ * A single-request GetObject or PutObject of a small object.
+ * Runs as a DEFAULT meta request, so it's sent once as-is, without the part splitting of GET_OBJECT/PUT_OBJECT.
+ * The response body is collected natively, and python is only called once, when the request finishes.
+ * No python object is kept for the request: the binding lives until the meta request shuts down.
+ */
+
+/* Response bodies start in a buffer of this size, if the response has no Content-Length */
+static const size_t s_initial_body_capacity = 16 * 1024;
+
+struct s3_small_request_binding {
+    struct aws_allocator *allocator;
+
+    /* Copy of the body to upload, and a stream over it */
+    struct aws_byte_buf request_body;
+    struct aws_input_stream *request_body_stream;
+
+    struct aws_byte_buf response_body;
+    struct aws_byte_buf etag;
+
+    struct aws_mutex lock;
+    struct {
+        struct aws_s3_meta_request *native;
+        bool finished;
+    } synced_data;
+
+    /* Callable invoked with (error_code, status_code, body, etag) when the request finishes. Released then. */
+    PyObject *on_done;
+};
+
+static void s_s3_small_request_destroy(struct s3_small_request_binding *binding) {
+    aws_input_stream_release(binding->request_body_stream);
+    aws_byte_buf_clean_up(&binding->request_body);
+    aws_byte_buf_clean_up(&binding->response_body);
+    aws_byte_buf_clean_up(&binding->etag);
+    aws_mutex_clean_up(&binding->lock);
+    aws_mem_release(binding->allocator, binding);
+}
+
+static int s_s3_small_request_on_headers(
+    struct aws_s3_meta_request *meta_request,
+    const struct aws_http_headers *headers,
+    int response_status,
+    void *user_data) {
+    (void)meta_request;
+    (void)response_status;
+    struct s3_small_request_binding *binding = user_data;
+
+    struct aws_byte_cursor value;
+    if (aws_http_headers_get(headers, aws_byte_cursor_from_c_str("ETag"), &value) == AWS_OP_SUCCESS) {
+        aws_byte_buf_reset(&binding->etag, false);
+        if (aws_byte_buf_append_dynamic(&binding->etag, &value)) {
+            return AWS_OP_ERR;
+        }
+    }
+
+    /* Allocate the whole body at once, when its size is known */
+    uint64_t content_length = 0;
+    if (aws_http_headers_get(headers, aws_byte_cursor_from_c_str("Content-Length"), &value) == AWS_OP_SUCCESS &&
+        aws_byte_cursor_utf8_parse_u64(value, &content_length) == AWS_OP_SUCCESS && content_length <= SIZE_MAX) {
+        return aws_byte_buf_reserve(&binding->response_body, (size_t)content_length);
+    }
+    return AWS_OP_SUCCESS;
+}
+
+static int s_s3_small_request_on_body(
+    struct aws_s3_meta_request *meta_request,
+    const struct aws_byte_cursor *body,
+    uint64_t range_start,
+    void *user_data) {
+    (void)meta_request;
+    (void)range_start;
+    struct s3_small_request_binding *binding = user_data;
+
+    if (binding->response_body.capacity == 0 &&
+        aws_byte_buf_reserve(&binding->response_body, s_initial_body_capacity)) {
+        return AWS_OP_ERR;
+    }
+    return aws_byte_buf_append_dynamic(&binding->response_body, body);
+}
+
+static void s_s3_small_request_on_finish(
+    struct aws_s3_meta_request *meta_request,
+    const struct aws_s3_meta_request_result *meta_request_result,
+    void *user_data) {
+    (void)meta_request;
+    struct s3_small_request_binding *binding = user_data;
+
+    /* BEGIN CRITICAL SECTION */
+    aws_mutex_lock(&binding->lock);
+    binding->synced_data.finished = true;
+    /* If NULL, aws_py_s3_client_make_small_request() hasn't stored it yet, and will release it */
+    struct aws_s3_meta_request *native = binding->synced_data.native;
+    binding->synced_data.native = NULL;
+    aws_mutex_unlock(&binding->lock);
+    /* END CRITICAL SECTION */
+
+    /* Error responses are delivered in the result rather than through the body callback */
+    struct aws_byte_cursor body = aws_byte_cursor_from_buf(&binding->response_body);
+    if (meta_request_result->error_response_body) {
+        body = aws_byte_cursor_from_buf(meta_request_result->error_response_body);
+    }
+
+    /*************** GIL ACQUIRE ***************/
+    PyGILState_STATE state;
+    if (aws_py_gilstate_ensure(&state)) {
+        aws_s3_meta_request_release(native);
+        return; /* Python has shut down. Nothing matters anymore, but don't crash */
+    }
+
+    PyObject *result = PyObject_CallFunction(
+        binding->on_done,
+        "(iiy#s#)",
+        meta_request_result->error_code,
+        meta_request_result->response_status,
+        (const char *)body.ptr,
+        (Py_ssize_t)body.len,
+        (const char *)binding->etag.buffer,
+        (Py_ssize_t)binding->etag.len);
+    if (result) {
+        Py_DECREF(result);
+    } else {
+        PyErr_WriteUnraisable(binding->on_done);
+    }
+    Py_CLEAR(binding->on_done);
+
+    PyGILState_Release(state);
+    /*************** GIL RELEASE ***************/
+
+    aws_s3_meta_request_release(native);
+}
+
+static void s_s3_small_request_on_shutdown(void *user_data) {
+    s_s3_small_request_destroy(user_data);
+}
+
+static int s_s3_small_request_add_header(
+    struct aws_http_message *message,
+    const char *name,
+    struct aws_byte_cursor value) {
+    struct aws_http_header header = {
+        .name = aws_byte_cursor_from_c_str(name),
+        .value = value,
+    };
+    return aws_http_message_add_header(message, header);
+}
+
+PyObject *aws_py_s3_client_make_small_request(PyObject *self, PyObject *args) {
+    (void)self;
+
+    struct aws_allocator *allocator = aws_py_get_allocator();
+
+    PyObject *s3_client_py;      /* O */
+    const char *method;          /* s */
+    struct aws_byte_cursor host; /* s# */
+    struct aws_byte_cursor path; /* s# */
+    Py_buffer body;              /* z* */
+    const char *operation_name;  /* s */
+    PyObject *on_done;           /* O */
+    if (!PyArg_ParseTuple(
+            args,
+            "Oss#s#z*sO",
+            &s3_client_py,
+            &method,
+            &host.ptr,
+            &host.len,
+            &path.ptr,
+            &path.len,
+            &body,
+            &operation_name,
+            &on_done)) {
+        return NULL;
+    }
+
+    struct s3_small_request_binding *binding = NULL;
+    struct aws_http_message *message = NULL;
+    PyObject *py_result = NULL;
+
+    struct aws_s3_client *s3_client = aws_py_get_s3_client(s3_client_py);
+    if (!s3_client) {
+        goto done;
+    }
+
+    binding = aws_mem_calloc(allocator, 1, sizeof(struct s3_small_request_binding));
+    binding->allocator = allocator;
+    aws_mutex_init(&binding->lock);
+    aws_byte_buf_init(&binding->etag, allocator, 0);
+    aws_byte_buf_init(&binding->response_body, allocator, 0);
+
+    message = aws_http_message_new_request(allocator);
+    if (aws_http_message_set_request_method(message, aws_byte_cursor_from_c_str(method)) ||
+        aws_http_message_set_request_path(message, path) || s_s3_small_request_add_header(message, "Host", host)) {
+        PyErr_SetAwsLastError();
+        goto done;
+    }
+
+    if (body.buf) {
+        /* Copied, so the caller's buffer may change as soon as this returns, and retries resend the same data */
+        struct aws_byte_cursor body_cursor = aws_byte_cursor_from_array(body.buf, (size_t)body.len);
+        char content_length[32];
+        snprintf(content_length, sizeof(content_length), "%zu", body_cursor.len);
+        if (aws_byte_buf_init_copy_from_cursor(&binding->request_body, allocator, body_cursor) ||
+            s_s3_small_request_add_header(message, "Content-Length", aws_byte_cursor_from_c_str(content_length))) {
+            PyErr_SetAwsLastError();
+            goto done;
+        }
+        struct aws_byte_cursor request_body = aws_byte_cursor_from_buf(&binding->request_body);
+        binding->request_body_stream = aws_input_stream_new_from_cursor(allocator, &request_body);
+        if (!binding->request_body_stream) {
+            PyErr_SetAwsLastError();
+            goto done;
+        }
+        aws_http_message_set_body_stream(message, binding->request_body_stream);
+    }
+
+    binding->on_done = on_done;
+    Py_INCREF(on_done);
+
+    struct aws_s3_meta_request_options options = {
+        .type = AWS_S3_META_REQUEST_TYPE_DEFAULT,
+        .operation_name = aws_byte_cursor_from_c_str(operation_name),
+        .message = message,
+        .headers_callback = s_s3_small_request_on_headers,
+        .body_callback = s_s3_small_request_on_body,
+        .finish_callback = s_s3_small_request_on_finish,
+        .shutdown_callback = s_s3_small_request_on_shutdown,
+        .user_data = binding,
+    };
+
+    /* Signing config is NULL, so the client's is used */
+    struct aws_s3_meta_request *native = aws_s3_client_make_meta_request(s3_client, &options);
+    if (!native) {
+        Py_CLEAR(binding->on_done);
+        PyErr_SetAwsLastError();
+        goto done;
+    }
+
+    /* BEGIN CRITICAL SECTION */
+    aws_mutex_lock(&binding->lock);
+    if (!binding->synced_data.finished) {
+        binding->synced_data.native = native;
+        native = NULL;
+    }
+    aws_mutex_unlock(&binding->lock);
+    /* END CRITICAL SECTION */
+
+    /* If it already finished on another thread, we're responsible for releasing it */
+    aws_s3_meta_request_release(native);
+
+    /* From hereon, the binding is destroyed when the meta request shuts down */
+    binding = NULL;
+    py_result = Py_None;
+    Py_INCREF(py_result);
+
+done:
+    if (binding) {
+        s_s3_small_request_destroy(binding);
+    }
+    aws_http_message_release(message);
+    PyBuffer_Release(&body);
+    return py_result;
+}
@@ -0,0 +1,534 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0.
+
+"""
+Local S3-compatible stand-in, for tests and benchmarks that can't reach a real bucket.
+
+Serves path-style requests ("/{bucket}/{key}") over loopback, with optional TLS.
+Supports GetObject (with Range and If-None-Match), HeadObject, PutObject, CopyObject, DeleteObject,
+ListObjectsV2, and the multipart upload operations, including UploadPartCopy.
+Signatures are accepted without being checked. Object metadata (ex: Content-Type, `x-amz-meta-*`) is stored
+and returned by GetObject and HeadObject.
+
+Objects are kept in memory, except for synthetic objects: any key under
+`SYNTHETIC_PREFIX` + "{size}/" is served as `size` bytes of a repeating pattern without being stored,
+and uploads to keys under `SYNTHETIC_PREFIX` are read and discarded, then served back as pattern bytes.
+This lets benchmarks move many gigabytes without the server holding them.
+
+Run standalone with `python test/s3_mock_server.py [--port PORT] [--tls]`.
+The server prints its endpoint (ex: "127.0.0.1:8080") on the first line of stdout once it's listening.
+"""
+
+import argparse
+import email.utils
+import os
+import re
+import ssl
+import sys
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+from xml.sax.saxutils import escape
+
+SYNTHETIC_PREFIX = '_synthetic/'
+
+PATTERN = bytes(range(256)) * 4096
+"""Contents of synthetic objects repeat this pattern, so byte `i` of any synthetic object is `i % 256`"""
+
+_RESOURCES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources')
+DEFAULT_TLS_CERT = os.path.join(_RESOURCES_DIR, 'unittest.crt')
+DEFAULT_TLS_KEY = os.path.join(_RESOURCES_DIR, 'unittest.key')
+
+_READ_CHUNK_SIZE = 1024 * 1024
+_RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+_XML_NAMESPACE = 'http://s3.amazonaws.com/doc/2006-03-01/'
+_METADATA_HEADERS = ('content-type', 'content-encoding', 'content-language', 'content-disposition',
+                     'cache-control', 'expires')
+
+
+def synthetic_key(size, name='object'):
+    """Returns a key the server serves as `size` bytes of `PATTERN`, without storing anything"""
+    return '{}{}/{}'.format(SYNTHETIC_PREFIX, size, name)
+
+
+def pattern_bytes(start, length):
+    """Returns the bytes of a synthetic object from offset `start`"""
+    offset = start % len(PATTERN)
+    out = bytearray()
+    while len(out) < length:
+        piece = PATTERN[offset:offset + length - len(out)]
+        out += piece
+        offset = 0
+    return bytes(out)
+
+
+class _StoredObject:
+    __slots__ = ('data', 'size', 'etag', 'last_modified', 'metadata')
+
+    def __init__(self, data, size, etag, metadata=()):
+        # data is None for synthetic objects, whose contents are PATTERN
+        self.data = data
+        self.size = size
+        self.etag = etag
+        self.last_modified = time.time()
+        # (name, value) pairs returned with the object
+        self.metadata = list(metadata)
+
+    def read(self, start, length):
+        if self.data is not None:
+            return self.data[start:start + length]
+        return pattern_bytes(start, length)
+
+
+class _Upload:
+    __slots__ = ('parts', 'metadata')
+
+    def __init__(self, metadata):
+        # part number -> (data, size, etag)
+        self.parts = {}
+        self.metadata = list(metadata)
+
+
+class _S3MockRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _parse_path(self):
+        url = urlsplit(self.path)
+        parts = unquote(url.path).lstrip('/').split('/', 1)
+        bucket = parts[0]
+        key = parts[1] if len(parts) > 1 else ''
+        query = {name: values[0] for name, values in parse_qs(url.query, keep_blank_values=True).items()}
+        return bucket, key, query
+
+    def _send(self, status, headers=(), body=b''):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _send_xml(self, status, xml):
+        body = '<?xml version="1.0" encoding="UTF-8"?>\n{}'.format(xml).encode()
+        self._send(status, [('Content-Type', 'application/xml')], body)
+
+    def _send_error(self, status, code, message):
+        self._send_xml(status, '<Error><Code>{}</Code><Message>{}</Message><RequestId>{}</RequestId></Error>'.format(
+            code, escape(message), uuid.uuid4().hex))
+
+    def _object_headers(self, obj):
+        return [
+            ('ETag', obj.etag),
+            ('Last-Modified', email.utils.formatdate(obj.last_modified, usegmt=True)),
+            ('Accept-Ranges', 'bytes'),
+        ] + obj.metadata
+
+    def _request_metadata(self):
+        """Returns the (name, value) pairs of the request to store with the object"""
+        metadata = []
+        for name, value in self.headers.items():
+            lower_name = name.lower()
+            if lower_name == 'content-encoding':
+                # aws-chunked describes the upload, not the object
+                value = ','.join(e.strip() for e in value.split(',') if e.strip() != 'aws-chunked')
+                if not value:
+                    continue
+            if lower_name in _METADATA_HEADERS or lower_name.startswith('x-amz-meta-'):
+                metadata.append((name, value))
+        return metadata
+
+    def _read_body(self, sink):
+        """Reads the request body, passing each piece to sink(memoryview). Returns the decoded length."""
+        self._trailers = []
+        encoding = self.headers.get('Content-Encoding', '')
+        if 'aws-chunked' in encoding:
+            return self._read_aws_chunked_body(sink)
+
+        remaining = int(self.headers.get('Content-Length', 0))
+        total = remaining
+        buffer = bytearray(min(remaining, _READ_CHUNK_SIZE))
+        view = memoryview(buffer)
+        while remaining > 0:
+            n = self.rfile.readinto(view[:min(remaining, len(buffer))])
+            if not n:
+                raise ConnectionError('connection closed mid-body')
+            sink(view[:n])
+            remaining -= n
+        return total
+
+    def _read_aws_chunked_body(self, sink):
+        # aws-chunked: "{hex-size}[;chunk-signature=...]\r\n{data}\r\n" repeated, a 0-size chunk, then trailers.
+        total = 0
+        while True:
+            size_line = self.rfile.readline().split(b';', 1)[0].strip()
+            size = int(size_line, 16)
+            if size == 0:
+                break
+            remaining = size
+            while remaining > 0:
+                data = self.rfile.read(min(remaining, _READ_CHUNK_SIZE))
+                if not data:
+                    raise ConnectionError('connection closed mid-chunk')
+                sink(memoryview(data))
+                remaining -= len(data)
+            total += size
+            self.rfile.readline()
+        # Trailing headers (ex: x-amz-checksum-crc32) end with an empty line. They're accepted unchecked.
+        while True:
+            line = self.rfile.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            self._trailers.append((name.strip(), value.strip()))
+        return total
+
+    def _request_checksums(self):
+        """Returns the x-amz-checksum-* headers and trailers of the request, which S3 returns in its response"""
+        return [(name, value) for name, value in list(self.headers.items()) + self._trailers
+                if name.lower().startswith('x-amz-checksum-') and name.lower() != 'x-amz-checksum-type']
+
+    def _read_object_body(self, key):
+        """Returns (data, size) of an uploaded body. Synthetic uploads are discarded, and data is None."""
+        if key.startswith(SYNTHETIC_PREFIX):
+            return None, self._read_body(lambda piece: None)
+        data = bytearray()
+        self._read_body(data.extend)
+        return bytes(data), len(data)
+
+    def _parse_range(self, size):
+        """Returns (start, end) inclusive, None for the whole object, or raises ValueError if unsatisfiable"""
+        header = self.headers.get('Range')
+        if not header:
+            return None
+        match = _RANGE_PATTERN.match(header.strip())
+        if not match or (not match.group(1) and not match.group(2)):
+            return None
+        if not match.group(1):
+            # suffix range: the last N bytes
+            length = min(int(match.group(2)), size)
+            if length == 0:
+                raise ValueError()
+            return size - length, size - 1
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else size - 1
+        if start >= size:
+            raise ValueError()
+        return start, min(end, size - 1)
+
+    def _write_object_range(self, obj, start, length):
+        if obj.data is not None:
+            self.wfile.write(memoryview(obj.data)[start:start + length])
+            return
+        pattern = memoryview(PATTERN)
+        offset = start % len(PATTERN)
+        while length > 0:
+            n = min(length, len(PATTERN) - offset)
+            self.wfile.write(pattern[offset:offset + n])
+            length -= n
+            offset = 0
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        bucket, key, query = self._parse_path()
+        if not key:
+            if query.get('list-type') == '2':
+                return self._list_objects_v2(bucket, query)
+            return self._send_error(400, 'InvalidRequest', 'Only ListObjectsV2 is supported on buckets')
+
+        obj = self.server.get_object(bucket, key)
+        if obj is None:
+            return self._send_error(404, 'NoSuchKey', 'The specified key does not exist.')
+        if self.headers.get('If-None-Match') == obj.etag:
+            return self._send(304, self._object_headers(obj))
+
+        try:
+            byte_range = self._parse_range(obj.size)
+        except ValueError:
+            return self._send(416, [('Content-Range', 'bytes */{}'.format(obj.size))])
+
+        headers = self._object_headers(obj)
+        if byte_range is None:
+            status, start, length = 200, 0, obj.size
+        else:
+            start, end = byte_range
+            status, length = 206, end - start + 1
+            headers.append(('Content-Range', 'bytes {}-{}/{}'.format(start, end, obj.size)))
+
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(length))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self._write_object_range(obj, start, length)
+
+    def do_PUT(self):
+        bucket, key, query = self._parse_path()
+        if self.headers.get('x-amz-copy-source'):
+            return self._copy(bucket, key, query)
+
+        if 'uploadId' in query:
+            upload = self.server.get_upload(query['uploadId'])
+            if upload is None:
+                self._read_body(lambda piece: None)
+                return self._send_error(404, 'NoSuchUpload', 'The specified upload does not exist.')
+            data, size = self._read_object_body(key)
+            etag = self.server.new_etag()
+            upload.parts[int(query['partNumber'])] = (data, size, etag)
+            return self._send(200, [('ETag', etag)] + self._request_checksums())
+
+        data, size = self._read_object_body(key)
+        obj = self.server.put_object(bucket, key, data, size, metadata=self._request_metadata())
+        self._send(200, [('ETag', obj.etag)] + self._request_checksums())
+
+    def _copy(self, bucket, key, query):
+        """CopyObject, or UploadPartCopy if there's an uploadId"""
+        self._read_body(lambda piece: None)
+        source_bucket, source_key = unquote(self.headers['x-amz-copy-source']).lstrip('/').split('/', 1)
+        source = self.server.get_object(source_bucket, source_key)
+        if source is None:
+            return self._send_error(404, 'NoSuchKey', 'The specified key does not exist.')
+        if_match = self.headers.get('x-amz-copy-source-if-match')
+        if if_match is not None and if_match != source.etag:
+            return self._send_error(412, 'PreconditionFailed', 'At least one of the preconditions did not hold.')
+
+        if 'uploadId' not in query:
+            data = None if key.startswith(SYNTHETIC_PREFIX) else source.read(0, source.size)
+            if self.headers.get('x-amz-metadata-directive', 'COPY').upper() == 'REPLACE':
+                metadata = self._request_metadata()
+            else:
+                metadata = source.metadata
+            obj = self.server.put_object(bucket, key, data, source.size, metadata=metadata)
+            return self._send_xml(200, '<CopyObjectResult><ETag>{}</ETag></CopyObjectResult>'.format(
+                escape(obj.etag)))
+
+        upload = self.server.get_upload(query['uploadId'])
+        if upload is None:
+            return self._send_error(404, 'NoSuchUpload', 'The specified upload does not exist.')
+        match = _RANGE_PATTERN.match(self.headers.get('x-amz-copy-source-range', '').strip())
+        if match and match.group(1) and match.group(2):
+            start, end = int(match.group(1)), int(match.group(2))
+        else:
+            start, end = 0, source.size - 1
+        if end >= source.size:
+            return self._send_error(400, 'InvalidArgument', 'Range specified is not valid for source object.')
+        size = end - start + 1
+        data = None if key.startswith(SYNTHETIC_PREFIX) else source.read(start, size)
+        etag = self.server.new_etag()
+        upload.parts[int(query['partNumber'])] = (data, size, etag)
+        self._send_xml(200, '<CopyPartResult><ETag>{}</ETag></CopyPartResult>'.format(escape(etag)))
+
+    def do_POST(self):
+        bucket, key, query = self._parse_path()
+        if 'uploads' in query:
+            self._read_body(lambda piece: None)
+            upload_id = self.server.create_upload(self._request_metadata())
+            return self._send_xml(200, (
+                '<InitiateMultipartUploadResult xmlns="{}"><Bucket>{}</Bucket><Key>{}</Key>'
+                '<UploadId>{}</UploadId></InitiateMultipartUploadResult>').format(
+                    _XML_NAMESPACE, escape(bucket), escape(key), upload_id))
+
+        if 'uploadId' in query:
+            request_xml = bytearray()
+            self._read_body(request_xml.extend)
+            upload = self.server.pop_upload(query['uploadId'])
+            if upload is None:
+                return self._send_error(404, 'NoSuchUpload', 'The specified upload does not exist.')
+            part_numbers = [int(element.text) for element in ET.fromstring(bytes(request_xml)).iter()
+                            if element.tag.rsplit('}', 1)[-1] == 'PartNumber']
+            try:
+                parts = [upload.parts[number] for number in part_numbers]
+            except KeyError:
+                return self._send_error(400, 'InvalidPart', 'One or more of the specified parts could not be found.')
+            size = sum(part[1] for part in parts)
+            data = None if key.startswith(SYNTHETIC_PREFIX) else b''.join(part[0] for part in parts)
+            obj = self.server.put_object(bucket, key, data, size, etag='"{}-{}"'.format(uuid.uuid4().hex, len(parts)),
+                                         metadata=upload.metadata)
+            return self._send_xml(200, (
+                '<CompleteMultipartUploadResult xmlns="{}"><Bucket>{}</Bucket><Key>{}</Key>'
+                '<ETag>{}</ETag></CompleteMultipartUploadResult>').format(
+                    _XML_NAMESPACE, escape(bucket), escape(key), escape(obj.etag)))
+
+        self._read_body(lambda piece: None)
+        self._send_error(400, 'InvalidRequest', 'Unsupported POST')
+
+    def do_DELETE(self):
+        bucket, key, query = self._parse_path()
+        if 'uploadId' in query:
+            self.server.pop_upload(query['uploadId'])
+        else:
+            self.server.delete_object(bucket, key)
+        self._send(204)
+
+    def _list_objects_v2(self, bucket, query):
+        prefix = query.get('prefix', '')
+        delimiter = query.get('delimiter', '')
+        max_keys = int(query.get('max-keys', 1000))
+        start_after = query.get('continuation-token') or query.get('start-after', '')
+
+        contents = []
+        common_prefixes = []
+        truncated = False
+        last_key = ''
+        for key, obj in self.server.list_objects(bucket, prefix):
+            if key <= start_after:
+                continue
+            if len(contents) + len(common_prefixes) >= max_keys:
+                truncated = True
+                break
+            if delimiter:
+                index = key.find(delimiter, len(prefix))
+                if index >= 0:
+                    common_prefix = key[:index + len(delimiter)]
+                    if common_prefix not in common_prefixes:
+                        common_prefixes.append(common_prefix)
+                    last_key = key
+                    continue
+            contents.append(
+                '<Contents><Key>{}</Key><LastModified>{}</LastModified><ETag>{}</ETag><Size>{}</Size>'
+                '<StorageClass>STANDARD</StorageClass></Contents>'.format(
+                    escape(key),
+                    time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(obj.last_modified)),
+                    escape(obj.etag),
+                    obj.size))
+            last_key = key
+
+        xml = ['<ListBucketResult xmlns="{}"><Name>{}</Name><Prefix>{}</Prefix><KeyCount>{}</KeyCount>'
+               '<MaxKeys>{}</MaxKeys><IsTruncated>{}</IsTruncated>'.format(
+                   _XML_NAMESPACE, escape(bucket), escape(prefix), len(contents) + len(common_prefixes),
+                   max_keys, 'true' if truncated else 'false')]
+        if truncated:
+            xml.append('<NextContinuationToken>{}</NextContinuationToken>'.format(escape(last_key)))
+        xml.extend(contents)
+        xml.extend('<CommonPrefixes><Prefix>{}</Prefix></CommonPrefixes>'.format(escape(p)) for p in common_prefixes)
+        xml.append('</ListBucketResult>')
+        self._send_xml(200, ''.join(xml))
+
+
+class S3MockServer(ThreadingHTTPServer):
+    """
+    Local S3-compatible server. Listens as soon as it's constructed; call `start()` to serve on a background thread.
+
+    Args:
+        host (str): Address to listen on.
+        port (int): Port to listen on. If 0, a free port is picked.
+        tls (bool): If True, serve HTTPS with the certificate at `tls_cert` and key at `tls_key`.
+            The default certificate is for "localhost", signed by a test CA, so clients shouldn't verify the peer.
+    """
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, host='127.0.0.1', port=0, *, tls=False, tls_cert=DEFAULT_TLS_CERT, tls_key=DEFAULT_TLS_KEY):
+        super().__init__((host, port), _S3MockRequestHandler)
+        if tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile=tls_cert, keyfile=tls_key)
+            self.socket = context.wrap_socket(self.socket, server_side=True)
+        self.tls = tls
+        self._lock = threading.Lock()
+        self._objects = {}
+        self._uploads = {}
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        """Host and port to send requests to, suitable for the Host header (ex: "127.0.0.1:8080")"""
+        host, port = self.server_address[:2]
+        return '{}:{}'.format(host, port)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name='s3_mock_server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def new_etag(self):
+        return '"{}"'.format(uuid.uuid4().hex)
+
+    def get_object(self, bucket, key):
+        with self._lock:
+            obj = self._objects.get((bucket, key))
+        if obj is None and key.startswith(SYNTHETIC_PREFIX):
+            size = key[len(SYNTHETIC_PREFIX):].split('/', 1)[0]
+            if size.isdigit():
+                obj = _StoredObject(None, int(size), '"synthetic-{}"'.format(size))
+        return obj
+
+    def put_object(self, bucket, key, data, size=None, *, etag=None, metadata=()):
+        """Stores an object. If `data` is None, the object is synthetic, and `size` bytes of PATTERN.
+        `metadata` are (name, value) pairs returned with the object."""
+        if size is None:
+            size = len(data)
+        obj = _StoredObject(None if data is None else bytes(data), size, etag or self.new_etag(), metadata)
+        with self._lock:
+            self._objects[(bucket, key)] = obj
+        return obj
+
+    def delete_object(self, bucket, key):
+        with self._lock:
+            self._objects.pop((bucket, key), None)
+
+    def list_objects(self, bucket, prefix):
+        """Returns sorted (key, object) pairs under the prefix"""
+        with self._lock:
+            items = [(key, obj) for (b, key), obj in self._objects.items() if b == bucket and key.startswith(prefix)]
+        return sorted(items, key=lambda item: item[0])
+
+    def create_upload(self, metadata=()):
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self._uploads[upload_id] = _Upload(metadata)
+        return upload_id
+
+    def get_upload(self, upload_id):
+        with self._lock:
+            return self._uploads.get(upload_id)
+
+    def pop_upload(self, upload_id):
+        with self._lock:
+            return self._uploads.pop(upload_id, None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local S3-compatible server until interrupted.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0, help='Port to listen on. If 0, a free port is picked.')
+    parser.add_argument('--tls', action='store_true', help='Serve HTTPS')
+    parser.add_argument('--tls-cert', default=DEFAULT_TLS_CERT)
+    parser.add_argument('--tls-key', default=DEFAULT_TLS_KEY)
+    args = parser.parse_args()
+
+    server = S3MockServer(args.host, args.port, tls=args.tls, tls_cert=args.tls_cert, tls_key=args.tls_key)
+    print(server.endpoint, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
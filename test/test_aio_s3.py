@@ -0,0 +1,97 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0.
+
+import asyncio
+import os
+import unittest
+from test import NativeResourceTest
+
+from awscrt.auth import AwsCredentialsProvider
+from awscrt.aio.s3 import AIOS3Client
+from awscrt.io import ClientBootstrap, DefaultHostResolver, EventLoopGroup
+from awscrt.s3 import S3ResponseError, create_default_s3_signing_config
+
+MB = 1024 ** 2
+
+
+class AIOS3ClientTest(NativeResourceTest):
+    def test_read_window_smaller_than_part(self):
+        with self.assertRaises(ValueError):
+            AIOS3Client(region="us-west-2", part_size=8 * MB, read_window_size=1 * MB)
+
+
+@unittest.skipUnless(os.environ.get('AWS_TEST_S3'), 'set env var to run test: AWS_TEST_S3')
+class AIOS3RequestTest(NativeResourceTest):
+    def setUp(self):
+        super().setUp()
+        self.region = "us-west-2"
+        self.bucket_name = "aws-crt-canary-bucket"
+        self.get_test_object_key = "get_object_test_10MB.txt"
+        self.put_test_object_key = "put_object_test_py_aio_1MB.txt"
+        self.timeout = 100  # seconds
+
+    def _new_client(self, **kwargs):
+        event_loop_group = EventLoopGroup()
+        host_resolver = DefaultHostResolver(event_loop_group)
+        bootstrap = ClientBootstrap(event_loop_group, host_resolver)
+        credential_provider = AwsCredentialsProvider.new_default_chain(bootstrap)
+        signing_config = create_default_s3_signing_config(region=self.region, credential_provider=credential_provider)
+        return AIOS3Client(region=self.region, bootstrap=bootstrap, signing_config=signing_config, **kwargs)
+
+    def _run(self, coro):
+        asyncio.run(asyncio.wait_for(coro, self.timeout))
+
+    def test_get_object(self):
+        async def _test():
+            client = self._new_client(part_size=5 * MB, read_window_size=5 * MB)
+            body = bytearray()
+            async with await client.get_object(self.bucket_name, self.get_test_object_key) as stream:
+                self.assertEqual(stream.status_code, 200)
+                content_length = int(dict((k.lower(), v) for k, v in stream.headers)['content-length'])
+                async for chunk in stream:
+                    body += chunk
+                    # let the window fill up, the download must not run ahead of the consumer
+                    await asyncio.sleep(0.01)
+                await stream.wait_for_completion()
+            self.assertEqual(len(body), content_length)
+        self._run(_test())
+
+    def test_get_object_stop_early(self):
+        async def _test():
+            client = self._new_client(part_size=5 * MB, read_window_size=5 * MB)
+            async with await client.get_object(self.bucket_name, self.get_test_object_key) as stream:
+                async for chunk in stream:
+                    self.assertTrue(len(chunk) > 0)
+                    break
+        self._run(_test())
+
+    def test_get_object_missing(self):
+        async def _test():
+            client = self._new_client()
+            with self.assertRaises(S3ResponseError) as cm:
+                await client.get_object(self.bucket_name, "this_object_does_not_exist.txt")
+            self.assertEqual(cm.exception.status_code, 404)
+        self._run(_test())
+
+    def test_put_then_get_object(self):
+        async def _test():
+            client = self._new_client()
+            data = os.urandom(1 * MB)
+            await client.put_object(self.bucket_name, self.put_test_object_key, body=data)
+            body = bytearray()
+            async with await client.get_object(self.bucket_name, self.put_test_object_key) as stream:
+                async for chunk in stream:
+                    body += chunk
+            self.assertEqual(body, data)
+        self._run(_test())
+
+    def test_put_object_body_and_filepath(self):
+        async def _test():
+            client = self._new_client()
+            with self.assertRaises(ValueError):
+                await client.put_object(self.bucket_name, self.put_test_object_key, body=b"abc", filepath=__file__)
+        self._run(_test())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -161,6 +161,74 @@ class TestAsyncClient(AsyncLocalServerTestBase):
         finally:
             self._stop_server()
 
+    async def _test_get_read_into(self, secure):
+        # Read body into a small reusable buffer, so chunks get split across reads
+        self._start_server(secure)
+        try:
+            connection = await self._new_client_connection(secure)
+
+            test_asset_path = 'test/test_aiohttp_client.py'
+
+            request = HttpRequest('GET', '/' + test_asset_path)
+            stream = connection.request(request)
+            self.assertEqual(200, await stream.get_response_status_code())
+
+            body = bytearray()
+            buffer = bytearray(1000)
+            while True:
+                n = await stream.read_response_body_into(buffer)
+                if n == 0:
+                    break
+                body.extend(buffer[:n])
+
+            self.assertEqual(200, await stream.wait_for_completion())
+
+            with open(test_asset_path, 'rb') as test_asset:
+                test_asset_bytes = test_asset.read()
+                self.assertEqual(test_asset_bytes, body)
+
+            await connection.close()
+
+        finally:
+            self._stop_server()
+
+    async def _test_get_mixed_reads(self, secure):
+        # Alternate between both kinds of reads, which switch how body data arrives
+        self._start_server(secure)
+        try:
+            connection = await self._new_client_connection(secure)
+
+            test_asset_path = 'test/test_aiohttp_client.py'
+
+            request = HttpRequest('GET', '/' + test_asset_path)
+            stream = connection.request(request)
+            self.assertEqual(200, await stream.get_response_status_code())
+
+            body = bytearray()
+            buffer = bytearray(100)
+            read_into = True
+            while True:
+                if read_into:
+                    n = await stream.read_response_body_into(buffer)
+                    chunk = bytes(buffer[:n])
+                else:
+                    chunk = await stream.get_next_response_chunk()
+                    self.assertIsInstance(chunk, bytes)
+                if not chunk:
+                    break
+                body.extend(chunk)
+                read_into = not read_into
+
+            self.assertEqual(200, await stream.wait_for_completion())
+
+            with open(test_asset_path, 'rb') as test_asset:
+                self.assertEqual(test_asset.read(), body)
+
+            await connection.close()
+
+        finally:
+            self._stop_server()
+
     async def _test_put(self, secure):
         # PUT request sends this very file to the server
         self._start_server(secure)
@@ -356,6 +424,15 @@ class TestAsyncClient(AsyncLocalServerTestBase):
     def test_get_https(self):
         asyncio.run(self._test_get(secure=True))
 
+    def test_get_read_into_http(self):
+        asyncio.run(self._test_get_read_into(secure=False))
+
+    def test_get_read_into_https(self):
+        asyncio.run(self._test_get_read_into(secure=True))
+
+    def test_get_mixed_reads_http(self):
+        asyncio.run(self._test_get_mixed_reads(secure=False))
+
     def test_put_http(self):
         asyncio.run(self._test_put(secure=False))
 
@@ -16,7 +16,7 @@ from io import BytesIO
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 from concurrent.futures import Future, thread
 from awscrt.io import ClientBootstrap, ClientTlsContext, DefaultHostResolver, EventLoopGroup, TlsConnectionOptions, TlsContextOptions, TlsCipherPref
-from awscrt.http import HttpClientConnection, HttpClientStreamBase, HttpHeaders, HttpProxyOptions, HttpRequest, HttpVersion, Http2ClientConnection, Http2Setting, Http2SettingID
+from awscrt.http import HttpClientConnection, HttpClientConnectionManager, HttpClientStreamBase, HttpHeaders, HttpProxyOptions, HttpRequest, HttpVersion, Http2ClientConnection, Http2Setting, Http2SettingID, Http2StreamManager
 import awscrt.exceptions
 
 
@@ -190,6 +190,172 @@ class TestClient(LocalServerTestBase):
     def test_get_https(self):
         self._test_get(secure=True)
 
+    def _test_get_memoryview(self, secure):
+        self._start_server(secure)
+        try:
+            connection = self._new_client_connection(secure)
+
+            test_asset_path = 'test/test_http_client.py'
+
+            request = HttpRequest('GET', '/' + test_asset_path)
+            response = Response()
+            chunk_types = set()
+            kept_chunks = []
+
+            def on_body(http_stream, chunk, **kwargs):
+                chunk_types.add(type(chunk))
+                response.body.extend(chunk)
+                # keeping a chunk past the callback is safe, its buffer just isn't reused
+                if len(kept_chunks) == 0:
+                    kept_chunks.append(chunk)
+
+            stream = connection.request(request, response.on_response, on_body, on_body_buffer_mode='memoryview')
+            stream.activate()
+
+            self.assertEqual(200, stream.completion_future.result(self.timeout))
+            self.assertEqual({memoryview}, chunk_types)
+
+            with open(test_asset_path, 'rb') as test_asset:
+                test_asset_bytes = test_asset.read()
+                self.assertEqual(test_asset_bytes, response.body)
+                self.assertTrue(test_asset_bytes.startswith(bytes(kept_chunks[0])))
+
+            self.assertEqual(None, connection.close().exception(self.timeout))
+
+        finally:
+            self._stop_server()
+
+    def test_get_memoryview_http(self):
+        self._test_get_memoryview(secure=False)
+
+    def test_get_memoryview_https(self):
+        self._test_get_memoryview(secure=True)
+
+    def _test_get_min_chunk_size(self, secure):
+        self._start_server(secure)
+        try:
+            connection = self._new_client_connection(secure)
+
+            test_asset_path = 'test/test_http_client.py'
+            min_chunk_size = 4096
+
+            request = HttpRequest('GET', '/' + test_asset_path)
+            response = Response()
+            chunk_sizes = []
+
+            def on_body(http_stream, chunk, **kwargs):
+                chunk_sizes.append(len(chunk))
+                response.body.extend(chunk)
+
+            stream = connection.request(request, response.on_response, on_body,
+                                        on_body_min_chunk_size=min_chunk_size)
+            stream.activate()
+
+            self.assertEqual(200, stream.completion_future.result(self.timeout))
+
+            with open(test_asset_path, 'rb') as test_asset:
+                test_asset_bytes = test_asset.read()
+                self.assertEqual(test_asset_bytes, response.body)
+
+            # only the final chunk may be smaller
+            for chunk_size in chunk_sizes[:-1]:
+                self.assertGreaterEqual(chunk_size, min_chunk_size)
+
+            self.assertEqual(None, connection.close().exception(self.timeout))
+
+        finally:
+            self._stop_server()
+
+    def test_get_min_chunk_size_http(self):
+        self._test_get_min_chunk_size(secure=False)
+
+    def test_get_min_chunk_size_https(self):
+        self._test_get_min_chunk_size(secure=True)
+
+    def test_get_invalid_body_args(self):
+        self._start_server(secure=False)
+        try:
+            connection = self._new_client_connection(secure=False)
+            request = HttpRequest('GET', '/test/test_http_client.py')
+            with self.assertRaises(ValueError):
+                connection.request(request, on_body_buffer_mode='bytearray')
+            with self.assertRaises(ValueError):
+                connection.request(request, on_body_min_chunk_size=-1)
+
+            self.assertEqual(None, connection.close().exception(self.timeout))
+
+        finally:
+            self._stop_server()
+
+    def _new_connection_manager(self, secure, max_connections):
+        tls_conn_opt = None
+        if secure:
+            tls_ctx_opt = TlsContextOptions()
+            tls_ctx_opt.verify_peer = False
+            tls_conn_opt = ClientTlsContext(tls_ctx_opt).new_connection_options()
+            tls_conn_opt.set_server_name(self.hostname)
+
+        event_loop_group = EventLoopGroup()
+        host_resolver = DefaultHostResolver(event_loop_group)
+        bootstrap = ClientBootstrap(event_loop_group, host_resolver)
+        return HttpClientConnectionManager(self.hostname,
+                                           self.port,
+                                           bootstrap=bootstrap,
+                                           tls_connection_options=tls_conn_opt,
+                                           max_connections=max_connections)
+
+    def _test_connection_manager_get(self, connection):
+        test_asset_path = 'test/test_http_client.py'
+        request = HttpRequest('GET', '/' + test_asset_path)
+        response = Response()
+        stream = connection.request(request, response.on_response, response.on_body)
+        stream.activate()
+        self.assertEqual(200, stream.completion_future.result(self.timeout))
+        with open(test_asset_path, 'rb') as test_asset:
+            self.assertEqual(test_asset.read(), response.body)
+
+    def _test_connection_manager(self, secure):
+        self._start_server(secure)
+        try:
+            manager = self._new_connection_manager(secure, max_connections=1)
+            connection = manager.acquire_connection().result(self.timeout)
+
+            # the only connection is acquired, so the next acquisition waits for its release
+            next_connection_future = manager.acquire_connection()
+            self._test_connection_manager_get(connection)
+            self.assertFalse(next_connection_future.done())
+
+            manager.release_connection(connection)
+            self.assertIsNone(connection.shutdown_future.result(self.timeout))
+            with self.assertRaises(RuntimeError):
+                manager.release_connection(connection)
+
+            # the released connection goes to the waiting acquisition, and is reused
+            connection = next_connection_future.result(self.timeout)
+            self._test_connection_manager_get(connection)
+            manager.release_connection(connection)
+
+            shutdown_event = manager.shutdown_event
+            del connection
+            del next_connection_future
+            del manager
+            self.assertTrue(shutdown_event.wait(self.timeout))
+
+        finally:
+            self._stop_server()
+
+    def test_connection_manager_http(self):
+        self._test_connection_manager(secure=False)
+
+    def test_connection_manager_https(self):
+        self._test_connection_manager(secure=True)
+
+    def test_connection_manager_invalid_args(self):
+        with self.assertRaises(ValueError):
+            HttpClientConnectionManager(self.hostname, 80, max_connections=0)
+        with self.assertRaises(ValueError):
+            HttpClientConnectionManager(self.hostname, 80, max_connection_idle_ms=0)
+
     def _test_shutdown_error(self, secure):
         # Use HTTP/1.0 connection to force a SOCKET_CLOSED error after request completes
         self._start_server(secure, http_1_0=True)
@@ -257,6 +423,41 @@ class TestClient(LocalServerTestBase):
     def test_put_https(self):
         self._test_put(secure=True)
 
+    def _test_put_bytes(self, secure):
+        # PUT request sends this very file to the server, from memory
+        self._start_server(secure)
+        try:
+            connection = self._new_client_connection(secure)
+            test_asset_path = 'test/test_http_client.py'
+            with open(test_asset_path, 'rb') as test_asset:
+                outgoing_body_bytes = test_asset.read()
+
+            for body in (outgoing_body_bytes, memoryview(bytearray(outgoing_body_bytes))):
+                headers = HttpHeaders([
+                    ('Content-Length', str(len(outgoing_body_bytes))),
+                ])
+                request = HttpRequest('PUT', '/' + test_asset_path, headers, body)
+                response = Response()
+                http_stream = connection.request(request, response.on_response, response.on_body)
+                http_stream.activate()
+
+                self.assertEqual(200, http_stream.completion_future.result(self.timeout))
+
+                # compare what we sent against what the server received
+                server_received = self.server.put_requests.get('/' + test_asset_path)
+                self.assertEqual(server_received, outgoing_body_bytes)
+
+            self.assertEqual(None, connection.close().result(self.timeout))
+
+        finally:
+            self._stop_server()
+
+    def test_put_bytes_http(self):
+        self._test_put_bytes(secure=False)
+
+    def test_put_bytes_https(self):
+        self._test_put_bytes(secure=True)
+
     def _test_stream_lives_until_complete(self, secure):
         # Ensure that stream and connection classes stay alive until work is complete
         self._start_server(secure)
@@ -535,6 +736,45 @@ class TestClientMockServer(MockServerTestBase):
         tls_conn_opt.set_alpn_list(["h2"])
         return tls_conn_opt
 
+    def test_h2_stream_manager(self):
+        stream_manager = Http2StreamManager(
+            host_name=self.mock_server_url.hostname,
+            port=self.mock_server_url.port,
+            bootstrap=self._create_client_bootstrap(),
+            tls_connection_options=self._create_tls_connection_options(),
+            initial_settings=[Http2Setting(Http2SettingID.ENABLE_PUSH, 0)],
+            max_connections=2,
+            max_concurrent_streams_per_connection=2)
+
+        # more streams than the connections can carry at once, so some wait for others to complete
+        responses = [Response() for _ in range(8)]
+        streams = []
+        for response in responses:
+            request = HttpRequest('GET', self.mock_server_url.path)
+            request.headers.add('host', self.mock_server_url.hostname)
+            streams.append(stream_manager.request(request, response.on_response, response.on_body))
+
+        for stream, response in zip(streams, responses):
+            self.assertEqual(200, stream.completion_future.result(self.timeout))
+            self.assertIsNone(stream.remote_end_stream_future.result(self.timeout))
+            self.assertEqual(200, response.status_code)
+            self.assertEqual(HttpVersion.Http2, stream.version)
+            self.assertIsNone(stream.connection)
+            # the manager activated it, so this is a no-op
+            stream.activate()
+
+        shutdown_event = stream_manager.shutdown_event
+        del stream
+        del streams
+        del stream_manager
+        self.assertTrue(shutdown_event.wait(self.timeout))
+
+    def test_h2_stream_manager_invalid_args(self):
+        with self.assertRaises(ValueError):
+            Http2StreamManager(host_name='localhost', port=3443)
+        with self.assertRaises(ValueError):
+            Http2StreamManager(host_name='localhost', port=3443, prior_knowledge=True, max_connections=0)
+
     def test_h2_mock_server_manual_write(self):
         connection = self._new_mock_connection()
         # check we set an h2 connection
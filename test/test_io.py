@@ -205,6 +205,30 @@ class InputStreamTest(NativeResourceTest):
         python_stream = MockPythonStream(src_data)
         self._test(python_stream, src_data)
 
+    def test_bytes_like(self):
+        # Bytes-like objects are read natively, without a python I/O object
+        src_data = b'read without python'
+        for body in (src_data, bytearray(src_data), memoryview(src_data)):
+            input_stream = InputStream(body)
+            self.assertIs(InputStream.wrap(input_stream), input_stream)
+
+    def test_bytes_like_holds_buffer(self):
+        # The buffer can't be resized out from under native code
+        body = bytearray(b'hold this')
+        input_stream = InputStream(body)
+        with self.assertRaises(BufferError):
+            body.extend(b' and more')
+        del input_stream
+        body.extend(b' and more')
+
+    def test_invalid_type(self):
+        with self.assertRaises(TypeError):
+            InputStream(123)
+
+    def test_non_contiguous_bytes_like(self):
+        with self.assertRaises(TypeError):
+            InputStream(memoryview(b'abcd')[::2])
+
 
 class Pkcs11LibTest(NativeResourceTest):
     def _lib_path(self):
@@ -8,24 +8,38 @@ import tempfile
 import math
 import shutil
 import time
-from test import NativeResourceTest
-from concurrent.futures import Future
+from test import NativeResourceTest, TIMEOUT
+from concurrent.futures import CancelledError, Future
 from multiprocessing import Process
 import multiprocessing as mp
 import sys
 import gc
+import itertools
+import threading
 
 from awscrt.http import HttpHeaders, HttpRequest
 from awscrt.auth import AwsCredentials
 from awscrt.s3 import (
+    S3Autotuner,
+    S3BufferPool,
     S3ChecksumAlgorithm,
     S3ChecksumConfig,
     S3ChecksumLocation,
     S3Client,
+    S3CopyObject,
+    S3RangeHedging,
+    S3RequestTlsMode,
     S3RequestType,
+    S3RequestMetrics,
+    S3ThroughputCoordinator,
     S3ResponseError,
+    S3ResumeToken,
+    S3TransferProgress,
     CrossProcessLock,
     S3FileIoOptions,
+    S3ObjectCache,
+    S3ObjectSummary,
+    S3ObjectWriter,
     create_default_s3_signing_config,
     get_optimized_platforms,
 )
@@ -46,7 +60,9 @@ from awscrt.auth import (
     AwsSigningConfig,
 )
 from awscrt.common import join_all_native_threads
+from test.s3_mock_server import S3MockServer, pattern_bytes, synthetic_key
 
+KB = 1024
 MB = 1024 ** 2
 GB = 1024 ** 3
 S3EXPRESS_ENDPOINT = "crts-east1--use1-az4--x-s3.s3express-use1-az4.us-east-1.amazonaws.com"
@@ -191,7 +207,11 @@ def s3_client_new(
         is_cancel_test=False,
         enable_s3express=False,
         mem_limit=None,
-        network_interface_names=None):
+        network_interface_names=None,
+        enable_read_backpressure=False,
+        initial_read_window=None,
+        object_cache=None,
+        buffer_pool=None):
 
     if is_cancel_test:
         # for cancellation tests, make things slow, so it's less likely that
@@ -222,7 +242,11 @@ def s3_client_new(
         throughput_target_gbps=throughput_target_gbps,
         enable_s3express=enable_s3express,
         memory_limit=mem_limit,
-        network_interface_names=network_interface_names)
+        network_interface_names=network_interface_names,
+        enable_read_backpressure=enable_read_backpressure,
+        initial_read_window=initial_read_window,
+        object_cache=object_cache,
+        buffer_pool=buffer_pool)
     return s3_client
 
 
@@ -271,6 +295,345 @@ class S3ClientTest(NativeResourceTest):
         self.assertTrue(len(platform_list) > 0)
         self.assertTrue("p4d.24xlarge" in platform_list)
 
+    def test_open_read_requires_backpressure(self):
+        s3_client = s3_client_new(False, self.region)
+        request = HttpRequest("GET", "/key", HttpHeaders([("host", "bucket.s3.us-west-2.amazonaws.com")]))
+        with self.assertRaises(ValueError):
+            s3_client.open_read(request=request)
+
+    def test_open_write_with_body_stream(self):
+        s3_client = s3_client_new(False, self.region)
+        request = HttpRequest("PUT", "/key", HttpHeaders([("host", "bucket.s3.us-west-2.amazonaws.com")]),
+                              BytesIO(b"data"))
+        with self.assertRaises(ValueError):
+            s3_client.open_write(request=request)
+
+    def test_open_write_del_after_failed_init(self):
+        # __init__ raises before the request exists, then the garbage collector runs __del__
+        writer = S3ObjectWriter.__new__(S3ObjectWriter)
+        writer.__del__()
+
+    def test_open_read_budget_smaller_than_part(self):
+        s3_client = s3_client_new(False, self.region, enable_read_backpressure=True)
+        request = HttpRequest("GET", "/key", HttpHeaders([("host", "bucket.s3.us-west-2.amazonaws.com")]))
+        with self.assertRaises(ValueError):
+            s3_client.open_read(request=request, part_size=8 * MB, max_buffered_bytes=1 * MB)
+
+    def test_batch_invalid_max_concurrency(self):
+        s3_client = s3_client_new(False, self.region)
+        with self.assertRaises(ValueError):
+            s3_client.download_many(bucket="bucket", items=[("key", "file")], max_concurrency=0)
+
+    def test_list_objects_fan_out_requires_delimiter(self):
+        s3_client = s3_client_new(False, self.region)
+        with self.assertRaises(ValueError):
+            s3_client.list_objects("bucket", fan_out=True)
+
+    def test_copy_object_invalid_part_size(self):
+        s3_client = s3_client_new(False, self.region)
+        with self.assertRaises(ValueError):
+            s3_client.copy_object(source_bucket="a", source_key="k", bucket="b", key="k", part_size=1 * MB)
+
+    def test_copy_object_cancel_before_start(self):
+        s3_client = s3_client_new(False, self.region)
+        copy = S3CopyObject(client=s3_client, source_bucket="a", source_key="k", bucket="b", key="k")
+        copy.cancel()
+        with self.assertRaises(CancelledError):
+            copy.finished_future.result(TIMEOUT)
+
+    def test_resume_download_requires_recv_filepath(self):
+        s3_client = s3_client_new(False, self.region)
+        request = HttpRequest("GET", "/key", HttpHeaders([("host", "localhost")]))
+        token = S3ResumeToken(type=S3RequestType.GET_OBJECT, part_size=8 * MB, etag='"etag"', object_size=1)
+        with self.assertRaises(ValueError):
+            s3_client.make_request(type=S3RequestType.GET_OBJECT, request=request, resume_token=token)
+
+    def test_resume_token_type_mismatch(self):
+        s3_client = s3_client_new(False, self.region)
+        request = HttpRequest("GET", "/key", HttpHeaders([("host", "localhost")]))
+        token = S3ResumeToken(type=S3RequestType.PUT_OBJECT, part_size=8 * MB, upload_id="upload")
+        with self.assertRaises(ValueError):
+            s3_client.make_request(type=S3RequestType.GET_OBJECT, request=request, resume_token=token)
+
+    def test_get_metrics_requires_enable_metrics(self):
+        s3_client = s3_client_new(False, self.region)
+        with self.assertRaises(ValueError):
+            s3_client.get_metrics()
+
+    def test_request_metrics_records(self):
+        from awscrt.s3 import _S3_METRICS_RECORD
+        records = b"".join([
+            _S3_METRICS_RECORD.pack(b"GetObject", b"10.0.0.1", 1, 0, 206, 0, 0, 99, 10, 20,
+                                    5, 1, 2, 3, 4, -1, 10, 1234, 1),
+            _S3_METRICS_RECORD.pack(b"GetObject", b"", 2, 1, 0, 1049, 100, 199, 30, 40,
+                                    -1, -1, -1, -1, -1, 7, 10, 0, 1),
+        ])
+        metrics = S3RequestMetrics(records)
+        self.assertEqual(len(metrics), 2)
+        first, second = list(metrics)
+        self.assertEqual(first.operation_name, "GetObject")
+        self.assertEqual(first.ip_address, "10.0.0.1")
+        self.assertEqual(first.num_bytes, 100)
+        self.assertEqual(first.conn_acquire_ns, 5)
+        self.assertIsNone(first.retry_delay_ns)
+        self.assertEqual(first.throughput_bytes_per_sec, 100 * 1e9 / 4)
+        self.assertIsNone(second.ip_address)
+        self.assertIsNone(second.conn_acquire_ns)
+        self.assertIsNone(second.throughput_bytes_per_sec)
+        self.assertEqual(metrics[-1], second)
+        self.assertEqual(metrics.num_retries, 1)
+        self.assertEqual(metrics.bytes_transferred, 100)
+
+    def test_autotuner_converges(self):
+        from awscrt.s3 import _S3_METRICS_RECORD
+
+        def run_request(part_size, connections, num_parts=4):
+            # Throughput scales with connections up to 48, then degrades. Every part waits 100ms for its first byte.
+            total = 10e6 * (min(connections, 48) - max(0, connections - 48) * 0.5)
+            per_connection = total / connections
+            transfer_ns = int(part_size / per_connection * 1e9)
+            records = b"".join(
+                _S3_METRICS_RECORD.pack(b"GetObject", b"", i + 1, 0, 206, 0, i * part_size, (i + 1) * part_size - 1,
+                                        0, int(num_parts * part_size / total * 1e9), -1, -1, 0, 100000000, transfer_ns, -1,
+                                        transfer_ns, i, 1)
+                for i in range(num_parts))
+            return S3RequestMetrics(records)
+
+        tuner = S3Autotuner(initial_max_active_connections=8)
+        for _ in range(15):
+            part_size, connections = tuner._settings()
+            tuner._observe(part_size, connections, run_request(part_size, connections))
+        self.assertEqual(len(tuner.history), 15)
+        # 8, 12, 18, 27, 40, 60 improve. 90 and then 40 don't, so it settles on 60
+        self.assertEqual(tuner.max_active_connections, 60)
+        self.assertAlmostEqual(tuner.best_throughput_bytes_per_sec, 420e6, delta=1e3)
+        # 7MB/s per connection * 100ms * 8, rounded up to a whole MiB
+        self.assertEqual(tuner.part_size, 6 * 1024 * 1024)
+
+        # A single part says nothing about multipart throughput
+        tuner._observe(tuner.part_size, tuner.max_active_connections,
+                       run_request(tuner.part_size, tuner.max_active_connections, num_parts=1))
+        self.assertEqual(len(tuner.history), 15)
+
+    def test_autotuner_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            S3Autotuner(min_part_size=10, max_part_size=5)
+        with self.assertRaises(ValueError):
+            S3Autotuner(max_connections=0)
+
+    def test_object_cache_lru(self):
+        tempdir = tempfile.mkdtemp()
+        try:
+            cache = S3ObjectCache(memory_limit=10, disk_dir=tempdir, disk_limit=10)
+            for i in range(3):
+                cache._store(("host", "/key%d" % i, None), '"etag%d"' % i, 200, [], b"%d" % i * 6)
+            # key0 was evicted from memory to disk, then from disk
+            self.assertEqual(len(cache), 2)
+            self.assertIsNone(cache._lookup(("host", "/key0", None)))
+            self.assertEqual(cache.memory_size, 6)
+            self.assertEqual(cache.disk_size, 6)
+
+            cached = cache._lookup(("host", "/key1", None))
+            self.assertEqual(cached.etag, '"etag1"')
+            self.assertEqual(cache._on_revalidated(("host", "/key1", None), cached), b"111111")
+            self.assertEqual(cache.hits, 1)
+
+            cache.clear()
+            self.assertEqual(len(cache), 0)
+            self.assertEqual(os.listdir(tempdir), [])
+        finally:
+            shutil.rmtree(tempdir)
+
+    def test_object_cache_invalid_limit(self):
+        with self.assertRaises(ValueError):
+            S3ObjectCache(memory_limit=-1)
+
+    def test_coalesce_ranges(self):
+        from awscrt.s3 import _coalesce_ranges
+        ranges = [(100, 200), (0, 10), (15, 30), (5, 20), (50, 50), (1000, 1100)]
+        self.assertEqual(_coalesce_ranges(ranges, 10, 1000), [(0, 30, [1, 3, 2]), (100, 200, [0]), (1000, 1100, [5])])
+        self.assertEqual(_coalesce_ranges(ranges, 0, 1000), [(0, 30, [1, 3, 2]), (100, 200, [0]), (1000, 1100, [5])])
+        self.assertEqual(_coalesce_ranges(ranges, 1000, 1000), [(0, 200, [1, 3, 2, 0]), (1000, 1100, [5])])
+        self.assertEqual(
+            _coalesce_ranges(ranges, 1000, 20),
+            [(0, 20, [1, 3]), (15, 30, [2]), (100, 200, [0]), (1000, 1100, [5])])
+
+    def test_get_ranges_invalid_range(self):
+        s3_client = s3_client_new(False, self.region)
+        with self.assertRaises(ValueError):
+            s3_client.get_ranges(bucket="bucket", key="key", ranges=[(10, 5)])
+
+    def test_get_ranges_empty(self):
+        s3_client = s3_client_new(False, self.region)
+        result = s3_client.get_ranges(bucket="bucket", key="key", ranges=[(5, 5)]).result(TIMEOUT)
+        self.assertEqual([bytes(view) for view in result], [b""])
+
+    def test_shared_buffer_pool(self):
+        buffer_pool = S3BufferPool(memory_limit=64 * MB, part_size=8 * MB)
+        s3_clients = [s3_client_new(False, self.region, buffer_pool=buffer_pool) for _ in range(2)]
+        self.assertEqual(len(s3_clients), 2)
+        usage = buffer_pool.get_usage()
+        self.assertEqual(usage.memory_limit, 64 * MB)
+        self.assertEqual(usage.used, 0)
+        self.assertEqual(usage.num_pending, 0)
+
+        # The clients keep the pool alive
+        shutdown_event = s3_clients[0].shutdown_event
+        del buffer_pool
+        del s3_clients
+        self.assertTrue(shutdown_event.wait(self.timeout))
+
+    def test_shared_buffer_pool_invalid_args(self):
+        with self.assertRaises(ValueError):
+            S3BufferPool(memory_limit=4 * MB, part_size=8 * MB)
+        buffer_pool = S3BufferPool(memory_limit=64 * MB)
+        with self.assertRaises(ValueError):
+            s3_client_new(False, self.region, mem_limit=64 * MB, buffer_pool=buffer_pool)
+
+    def test_throughput_coordinator_splits_share(self):
+        scope_name = f'throughput_{time.time()}'
+        coordinator = S3ThroughputCoordinator(scope_name, throughput_target_gbps=10.0, max_active_connections=40)
+        # Another process would use its own coordinator, with the same scope name
+        other = S3ThroughputCoordinator(scope_name, throughput_target_gbps=10.0, max_active_connections=40)
+        try:
+            self.assertEqual(coordinator._acquire(), 40)
+            self.assertEqual(other._acquire(), 20)
+            # The first process only rereads the state file once its last update is stale
+            self.assertEqual(coordinator._acquire(), 20)
+            share = coordinator.get_share()
+            self.assertEqual(share.num_participants, 2)
+            # Requests in flight in one process split its share
+            self.assertEqual(coordinator._acquire(), 40 // 2 // 3)
+            self.assertEqual(share.throughput_target_gbps, 5.0)
+            self.assertEqual(share.max_active_connections, 20)
+
+            for _ in range(3):
+                coordinator._release()
+            other._release()
+            other.close()
+            self.assertEqual(coordinator.get_share().num_participants, 1)
+        finally:
+            coordinator.close()
+            other.close()
+            os.remove(coordinator._state_filepath)
+
+    def test_throughput_coordinator_release_is_batched(self):
+        from awscrt.s3 import _COORDINATOR_RECORD
+        coordinator = S3ThroughputCoordinator(f'throughput_{time.time()}')
+        try:
+            coordinator._acquire()
+            coordinator._acquire()
+            # Releases only touch the in-memory count, one timer writes them both to the state file
+            coordinator._release()
+            timer = coordinator._flush_timer
+            coordinator._release()
+            self.assertIs(coordinator._flush_timer, timer)
+            timer.join(TIMEOUT)
+            with open(coordinator._state_filepath, "rb") as f:
+                records = list(_COORDINATOR_RECORD.iter_unpack(f.read()))
+            self.assertEqual([record[2] for record in records], [0])
+        finally:
+            coordinator.close()
+            os.remove(coordinator._state_filepath)
+
+    def test_throughput_coordinator_unusable_lock(self):
+        class BrokenLock:
+            def acquire(self):
+                raise RuntimeError("AWS_ERROR_NO_PERMISSION")
+
+        coordinator = S3ThroughputCoordinator(f'throughput_{time.time()}', max_active_connections=40)
+        coordinator._cross_process_lock = BrokenLock()
+        # Falls back on the last known share, rather than waiting for the lock forever
+        self.assertEqual(coordinator._acquire(), 40)
+        self.assertEqual(coordinator.get_share().num_participants, 1)
+
+    def test_throughput_coordinator_invalid_args(self):
+        with self.assertRaises(ValueError):
+            S3ThroughputCoordinator("invalid/scope")
+        with self.assertRaises(ValueError):
+            S3ThroughputCoordinator("scope", max_active_connections=0)
+
+    def test_hedging_fires_for_straggler(self):
+        hedging = S3RangeHedging(min_samples=2, max_hedged_fraction=1.0)
+        for _ in range(2):
+            hedging._on_finished(hedging._watch(lambda: self.fail("Request shouldn't be hedged")), 0.001)
+        self.assertAlmostEqual(hedging.get_stats().threshold_secs, 0.001)
+
+        hedged = threading.Event()
+        watch_id = hedging._watch(hedged.set)
+        self.assertTrue(hedged.wait(TIMEOUT))
+        hedging._on_finished(watch_id, 0.002, hedge_won=True)
+        stats = hedging.get_stats()
+        self.assertEqual(stats.num_requests, 3)
+        self.assertEqual(stats.num_hedged, 1)
+        self.assertEqual(stats.num_hedges_won, 1)
+
+    def test_hedging_times_requests_started_before_threshold(self):
+        hedging = S3RangeHedging(min_samples=1, max_hedged_fraction=1.0)
+        hedged = threading.Event()
+        watch_id = hedging._watch(hedged.set)
+        self.assertIsNone(hedging.get_stats().threshold_secs)
+        # The first sample gives a threshold, which the request in flight is already past
+        time.sleep(0.01)
+        hedging._on_finished(hedging._watch(lambda: self.fail("Request shouldn't be hedged")), 0.001)
+        self.assertTrue(hedged.wait(TIMEOUT))
+        hedging._on_finished(watch_id, None)
+        self.assertEqual(hedging.get_stats().num_hedged, 1)
+
+    def test_hedging_invalid_args(self):
+        with self.assertRaises(ValueError):
+            S3RangeHedging(percentile=100)
+        with self.assertRaises(ValueError):
+            S3RangeHedging(max_hedged_fraction=2)
+
+    def test_full_object_checksum_requires_crc(self):
+        s3_client = s3_client_new(False, self.region)
+        request = HttpRequest("PUT", "/key", HttpHeaders([("host", "bucket.s3.us-west-2.amazonaws.com")]),
+                              BytesIO(b"data"))
+        checksum_config = S3ChecksumConfig(algorithm=S3ChecksumAlgorithm.SHA256,
+                                           location=S3ChecksumLocation.TRAILER,
+                                           full_object_checksum=True)
+        with self.assertRaises(ValueError):
+            s3_client.make_request(type=S3RequestType.PUT_OBJECT, request=request, checksum_config=checksum_config)
+        checksum_config = S3ChecksumConfig(algorithm=S3ChecksumAlgorithm.CRC32, full_object_checksum=True)
+        with self.assertRaises(ValueError):
+            s3_client.make_request(type=S3RequestType.PUT_OBJECT, request=request, checksum_config=checksum_config)
+
+    def test_directory_walk_and_filters(self):
+        from awscrt.s3 import _is_unchanged, _matches_filters, _walk_directory
+        tempdir = tempfile.mkdtemp()
+        try:
+            os.makedirs(os.path.join(tempdir, "a", "b"))
+            for relpath in ("top.txt", "a/one.parquet", "a/b/two.parquet", "a/b/skip.tmp"):
+                with open(os.path.join(tempdir, *relpath.split("/")), "wb") as f:
+                    f.write(b"12345")
+            files = {relpath: (path, stat) for relpath, path, stat in _walk_directory(tempdir)}
+            self.assertEqual(sorted(files), ["a/b/skip.tmp", "a/b/two.parquet", "a/one.parquet", "top.txt"])
+            selected = [relpath for relpath in sorted(files) if _matches_filters(relpath, ["a/*"], ["*.tmp"])]
+            self.assertEqual(selected, ["a/b/two.parquet", "a/one.parquet"])
+
+            path, stat = files["top.txt"]
+            os.utime(path, (1500000000, 1500000000))
+            stat = os.stat(path)
+            summary = S3ObjectSummary(key="top.txt", size=5, etag='"827ccb0eea8a706c4c34a16891f84e7b"',
+                                      last_modified="2017-07-14T02:40:00.000Z", storage_class="STANDARD")
+            self.assertTrue(_is_unchanged("size_mtime", summary, path, stat, upload=True))
+            self.assertTrue(_is_unchanged("size_mtime", summary, path, stat, upload=False))
+            self.assertTrue(_is_unchanged("checksum", summary, path, stat, upload=True))
+            self.assertFalse(_is_unchanged(None, summary, path, stat, upload=True))
+            newer = S3ObjectSummary(key="top.txt", size=5, etag='"00000000000000000000000000000000"',
+                                    last_modified="2020-01-01T00:00:00.000Z", storage_class="STANDARD")
+            self.assertFalse(_is_unchanged("size_mtime", newer, path, stat, upload=False))
+            self.assertFalse(_is_unchanged("checksum", newer, path, stat, upload=True))
+        finally:
+            shutil.rmtree(tempdir)
+
+    def test_batch_empty(self):
+        s3_client = s3_client_new(False, self.region)
+        batch = s3_client.download_many(bucket="bucket", items=[])
+        self.assertEqual(batch.finished_future.result(TIMEOUT), [])
+        self.assertEqual(batch.progress(), S3TransferProgress(total=0))
+
 
 @unittest.skipUnless(os.environ.get('AWS_TEST_S3'), 'set env var to run test: AWS_TEST_S3')
 class S3RequestTest(NativeResourceTest):
@@ -441,6 +804,326 @@ class S3RequestTest(NativeResourceTest):
         request = self._get_object_request(self.get_test_object_path)
         self._test_s3_put_get_object(request, S3RequestType.GET_OBJECT)
 
+    def test_get_object_memoryview_body(self):
+        chunks = []
+
+        def _on_body(chunk, offset, **kwargs):
+            self.assertIsInstance(chunk, memoryview)
+            self.assertTrue(chunk.readonly)
+            self.received_body_len += len(chunk)
+            chunks.append(chunk)
+
+        request = self._get_object_request(self.get_test_object_path)
+        s3_client = s3_client_new(False, self.region, 5 * MB)
+        s3_request = s3_client.make_request(
+            request=request,
+            type=S3RequestType.GET_OBJECT,
+            on_headers=self._on_request_headers,
+            on_body=_on_body,
+            on_done=self._on_request_done,
+            on_body_buffer_mode="memoryview")
+        finished_future = s3_request.finished_future
+        shutdown_event = s3_request.shutdown_event
+        s3_request = None
+        self.assertTrue(shutdown_event.wait(self.timeout))
+        finished_future.result()
+        self._validate_successful_response(False)
+
+        # views kept past the callback still hold their own data
+        self.assertTrue(len(chunks) > 0)
+        self.assertEqual(self.received_body_len, sum(len(bytes(chunk)) for chunk in chunks))
+        self.assertEqual(len(chunks), len(set(id(chunk.obj) for chunk in chunks)))
+
+    def test_invalid_on_body_buffer_mode(self):
+        request = self._get_object_request(self.get_test_object_path)
+        s3_client = s3_client_new(False, self.region, 5 * MB)
+        with self.assertRaises(ValueError):
+            s3_client.make_request(
+                request=request,
+                type=S3RequestType.GET_OBJECT,
+                on_body_buffer_mode="bytearray")
+
+    def _get_object_into_buffer(self, request, recv_buffer):
+        s3_client = s3_client_new(False, self.region, 5 * MB)
+        s3_request = s3_client.make_request(
+            request=request,
+            type=S3RequestType.GET_OBJECT,
+            on_headers=self._on_request_headers,
+            on_body=self._on_request_body,
+            on_done=self._on_request_done,
+            recv_buffer=recv_buffer)
+        finished_future = s3_request.finished_future
+        shutdown_event = s3_request.shutdown_event
+        s3_request = None
+        self.assertTrue(shutdown_event.wait(self.timeout))
+        return finished_future
+
+    def test_get_object_recv_buffer(self):
+        full_body = bytearray(10 * MB)
+        request = self._get_object_request(self.get_test_object_path)
+        self._get_object_into_buffer(request, full_body).result()
+        # on_body is not invoked when receiving into a buffer
+        self.assertEqual(self.received_body_len, 0)
+        self.assertEqual(self.response_status_code, 200)
+        self.assertIsNone(self.done_error)
+
+        # ranged GET spanning several parts lands at the start of the buffer
+        range_start = 1 * MB + 3
+        range_end = 8 * MB
+        ranged_body = memoryview(bytearray(range_end - range_start + 1))
+        request = self._get_object_request(self.get_test_object_path)
+        request.headers.add("Range", "bytes={}-{}".format(range_start, range_end))
+        self._get_object_into_buffer(request, ranged_body).result()
+        self.assertEqual(self.response_status_code, 206)
+        self.assertEqual(ranged_body, full_body[range_start:range_end + 1])
+
+    def test_get_object_recv_buffer_too_small(self):
+        request = self._get_object_request(self.get_test_object_path)
+        finished_future = self._get_object_into_buffer(request, bytearray(1 * MB))
+        with self.assertRaises(Exception) as cm:
+            finished_future.result()
+        self.assertEqual(cm.exception.name, "AWS_ERROR_SHORT_BUFFER")
+
+    def test_recv_buffer_with_recv_filepath(self):
+        request = self._get_object_request(self.get_test_object_path)
+        s3_client = s3_client_new(False, self.region, 5 * MB)
+        with self.assertRaises(ValueError):
+            s3_client.make_request(
+                request=request,
+                type=S3RequestType.GET_OBJECT,
+                recv_filepath="file.txt",
+                recv_buffer=bytearray(10 * MB))
+
+    def test_open_read(self):
+        s3_client = s3_client_new(False, self.region, enable_read_backpressure=True)
+        request = self._get_object_request(self.get_test_object_path)
+        body = bytearray()
+        with s3_client.open_read(request=request, part_size=5 * MB, max_buffered_bytes=5 * MB) as reader:
+            while True:
+                # small reads, so the reader falls behind and the download has to wait for it
+                data = reader.read(1 * MB + 7)
+                if not data:
+                    break
+                body += data
+            self.assertEqual(reader.status_code, 200)
+            content_length = int(HttpHeaders(reader.headers).get("Content-Length"))
+            reader.finished_future.result(self.timeout)
+        self.assertEqual(len(body), content_length)
+
+        # a ranged read starts at the start of the range
+        range_start = 3 * MB + 1
+        request = self._get_object_request(self.get_test_object_path)
+        request.headers.add("Range", "bytes={}-".format(range_start))
+        with s3_client.open_read(request=request, part_size=5 * MB) as reader:
+            self.assertEqual(reader.read(), body[range_start:])
+
+    def test_open_read_close_early(self):
+        s3_client = s3_client_new(False, self.region, enable_read_backpressure=True)
+        request = self._get_object_request(self.get_test_object_path)
+        reader = s3_client.open_read(request=request, part_size=5 * MB)
+        self.assertTrue(len(reader.read(10)) > 0)
+        reader.close()
+        with self.assertRaises(Exception):
+            reader.finished_future.result(self.timeout)
+        with self.assertRaises(ValueError):
+            reader.read(10)
+
+    def test_open_write(self):
+        s3_client = s3_client_new(False, self.region, 5 * MB)
+        # unknown content length
+        request = self._put_object_request(None, 0, unknown_content_length=True)
+        data = os.urandom(12 * MB + 3)
+        with s3_client.open_write(request=request, max_queued_bytes=5 * MB) as writer:
+            view = memoryview(data)
+            for i in range(0, len(data), 256 * 1024):
+                self.assertEqual(writer.write(view[i:i + 256 * 1024]), len(view[i:i + 256 * 1024]))
+        writer.finished_future.result(self.timeout)
+
+        # read it back
+        body = bytearray()
+
+        def _on_body(chunk, offset, **kwargs):
+            body.extend(chunk)
+
+        s3_request = s3_client.make_request(
+            request=self._get_object_request(self.put_test_object_path),
+            type=S3RequestType.GET_OBJECT,
+            on_body=_on_body)
+        s3_request.finished_future.result(self.timeout)
+        self.assertEqual(body, data)
+
+    def test_open_write_abort(self):
+        s3_client = s3_client_new(False, self.region, 5 * MB)
+        request = self._put_object_request(None, 0, unknown_content_length=True)
+        with self.assertRaises(RuntimeError):
+            with s3_client.open_write(request=request) as writer:
+                writer.write(b"x" * MB)
+                raise RuntimeError("stop")
+        with self.assertRaises(Exception):
+            writer.finished_future.result(self.timeout)
+
+    def test_download_many(self):
+        s3_client = s3_client_new(False, self.region, 5 * MB)
+        key = self.get_test_object_path[1:]
+        items = [(key, self.files.full_path("download_{}".format(i))) for i in range(4)]
+        items.append((key, self.files.full_path("download_range"), "bytes=0-9"))
+        items.append(("does_not_exist", self.files.full_path("download_missing")))
+        batch = s3_client.download_many(bucket=self.bucket_name, items=items, max_concurrency=2)
+        failures = batch.finished_future.result(self.timeout)
+
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(failures[0].key, "does_not_exist")
+        self.assertIsInstance(failures[0].error, S3ResponseError)
+        self.assertEqual(failures[0].error.status_code, 404)
+        for _, filepath in items[:4]:
+            self.assertEqual(os.stat(filepath).st_size, 10 * MB)
+        self.assertEqual(os.stat(self.files.full_path("download_range")).st_size, 10)
+        progress = batch.progress()
+        self.assertEqual((progress.total, progress.succeeded, progress.failed, progress.in_flight), (6, 5, 1, 0))
+
+    def test_upload_many(self):
+        s3_client = s3_client_new(False, self.region, 5 * MB)
+        key = self.put_test_object_path[1:]
+        items = [(key, self.temp_put_obj_file_path)] * 3
+        batch = s3_client.upload_many(bucket=self.bucket_name, items=items)
+        self.assertEqual(batch.finished_future.result(self.timeout), [])
+        self.assertEqual(batch.progress().bytes_transferred, 3 * 10 * MB)
+
+    def test_list_objects(self):
+        s3_client = s3_client_new(False, self.region)
+        key = self.get_test_object_path[1:]
+        objects = list(s3_client.list_objects(self.bucket_name, key))
+        self.assertIn(key, [o.key for o in objects])
+        self.assertEqual(next(o for o in objects if o.key == key).size, 10 * MB)
+
+        # small pages, to exercise pagination
+        with s3_client.list_objects(self.bucket_name, max_keys=2) as lister:
+            keys = [o.key for o in itertools.islice(lister, 7)]
+        self.assertEqual(len(keys), 7)
+        self.assertEqual(keys, sorted(keys))
+
+    def test_list_objects_delimiter(self):
+        s3_client = s3_client_new(False, self.region)
+        lister = s3_client.list_objects(self.bucket_name, delimiter="/")
+        top_level_keys = [o.key for o in lister]
+        for key in top_level_keys:
+            self.assertNotIn("/", key)
+        for prefix in lister.common_prefixes:
+            self.assertTrue(prefix.endswith("/"))
+
+        if lister.common_prefixes:
+            prefix = lister.common_prefixes[0]
+            expected = sorted(o.key for o in s3_client.list_objects(self.bucket_name, prefix))
+            fanned_out = sorted(o.key for o in s3_client.list_objects(self.bucket_name, prefix, "/", fan_out=True))
+            self.assertEqual(fanned_out, expected)
+
+    def _copy_object_helper(self, part_size):
+        s3_client = s3_client_new(False, self.region)
+        progress = []
+        copy = s3_client.copy_object(
+            source_bucket=self.bucket_name,
+            source_key=self.get_test_object_path[1:],
+            bucket=self.bucket_name,
+            key=self.put_test_object_path[1:],
+            part_size=part_size,
+            max_active_connections_override=2,
+            on_progress=progress.append)
+        self.assertIsNone(copy.finished_future.result(self.timeout))
+        self.assertEqual(sum(progress), 10 * MB)
+
+        s3_request = s3_client.make_request(
+            request=self._get_object_request(self.put_test_object_path),
+            type=S3RequestType.GET_OBJECT,
+            on_headers=self._on_request_headers)
+        s3_request.finished_future.result(self.timeout)
+        self.assertEqual(int(HttpHeaders(self.response_headers).get("Content-Length")), 10 * MB)
+        return progress
+
+    def test_copy_object_single_part(self):
+        progress = self._copy_object_helper(part_size=None)
+        self.assertEqual(len(progress), 1)
+
+    def test_copy_object_multipart(self):
+        progress = self._copy_object_helper(part_size=5 * MB)
+        self.assertEqual(len(progress), 2)
+
+    def test_copy_many(self):
+        s3_client = s3_client_new(False, self.region)
+        source_key = self.get_test_object_path[1:]
+        items = [(self.bucket_name, source_key, self.bucket_name, self.put_test_object_path[1:])] * 3
+        items.append((self.bucket_name, "does_not_exist", self.bucket_name, self.put_test_object_path[1:]))
+        copies = s3_client.copy_many(items=items, max_concurrency=2)
+        self.assertEqual(len(copies), 4)
+        for copy in copies[:3]:
+            self.assertIsNone(copy.finished_future.result(self.timeout))
+        with self.assertRaises(S3ResponseError):
+            copies[3].finished_future.result(self.timeout)
+
+    def test_get_object_telemetry(self):
+        request = self._get_object_request(self.get_test_object_path)
+        s3_client = s3_client_new(False, self.region, 5 * MB)
+        telemetry = Future()
+        s3_request = s3_client.make_request(
+            request=request,
+            type=S3RequestType.GET_OBJECT,
+            on_body=self._on_request_body,
+            on_telemetry=lambda metrics, **kwargs: telemetry.set_result(metrics))
+        s3_request.finished_future.result(self.timeout)
+        metrics = telemetry.result(self.timeout)
+        self.assertEqual(metrics.bytes_transferred, 10485760)
+        for attempt in metrics:
+            self.assertEqual(attempt.operation_name, "GetObject")
+            self.assertIsNotNone(attempt.ip_address)
+        self.assertEqual(len(s3_request.get_metrics()), len(metrics))
+
+    def test_get_object_cached(self):
+        cache = S3ObjectCache()
+        s3_client = s3_client_new(False, self.region, 5 * MB, object_cache=cache)
+        for _ in range(2):
+            self.received_body_len = 0
+            s3_request = s3_client.make_request(
+                request=self._get_object_request(self.get_test_object_path),
+                type=S3RequestType.GET_OBJECT,
+                on_headers=self._on_request_headers,
+                on_body=self._on_request_body)
+            s3_request.finished_future.result(self.timeout)
+            self.assertEqual(self.response_status_code, 200)
+            self.assertEqual(self.received_body_len, 10485760)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 1)
+
+    def test_get_ranges(self):
+        s3_client = s3_client_new(False, self.region, 5 * MB)
+        ranges = [(10485660, 10485760), (0, 8), (4, 100), (2 * MB, 3 * MB)]
+        result = s3_client.get_ranges(
+            bucket=self.bucket_name, key=self.get_test_object_path[1:], ranges=ranges).result(self.timeout)
+
+        # Compare against each range downloaded on its own
+        for (start, end), view in zip(ranges, result):
+            headers = HttpHeaders([("host", self._build_endpoint_string(self.region, self.bucket_name)),
+                                   ("Range", "bytes={}-{}".format(start, end - 1))])
+            expected = bytearray(end - start)
+            s3_client.make_request(
+                type=S3RequestType.GET_OBJECT,
+                request=HttpRequest("GET", self.get_test_object_path, headers),
+                recv_buffer=expected).finished_future.result(self.timeout)
+            self.assertEqual(bytes(view), bytes(expected))
+
+    def test_put_get_small(self):
+        s3_client = s3_client_new(False, self.region)
+        key = "put_small_test_py.txt"
+        body = os.urandom(10 * KB)
+        etag = s3_client.put_small(bucket=self.bucket_name, key=key, body=body).result(self.timeout)
+        self.assertTrue(etag.startswith('"'))
+        self.assertEqual(s3_client.get_small(bucket=self.bucket_name, key=key).result(self.timeout), body)
+
+    def test_get_small_missing_object(self):
+        s3_client = s3_client_new(False, self.region)
+        future = s3_client.get_small(bucket=self.bucket_name, key="get_small_missing_object_{}".format(time.time()))
+        with self.assertRaises(S3ResponseError) as context:
+            future.result(self.timeout)
+        self.assertEqual(context.exception.status_code, 404)
+
     def test_get_object_mem_limit(self):
         request = self._get_object_request(self.get_test_object_path)
         self._test_s3_put_get_object(request, S3RequestType.GET_OBJECT, mem_limit=2 * GB)
@@ -815,6 +1498,71 @@ class S3RequestTest(NativeResourceTest):
             self.assertTrue(shutdown_event.wait(self.timeout))
             os.remove(file.name)
 
+    def test_get_object_resume_from_checkpoint(self):
+        request = self._get_object_request(self.get_test_object_path)
+        s3_client = s3_client_new(False, self.region, 5 * MB)
+        tempdir = tempfile.mkdtemp()
+        try:
+            recv_filepath = os.path.join(tempdir, "download")
+            checkpoint_filepath = os.path.join(tempdir, "checkpoint.json")
+            self.progress_invoked = 0
+            self.s3_request = s3_client.make_request(
+                request=request,
+                recv_filepath=recv_filepath,
+                checkpoint_filepath=checkpoint_filepath,
+                type=S3RequestType.GET_OBJECT,
+                on_progress=self._on_progress_cancel_after_first_chunk)
+            e = self.s3_request.finished_future.exception(self.timeout)
+            self.assertEqual(e.name, "AWS_ERROR_S3_CANCELED")
+            self.assertTrue(os.path.exists(checkpoint_filepath))
+            resume_token = self.s3_request.resume_token
+            self.assertIsNotNone(resume_token.etag)
+            self.assertEqual(resume_token.continuous_downloaded_bytes, os.path.getsize(recv_filepath))
+
+            # The checkpoint is picked up, and removed once the download completes
+            s3_request = s3_client.make_request(
+                request=self._get_object_request(self.get_test_object_path),
+                recv_filepath=recv_filepath,
+                checkpoint_filepath=checkpoint_filepath,
+                type=S3RequestType.GET_OBJECT)
+            s3_request.finished_future.result(self.timeout)
+            self.assertEqual(os.path.getsize(recv_filepath), 10485760)
+            self.assertFalse(os.path.exists(checkpoint_filepath))
+        finally:
+            shutil.rmtree(tempdir)
+
+    def _on_progress_pause(self, progress):
+        self.s3_request.pause()
+
+    def test_put_object_pause_resume(self):
+        file_creator = FileCreator()
+        try:
+            data_len = 20 * MB
+            send_filepath = file_creator.create_file_with_size("pause_resume", data_len)
+            s3_client = s3_client_new(False, self.region, 5 * MB)
+            self.s3_request = s3_client.make_request(
+                request=self._put_object_request(None, data_len),
+                send_filepath=send_filepath,
+                type=S3RequestType.PUT_OBJECT,
+                on_progress=self._on_progress_pause)
+            e = self.s3_request.finished_future.exception(self.timeout)
+            if e is None:
+                # The upload finished before it could be paused
+                return
+            self.assertEqual(e.name, "AWS_ERROR_S3_PAUSED")
+            resume_token = self.s3_request.resume_token
+            self.assertEqual(resume_token.type, S3RequestType.PUT_OBJECT)
+            self.assertIsNotNone(resume_token.upload_id)
+
+            s3_request = s3_client.make_request(
+                request=self._put_object_request(None, data_len),
+                send_filepath=send_filepath,
+                type=S3RequestType.PUT_OBJECT,
+                resume_token=resume_token)
+            s3_request.finished_future.result(self.timeout)
+        finally:
+            file_creator.remove_all()
+
     def test_get_object_quick_cancel(self):
         # a 5 GB file
         request = self._get_object_request("/get_object_test_5120MB.txt")
@@ -1060,5 +1808,192 @@ class S3RequestTest(NativeResourceTest):
         self.assertEqual(self.response_status_code, 200, "status code is not 200")
 
 
+class S3LocalServerTest(NativeResourceTest):
+    """Runs S3Client against the local S3-compatible server in test/s3_mock_server.py"""
+
+    timeout = 30  # seconds
+    part_size = 5 * MB
+
+    def _run_with_server(self, secure, test_fn, **client_args):
+        with S3MockServer(tls=secure) as server:
+            tls_option = None
+            if secure:
+                opt = TlsContextOptions()
+                opt.verify_peer = False
+                tls_option = ClientTlsContext(opt).new_connection_options()
+                tls_option.set_server_name('localhost')
+            credential_provider = AwsCredentialsProvider.new_static('AKIDLOCALSERVER', 'local-server-secret')
+            s3_client = S3Client(
+                region='us-east-1',
+                tls_mode=S3RequestTlsMode.ENABLED if secure else S3RequestTlsMode.DISABLED,
+                tls_connection_options=tls_option,
+                signing_config=create_default_s3_signing_config(
+                    region='us-east-1', credential_provider=credential_provider),
+                part_size=self.part_size,
+                multipart_upload_threshold=self.part_size,
+                **client_args)
+            test_fn(server, s3_client)
+
+    def _test_multipart_round_trip(self, server, s3_client):
+        body = os.urandom(3 * self.part_size + 100)
+        headers = HttpHeaders([('host', server.endpoint), ('Content-Length', str(len(body)))])
+        put_request = HttpRequest('PUT', '/bucket/round_trip', headers, BytesIO(body))
+        s3_client.make_request(type=S3RequestType.PUT_OBJECT, request=put_request).finished_future.result(self.timeout)
+
+        received = bytearray()
+        get_request = HttpRequest('GET', '/bucket/round_trip', HttpHeaders([('host', server.endpoint)]))
+        s3_client.make_request(
+            type=S3RequestType.GET_OBJECT,
+            request=get_request,
+            on_body=lambda chunk, offset, **kwargs: received.extend(chunk)).finished_future.result(self.timeout)
+        self.assertEqual(bytes(received), body)
+
+    def test_multipart_round_trip(self):
+        self._run_with_server(False, self._test_multipart_round_trip)
+
+    def test_multipart_round_trip_tls(self):
+        self._run_with_server(True, self._test_multipart_round_trip)
+
+    def _test_upload_checksum(self, server, s3_client, size):
+        from awscrt.checksums import crc64nvme
+        body = os.urandom(size)
+        headers = HttpHeaders([('host', server.endpoint), ('Content-Length', str(len(body)))])
+        s3_request = s3_client.make_request(
+            type=S3RequestType.PUT_OBJECT,
+            request=HttpRequest('PUT', '/bucket/checksummed', headers, BytesIO(body)),
+            checksum_config=S3ChecksumConfig(
+                algorithm=S3ChecksumAlgorithm.CRC64NVME,
+                location=S3ChecksumLocation.TRAILER,
+                full_object_checksum=True))
+        s3_request.finished_future.result(self.timeout)
+        upload_checksum = s3_request.upload_checksum
+        self.assertEqual(upload_checksum.algorithm, S3ChecksumAlgorithm.CRC64NVME)
+        self.assertEqual(upload_checksum.checksum, crc64nvme(body))
+        part_size = upload_checksum.part_size
+        self.assertEqual(upload_checksum.part_checksums,
+                         [crc64nvme(body[i:i + part_size]) for i in range(0, len(body), part_size)])
+        return upload_checksum
+
+    def test_upload_checksum_multipart(self):
+        def test_fn(server, s3_client):
+            upload_checksum = self._test_upload_checksum(server, s3_client, 2 * self.part_size + 100)
+            self.assertEqual(upload_checksum.part_size, self.part_size)
+            self.assertEqual(len(upload_checksum.part_checksums), 3)
+
+        self._run_with_server(False, test_fn)
+
+    def test_upload_checksum_single_part(self):
+        def test_fn(server, s3_client):
+            upload_checksum = self._test_upload_checksum(server, s3_client, 100 * KB)
+            self.assertEqual(upload_checksum.part_size, 100 * KB)
+
+        self._run_with_server(False, test_fn)
+
+    def test_get_synthetic_object(self):
+        def test_fn(server, s3_client):
+            size = 2 * self.part_size + 1
+            received = bytearray(size)
+            request = HttpRequest('GET', '/bucket/' + synthetic_key(size), HttpHeaders([('host', server.endpoint)]))
+            s3_client.make_request(
+                type=S3RequestType.GET_OBJECT,
+                request=request,
+                recv_buffer=received).finished_future.result(self.timeout)
+            self.assertEqual(bytes(received), pattern_bytes(0, size))
+
+        self._run_with_server(False, test_fn)
+
+    def test_put_get_small(self):
+        def test_fn(server, s3_client):
+            body = os.urandom(10 * KB)
+            s3_client.put_small(bucket='bucket', key='small', body=body,
+                                endpoint=server.endpoint).result(self.timeout)
+            self.assertEqual(s3_client.get_small(bucket='bucket', key='small',
+                                                 endpoint=server.endpoint).result(self.timeout), body)
+            with self.assertRaises(S3ResponseError) as context:
+                s3_client.get_small(bucket='bucket', key='missing', endpoint=server.endpoint).result(self.timeout)
+            self.assertEqual(context.exception.status_code, 404)
+
+        self._run_with_server(False, test_fn)
+
+    def test_get_object_cached_range(self):
+        def test_fn(server, s3_client):
+            body = os.urandom(1000)
+            server.put_object('bucket', 'cached', body)
+            for _ in range(2):
+                chunks = []
+                headers = HttpHeaders([('host', server.endpoint), ('Range', 'bytes=100-299')])
+                s3_client.make_request(
+                    type=S3RequestType.GET_OBJECT,
+                    request=HttpRequest('GET', '/bucket/cached', headers),
+                    on_body=lambda chunk, offset, **kwargs: chunks.append((offset, bytes(chunk)))
+                ).finished_future.result(self.timeout)
+                # Offsets are in the object, whether the response was downloaded or replayed from the cache
+                self.assertEqual(chunks[0][0], 100)
+                self.assertEqual(b''.join(chunk for offset, chunk in chunks), body[100:300])
+            self.assertEqual(cache.misses, 1)
+            self.assertEqual(cache.hits, 1)
+
+        cache = S3ObjectCache()
+        self._run_with_server(False, test_fn, object_cache=cache)
+
+    def test_copy_object_multipart_keeps_metadata(self):
+        def test_fn(server, s3_client):
+            body = os.urandom(2 * self.part_size + 100)
+            server.put_object('bucket', 'source', body, metadata=[
+                ('Content-Type', 'image/png'),
+                ('Content-Encoding', 'gzip'),
+                ('Cache-Control', 'max-age=60'),
+                ('Content-Disposition', 'attachment; filename="a.png"'),
+                ('x-amz-meta-color', 'blue'),
+            ])
+            copy = s3_client.copy_object(
+                source_bucket='bucket',
+                source_key='source',
+                bucket='bucket',
+                key='copied',
+                part_size=self.part_size,
+                headers=[('Cache-Control', 'no-cache')],
+                endpoint=server.endpoint)
+            self.assertIsNone(copy.finished_future.result(self.timeout))
+
+            copied = server.get_object('bucket', 'copied')
+            self.assertEqual(copied.data, body)
+            self.assertTrue(copied.etag.endswith('-3"'))
+            # The caller's headers override the source's
+            self.assertEqual(sorted((name.lower(), value) for name, value in copied.metadata), [
+                ('cache-control', 'no-cache'),
+                ('content-disposition', 'attachment; filename="a.png"'),
+                ('content-encoding', 'gzip'),
+                ('content-type', 'image/png'),
+                ('x-amz-meta-color', 'blue'),
+            ])
+
+            copy = s3_client.copy_object(
+                source_bucket='bucket',
+                source_key='source',
+                bucket='bucket',
+                key='replaced',
+                part_size=self.part_size,
+                headers=[('x-amz-metadata-directive', 'REPLACE'), ('x-amz-meta-shape', 'round')],
+                endpoint=server.endpoint)
+            self.assertIsNone(copy.finished_future.result(self.timeout))
+            self.assertEqual(server.get_object('bucket', 'replaced').metadata, [('x-amz-meta-shape', 'round')])
+
+        self._run_with_server(False, test_fn)
+
+    def test_list_objects_escaped_keys(self):
+        def test_fn(server, s3_client):
+            keys = ['a&b/1', 'a&b/2', "c<d>'e\"", 'f\u00e9\u4e16\U0001f600']
+            for key in keys:
+                server.put_object('bucket', key, b'x')
+            listed = [o.key for o in s3_client.list_objects('bucket', max_keys=1, endpoint=server.endpoint)]
+            self.assertEqual(listed, sorted(keys))
+            lister = s3_client.list_objects('bucket', delimiter='/', endpoint=server.endpoint)
+            self.assertEqual([o.key for o in lister], sorted(keys)[2:])
+            self.assertEqual(lister.common_prefixes, ['a&b/'])
+
+        self._run_with_server(False, test_fn)
+
+
 if __name__ == '__main__':
     unittest.main()